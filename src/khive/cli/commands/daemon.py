@@ -19,15 +19,19 @@ from pathlib import Path
 import click
 import psutil
 
-from khive.daemon.client import get_daemon_client
+from khive.daemon.client import KhiveDaemonClient, get_daemon_client
+from khive.daemon.liveness import read_daemon_record
 from khive.utils import get_logger
 
 logger = get_logger("KhiveDaemonCLI", "🎮 [DAEMON-CLI]")
 
-# Daemon paths
-PID_FILE = Path.home() / ".khive" / "daemon.pid"
+# Daemon paths (the daemon records its PID in khive.daemon.liveness.STATE_FILE)
 LOG_FILE = Path.home() / ".khive" / "daemon.log"
 
+# Startup readiness polling
+STARTUP_TIMEOUT = 15.0  # seconds
+STARTUP_POLL_INTERVAL = 0.05  # seconds
+
 
 @click.group()
 def daemon():
@@ -47,7 +51,7 @@ def start(foreground: bool, port: int, host: str):
         return
 
     # Ensure directories exist
-    PID_FILE.parent.mkdir(exist_ok=True)
+    LOG_FILE.parent.mkdir(exist_ok=True)
 
     if foreground:
         # Run in foreground
@@ -78,15 +82,22 @@ def start(foreground: bool, port: int, host: str):
                 start_new_session=True,  # Detach from terminal
             )
 
-        # Wait a moment for startup
-        time.sleep(2)
-
-        # Check if started successfully
-        client = get_daemon_client()
-        client.base_url = f"http://{host}:{port}"
-
-        if client.is_running():
-            click.echo("✅ Khive daemon started successfully")
+        # Poll until the daemon answers instead of sleeping a fixed time
+        client = KhiveDaemonClient(f"http://{host}:{port}")
+        started = time.monotonic()
+        running = False
+        while time.monotonic() - started < STARTUP_TIMEOUT:
+            if process.poll() is not None:
+                break  # Daemon process exited during startup
+            if client.is_running():
+                running = True
+                break
+            time.sleep(STARTUP_POLL_INTERVAL)
+
+        if running:
+            click.echo(
+                f"✅ Khive daemon started successfully in {time.monotonic() - started:.2f}s"
+            )
             _show_status()
         else:
             click.echo("❌ Failed to start daemon. Check logs with: khive daemon logs")
@@ -106,18 +117,16 @@ def stop():
         click.echo("Shutting down daemon gracefully...")
         time.sleep(1)
 
-    # If still running, use PID file
-    if PID_FILE.exists():
+    # If still running, signal the PID the daemon recorded at startup
+    pid = _daemon_pid()
+    if pid:
         try:
-            pid = int(PID_FILE.read_text())
             os.kill(pid, signal.SIGTERM)
             click.echo("✅ Khive daemon stopped")
-            PID_FILE.unlink()
-        except (ProcessLookupError, ValueError):
+        except ProcessLookupError:
             click.echo("Daemon process not found")
-            PID_FILE.unlink()
     else:
-        click.echo("No PID file found")
+        click.echo("No daemon PID recorded")
 
 
 @daemon.command()
@@ -154,10 +163,6 @@ def restart():
         client.shutdown()
         time.sleep(1)
 
-    # Clean up PID file
-    if PID_FILE.exists():
-        PID_FILE.unlink()
-
     # Start again
     ctx = click.get_current_context()
     ctx.invoke(start)
@@ -170,9 +175,9 @@ def ps():
         click.echo("Khive daemon is not running")
         return
 
-    if PID_FILE.exists():
+    pid = _daemon_pid()
+    if pid:
         try:
-            pid = int(PID_FILE.read_text())
             proc = psutil.Process(pid)
 
             click.echo(f"PID: {pid}")
@@ -191,10 +196,16 @@ def ps():
                     if conn.status == "LISTEN":
                         click.echo(f"  {conn.laddr.ip}:{conn.laddr.port}")
 
-        except (psutil.NoSuchProcess, ValueError):
+        except psutil.NoSuchProcess:
             click.echo("Daemon process not found")
 
 
+def _daemon_pid() -> int | None:
+    """PID recorded by the running daemon, if any."""
+    record = read_daemon_record()
+    return record.get("pid") if record else None
+
+
 def _is_daemon_running() -> bool:
     """Check if daemon is running."""
     client = get_daemon_client()
@@ -222,6 +233,19 @@ def _show_status():
         click.echo(f"  Requests: {stats.get('requests', 0)}")
         click.echo(f"  Errors: {stats.get('errors', 0)}")
 
+    # Startup timings (services are initialized lazily after the port binds)
+    report = client.startup_report()
+    if report:
+        click.echo(f"  Startup: {report.get('startup_ms')} ms")
+        for name, service in report.get("services", {}).items():
+            timing = ""
+            if service.get("state") == "ready":
+                timing = (
+                    f" (import {service.get('import_ms')} ms,"
+                    f" init {service.get('init_ms')} ms)"
+                )
+            click.echo(f"    {name}: {service.get('state')}{timing}")
+
     click.echo("  API: http://127.0.0.1:11634/")
 
 
@@ -21,12 +21,34 @@ from khive.services.claude.hooks.hook_event import (
     HookEventBroadcaster,
     HookEventContent,
 )
+from khive.services.claude.hooks.export import EXPORT_FORMATS, iter_export
+from khive.services.claude.hooks.spool import import_spool
+from khive.utils import HOOK_SPOOL_DIR, SQLITE_PATH
 
 
 @click.group()
 @click.version_option(version=version)
-def cli():
+@click.pass_context
+def cli(ctx: click.Context):
     """Claude Code Observability - Hook monitoring and dashboard."""
+    if ctx.invoked_subcommand != "hook":
+        import_spooled_events()
+
+
+def import_spooled_events():
+    """Fold events hooks spooled while the daemon was down into the database."""
+    try:
+        result = import_spool(HOOK_SPOOL_DIR, db_path=SQLITE_PATH)
+    except Exception as e:
+        click.echo(f"⚠️  Could not import spooled hook events: {e}", err=True)
+        return
+    if result["files"]:
+        # stderr, so it never mixes into `khive claude export` on stdout
+        click.echo(
+            f"📥 Imported {result['imported']} spooled hook events "
+            f"from {result['files']} files",
+            err=True,
+        )
 
 
 @cli.command()
@@ -326,6 +348,69 @@ def status(limit: int, event_type: str | None, session_id: str | None):
         click.echo(f"❌ Status error: {e}", err=True)
 
 
+@cli.command()
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    default="-",
+    help="Output file (default: stdout); a .gz suffix implies --gzip",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(EXPORT_FORMATS),
+    default="ndjson",
+    help="NDJSON (spool record layout) or CSV",
+)
+@click.option("--since", help="Start time, inclusive (e.g. 2026-01-01 or 2026-01-01 12:00)")
+@click.option("--until", help="End time, exclusive")
+@click.option("--event-type", help="Filter by event type")
+@click.option("--session-id", help="Filter by session ID")
+@click.option("--tool-name", help="Filter by tool name")
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output on the fly")
+def export(
+    output: str,
+    fmt: str,
+    since: str | None,
+    until: str | None,
+    event_type: str | None,
+    session_id: str | None,
+    tool_name: str | None,
+    compress: bool,
+):
+    """Stream hook events to NDJSON or CSV, oldest first.
+
+    Reads the database a page at a time, so exports of any size run in
+    constant memory.
+    """
+    filters = {
+        name: value
+        for name, value in (
+            ("event_type", event_type),
+            ("session_id", session_id),
+            ("tool_name", tool_name),
+        )
+        if value is not None
+    }
+    compress = compress or output.endswith(".gz")
+    stats: dict[str, int] = {}
+    try:
+        chunks = iter_export(
+            SQLITE_PATH, fmt, since, until, compress, stats=stats, **filters
+        )
+        with click.open_file(output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except Exception as e:
+        click.echo(f"❌ Export error: {e}", err=True)
+        sys.exit(1)
+    if output != "-":
+        click.echo(f"📤 Exported {stats.get('events', 0)} hook events to {output}")
+    else:
+        click.echo(f"📤 Exported {stats.get('events', 0)} hook events", err=True)
+
+
 @cli.command()
 @click.option("--event-type", default="test", help="Event type to create")
 @click.option("--tool-name", default="TestTool", help="Tool name for event")
@@ -15,8 +15,24 @@ Usage:
   khive daemon logs     # View logs
 """
 
-from .client import KhiveDaemonClient, ensure_daemon_running, get_daemon_client
-from .server import KhiveDaemonServer
+# The client pulls in httpx and the server FastAPI; hook entry points import
+# khive.daemon.liveness on every invocation, so load these only when used.
+_LAZY_EXPORTS = {
+    "KhiveDaemonClient": "client",
+    "ensure_daemon_running": "client",
+    "get_daemon_client": "client",
+    "KhiveDaemonServer": "server",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "KhiveDaemonServer",
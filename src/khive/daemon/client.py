@@ -4,36 +4,93 @@ Khive Daemon Client - Lightweight client for daemon communication.
 Handles communication with the khive daemon for stateful operations.
 """
 
+import json
 import os
 import time
 import asyncio
-from typing import Any, Optional
+from collections import Counter, deque
+from collections.abc import Awaitable
+from typing import Any, Optional, TypeVar
 from contextlib import asynccontextmanager
 import threading
-from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 
+from khive.daemon.liveness import DAEMON_URL, DaemonLiveness
 from khive.utils import get_logger
 
 logger = get_logger("KhiveClient", "📡 [KHIVE-CLIENT]")
 
 # Client configuration with performance optimizations
-DAEMON_URL = os.getenv("KHIVE_DAEMON_URL", "http://127.0.0.1:11634")
 CLIENT_TIMEOUT = 30.0  # seconds
 CONNECTION_POOL_SIZE = 10  # Maximum connections in pool
 MAX_KEEPALIVE_CONNECTIONS = 5  # Keep-alive connections
 KEEPALIVE_EXPIRY = 30.0  # Keep-alive timeout
 MAX_RETRIES = 3  # Maximum retry attempts
 BACKOFF_FACTOR = 0.3  # Exponential backoff factor
+MAX_CONCURRENT_REQUESTS = 32  # In-flight async requests per client
+TIMING_WINDOW = 1000  # Latency samples kept per endpoint
+# Errors meaning the daemon is not there. A slow reply (read/write/pool
+# timeout) does not: it must not open the circuit shared by every client.
+UNREACHABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+T = TypeVar("T")
+
+
+class RequestStats:
+    """Per-endpoint request timings and in-flight counts for one client."""
+
+    def __init__(self, window: int = TIMING_WINDOW):
+        self.window = window
+        self.latencies_ms: dict[str, deque[float]] = {}
+        self.counts: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def started(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self, endpoint: str, elapsed: float, ok: bool):
+        self.in_flight -= 1
+        self.counts[endpoint] += 1
+        if not ok:
+            self.failures[endpoint] += 1
+        samples = self.latencies_ms.get(endpoint)
+        if samples is None:
+            samples = self.latencies_ms[endpoint] = deque(maxlen=self.window)
+        samples.append(elapsed * 1000)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Count, failures and p50/p95/max latency (ms) per endpoint."""
+        summary = {}
+        for endpoint, samples in self.latencies_ms.items():
+            ordered = sorted(samples)
+            summary[endpoint] = {
+                "count": self.counts[endpoint],
+                "failed": self.failures[endpoint],
+                "p50_ms": round(ordered[len(ordered) // 2], 3),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                "max_ms": round(ordered[-1], 3),
+            }
+        return summary
 
 
 class KhiveDaemonClient:
     """High-performance client for communicating with khive daemon with async optimizations."""
 
-    def __init__(self, base_url: str = DAEMON_URL, enable_async: bool = False):
+    def __init__(
+        self,
+        base_url: str = DAEMON_URL,
+        enable_async: bool = False,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ):
         self.base_url = base_url.rstrip("/")
         self.enable_async = enable_async
+        self.max_concurrency = max_concurrency
+        # Circuit breaker + liveness cache shared with other processes
+        self.liveness = DaemonLiveness(self.base_url)
         
         # Connection pooling configuration for better performance
         limits = httpx.Limits(
@@ -56,29 +113,21 @@ class KhiveDaemonClient:
             transport=transport
         )
         
-        # Async client for high-performance operations
+        # Async client for high-performance operations; created on first
+        # async call unless enable_async asks for it up front
+        self.async_client: httpx.AsyncClient | None = None
         if enable_async:
-            self.async_client = httpx.AsyncClient(
-                timeout=httpx.Timeout(CLIENT_TIMEOUT),
-                limits=limits,
-                transport=httpx.AsyncHTTPTransport(
-                    limits=limits,
-                    retries=MAX_RETRIES,
-                    http2=True
-                )
-            )
-            self._async_lock = asyncio.Lock()
-        else:
-            self.async_client = None
-            self._async_lock = None
-        
-        # Thread pool for async-to-sync bridging
-        self._thread_pool = ThreadPoolExecutor(max_workers=4)
-        
+            self._get_async_client()
+        # Bounds concurrent async requests instead of serializing them;
+        # created per event loop on first use, see _get_semaphore
+        self._async_semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
         # Performance tracking
         self._request_count = 0
         self._total_request_time = 0.0
         self._failed_requests = 0
+        self.request_stats = RequestStats()
 
     def __enter__(self):
         return self
@@ -86,7 +135,6 @@ class KhiveDaemonClient:
     def __exit__(self, *args):
         self.client.close()
         if self.async_client:
-            # Use thread pool to handle async cleanup
             loop = None
             try:
                 loop = asyncio.get_running_loop()
@@ -97,72 +145,127 @@ class KhiveDaemonClient:
                 loop.create_task(self.async_client.aclose())
             else:
                 asyncio.run(self.async_client.aclose())
-        
-        self._thread_pool.shutdown(wait=False)
-    
+
     async def __aenter__(self):
-        if not self.async_client:
-            raise RuntimeError("Async client not initialized. Set enable_async=True")
+        self._get_async_client()
         return self
-    
+
     async def __aexit__(self, *args):
         if self.async_client:
             await self.async_client.aclose()
         self.client.close()
-        self._thread_pool.shutdown(wait=False)
 
-    async def _make_async_request(self, method: str, url: str, **kwargs) -> httpx.Response:
-        """Make async HTTP request with error handling and retries."""
-        if not self.async_client:
-            raise RuntimeError("Async client not initialized")
-        
-        start_time = time.time()
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the async client, creating it on first use."""
+        if self.async_client is None:
+            # HTTP/2 is not negotiated over plain http, so every in-flight
+            # request needs its own connection - size the pool to match
+            limits = httpx.Limits(
+                max_connections=max(CONNECTION_POOL_SIZE, self.max_concurrency),
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )
+            self.async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(CLIENT_TIMEOUT),
+                limits=limits,
+                transport=httpx.AsyncHTTPTransport(
+                    limits=limits,
+                    retries=MAX_RETRIES,
+                    http2=True
+                )
+            )
+        return self.async_client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """The concurrency bound for the running loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._async_semaphore is None or self._semaphore_loop is not loop:
+            # A semaphore binds to the loop it first waits on; callers such
+            # as hooks may use a fresh loop per call
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._async_semaphore
+
+    def _check_circuit(self):
+        """Fail fast while the daemon is known to be down."""
+        if not self.liveness.allow_request():
+            raise httpx.ConnectError(f"Khive daemon unavailable at {self.base_url}")
+
+    def _record(self, method: str, url: str, started: float, ok: bool):
+        elapsed = time.perf_counter() - started
         self._request_count += 1
-        
-        try:
-            async with self._async_lock:
-                response = await self.async_client.request(method, url, **kwargs)
+        self._total_request_time += elapsed
+        if not ok:
+            self._failed_requests += 1
+        endpoint = f"{method} {url.removeprefix(self.base_url)}"
+        self.request_stats.finished(endpoint, elapsed, ok)
+
+    async def _make_async_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Make async HTTP request; up to `max_concurrency` are in flight at once."""
+        client = self._get_async_client()
+        self._check_circuit()
+
+        async with self._get_semaphore():
+            started = time.perf_counter()
+            self.request_stats.started()
+            ok = False
+            try:
+                response = await client.request(method, url, **kwargs)
+                self.liveness.record_success()
                 response.raise_for_status()
-                
-                self._total_request_time += time.time() - start_time
+                ok = True
                 return response
-        except Exception as e:
-            self._failed_requests += 1
-            self._total_request_time += time.time() - start_time
-            raise e
-    
+            except UNREACHABLE_ERRORS:
+                self.liveness.record_failure()
+                raise
+            finally:
+                self._record(method, url, started, ok)
+
     def _make_sync_request(self, method: str, url: str, **kwargs) -> httpx.Response:
         """Make synchronous HTTP request with performance tracking."""
-        start_time = time.time()
-        self._request_count += 1
-        
+        self._check_circuit()
+        started = time.perf_counter()
+        self.request_stats.started()
+        ok = False
         try:
             response = self.client.request(method, url, **kwargs)
+            self.liveness.record_success()
             response.raise_for_status()
-            
-            self._total_request_time += time.time() - start_time
+            ok = True
             return response
-        except Exception as e:
-            self._failed_requests += 1
-            self._total_request_time += time.time() - start_time
-            raise e
+        except UNREACHABLE_ERRORS:
+            self.liveness.record_failure()
+            raise
+        finally:
+            self._record(method, url, started, ok)
+
+    async def gather(
+        self, *calls: Awaitable[T], return_exceptions: bool = False
+    ) -> list[T]:
+        """
+        Await many async client calls concurrently, in order, e.g.::
+
+            await client.gather(
+                *(client.register_file_operation_async(p, agent_id) for p in paths)
+            )
+
+        In-flight requests stay bounded by `max_concurrency`.
+        """
+        return list(await asyncio.gather(*calls, return_exceptions=return_exceptions))
     
     def is_running(self) -> bool:
-        """Check if daemon is running with optimized health check."""
-        try:
-            response = self._make_sync_request("GET", f"{self.base_url}/health")
-            return response.status_code == 200
-        except (httpx.ConnectError, httpx.TimeoutException, httpx.HTTPStatusError):
-            return False
-    
+        """Check if daemon is running, from the shared liveness cache when fresh.
+
+        A known-down daemon costs a state-file read; only a stale or expired
+        entry triggers a single no-retry /health probe.
+        """
+        return self.liveness.is_alive()
+
     async def is_running_async(self) -> bool:
         """Async version of daemon health check."""
-        if not self.async_client:
-            # Fallback to sync version
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.is_running
-            )
-        
+        alive = self.liveness.cached()
+        if alive is not None:
+            return alive
         try:
             await self._make_async_request("GET", f"{self.base_url}/health")
             return True
@@ -184,6 +287,15 @@ class KhiveDaemonClient:
             logger.error(f"Failed to get daemon health: {e}")
             return {"status": "error", "error": str(e)}
     
+    def startup_report(self) -> dict[str, Any]:
+        """Get daemon startup timings (per-service import and init time)."""
+        try:
+            response = self._make_sync_request("GET", f"{self.base_url}/api/startup")
+            return response.json()
+        except Exception as e:
+            logger.debug(f"Startup report unavailable: {e}")
+            return {}
+
     def get_performance_metrics(self) -> dict[str, Any]:
         """Get client performance metrics."""
         if self._request_count == 0:
@@ -199,7 +311,12 @@ class KhiveDaemonClient:
             "failed_requests": self._failed_requests,
             "connection_pool_size": CONNECTION_POOL_SIZE,
             "keepalive_connections": MAX_KEEPALIVE_CONNECTIONS,
-            "async_enabled": self.async_client is not None
+            "async_enabled": self.async_client is not None,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.request_stats.in_flight,
+            "peak_in_flight": self.request_stats.peak_in_flight,
+            "endpoints": self.request_stats.summary(),
+            "circuit": self.liveness.report(),
         }
 
     def plan(
@@ -225,12 +342,6 @@ class KhiveDaemonClient:
         self, task_description: str, context: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """Async version of plan generation for better performance."""
-        if not self.async_client:
-            # Fallback to sync version in thread pool
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.plan, task_description, context
-            )
-        
         try:
             response = await self._make_async_request(
                 "POST",
@@ -308,6 +419,26 @@ class KhiveDaemonClient:
             logger.error(f"Failed to get insights: {e}")
             return {}
 
+    def hook_rollups(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        group_by: str = "event_type",
+        **filters: str,
+    ) -> list[dict[str, Any]]:
+        """Hourly hook event aggregates (see /api/hooks/rollups)."""
+        params = {"since": since, "until": until, "group_by": group_by, **filters}
+        try:
+            response = self._make_sync_request(
+                "GET",
+                f"{self.base_url}/api/hooks/rollups",
+                params={k: v for k, v in params.items() if v is not None},
+            )
+            return response.json()["rollups"]
+        except Exception as e:
+            logger.debug(f"Hook rollups unavailable: {e}")
+            return []
+
     def get_active_file_operations(self) -> dict[str, str]:
         """Get active file operations with optimized performance."""
         try:
@@ -325,11 +456,6 @@ class KhiveDaemonClient:
     
     async def get_active_file_operations_async(self) -> dict[str, str]:
         """Async version for better performance in high-throughput scenarios."""
-        if not self.async_client:
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.get_active_file_operations
-            )
-        
         try:
             response = await self._make_async_request(
                 "GET",
@@ -343,54 +469,123 @@ class KhiveDaemonClient:
             logger.error(f"Failed to get active file operations: {e}")
             return {}
 
-    def register_file_operation(self, file_path: str, agent_id: str) -> dict[str, Any]:
-        """Register file operation with optimized conflict detection."""
+    def register_file_operation(
+        self, file_path: str, agent_id: str, directory: bool = False
+    ) -> dict[str, Any]:
+        """Register file operation with optimized conflict detection.
+
+        With `directory=True`, `file_path` is a directory and the lock
+        covers everything below it.
+        """
         try:
             # Use path normalization for better cache hits
             normalized_path = os.path.normpath(file_path)
             response = self._make_sync_request(
                 "POST",
-                f"{self.base_url}/api/coordinate/file-operations/register",
-                json={"file_path": normalized_path, "agent_id": agent_id}
+                f"{self.base_url}/api/coordinate/file-register",
+                json={
+                    "file_path": normalized_path,
+                    "agent_id": agent_id,
+                    "directory": directory,
+                },
             )
-            return response.json()
+            return {"can_proceed": True, **response.json()}
         except httpx.ConnectError:
             logger.debug("Daemon not running, allowing file operation")
             return {"status": "granted", "can_proceed": True}
+        except httpx.HTTPStatusError as e:
+            return _file_register_error(e)
         except Exception as e:
             logger.error(f"Failed to register file operation: {e}")
             return {"status": "error", "can_proceed": True, "error": str(e)}
-    
-    async def register_file_operation_async(self, file_path: str, agent_id: str) -> dict[str, Any]:
-        """Async file operation registration for better performance."""
-        if not self.async_client:
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.register_file_operation, file_path, agent_id
-            )
-        
+
+    async def register_file_operation_async(
+        self, file_path: str, agent_id: str, directory: bool = False
+    ) -> dict[str, Any]:
+        """Async file operation registration; safe to run many at once."""
         try:
             normalized_path = os.path.normpath(file_path)
             response = await self._make_async_request(
                 "POST",
-                f"{self.base_url}/api/coordinate/file-operations/register",
-                json={"file_path": normalized_path, "agent_id": agent_id}
+                f"{self.base_url}/api/coordinate/file-register",
+                json={
+                    "file_path": normalized_path,
+                    "agent_id": agent_id,
+                    "directory": directory,
+                },
             )
-            return response.json()
+            return {"can_proceed": True, **response.json()}
         except httpx.ConnectError:
             logger.debug("Daemon not running, allowing file operation")
             return {"status": "granted", "can_proceed": True}
+        except httpx.HTTPStatusError as e:
+            return _file_register_error(e)
         except Exception as e:
             logger.error(f"Failed to register file operation: {e}")
             return {"status": "error", "can_proceed": True, "error": str(e)}
 
-    def unregister_file_operation(self, file_path: str) -> dict[str, Any]:
+    def request_file_locks(
+        self,
+        file_paths: list[str],
+        agent_id: str,
+        directory: bool = False,
+        wait_seconds: float = 0.0,
+    ) -> dict[str, Any]:
+        """Lock every path or none, in one round-trip.
+
+        With `wait_seconds`, the daemon queues the request fairly behind
+        earlier ones for up to that long instead of refusing at once.
+        """
+        try:
+            response = self._make_sync_request(
+                "POST",
+                f"{self.base_url}/api/coordinate/file-locks",
+                json=_file_locks_body(file_paths, agent_id, directory, wait_seconds),
+                timeout=CLIENT_TIMEOUT + wait_seconds,
+            )
+            return {"can_proceed": True, **response.json()}
+        except httpx.ConnectError:
+            logger.debug("Daemon not running, allowing file operations")
+            return {"status": "granted", "can_proceed": True}
+        except httpx.HTTPStatusError as e:
+            return _file_register_error(e)
+        except Exception as e:
+            logger.error(f"Failed to request file locks: {e}")
+            return {"status": "error", "can_proceed": True, "error": str(e)}
+
+    async def request_file_locks_async(
+        self,
+        file_paths: list[str],
+        agent_id: str,
+        directory: bool = False,
+        wait_seconds: float = 0.0,
+    ) -> dict[str, Any]:
+        """Async request_file_locks."""
+        try:
+            response = await self._make_async_request(
+                "POST",
+                f"{self.base_url}/api/coordinate/file-locks",
+                json=_file_locks_body(file_paths, agent_id, directory, wait_seconds),
+                timeout=CLIENT_TIMEOUT + wait_seconds,
+            )
+            return {"can_proceed": True, **response.json()}
+        except httpx.ConnectError:
+            logger.debug("Daemon not running, allowing file operations")
+            return {"status": "granted", "can_proceed": True}
+        except httpx.HTTPStatusError as e:
+            return _file_register_error(e)
+        except Exception as e:
+            logger.error(f"Failed to request file locks: {e}")
+            return {"status": "error", "can_proceed": True, "error": str(e)}
+
+    def unregister_file_operation(self, file_path: str, agent_id: str) -> dict[str, Any]:
         """Unregister file operation and release lock."""
         try:
-            response = self.client.post(
-                f"{self.base_url}/api/coordinate/file-operations/unregister",
-                json={"file_path": file_path},
+            response = self._make_sync_request(
+                "POST",
+                f"{self.base_url}/api/coordinate/file-unregister",
+                json={"file_path": os.path.normpath(file_path), "agent_id": agent_id},
             )
-            response.raise_for_status()
             return response.json()
         except httpx.ConnectError:
             logger.debug("Daemon not running, file operation cleanup skipped")
@@ -399,6 +594,38 @@ class KhiveDaemonClient:
             logger.error(f"Failed to unregister file operation: {e}")
             return {"status": "error", "error": str(e)}
 
+    async def unregister_file_operation_async(
+        self, file_path: str, agent_id: str
+    ) -> dict[str, Any]:
+        """Async lock release; pairs with register_file_operation_async."""
+        try:
+            response = await self._make_async_request(
+                "POST",
+                f"{self.base_url}/api/coordinate/file-unregister",
+                json={"file_path": os.path.normpath(file_path), "agent_id": agent_id},
+            )
+            return response.json()
+        except httpx.ConnectError:
+            logger.debug("Daemon not running, file operation cleanup skipped")
+            return {"status": "not_running"}
+        except Exception as e:
+            logger.error(f"Failed to unregister file operation: {e}")
+            return {"status": "error", "error": str(e)}
+
+    def get_file_lock_tree(self) -> dict[str, Any]:
+        """Held file and directory locks as a path tree."""
+        try:
+            response = self._make_sync_request(
+                "GET", f"{self.base_url}/api/coordinate/file-locks"
+            )
+            return response.json()
+        except httpx.ConnectError:
+            logger.debug("Daemon not running, no file locks available")
+            return {"total_locks": 0, "tree": None}
+        except Exception as e:
+            logger.error(f"Failed to get file lock tree: {e}")
+            return {"status": "error", "error": str(e)}
+
     def get_file_coordination_status(self) -> dict[str, Any]:
         """Get file coordination status and metrics."""
         try:
@@ -412,6 +639,33 @@ class KhiveDaemonClient:
             logger.error(f"Failed to get file coordination status: {e}")
             return {"status": "error", "error": str(e)}
 
+    def iter_coordination_events(self, since: int | None = None):
+        """
+        Follow the daemon's coordination change stream (Server-Sent Events).
+
+        Yields event dicts with `seq`, `kind`, `timestamp` and `data`. The
+        first event is a `snapshot` unless `since` can be replayed. Pass the
+        last `seq` seen to resume after a disconnect.
+        """
+        headers = {"Accept": "text/event-stream"}
+        if since is not None:
+            headers["Last-Event-ID"] = str(since)
+
+        with self.client.stream(
+            "GET",
+            f"{self.base_url}/api/coordinate/events",
+            headers=headers,
+            timeout=httpx.Timeout(CLIENT_TIMEOUT, read=None),
+        ) as response:
+            response.raise_for_status()
+            data_lines: list[str] = []
+            for line in response.iter_lines():
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                elif not line and data_lines:
+                    yield json.loads("\n".join(data_lines))
+                    data_lines = []
+
     def session_init(self, resume: bool = False) -> dict[str, Any]:
         """Initialize or resume session with optimized performance."""
         try:
@@ -431,11 +685,6 @@ class KhiveDaemonClient:
     
     async def session_init_async(self, resume: bool = False) -> dict[str, Any]:
         """Async session initialization for better responsiveness."""
-        if not self.async_client:
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.session_init, resume
-            )
-        
         try:
             response = await self._make_async_request(
                 "POST",
@@ -532,11 +781,6 @@ class KhiveDaemonClient:
         visualize: bool = False,
     ) -> dict[str, Any]:
         """Async orchestration for high-performance scenarios."""
-        if not self.async_client:
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.orchestrate_task, task_description, context, pattern, max_agents, visualize
-            )
-        
         try:
             response = await self._make_async_request(
                 "POST",
@@ -703,11 +947,6 @@ class KhiveDaemonClient:
     
     async def shutdown_async(self) -> bool:
         """Async daemon shutdown for better performance."""
-        if not self.async_client:
-            return await asyncio.get_event_loop().run_in_executor(
-                self._thread_pool, self.shutdown
-            )
-        
         try:
             await self._make_async_request("POST", f"{self.base_url}/api/shutdown")
             return True
@@ -715,6 +954,27 @@ class KhiveDaemonClient:
             return False
 
 
+def _file_locks_body(
+    file_paths: list[str], agent_id: str, directory: bool, wait_seconds: float
+) -> dict[str, Any]:
+    return {
+        "file_paths": [os.path.normpath(path) for path in file_paths],
+        "agent_id": agent_id,
+        "directory": directory,
+        "wait_seconds": wait_seconds,
+    }
+
+
+def _file_register_error(error: httpx.HTTPStatusError) -> dict[str, Any]:
+    """Map a failed file-register response to a hook-friendly result."""
+    if error.response.status_code == 409:
+        # Held by another agent - the daemon sends the lock holder as detail
+        detail = error.response.json().get("detail", {})
+        return {**detail, "status": "locked", "can_proceed": False}
+    logger.error(f"Failed to register file operation: {error}")
+    return {"status": "error", "can_proceed": True, "error": str(error)}
+
+
 # Global client instances with performance optimizations
 _global_client: Optional[KhiveDaemonClient] = None
 _global_async_client: Optional[KhiveDaemonClient] = None
@@ -0,0 +1,134 @@
+"""
+Push-based coordination change stream for the khive daemon.
+
+Replaces polling of /api/coordinate/status and friends: clients open one
+Server-Sent Events connection and receive incremental, sequence-numbered
+registry events. A client that reconnects sends its last sequence number
+(``Last-Event-ID`` header or ``?since=``) and resumes without gaps; if the
+registry has already evicted those events, a fresh ``snapshot`` is sent
+instead so the client can rebuild its view.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from khive.services.claude.hooks.coordination import (
+    CoordinationEvent,
+    CoordinationRegistry,
+)
+
+HEARTBEAT_SECONDS = 15.0  # Keep proxies from closing idle streams
+RETRY_MS = 3000  # Reconnect delay suggested to EventSource clients
+
+
+class CoordinationEventStream:
+    """Fan registry change events out to any number of async stream readers."""
+
+    def __init__(
+        self,
+        registry: CoordinationRegistry,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS,
+    ):
+        self.registry = registry
+        self.heartbeat_seconds = heartbeat_seconds
+        self._waiters: set[asyncio.Future] = set()
+        self.subscribers = 0
+        registry.add_event_listener(self._on_event)
+
+    def close(self):
+        """Detach from the registry and wake all readers."""
+        self.registry.remove_event_listener(self._on_event)
+        self._wake_all()
+
+    def _on_event(self, _event: CoordinationEvent):
+        self._wake_all()
+
+    def _wake_all(self):
+        waiters, self._waiters = self._waiters, set()
+        for fut in waiters:
+            if not fut.done():
+                fut.get_loop().call_soon_threadsafe(_resolve, fut)
+
+    async def _wait(self, timeout: float) -> bool:
+        """Wait for the next registry event. Returns False on timeout."""
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.add(fut)
+        try:
+            await asyncio.wait_for(fut, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiters.discard(fut)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Full registry state tagged with the sequence it reflects."""
+        status = self.registry.get_status()
+        return {"seq": status["seq"], "kind": "snapshot", "data": status}
+
+    async def iter_events(
+        self, since: int | None = None
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """
+        Yield events after `since` forever, as dicts.
+
+        Starts with a snapshot when `since` is None or too old to replay.
+        Yields None when `heartbeat_seconds` pass without any change.
+        """
+        self.subscribers += 1
+        try:
+            last_seq = since
+            while True:
+                events = (
+                    None if last_seq is None else self.registry.events_since(last_seq)
+                )
+                if events is None:
+                    snapshot = self.snapshot()
+                    last_seq = snapshot["seq"]
+                    yield snapshot
+                    continue
+
+                for event in events:
+                    last_seq = event.seq
+                    yield event.to_dict()
+
+                if not events and not await self._wait(self.heartbeat_seconds):
+                    yield None
+        finally:
+            self.subscribers -= 1
+
+
+def _resolve(fut: asyncio.Future):
+    if not fut.done():
+        fut.set_result(None)
+
+
+def format_sse(message: dict[str, Any] | None) -> str:
+    """Encode one stream message as an SSE frame (None -> heartbeat comment)."""
+    if message is None:
+        return ": heartbeat\n\n"
+    return (
+        f"id: {message['seq']}\n"
+        f"event: {message['kind']}\n"
+        f"data: {json.dumps(message, default=str)}\n\n"
+    )
+
+
+async def sse_frames(
+    stream: CoordinationEventStream, since: int | None = None
+) -> AsyncIterator[str]:
+    """SSE body for a StreamingResponse, starting with the retry hint."""
+    yield f"retry: {RETRY_MS}\n\n"
+    async for message in stream.iter_events(since):
+        yield format_sse(message)
+
+
+__all__ = (
+    "CoordinationEventStream",
+    "format_sse",
+    "sse_frames",
+)
@@ -0,0 +1,377 @@
+"""
+Batched hook event ingestion for the khive daemon.
+
+Saving a HookEvent through the lionagi adapter opens an engine, checks the
+table and commits one row per hook. Under bursty hook traffic that is one
+fsync per event, and concurrent hook processes fight over the SQLite write
+lock.
+
+Inside the daemon, events are instead put on an asyncio queue and a single
+writer task drains it: each batch is one ``executemany`` transaction on a
+long-lived WAL connection with ``synchronous=NORMAL``. Subscribers are only
+told about events once their batch has committed. A full queue makes
+producers wait (up to `enqueue_timeout`) rather than grow memory without
+bound; queue depth, producer wait time and rejections are reported by
+`stats()`.
+
+Events are acknowledged once queued, so a batch that fails to commit is
+retried with exponential backoff. If it still fails it is appended to the
+offline spool, which the next spool import replays into the table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from khive.services.claude.hooks.schema import INSERT_SQL, migrate
+from khive.utils import HOOK_SPOOL_DIR
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 256  # max events per transaction
+MAX_QUEUE = 10_000  # queued events before producers have to wait
+ENQUEUE_TIMEOUT = 1.0  # seconds a producer waits on a full queue
+COMMIT_WINDOW = 256  # recent commit timings kept for percentiles
+BUSY_TIMEOUT_MS = 5000  # wait for other writers (e.g. a CLI spool import)
+WRITE_RETRIES = 3  # further attempts at a failed batch before spooling it
+RETRY_BACKOFF = 0.1  # seconds before the first retry, doubled for each next one
+
+Row = tuple[str, str, str, str, str | None]
+Subscriber = Callable[[Any], Awaitable[None] | None]
+
+
+class IngestBackpressure(RuntimeError):
+    """The ingestion queue stayed full for longer than the enqueue timeout."""
+
+
+class IngestorClosed(RuntimeError):
+    """The ingestor is not running."""
+
+
+def event_row(event: Any) -> Row:
+    """Table row for a lionagi Node (anything with ``to_dict(mode="db")``)."""
+    return db_row(event.to_dict(mode="db"))
+
+
+def db_row(data: dict[str, Any]) -> Row:
+    """Table row for a node already in lionagi's db dict format."""
+    embedding = data.get("embedding")
+    return (
+        str(data["id"]),
+        json.dumps(data.get("content")),
+        json.dumps(data.get("node_metadata")),
+        str(data["created_at"]),
+        None if embedding is None else json.dumps(embedding),
+    )
+
+
+def row_record(row: Row) -> dict[str, Any]:
+    """Inverse of `db_row`: the db dict a spool line holds."""
+    event_id, content, node_metadata, created_at, embedding = row
+    return {
+        "id": event_id,
+        "content": json.loads(content),
+        "node_metadata": json.loads(node_metadata),
+        "created_at": created_at,
+        "embedding": None if embedding is None else json.loads(embedding),
+    }
+
+
+def connect(db_path: str | Path) -> sqlite3.Connection:
+    """Writer connection: WAL so readers never block it, NORMAL fsync policy."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")  # First: WAL switch may wait
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def open_table(db_path: str | Path, table: str = "hook_events") -> sqlite3.Connection:
+    """Writer connection with the events table created and migrated."""
+    conn = connect(db_path)
+    migrate(conn, table)
+    return conn
+
+
+def insert_rows(conn: sqlite3.Connection, rows: list[Row], table: str = "hook_events") -> int:
+    """Insert `rows` in one transaction, skipping known ids. Returns rows added."""
+    with conn:
+        before = conn.total_changes
+        conn.executemany(INSERT_SQL.format(table=table), rows)
+        return conn.total_changes - before
+
+
+class HookEventIngestor:
+    """Single-writer, batched persistence of hook events."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        table: str = "hook_events",
+        batch_size: int = BATCH_SIZE,
+        max_queue: int = MAX_QUEUE,
+        enqueue_timeout: float = ENQUEUE_TIMEOUT,
+        spool_dir: str | Path = HOOK_SPOOL_DIR,
+        write_retries: int = WRITE_RETRIES,
+        retry_backoff: float = RETRY_BACKOFF,
+    ):
+        self.db_path = Path(db_path)
+        self.spool_dir = Path(spool_dir)
+        self.write_retries = write_retries
+        self.retry_backoff = retry_backoff
+        self.table = table
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._conn: sqlite3.Connection | None = None
+        self._closing = False
+        # One thread owns the connection; the event loop never blocks on I/O
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="khive-ingest")
+        self._subscribers: list[Subscriber] = []
+        self._commit_ms: deque[float] = deque(maxlen=COMMIT_WINDOW)
+        self.counters = {
+            "enqueued": 0,
+            "written": 0,
+            "duplicates": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "retries": 0,
+            "spooled": 0,
+            "lost": 0,
+            "rejected": 0,
+            "producer_waits": 0,
+            "producer_wait_ms": 0.0,
+            "max_queue_depth": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
+    def subscribe(self, callback: Subscriber):
+        """Call `callback(event)` for every event after its batch commits."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def start(self):
+        """Start the writer task on the running loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.max_queue)
+        self._writer = asyncio.create_task(self._run(), name="khive-ingest-writer")
+
+    async def stop(self):
+        """Write everything already queued, then stop the writer."""
+        if self._writer is None:
+            return
+        self._closing = True
+        if self.running:
+            await self._queue.put(None)
+            await self._writer
+        self._writer = None
+        self._closing = False
+        await self._in_writer_thread(self._close)
+
+    async def submit(self, event: Any) -> int:
+        """
+        Queue one event for writing; returns the queue depth after it.
+
+        Returns once queued, not once committed. Waits while the queue is
+        full and raises IngestBackpressure after `enqueue_timeout`.
+        """
+        if not self.running or self._closing:
+            raise IngestorClosed("Hook event ingestor is not running")
+        item = (event_row(event), event)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            started = time.perf_counter()
+            self.counters["producer_waits"] += 1
+            try:
+                await asyncio.wait_for(self._queue.put(item), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.counters["rejected"] += 1
+                raise IngestBackpressure(
+                    f"Ingestion queue full ({self.max_queue} events)"
+                ) from None
+            finally:
+                self.counters["producer_wait_ms"] += (
+                    time.perf_counter() - started
+                ) * 1000
+        self.counters["enqueued"] += 1
+        depth = self._queue.qsize()
+        if depth > self.counters["max_queue_depth"]:
+            self.counters["max_queue_depth"] = depth
+        return depth
+
+    async def enqueue(self, event: Any) -> int:
+        """`submit` from any thread or event loop (e.g. hooks run in an executor)."""
+        if self._loop is None:
+            raise IngestorClosed("Hook event ingestor is not running")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            return await self.submit(event)
+        future = asyncio.run_coroutine_threadsafe(self.submit(event), self._loop)
+        return await asyncio.wrap_future(future)
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            # Block for the first event, then take whatever else is queued
+            item = await queue.get()
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size or queue.empty():
+                    break
+                item = queue.get_nowait()
+            if batch:
+                await self._write(batch)
+            if item is None:  # stop() sentinel
+                return
+
+    async def _write(self, batch: list[tuple[Row, Any]]):
+        rows = [row for row, _ in batch]
+        delay = self.retry_backoff
+        for attempt in range(self.write_retries + 1):
+            started = time.perf_counter()
+            try:
+                inserted = await self._in_writer_thread(self._insert, rows)
+                break
+            except Exception as e:
+                error = e
+                # Reopen on the next attempt in case the connection is broken
+                await self._in_writer_thread(self._close)
+            if attempt < self.write_retries:
+                self.counters["retries"] += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+        else:
+            self.counters["failed_batches"] += 1
+            await self._spool(rows, error)
+            return
+        self._commit_ms.append((time.perf_counter() - started) * 1000)
+        self.counters["batches"] += 1
+        self.counters["written"] += inserted
+        self.counters["duplicates"] += len(batch) - inserted
+
+        for _, event in batch:
+            for callback in list(self._subscribers):
+                try:
+                    result = callback(event)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.warning(f"Hook event subscriber failed: {e}")
+
+    async def _spool(self, rows: list[Row], error: Exception):
+        """Keep a batch that could not be committed in the offline spool."""
+        from khive.services.claude.hooks import spool
+
+        def append_all():
+            for row in rows:
+                spool.append(row_record(row), self.spool_dir)
+
+        try:
+            await self._in_writer_thread(append_all)
+        except Exception as e:
+            self.counters["lost"] += len(rows)
+            logger.error(
+                f"Failed to write {len(rows)} hook events ({error}) "
+                f"or spool them ({e}); they are lost"
+            )
+            return
+        self.counters["spooled"] += len(rows)
+        logger.error(
+            f"Failed to write {len(rows)} hook events after "
+            f"{self.write_retries} retries ({error}); spooled to {self.spool_dir}"
+        )
+
+    async def _in_writer_thread(self, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = open_table(self.db_path, self.table)
+        return self._conn
+
+    def _insert(self, rows: list[Row]) -> int:
+        """One transaction per batch. Returns the number of new rows."""
+        return insert_rows(self._connection(), rows, self.table)
+
+    async def run_on_connection(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run ``func(conn)`` on the writer's connection, in the writer thread.
+
+        Maintenance (spool import, retention) goes through here so it
+        serializes with batch commits instead of contending for the lock.
+        """
+        return await self._in_writer_thread(lambda: func(self._connection()))
+
+    async def import_spool(self, spool_dir: str | Path) -> dict[str, int]:
+        """Bulk-import offline spool files on the writer's own connection."""
+        from khive.services.claude.hooks.spool import import_spool
+
+        return await self.run_on_connection(
+            lambda conn: import_spool(spool_dir, conn=conn, table=self.table)
+        )
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> dict[str, Any]:
+        """Throughput and backpressure counters."""
+        timings = sorted(self._commit_ms)
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "producer_wait_ms": round(self.counters["producer_wait_ms"], 3),
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_queue,
+            "avg_batch_size": (
+                round((self.counters["written"] + self.counters["duplicates"]) / batches, 2)
+                if batches
+                else 0.0
+            ),
+            "commit_p50_ms": round(timings[len(timings) // 2], 3) if timings else 0.0,
+            "commit_max_ms": round(timings[-1], 3) if timings else 0.0,
+            "subscribers": len(self._subscribers),
+        }
+
+
+__all__ = (
+    "HookEventIngestor",
+    "IngestBackpressure",
+    "IngestorClosed",
+    "db_row",
+    "event_row",
+    "insert_rows",
+    "open_table",
+    "row_record",
+)
@@ -0,0 +1,142 @@
+"""
+Lazy, once-only construction of heavy daemon services.
+
+Each service module (planner, session, artifacts, composer) drags in a large
+dependency tree. Instead of importing and building them before the daemon
+binds its port, every service is wrapped in a LazyService that imports and
+constructs it on first use - or during background warm-up - exactly once,
+recording how long the import and the construction took.
+
+A service that failed to build (say, a missing API key) is not built again
+on every request: callers get None until a retry backoff has passed, which
+doubles with each consecutive failure, and the next use then retries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import time
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRY_BACKOFF = 30.0  # seconds before a failed service is built again
+MAX_RETRY_BACKOFF = 600.0
+
+
+class LazyService(Generic[T]):
+    """Async once-guard around a service that is expensive to import/build."""
+
+    def __init__(
+        self,
+        name: str,
+        module: str,
+        factory: Callable[[ModuleType], T],
+        retry_backoff: float = RETRY_BACKOFF,
+    ):
+        self.name = name
+        self.module = module
+        self.factory = factory
+        self.retry_backoff = retry_backoff
+        self.instance: T | None = None
+        self.state = "pending"  # pending, initializing, ready, failed
+        self.error: str | None = None
+        self.import_seconds: float | None = None
+        self.init_seconds: float | None = None
+        self.initialized_by: str | None = None  # "request" or "warmup"
+        self.failures = 0  # consecutive failed builds
+        self.retry_at: float | None = None  # monotonic time a failed build may rerun
+        self._building: asyncio.Future | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in ("ready", "failed")
+
+    async def get(self, reason: str = "request") -> T | None:
+        """
+        Return the service, building it on first call.
+
+        None if it failed; the first call after the retry backoff builds
+        it again.
+        """
+        if self.state == "ready":
+            return self.instance
+        if self.state == "failed":
+            if time.monotonic() < self.retry_at:
+                return None
+            self._building = None
+
+        if self._building is None:
+            self.state = "initializing"
+            self.initialized_by = reason
+            # Imports and constructors are blocking - keep them off the loop
+            self._building = asyncio.get_running_loop().run_in_executor(
+                None, self._build
+            )
+        # Every concurrent caller wakes together once the build finishes,
+        # instead of being handed a lock one at a time
+        await asyncio.shield(self._building)
+        return self.instance
+
+    def _build(self):
+        try:
+            started = time.perf_counter()
+            module = importlib.import_module(self.module)
+            self.import_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            self.instance = self.factory(module)
+            self.init_seconds = time.perf_counter() - started
+            self.error = None
+            self.failures = 0
+            self.retry_at = None
+            self.state = "ready"
+        except Exception as e:
+            self.failures += 1
+            backoff = min(MAX_RETRY_BACKOFF, self.retry_backoff * 2 ** (self.failures - 1))
+            logger.error(
+                f"Failed to initialize {self.name} service: {e} "
+                f"(retrying after {backoff:.0f}s)"
+            )
+            self.error = str(e)
+            self.instance = None
+            self.retry_at = time.monotonic() + backoff
+            self.state = "failed"
+
+    def report(self) -> dict[str, Any]:
+        """Timing and state for the startup report."""
+        return {
+            "state": self.state,
+            "initialized_by": self.initialized_by,
+            "import_ms": _ms(self.import_seconds),
+            "init_ms": _ms(self.init_seconds),
+            "error": self.error,
+            "failures": self.failures,
+            "retry_in_s": (
+                None
+                if self.retry_at is None
+                else round(max(0.0, self.retry_at - time.monotonic()), 1)
+            ),
+        }
+
+
+async def warm_up(services: dict[str, LazyService], delay: float = 0.0):
+    """Build every service in the background, one at a time."""
+    if delay:
+        # Let the server finish binding its socket before competing for the GIL
+        await asyncio.sleep(delay)
+    for service in services.values():
+        await service.get(reason="warmup")
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+__all__ = ("LazyService", "warm_up")
@@ -0,0 +1,321 @@
+"""
+Daemon liveness cache and circuit breaker, shared across processes.
+
+Every hook is a fresh process that asks "is the daemon up?" before doing any
+coordination. Probing /health each time costs a round trip when the daemon
+is up and a full connect attempt (with transport retries) when it is down.
+
+Instead, the answer lives in a small JSON state file:
+
+- The daemon writes its PID and URL once it is listening, and marks itself
+  stopped on shutdown.
+- Clients trust a successful probe for `ttl` seconds.
+- A failed connect opens the circuit: callers fail fast until `open_until`,
+  then one caller is let through as a half-open probe. Each failed probe
+  doubles the open window, up to `max_open_seconds`.
+- If the recorded daemon PID no longer exists, the circuit opens without
+  touching the network.
+
+Only stdlib is used so lightweight hook entry points can import this module.
+Non-loopback URLs keep their breaker state in memory only.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+DAEMON_URL = os.getenv("KHIVE_DAEMON_URL", "http://127.0.0.1:11634")
+STATE_FILE = Path(
+    os.getenv("KHIVE_DAEMON_STATE", str(Path.home() / ".khive" / "daemon.state"))
+)
+LIVENESS_TTL = 2.0  # seconds a successful probe is trusted
+OPEN_SECONDS = 1.0  # first open window after a failure
+MAX_OPEN_SECONDS = 30.0  # cap for the backed-off open window
+PROBE_TIMEOUT = 0.5  # seconds for the stdlib /health probe
+
+_LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1", "0.0.0.0"}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical daemon URL, so localhost and 127.0.0.1 share one circuit."""
+    parts = urlsplit(url.rstrip("/"))
+    host = parts.hostname or "127.0.0.1"
+    if host in ("localhost", "0.0.0.0"):
+        host = "127.0.0.1"
+    if ":" in host:
+        host = f"[{host}]"
+    port = f":{parts.port}" if parts.port else ""
+    return f"{parts.scheme or 'http'}://{host}{port}"
+
+
+def read_state(path: Path = STATE_FILE) -> dict[str, Any]:
+    """The whole state file, or an empty state if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(state: dict[str, Any], path: Path = STATE_FILE):
+    """Atomically replace the state file (last writer wins)."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Liveness caching is best effort
+
+
+def read_daemon_record(path: Path = STATE_FILE) -> dict[str, Any] | None:
+    """PID, URL and start time of the daemon that last announced itself."""
+    return read_state(path).get("daemon")
+
+
+def write_daemon_state(url: str, pid: int | None = None, path: Path = STATE_FILE):
+    """Called by the daemon once it is listening on `url`."""
+    url = normalize_url(url)
+    now = time.time()
+    state = read_state(path)
+    state["daemon"] = {"pid": pid or os.getpid(), "url": url, "started_at": now}
+    state.setdefault("circuits", {})[url] = _new_circuit("closed", checked_at=now)
+    _write_state(state, path)
+
+
+def clear_daemon_state(url: str, path: Path = STATE_FILE):
+    """Called by the daemon on shutdown: clients fail fast immediately."""
+    url = normalize_url(url)
+    now = time.time()
+    state = read_state(path)
+    daemon = state.get("daemon")
+    if daemon and daemon.get("url") == url and daemon.get("pid") == os.getpid():
+        state["daemon"] = None
+    state.setdefault("circuits", {})[url] = _new_circuit(
+        "open", failures=1, checked_at=now, open_until=now + OPEN_SECONDS
+    )
+    _write_state(state, path)
+
+
+def http_request(
+    base_url: str,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    timeout: float = PROBE_TIMEOUT,
+) -> tuple[int, bytes]:
+    """
+    Minimal HTTP/1.1 round trip over a plain socket: (status, body).
+
+    http.client drags in ssl and the email package, which costs more than a
+    whole hook should; the daemon only ever speaks plain http on loopback.
+    Raises OSError (or ValueError on a malformed reply).
+    """
+    parts = urlsplit(base_url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(head.encode("latin-1") + body)
+        chunks = []
+        while chunk := sock.recv(65536):
+            chunks.append(chunk)
+    raw = b"".join(chunks)
+    header, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(header.split(b" ", 2)[1])
+    if b"transfer-encoding: chunked" in header.lower():
+        payload = _dechunk(payload)
+    return status, payload
+
+
+def _dechunk(payload: bytes) -> bytes:
+    body = []
+    while payload:
+        size_line, _, payload = payload.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            break
+        body.append(payload[:size])
+        payload = payload[size + 2 :]
+    return b"".join(body)
+
+
+def _new_circuit(state: str = "unknown", **fields) -> dict[str, Any]:
+    return {"state": state, "failures": 0, "checked_at": 0.0, "open_until": 0.0, **fields}
+
+
+def pid_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        pass  # Exists but owned by someone else, or not checkable here
+    return True
+
+
+class DaemonLiveness:
+    """Circuit breaker with a TTL liveness cache for one daemon URL."""
+
+    def __init__(
+        self,
+        base_url: str,
+        path: Path = STATE_FILE,
+        ttl: float = LIVENESS_TTL,
+        open_seconds: float = OPEN_SECONDS,
+        max_open_seconds: float = MAX_OPEN_SECONDS,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.url = normalize_url(base_url)
+        self.path = path
+        self.ttl = ttl
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.shared = urlsplit(self.url).hostname in _LOOPBACK_HOSTS
+        self.circuit: dict[str, Any] | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        return self._circuit()["state"]
+
+    def _circuit(self) -> dict[str, Any]:
+        if self.circuit is None:
+            self._load()
+        return self.circuit
+
+    def _load(self) -> dict[str, Any]:
+        """Refresh the circuit from the state file; returns the file's state."""
+        if not self.shared:
+            if self.circuit is None:
+                self.circuit = _new_circuit()
+            return {}
+        state = read_state(self.path)
+        self.circuit = state.get("circuits", {}).get(self.url) or _new_circuit()
+        return state
+
+    def _save(self):
+        if not self.shared:
+            return
+        state = read_state(self.path)
+        state.setdefault("circuits", {})[self.url] = self.circuit
+        _write_state(state, self.path)
+
+    def cached(self) -> bool | None:
+        """
+        Liveness without touching the network, or None if a probe is needed.
+
+        Returning None from an open circuit claims the half-open probe: the
+        circuit is marked half_open so other processes keep failing fast
+        until this caller records the probe's outcome.
+        """
+        state = self._load()
+        circuit = self.circuit
+        now = time.time()
+
+        daemon = state.get("daemon")
+        if (
+            daemon
+            and daemon.get("url") == self.url
+            and daemon.get("pid")
+            and not pid_exists(daemon["pid"])
+        ):
+            if circuit["state"] != "open" or now >= circuit["open_until"]:
+                self._open(now)
+            return False
+
+        if circuit["state"] == "closed":
+            return True if now - circuit["checked_at"] < self.ttl else None
+        if circuit["state"] == "unknown":
+            return None
+        if now < circuit["open_until"]:
+            return False
+
+        circuit["state"] = "half_open"
+        circuit["open_until"] = now + 2 * PROBE_TIMEOUT
+        self._probing = True
+        self._save()
+        return None
+
+    def allow_request(self) -> bool:
+        """In-memory check for each request: False while the circuit is open."""
+        circuit = self._circuit()
+        if circuit["state"] in ("closed", "unknown") or self._probing:
+            return True
+        return time.time() >= circuit["open_until"]
+
+    def record_success(self):
+        circuit = self._circuit()
+        now = time.time()
+        stale = now - circuit["checked_at"] >= self.ttl / 2
+        changed = circuit["state"] != "closed"
+        circuit.update(state="closed", failures=0, checked_at=now, open_until=0.0)
+        self._probing = False
+        if changed or stale:
+            self._save()
+
+    def record_failure(self):
+        self._open(time.time())
+
+    def _open(self, now: float):
+        circuit = self._circuit()
+        failures = circuit["failures"] + 1
+        window = min(self.max_open_seconds, self.open_seconds * 2 ** (failures - 1))
+        circuit.update(state="open", failures=failures, checked_at=now, open_until=now + window)
+        self._probing = False
+        self._save()
+
+    def probe(self, timeout: float = PROBE_TIMEOUT) -> bool:
+        """One GET /health with no retries - a refused connect returns at once."""
+        try:
+            status, _ = http_request(self.base_url, "GET", "/health", timeout=timeout)
+            return status == 200
+        except (OSError, ValueError, IndexError):
+            return False
+
+    def is_alive(self) -> bool:
+        """Cached answer if there is one, otherwise probe and record it."""
+        alive = self.cached()
+        if alive is None:
+            alive = self.probe()
+            if alive:
+                self.record_success()
+            else:
+                self.record_failure()
+        return alive
+
+    def report(self) -> dict[str, Any]:
+        circuit = self._circuit()
+        return {
+            "url": self.url,
+            "state": circuit["state"],
+            "failures": circuit["failures"],
+            "open_for_seconds": max(0.0, round(circuit["open_until"] - time.time(), 3)),
+            "shared": self.shared,
+        }
+
+
+__all__ = (
+    "DAEMON_URL",
+    "DaemonLiveness",
+    "clear_daemon_state",
+    "http_request",
+    "normalize_url",
+    "pid_exists",
+    "read_daemon_record",
+    "write_daemon_state",
+)
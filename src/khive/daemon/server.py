@@ -7,26 +7,66 @@ No fake or misleading functionality - only working features.
 
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Any, Literal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-from khive.services.artifacts.factory import create_artifacts_service_from_env
-from khive.services.artifacts.service import ArtifactsService
+from khive.daemon.event_stream import CoordinationEventStream, sse_frames
+from khive.daemon.ingest import HookEventIngestor, IngestBackpressure, IngestorClosed
+from khive.daemon.lazy_services import LazyService, warm_up
+from khive.daemon.liveness import clear_daemon_state, write_daemon_state
 from khive.services.claude.hooks.coordination import (
     CoordinationRegistry,
     check_duplicate_work,
     get_registry,
 )
-from khive.services.composition.agent_composer import AgentComposer
-from khive.services.plan.service import ConsensusPlannerV3 as PlannerService
-from khive.services.session.session_service import SessionService
+from khive.services.claude.hooks.change_feed import HookEventFeed, current_high_water
+from khive.services.claude.hooks.coordination_store import CoordinationJournal
+from khive.services.claude.hooks.entry import HOOK_TYPES, respond_safely
+from khive.services.claude.hooks.export import MEDIA_TYPES, iter_export
+from khive.services.claude.hooks.retention import (
+    HookEventRetention,
+    RetentionPolicy,
+    query_rollups,
+)
+from khive.utils import (
+    COORDINATION_STATE_DIR,
+    HOOK_SPOOL_DIR,
+    SQLITE_PATH,
+    EventBroadcaster,
+)
+
+if TYPE_CHECKING:
+    from khive.services.artifacts.service import ArtifactsService
+    from khive.services.composition.agent_composer import AgentComposer
+    from khive.services.plan.service import ConsensusPlannerV3 as PlannerService
+    from khive.services.session.session_service import SessionService
 
 logger = logging.getLogger(__name__)
 
+# Services are built in the background once the port is bound; set
+# KHIVE_DAEMON_WARMUP=0 to build each one only on its first request.
+WARMUP_ENABLED = os.getenv("KHIVE_DAEMON_WARMUP", "1") != "0"
+WARMUP_DELAY_SECONDS = 0.2
+PROMPTS_PATH = Path(__file__).parent.parent / "prompts"
+# First retention pass runs this long after startup, off the startup path
+RETENTION_DELAY_SECONDS = 60.0
+# How long shutdown waits for subscribers to handle already-queued events
+BROADCAST_DRAIN_SECONDS = 2.0
+# Longest the lock sweeper sleeps, so locks granted meanwhile expire on time
+LOCK_SWEEP_MAX_SECONDS = 1.0
+# Upper bound on how long a multi-file lock request may wait in the queue
+MAX_LOCK_WAIT_SECONDS = 300.0
+# How often the coordination journal snapshots (or, when idle, heartbeats)
+COORDINATION_CHECKPOINT_SECONDS = 10.0
+
 
 # Request/Response Models
 class CoordinateRequest(BaseModel):
@@ -50,6 +90,15 @@ class InsightsRequest(BaseModel):
 class FileOperationRequest(BaseModel):
     file_path: str
     agent_id: str
+    directory: bool = False  # Lock everything below file_path
+
+
+class FileLocksRequest(BaseModel):
+    file_paths: list[str]
+    agent_id: str
+    directory: bool = False
+    # Queue (fairly, per path) for up to this long instead of failing at once
+    wait_seconds: float = Field(0.0, ge=0, le=MAX_LOCK_WAIT_SECONDS)
 
 
 class FileUnregisterRequest(BaseModel):
@@ -62,6 +111,10 @@ class SessionMappingRequest(BaseModel):
     agent_id: str
 
 
+class HookEventBatch(BaseModel):
+    events: list[dict[str, Any]]
+
+
 class AgentSpawnRequest(BaseModel):
     role: str
     domain: str | None = None
@@ -164,10 +217,49 @@ class KhiveDaemonServer:
         )
 
         self.coordination_registry: CoordinationRegistry | None = None
-        self.planner_service: PlannerService | None = None
-        self.session_service: SessionService | None = None
-        self.artifact_service: ArtifactsService | None = None
-        self.agent_composer: AgentComposer | None = None
+        self.event_stream: CoordinationEventStream | None = None
+        # Where the registry is persisted across restarts; None keeps it in memory
+        self.coordination_state_dir: Path | None = COORDINATION_STATE_DIR
+        self.coordination_journal: CoordinationJournal | None = None
+        self._checkpoint_task: asyncio.Task | None = None
+        self.spool_dir = HOOK_SPOOL_DIR
+        self.ingestor = HookEventIngestor(SQLITE_PATH, spool_dir=self.spool_dir)
+        self.spool_import: dict[str, int] | None = None
+        self._spool_task: asyncio.Task | None = None
+        self.retention = HookEventRetention(RetentionPolicy.from_env())
+        self.feed: HookEventFeed | None = None
+        self._retention_task: asyncio.Task | None = None
+        self._lock_sweep_task: asyncio.Task | None = None
+        self.services: dict[str, LazyService] = {
+            "planner": LazyService(
+                "planner",
+                "khive.services.plan.service",
+                lambda m: m.ConsensusPlannerV3(),
+            ),
+            "session": LazyService(
+                "session",
+                "khive.services.session.session_service",
+                lambda m: m.SessionService(),
+            ),
+            "artifacts": LazyService(
+                "artifacts",
+                "khive.services.artifacts.factory",
+                lambda m: m.create_artifacts_service_from_env(),
+            ),
+            "composer": LazyService(
+                "composer",
+                "khive.services.composition.agent_composer",
+                lambda m: m.AgentComposer(base_path=str(PROMPTS_PATH)),
+            ),
+            # Hook events (lionagi) for forwarded hooks and ingestion
+            "hooks": LazyService(
+                "hooks",
+                "khive.services.claude.hooks.hook_event",
+                self._bind_hook_events,
+            ),
+        }
+        self._warmup_task: asyncio.Task | None = None
+        self.startup_seconds: float | None = None
         self.startup_time = datetime.now()
         self.stats = {
             "requests": 0,
@@ -178,34 +270,212 @@ class KhiveDaemonServer:
 
         self._setup_routes()
 
+    # Instances are None until first use (or warm-up) has built them
+    @property
+    def planner_service(self) -> "PlannerService | None":
+        return self.services["planner"].instance
+
+    @property
+    def session_service(self) -> "SessionService | None":
+        return self.services["session"].instance
+
+    @property
+    def artifact_service(self) -> "ArtifactsService | None":
+        return self.services["artifacts"].instance
+
+    @property
+    def agent_composer(self) -> "AgentComposer | None":
+        return self.services["composer"].instance
+
+    async def _require(self, name: str, label: str) -> Any:
+        """Get a lazily-built service or fail the request with 503."""
+        service = await self.services[name].get()
+        if service is None:
+            raise HTTPException(status_code=503, detail=f"{label} unavailable")
+        return service
+
+    def _bind_hook_events(self, module) -> Any:
+        """Send HookEvent saves made in this process through the ingestor."""
+        module.HookEvent.set_sink(self.ingestor.enqueue)
+        return module.HookEvent
+
+    async def _publish_hook_event(self, record):
+        """Broadcast a committed event (from any writer) to in-process subscribers."""
+        hook_event_cls = self.services["hooks"].instance
+        if hook_event_cls is None:
+            return  # Nothing can have subscribed without the hooks module
+        from khive.services.claude.hooks.hook_event import HookEventBroadcaster
+
+        if HookEventBroadcaster.get_subscriber_count():
+            await HookEventBroadcaster.broadcast(
+                hook_event_cls.from_dict(record.to_dict(), mode="db")
+            )
+
     async def startup(self):
-        """Initialize daemon services."""
+        """Initialize daemon services.
+
+        Only the in-memory coordination registry is created here; heavier
+        services are deferred to first use or background warm-up.
+        """
+        started = time.perf_counter()
         logger.info("Initializing Khive daemon services...")
 
-        # Initialize core services
         self.coordination_registry = get_registry()
-        self.planner_service = PlannerService()
-        self.session_service = SessionService()
+        if self.coordination_state_dir is not None:
+            self._recover_coordination()
+        self.event_stream = CoordinationEventStream(self.coordination_registry)
+        self.ingestor.start()
+        # Every committed event - ours, spool imports, other processes' -
+        # reaches subscribers through the feed, woken by our own commits
+        self.feed = HookEventFeed(self.ingestor.db_path)
+        self.ingestor.subscribe(lambda _event: self.feed.wake())
+        self._spool_task = asyncio.create_task(self._import_spool())
+        self._retention_task = asyncio.create_task(self._retention_loop())
+        self._lock_sweep_task = asyncio.create_task(self._lock_sweep_loop())
+        if self.coordination_journal is not None:
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+
+        if WARMUP_ENABLED:
+            self._warmup_task = asyncio.create_task(
+                warm_up(self.services, delay=WARMUP_DELAY_SECONDS)
+            )
+
+        self.startup_seconds = time.perf_counter() - started
+        logger.info(
+            f"Khive daemon ready in {self.startup_seconds * 1000:.1f}ms "
+            f"(deferred: {', '.join(self.services)})"
+        )
 
-        # Initialize artifacts service
-        try:
-            self.artifact_service = create_artifacts_service_from_env()
-        except Exception as e:
-            logger.error(f"Failed to initialize artifacts service: {e}")
-            self.artifact_service = None
+    async def _import_spool(self):
+        """Import events hooks spooled to disk while the daemon was down.
 
-        # Initialize agent composer with correct path
-        try:
-            from pathlib import Path
+        The change feed starts afterwards, once the writer has created
+        and migrated the database. Its mark is taken by the writer right
+        after the import, so imported events count as history and nothing
+        committed later is missed.
+        """
+        from khive.services.claude.hooks.spool import import_spool
 
-            # Use the khive prompts directory as base path
-            prompts_path = Path(__file__).parent.parent / "prompts"
-            self.agent_composer = AgentComposer(base_path=str(prompts_path))
-        except Exception as e:
-            logger.error(f"Failed to initialize agent composer: {e}")
-            self.agent_composer = None
+        table = self.ingestor.table
 
-        logger.info("Khive daemon services initialized successfully")
+        def import_then_mark(conn):
+            try:
+                return import_spool(self.spool_dir, conn=conn, table=table), None
+            except Exception as e:
+                return None, e
+            finally:
+                high_water.append(current_high_water(conn, table))
+
+        high_water: list[int] = []
+        self.spool_import, error = await self.ingestor.run_on_connection(import_then_mark)
+        self.feed.start(self._publish_hook_event, high_water=high_water[0])
+        if error is not None:
+            logger.error(f"Hook event spool import failed: {error}")
+            return
+        if self.spool_import["files"]:
+            logger.info(
+                f"Imported {self.spool_import['imported']} spooled hook events "
+                f"from {self.spool_import['files']} files"
+            )
+
+    async def _retention_loop(self):
+        """Roll up, purge and compact the hook events database periodically."""
+        await asyncio.sleep(RETENTION_DELAY_SECONDS)
+        while True:
+            try:
+                result = await self.retention.run_once(self.ingestor.run_on_connection)
+                if result["purged"] or result["compaction"]:
+                    logger.info(f"Hook event retention: {result}")
+            except Exception as e:
+                logger.error(f"Hook event retention failed: {e}")
+            await asyncio.sleep(self.retention.policy.interval_seconds)
+
+    def _recover_coordination(self):
+        """Reload agents, locks, artifacts and sessions from before a restart."""
+        journal = CoordinationJournal(self.coordination_state_dir)
+        try:
+            recovery = journal.recover(self.coordination_registry)
+        except Exception as e:
+            # Never refuse to start over a damaged journal: set it aside
+            # and begin afresh
+            logger.error(f"Coordination state recovery failed: {e}")
+            for path in (journal.snapshot_path, journal.wal_path):
+                if path.exists():
+                    path.replace(path.with_name(f"{path.name}.corrupt"))
+        else:
+            if recovery["snapshot"] or recovery["replayed"]:
+                logger.info(f"Recovered coordination state: {recovery}")
+        journal.attach(self.coordination_registry)
+        self.coordination_journal = journal
+
+    async def _checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(COORDINATION_CHECKPOINT_SECONDS)
+            try:
+                self.coordination_journal.checkpoint()
+            except Exception as e:
+                logger.error(f"Coordination checkpoint failed: {e}")
+
+    async def _lock_sweep_loop(self):
+        """Expire file locks as their deadlines pass, not on the next request.
+
+        Expiries are emitted as ``lock_expired`` events, so stream clients
+        see a lock free up without anyone asking for it.
+        """
+        registry = self.coordination_registry
+        while True:
+            delay = registry.next_lock_expiry()
+            await asyncio.sleep(
+                LOCK_SWEEP_MAX_SECONDS
+                if delay is None
+                else min(delay, LOCK_SWEEP_MAX_SECONDS)
+            )
+            registry.expire_locks()
+
+    async def shutdown(self):
+        """Flush queued hook events and detach from the HookEvent class."""
+        for task in (
+            self._warmup_task,
+            self._retention_task,
+            self._lock_sweep_task,
+            self._checkpoint_task,
+        ):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._spool_task is not None:
+            await self._spool_task
+        if self.coordination_journal is not None:
+            self.coordination_journal.close()
+            self.coordination_journal = None
+        hook_event_cls = self.services["hooks"].instance
+        if hook_event_cls is not None and hook_event_cls._sink == self.ingestor.enqueue:
+            hook_event_cls.set_sink(None)
+        await self.ingestor.stop()
+        if self.feed is not None:
+            await self.feed.stop()
+        try:
+            await asyncio.wait_for(EventBroadcaster.drain(), BROADCAST_DRAIN_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("Hook event subscribers still busy at shutdown")
+
+    def startup_report(self) -> dict[str, Any]:
+        """Per-service import/init timings and overall readiness."""
+        return {
+            "startup_ms": (
+                None
+                if self.startup_seconds is None
+                else round(self.startup_seconds * 1000, 2)
+            ),
+            "warmup_enabled": WARMUP_ENABLED,
+            "warmup_complete": all(s.done for s in self.services.values()),
+            "spool_import": self.spool_import,
+            "services": {name: s.report() for name, s in self.services.items()},
+        }
 
     def _setup_routes(self):
         """Set up API routes."""
@@ -214,6 +484,10 @@ class KhiveDaemonServer:
         async def startup_event():
             await self.startup()
 
+        @self.app.on_event("shutdown")
+        async def shutdown_event():
+            await self.shutdown()
+
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint."""
@@ -224,6 +498,12 @@ class KhiveDaemonServer:
                 "stats": self.stats,
             }
 
+        @self.app.get("/api/startup")
+        async def get_startup_report():
+            """Startup timing report - per-service import and init time."""
+            self.stats["requests"] += 1
+            return self.startup_report()
+
         @self.app.get("/api/stats")
         async def get_stats():
             """Get daemon statistics."""
@@ -232,11 +512,30 @@ class KhiveDaemonServer:
                 "stats": self.stats,
                 "services": {
                     "coordination": self.coordination_registry is not None,
-                    "planner": self.planner_service is not None,
-                    "session": self.session_service is not None,
-                    "artifacts": self.artifact_service is not None,
-                    "composer": self.agent_composer is not None,
+                    **{
+                        name: service.state != "failed"
+                        for name, service in self.services.items()
+                    },
                 },
+                "event_stream": {
+                    "seq": (
+                        self.coordination_registry.event_seq
+                        if self.coordination_registry
+                        else 0
+                    ),
+                    "subscribers": (
+                        self.event_stream.subscribers if self.event_stream else 0
+                    ),
+                },
+                "ingest": self.ingestor.stats(),
+                "broadcast": EventBroadcaster.get_subscriber_stats(),
+                "feed": self.feed.stats() if self.feed else None,
+                "coordination_journal": (
+                    self.coordination_journal.stats()
+                    if self.coordination_journal
+                    else None
+                ),
+                "retention": self.retention.report(),
             }
 
         # Basic coordination endpoints
@@ -310,7 +609,7 @@ class KhiveDaemonServer:
             try:
                 # Use coordinator for real file locking
                 result = self.coordination_registry.request_file_lock(
-                    request.agent_id, request.file_path
+                    request.agent_id, request.file_path, directory=request.directory
                 )
 
                 # Convert to HTTP status codes
@@ -356,6 +655,55 @@ class KhiveDaemonServer:
                 logger.error(f"File lock renewal failed: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.post("/api/coordinate/file-locks")
+        async def request_file_locks(request: FileLocksRequest):
+            """Lock several files all-or-nothing - optionally waiting in line."""
+            self.stats["requests"] += 1
+            if not self.coordination_registry:
+                raise HTTPException(
+                    status_code=503, detail="Coordination service unavailable"
+                )
+            registry = self.coordination_registry
+            granted = asyncio.get_running_loop().create_future()
+            result = registry.request_file_locks(
+                request.agent_id,
+                request.file_paths,
+                directory=request.directory,
+                wait=request.wait_seconds > 0,
+                on_granted=lambda result: granted.done() or granted.set_result(result),
+            )
+            if result["status"] == "queued":
+                ticket = result["ticket"]
+                try:
+                    result = await asyncio.wait_for(
+                        asyncio.shield(granted), request.wait_seconds
+                    )
+                except asyncio.TimeoutError:
+                    if registry.cancel_lock_request(ticket):
+                        result = {**result, "status": "locked", "timed_out": True}
+                    else:  # Granted just as the wait ran out
+                        result = granted.result()
+                except asyncio.CancelledError:
+                    # Client went away: leave the queue, or hand back locks
+                    # granted as it disconnected - nobody will release them
+                    if not registry.cancel_lock_request(ticket) and granted.done():
+                        for file_path in granted.result()["files"]:
+                            registry.release_file_lock(request.agent_id, file_path)
+                    raise
+            if result["status"] == "locked":
+                raise HTTPException(status_code=409, detail=result)
+            return result
+
+        @self.app.get("/api/coordinate/file-locks")
+        async def get_file_lock_tree():
+            """Held file and directory locks as a path tree."""
+            self.stats["requests"] += 1
+            if not self.coordination_registry:
+                raise HTTPException(
+                    status_code=503, detail="Coordination service unavailable"
+                )
+            return self.coordination_registry.get_lock_tree()
+
         @self.app.get("/api/coordinate/status")
         async def get_coordination_status():
             """Get coordination status - PRACTICAL info agents need."""
@@ -369,56 +717,39 @@ class KhiveDaemonServer:
                 logger.error(f"Status retrieval failed: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.get("/api/coordinate/events")
+        async def stream_coordination_events(
+            since: int | None = Query(default=None, ge=0),
+            last_event_id: str | None = Header(default=None),
+        ):
+            """Stream incremental coordination changes as Server-Sent Events.
+
+            Resume with ?since=<seq> or the standard Last-Event-ID header;
+            without either, the stream opens with a full snapshot.
+            """
+            self.stats["requests"] += 1
+            if not self.event_stream:
+                raise HTTPException(
+                    status_code=503, detail="Coordination service unavailable"
+                )
+
+            if since is None and last_event_id and last_event_id.isdigit():
+                since = int(last_event_id)
+
+            return StreamingResponse(
+                sse_frames(self.event_stream, since),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
         @self.app.post("/api/coordinate/cleanup")
         async def cleanup_stale_agents():
             """Clean up stale agents from coordination registry."""
             self.stats["requests"] += 1
             try:
                 # Clean up agents older than 1 hour
-                import time
-
-                current_time = time.time()
-                stale_agents = []
-
-                for agent_id, work in list(
-                    self.coordination_registry.active_agents.items()
-                ):
-                    if current_time - work.started_at > 3600:  # 1 hour
-                        stale_agents.append(agent_id)
-
-                # Remove stale agents and their locks
-                for agent_id in stale_agents:
-                    work = self.coordination_registry.active_agents[agent_id]
-                    # Release any file locks
-                    for file_path in list(work.files_editing):
-                        if file_path in self.coordination_registry.file_locks:
-                            if (
-                                self.coordination_registry.file_locks[
-                                    file_path
-                                ].agent_id
-                                == agent_id
-                            ):
-                                del self.coordination_registry.file_locks[file_path]
-                    # Remove from active agents
-                    del self.coordination_registry.active_agents[agent_id]
-
-                # Also clean up session mappings for removed agents
-                sessions_to_remove = []
-                for session_id, mapped_agent_id in list(
-                    self.coordination_registry.session_to_agent.items()
-                ):
-                    if mapped_agent_id in stale_agents:
-                        sessions_to_remove.append(session_id)
-
-                for session_id in sessions_to_remove:
-                    del self.coordination_registry.session_to_agent[session_id]
-
-                return {
-                    "status": "cleaned",
-                    "stale_agents_removed": len(stale_agents),
-                    "sessions_cleaned": len(sessions_to_remove),
-                    "agents_removed": stale_agents,
-                }
+                result = self.coordination_registry.remove_stale_agents(3600)
+                return {"status": "cleaned", **result}
             except Exception as e:
                 self.stats["errors"] += 1
                 logger.error(f"Cleanup failed: {e}")
@@ -539,18 +870,129 @@ class KhiveDaemonServer:
                 logger.error(f"Session mapping failed: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.post("/api/hooks/events", status_code=202)
+        async def ingest_hook_events(batch: HookEventBatch):
+            """Queue hook events for the batched writer.
+
+            Answers once queued; events are broadcast after they commit.
+            """
+            self.stats["requests"] += 1
+            hook_event_cls = await self._require("hooks", "Hook events")
+            try:
+                events = [hook_event_cls.model_validate(e) for e in batch.events]
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+
+            depth = 0
+            for accepted, event in enumerate(events):
+                try:
+                    depth = await self.ingestor.submit(event)
+                except (IngestBackpressure, IngestorClosed) as e:
+                    self.stats["errors"] += 1
+                    return JSONResponse(
+                        status_code=503,
+                        content={"detail": str(e), "accepted": accepted},
+                        headers={"Retry-After": "1"},
+                    )
+            return {"accepted": len(events), "queue_depth": depth}
+
+        @self.app.get("/api/hooks/rollups")
+        async def get_hook_rollups(
+            since: str | None = None,
+            until: str | None = None,
+            group_by: str = "event_type",
+            event_type: str | None = None,
+            session_id: str | None = None,
+            tool_name: str | None = None,
+        ):
+            """Hourly hook event aggregates for dashboards.
+
+            `group_by` is a comma-separated subset of event_type, session_id
+            and tool_name; events not yet rolled up are not included.
+            """
+            self.stats["requests"] += 1
+            filters = {
+                name: value
+                for name, value in (
+                    ("event_type", event_type),
+                    ("session_id", session_id),
+                    ("tool_name", tool_name),
+                )
+                if value is not None
+            }
+            dimensions = tuple(d for d in group_by.split(",") if d)
+            try:
+                rollups = await self.ingestor.run_on_connection(
+                    lambda conn: query_rollups(conn, since, until, dimensions, **filters)
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            return {"rollups": rollups, "group_by": list(dimensions)}
+
+        @self.app.get("/api/hooks/export")
+        async def export_hook_events(
+            format: Literal["ndjson", "csv"] = "ndjson",
+            since: str | None = None,
+            until: str | None = None,
+            event_type: str | None = None,
+            session_id: str | None = None,
+            tool_name: str | None = None,
+            gzip: bool = False,
+        ):
+            """Stream hook events, oldest first, straight from SQLite.
+
+            Reads a page at a time on a read-only connection (in the
+            threadpool), so memory does not grow with the export size and
+            the batched writer is never blocked.
+            """
+            self.stats["requests"] += 1
+            filters = {
+                name: value
+                for name, value in (
+                    ("event_type", event_type),
+                    ("session_id", session_id),
+                    ("tool_name", tool_name),
+                )
+                if value is not None
+            }
+            try:
+                chunks = iter_export(
+                    self.ingestor.db_path, format, since, until, gzip, **filters
+                )
+            except RuntimeError as e:  # Not migrated yet
+                raise HTTPException(status_code=503, detail=str(e))
+            filename = f"hook_events.{format}" + (".gz" if gzip else "")
+            return StreamingResponse(
+                chunks,
+                media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            )
+
+        # Hook forwarding from khive.services.claude.hooks.entry
+        @self.app.post("/api/hooks/{hook_type}")
+        async def run_hook(hook_type: str, hook_input: dict[str, Any]):
+            """Run a Claude Code hook here so the hook process stays tiny."""
+            self.stats["requests"] += 1
+            if hook_type not in HOOK_TYPES:
+                raise HTTPException(status_code=404, detail=f"Unknown hook: {hook_type}")
+
+            await self.services["hooks"].get()
+            # Hook handlers are blocking and may run their own event loop
+            response = await asyncio.get_running_loop().run_in_executor(
+                None, respond_safely, hook_type, hook_input
+            )
+            if response.exit_code:
+                logger.info(f"Hook {hook_type} blocked: {response.stderr}")
+            return response.to_dict()
+
         # Planning service endpoints
         @self.app.post("/api/plan")
         async def create_plan(request: dict[str, Any]):
             """Create execution plan."""
             self.stats["requests"] += 1
             try:
-                if not self.planner_service:
-                    raise HTTPException(
-                        status_code=503, detail="Planning service unavailable"
-                    )
-
-                plan = await self.planner_service.create_plan(request.get("task", ""))
+                planner = await self._require("planner", "Planning service")
+                plan = await planner.create_plan(request.get("task", ""))
                 return plan
             except Exception as e:
                 self.stats["errors"] += 1
@@ -563,12 +1005,8 @@ class KhiveDaemonServer:
             """List active sessions."""
             self.stats["requests"] += 1
             try:
-                if not self.session_service:
-                    raise HTTPException(
-                        status_code=503, detail="Session service unavailable"
-                    )
-
-                sessions = await self.session_service.list_sessions()
+                session_service = await self._require("session", "Session service")
+                sessions = await session_service.list_sessions()
                 return {"sessions": sessions}
             except Exception as e:
                 self.stats["errors"] += 1
@@ -581,12 +1019,10 @@ class KhiveDaemonServer:
             """List artifacts."""
             self.stats["requests"] += 1
             try:
-                if not self.artifact_service:
-                    raise HTTPException(
-                        status_code=503, detail="Artifacts service unavailable"
-                    )
-
-                artifacts = await self.artifact_service.list_artifacts()
+                artifact_service = await self._require(
+                    "artifacts", "Artifacts service"
+                )
+                artifacts = await artifact_service.list_artifacts()
                 return {"artifacts": artifacts}
             except Exception as e:
                 self.stats["errors"] += 1
@@ -599,13 +1035,12 @@ class KhiveDaemonServer:
             """Spawn a new agent with specified role and domain."""
             self.stats["requests"] += 1
             try:
-                if not self.agent_composer:
-                    raise HTTPException(
-                        status_code=503, detail="Agent composer service unavailable"
-                    )
+                composer = await self._require(
+                    "composer", "Agent composer service"
+                )
 
                 # Validate role exists
-                available_roles = self.agent_composer.list_available_roles()
+                available_roles = composer.list_available_roles()
                 if request.role not in available_roles:
                     raise HTTPException(
                         status_code=400,
@@ -614,7 +1049,7 @@ class KhiveDaemonServer:
 
                 # Validate domain if provided
                 if request.domain:
-                    available_domains = self.agent_composer.list_available_domains()
+                    available_domains = composer.list_available_domains()
                     if request.domain not in available_domains:
                         raise HTTPException(
                             status_code=400,
@@ -622,7 +1057,7 @@ class KhiveDaemonServer:
                         )
 
                 # Compose agent specification
-                agent_spec = self.agent_composer.compose_agent(
+                agent_spec = composer.compose_agent(
                     role=request.role, domains=request.domain, context=request.context
                 )
 
@@ -633,7 +1068,7 @@ class KhiveDaemonServer:
                     agent_spec["session_id"] = request.session_id
 
                 # Generate agent ID
-                agent_id = self.agent_composer.get_unique_agent_id(
+                agent_id = composer.get_unique_agent_id(
                     request.role, request.domain or "general"
                 )
 
@@ -672,12 +1107,11 @@ class KhiveDaemonServer:
             """Get list of available agent roles."""
             self.stats["requests"] += 1
             try:
-                if not self.agent_composer:
-                    raise HTTPException(
-                        status_code=503, detail="Agent composer service unavailable"
-                    )
+                composer = await self._require(
+                    "composer", "Agent composer service"
+                )
 
-                roles = self.agent_composer.list_available_roles()
+                roles = composer.list_available_roles()
                 return {"roles": roles, "count": len(roles)}
 
             except Exception as e:
@@ -690,13 +1124,12 @@ class KhiveDaemonServer:
             """Get list of available domain expertise modules."""
             self.stats["requests"] += 1
             try:
-                if not self.agent_composer:
-                    raise HTTPException(
-                        status_code=503, detail="Agent composer service unavailable"
-                    )
+                composer = await self._require(
+                    "composer", "Agent composer service"
+                )
 
-                domains = self.agent_composer.list_available_domains()
-                taxonomy = self.agent_composer.list_domains_by_taxonomy()
+                domains = composer.list_available_domains()
+                taxonomy = composer.list_domains_by_taxonomy()
 
                 return {"domains": domains, "count": len(domains), "taxonomy": taxonomy}
 
@@ -965,8 +1398,28 @@ async def run_daemon_server(host: str = "localhost", port: int = 11634):
     config = uvicorn.Config(server.app, host=host, port=port, log_level="info")
 
     uvicorn_server = uvicorn.Server(config)
-    await uvicorn_server.serve()
+    serving = asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started and not serving.done():
+        await asyncio.sleep(0.01)
+
+    # Announce PID/URL only once listening, so clients never cache a
+    # "running" daemon that cannot accept connections yet. Cleared from the
+    # lifespan shutdown: uvicorn re-raises SIGTERM once serve() returns.
+    url = f"http://{host}:{port}"
+    if uvicorn_server.started:
+        write_daemon_state(url)
+
+        @server.app.on_event("shutdown")
+        async def announce_stopped():
+            clear_daemon_state(url)
+
+    await serving
 
 
 if __name__ == "__main__":
-    asyncio.run(run_daemon_server())
+    asyncio.run(
+        run_daemon_server(
+            os.getenv("KHIVE_DAEMON_HOST", "localhost"),
+            int(os.getenv("KHIVE_DAEMON_PORT", "11634")),
+        )
+    )
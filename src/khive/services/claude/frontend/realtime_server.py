@@ -7,7 +7,8 @@ import websockets
 
 from khive.core import TimePolicy
 from khive.services.claude.hooks import HookEvent, HookEventBroadcaster
-from khive.utils import get_logger
+from khive.services.claude.hooks.change_feed import HookEventFeed
+from khive.utils import HOOK_SPOOL_DIR, SQLITE_PATH, get_logger
 
 logger = get_logger("HookEventWebSocketServer", "🪝 [HOOK-EVENT-WSS]")
 
@@ -21,6 +22,9 @@ class HookEventWebSocketServer:
         self.clients: set[websockets.WebSocketServerProtocol] = set()
         self.server = None
         self.running = False
+        # Events are saved by other processes (daemon, hooks' spool), so
+        # follow the table rather than this process's own saves
+        self.feed = HookEventFeed(SQLITE_PATH, spool_dir=HOOK_SPOOL_DIR)
 
         # Subscribe to hook event broadcasts
         HookEventBroadcaster.subscribe_async(self.broadcast_to_clients)
@@ -167,6 +171,8 @@ class HookEventWebSocketServer:
                         "total_events": total_events,
                         "server_uptime": "N/A",  # TODO: Track server start time
                         "subscribers": HookEventBroadcaster.get_subscriber_count(),
+                        "subscriber_queues": HookEventBroadcaster.get_subscriber_stats(),
+                        "feed": self.feed.stats(),
                     },
                 }
                 await websocket.send(json.dumps(stats_data))
@@ -176,6 +182,10 @@ class HookEventWebSocketServer:
         except Exception as e:
             logger.exception(f"Error handling client message: {e}")
 
+    async def _publish_record(self, record):
+        """Broadcast an event the change feed picked up from the database."""
+        await HookEventBroadcaster.broadcast(HookEvent.from_dict(record.to_dict(), mode="db"))
+
     async def handle_client(
         self, websocket: websockets.WebSocketServerProtocol, _path: str
     ):
@@ -217,6 +227,7 @@ class HookEventWebSocketServer:
             )
 
             self.running = True
+            self.feed.start(self._publish_record)
             logger.info(
                 f"WebSocket server started successfully on ws://{self.host}:{self.port}"
             )
@@ -253,6 +264,7 @@ class HookEventWebSocketServer:
         # Close server
         self.server.close()
         await self.server.wait_closed()
+        await self.feed.stop()
 
         self.running = False
         logger.info("WebSocket server stopped")
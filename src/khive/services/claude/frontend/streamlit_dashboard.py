@@ -2,7 +2,7 @@ import asyncio
 import datetime as dt
 import os
 import time
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
 from datetime import timedelta
 from typing import Any
 
@@ -185,11 +185,15 @@ class ClaudeCodeObservabilityDashboard:
             return self.events_cache
 
         try:
-            # Get recent events from database (no limit, filter based on criteria)
-            recent_events = await HookEvent.get_recent()
+            # Newest 25k events of the last 30 days, streamed as lightweight
+            # records rather than materialized as HookEvent nodes
+            since = TimePolicy.now_utc() - timedelta(days=30)
+            recent_events = deque(maxlen=25000)
+            async for record in HookEvent.iter_since(since.strftime("%Y-%m-%d %H:%M:%S")):
+                recent_events.append(record)
 
             events = []
-            for event in recent_events:
+            for event in reversed(recent_events):  # newest first
                 # Convert naive datetime to timezone-aware UTC
                 created_dt = event.created_datetime
                 if created_dt.tzinfo is None:
@@ -293,6 +297,20 @@ class ClaudeCodeObservabilityDashboard:
             "latest_events": events[-20:] if events else [],
         }
 
+    def load_rollup_totals(self, days: int = 30) -> dict[str, int]:
+        """Event counts per type from the daemon's hourly rollups.
+
+        Rollups outlive raw events (which retention purges), so these are
+        the long-range totals; recent events appear once rolled up.
+        """
+        if not self.get_daemon_status().get("running"):
+            return {}
+        since = (TimePolicy.now_utc() - timedelta(days=days)).strftime("%Y-%m-%d %H:00:00")
+        totals = Counter()
+        for row in self.daemon_client.hook_rollups(since=since):
+            totals[row["event_type"] or "unknown"] += row["count"]
+        return dict(totals)
+
     def get_daemon_status(self, force_refresh: bool = False) -> dict[str, Any]:
         """Get daemon status with caching."""
         current_time = time.time()
@@ -1515,6 +1533,15 @@ class ClaudeCodeObservabilityDashboard:
                 hook_display = hook_type.replace("_", " ").title()
                 st.sidebar.write(f"**{hook_display}**: {count}")
 
+        # Long-range totals from hourly rollups
+        if rollup_totals := self.load_rollup_totals():
+            st.sidebar.subheader("📦 Last 30 Days")
+            for hook_type, count in sorted(
+                rollup_totals.items(), key=lambda x: x[1], reverse=True
+            ):
+                hook_display = hook_type.replace("_", " ").title()
+                st.sidebar.write(f"**{hook_display}**: {count}")
+
         # Quick actions
         st.sidebar.subheader("⚡ Quick Actions")
 
@@ -1531,6 +1558,13 @@ class ClaudeCodeObservabilityDashboard:
                 file_name=f"claude_code_events_{TimePolicy.now_local().strftime('%Y%m%d_%H%M%S')}.csv",
                 mime="text/csv",
             )
+        if self.get_daemon_status().get("running"):
+            # Streamed by the daemon: not limited to what the dashboard loaded
+            export_url = f"{self.daemon_client.base_url}/api/hooks/export"
+            st.sidebar.markdown(
+                f"Full history: [NDJSON.gz]({export_url}?gzip=true) · "
+                f"[CSV.gz]({export_url}?format=csv&gzip=true)"
+            )
 
         # Real-time controls
         st.sidebar.subheader("🔴 Real-time")
@@ -1,20 +1,32 @@
-from .coordination import (
-    CoordinationRegistry,
-    after_file_edit,
-    before_file_edit,
-    check_duplicate_work,
-    get_registry,
-    whats_happening,
-)
-from .hook_event import (
-    HookEvent,
-    HookEventBroadcaster,
-    HookEventContent,
-    hook_event_logger,
-    shield,
-)
+# Hook entry points import this package on every invocation: keep it free of
+# eager imports. hook_event pulls in lionagi (seconds of import time).
+_LAZY_EXPORTS = {
+    "CoordinationRegistry": "coordination",
+    "after_file_edit": "coordination",
+    "before_file_edit": "coordination",
+    "check_duplicate_work": "coordination",
+    "get_registry": "coordination",
+    "whats_happening": "coordination",
+    "EventRecord": "reader",
+    "HookEvent": "hook_event",
+    "HookEventBroadcaster": "hook_event",
+    "HookEventContent": "hook_event",
+    "hook_event_logger": "hook_event",
+    "shield": "hook_event",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
+    "EventRecord",
     "HookEvent",
     "HookEventBroadcaster",
     "HookEventContent",
@@ -0,0 +1,228 @@
+"""
+Cross-process change feed for the hook events table.
+
+`HookEventBroadcaster` only reaches subscribers in the process that saved
+the event, but hook events are written by other processes: the daemon's
+batched writer, spool imports from the CLI, the lionagi adapter. This feed
+tails the table itself, so any process can follow every committed event:
+
+- **High-water mark** - rows are read by ``rowid`` (insert order, so
+  events imported late from the spool are not missed the way a
+  ``created_at`` tail would miss them), only ever past the last one
+  delivered: ``WHERE rowid > :high_water ORDER BY rowid LIMIT n``.
+- **Cheap wakeups** - between reads the feed checks ``PRAGMA
+  data_version``, which changes only when another connection commits. An
+  idle feed never touches the table; a commit is picked up within one
+  `poll_interval` (20 ms by default), or at once if the writer lives in
+  the same process and calls `wake`.
+- **Spool** - while the daemon is down, hooks spool events to disk
+  instead of the table. With ``spool_dir`` set, the feed also imports
+  finished spool files every `spool_interval`.
+
+A full ``VACUUM`` (retention's one-time conversion to incremental vacuum)
+can renumber rowids; the feed notices the table's max rowid falling
+below its mark and re-anchors there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from khive.services.claude.hooks.reader import BATCH_SIZE, EventRecord, connect_reader
+from khive.services.claude.hooks.schema import SELECT_COLUMNS, TABLE, migrate_path
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.02  # seconds between data_version checks
+SPOOL_INTERVAL = 0.5  # seconds between spool directory scans
+
+Callback = Callable[[EventRecord], Awaitable[Any] | Any]
+
+
+def current_high_water(conn: sqlite3.Connection, table: str = TABLE) -> int:
+    """The mark after which rows committed from now on will appear."""
+    return conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+
+
+class HookEventFeed:
+    """Follows new rows of the events table and hands them to a callback."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        poll_interval: float = POLL_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        spool_dir: str | Path | None = None,
+        spool_interval: float = SPOOL_INTERVAL,
+        table: str = TABLE,
+    ):
+        self.db_path = Path(db_path)
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.spool_dir = Path(spool_dir) if spool_dir is not None else None
+        self.spool_interval = spool_interval
+        self.table = table
+        self.high_water: int | None = None  # rowid of the last row delivered
+        self.counters = {
+            "delivered": 0,
+            "fetches": 0,
+            "wakeups": 0,
+            "resets": 0,
+            "spool_imported": 0,
+            "callback_errors": 0,
+        }
+        self._conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._last_spool_scan = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def open(self, from_start: bool = False):
+        """Connect and place the mark at the table's end (or its start)."""
+        if self._conn is not None:
+            return
+        migrate_path(str(self.db_path), self.table)
+        self._conn = connect_reader(self.db_path)
+        # No baseline version: the first pass reads whatever landed past
+        # the mark before the connection opened
+        self._data_version = None
+        if self.high_water is None:
+            self.high_water = 0 if from_start else current_high_water(self._conn, self.table)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self) -> bool:
+        """Whether another connection committed since the last check."""
+        version = self._read_data_version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    def fetch(self) -> list[EventRecord]:
+        """Up to `batch_size` rows past the high-water mark; advances it."""
+        self.counters["fetches"] += 1
+        rows = self._conn.execute(
+            f"SELECT rowid, {SELECT_COLUMNS} FROM {self.table} "
+            "WHERE rowid > :high_water ORDER BY rowid LIMIT :limit",
+            {"high_water": self.high_water, "limit": self.batch_size},
+        ).fetchall()
+        if rows:
+            self.high_water = rows[-1][0]
+        elif (top := current_high_water(self._conn, self.table)) < self.high_water:
+            logger.warning(f"Hook event rowids renumbered; feed re-anchored at {top}")
+            self.high_water = top
+            self.counters["resets"] += 1
+        return [EventRecord.from_row(row[1:]) for row in rows]
+
+    def _import_spool(self) -> int:
+        from khive.services.claude.hooks.spool import import_spool
+
+        return import_spool(self.spool_dir, db_path=self.db_path, table=self.table)[
+            "imported"
+        ]
+
+    def wake(self):
+        """Read now instead of at the next poll (call from the feed's loop)."""
+        if self._wake is not None and not self._wake.is_set():
+            self.counters["wakeups"] += 1
+            self._wake.set()
+
+    def start(
+        self, callback: Callback, from_start: bool = False, high_water: int | None = None
+    ):
+        """
+        Deliver every row committed from now on to `callback`, in order.
+
+        Pass `high_water` (see `current_high_water`) to start from a mark
+        taken earlier, e.g. by the writer before more rows could land.
+        """
+        if self.running:
+            return
+        if high_water is not None:
+            self.high_water = high_water
+        self._closing = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(callback, from_start))
+
+    async def stop(self):
+        """Deliver what is already committed, then stop."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+            self.close()
+
+    async def _run(self, callback: Callback, from_start: bool):
+        await asyncio.to_thread(self.open, from_start)
+        while True:
+            closing = self._closing  # stop() still gets one full pass
+            if self.spool_dir is not None:
+                now = time.monotonic()
+                if now - self._last_spool_scan >= self.spool_interval:
+                    self._last_spool_scan = now
+                    try:
+                        self.counters["spool_imported"] += await asyncio.to_thread(
+                            self._import_spool
+                        )
+                    except Exception as e:
+                        logger.warning(f"Hook event spool import failed: {e}")
+
+            # data_version is a cheap, lock-free read: check it on the loop
+            # and only go to a thread when there is something to read
+            if self.changed() or closing:
+                while page := await asyncio.to_thread(self.fetch):
+                    await self._deliver(callback, page)
+                    if len(page) < self.batch_size:
+                        break
+
+            if closing:
+                return
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _deliver(self, callback: Callback, page: list[EventRecord]):
+        for record in page:
+            try:
+                result = callback(record)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.counters["callback_errors"] += 1
+                logger.warning(f"Hook event feed callback failed: {e}")
+            self.counters["delivered"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.counters,
+            "running": self.running,
+            "high_water": self.high_water,
+            "poll_interval_ms": self.poll_interval * 1000,
+        }
+
+
+__all__ = ("HookEventFeed", "current_high_water")
@@ -0,0 +1,186 @@
+"""
+Threshold clustering of unit-length embeddings.
+
+Two rows are linked when their cosine similarity reaches the threshold,
+and clusters are the connected components of those links, found with
+union-find. A chain of near-duplicates therefore lands in one cluster
+whatever order the rows come in.
+
+Links come from one of two pair generators:
+
+- `similar_pairs_blocked` scores every pair exactly, a block of rows at a
+  time against the rows after them. Blocks are sized so one block of
+  scores fits in ``memory_budget`` bytes: O(n² · dim) work, but bounded
+  memory and no Python loop over pairs.
+- `similar_pairs_lsh` only scores pairs that share a SimHash bucket in at
+  least one table (see `simhash`), so work grows with the bucket sizes
+  rather than n². Pairs are found per table by sorting rows on their
+  bucket key and comparing each row with the ones k places after it, for
+  k up to the largest bucket, and scored in memory-bounded chunks as
+  they are found.
+
+Clustering uses wider codes (`lsh_codes`) than the lookup index: every
+bucket-mate pair is scored, so with 12-bit keys the pair count grows
+with n². 16 bits keep buckets near one row up to ~65k rows, and 48
+tables make up the recall (about 0.98 of planted near-duplicate groups
+at 50k rows, see ``tests/performance/test_task_clustering.py``).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from khive.services.claude.hooks.simhash import SimHashLSH
+
+MEMORY_BUDGET = 64 * 2**20  # bytes of scores or gathered rows held at once
+LSH_TABLES = 48
+LSH_BITS = 16
+
+
+class UnionFind:
+    """Disjoint sets over ``0..n-1`` with path halving and union by size."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+    def groups(self, min_size: int = 2) -> list[list[int]]:
+        """Sets of at least `min_size` members, each sorted, ordered by first member."""
+        members: dict[int, list[int]] = {}
+        for x in range(len(self.parent)):
+            members.setdefault(self.find(x), []).append(x)
+        return [group for group in members.values() if len(group) >= min_size]
+
+
+def similar_pairs_blocked(
+    vectors: np.ndarray, threshold: float, memory_budget: int = MEMORY_BUDGET
+) -> tuple[np.ndarray, np.ndarray]:
+    """Every pair ``i < j`` with ``vectors[i] @ vectors[j] >= threshold``."""
+    n = len(vectors)
+    rows = max(1, memory_budget // (vectors.itemsize * max(n, 1)))
+    left, right = [], []
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        scores = vectors[start:stop] @ vectors[start:].T
+        i, j = np.nonzero(scores >= threshold)
+        keep = j > i  # column j is row start + j; row i is start + i
+        left.append(i[keep] + start)
+        right.append(j[keep] + start)
+    if not left:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(left), np.concatenate(right)
+
+
+def _bucket_pairs(table: np.ndarray):
+    """Yield ``(a, b)`` row arrays of pairs sharing a bucket in one table."""
+    order = np.argsort(table, kind="stable")
+    ordered = table[order]
+    for k in range(1, len(table)):
+        same = ordered[k:] == ordered[:-k]
+        if not same.any():
+            return  # No bucket holds more than k rows
+        yield order[:-k][same], order[k:][same]
+
+
+def candidate_pairs(codes: np.ndarray) -> np.ndarray:
+    """Distinct pairs sharing a bucket in any table, as ``i * n + j`` with ``i < j``."""
+    n = len(codes)
+    keys = [
+        np.minimum(a, b).astype(np.int64) * n + np.maximum(a, b)
+        for table in codes.T
+        for a, b in _bucket_pairs(table)
+    ]
+    return np.unique(np.concatenate(keys)) if keys else np.empty(0, np.int64)
+
+
+def similar_pairs_lsh(
+    vectors: np.ndarray,
+    codes: np.ndarray,
+    threshold: float,
+    memory_budget: int = MEMORY_BUDGET,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs sharing a bucket in `codes` (``(n, tables)``) that reach `threshold`.
+
+    Tables are scored one at a time, so memory holds one table's candidates
+    rather than all of them; a pair sharing several buckets is scored once
+    per table, and only the matches are deduplicated.
+    """
+    n = len(vectors)
+    chunk = max(1, memory_budget // (2 * vectors.itemsize * vectors.shape[1]))
+    matches = []
+    for table in codes.T:
+        for a, b in _bucket_pairs(table):
+            for start in range(0, len(a), chunk):
+                i, j = a[start : start + chunk], b[start : start + chunk]
+                scores = np.einsum("ij,ij->i", vectors[i], vectors[j])
+                keep = scores >= threshold
+                i, j = i[keep], j[keep]
+                matches.append(np.minimum(i, j).astype(np.int64) * n + np.maximum(i, j))
+    if not matches:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.divmod(np.unique(np.concatenate(matches)), n)
+
+
+def lsh_codes(
+    vectors: np.ndarray, tables: int = LSH_TABLES, bits: int = LSH_BITS
+) -> np.ndarray:
+    """SimHash bucket keys for clustering `vectors`, as ``(n, tables)``."""
+    return SimHashLSH(vectors.shape[1], tables=tables, bits=bits).codes(vectors)
+
+
+def cluster(
+    vectors: np.ndarray,
+    threshold: float,
+    codes: np.ndarray | None = None,
+    memory_budget: int = MEMORY_BUDGET,
+) -> list[list[int]]:
+    """
+    Row indices of each cluster of two or more rows, in row order.
+
+    `vectors` must be unit length. With LSH `codes` for the rows, only
+    bucket-mates are scored (a link can be missed); without, every pair is.
+    All-zero rows match nothing and are left out up front, which also keeps
+    them from piling into one LSH bucket.
+    """
+    nonzero = np.flatnonzero(np.einsum("ij,ij->i", vectors, vectors) > 0)
+    if len(nonzero) < len(vectors):
+        vectors = vectors[nonzero]
+        codes = codes[nonzero] if codes is not None else None
+    if codes is None:
+        left, right = similar_pairs_blocked(vectors, threshold, memory_budget)
+    else:
+        left, right = similar_pairs_lsh(vectors, codes, threshold, memory_budget)
+
+    sets = UnionFind(len(vectors))
+    for a, b in zip(left.tolist(), right.tolist()):
+        sets.union(a, b)
+    return [[int(nonzero[row]) for row in group] for group in sets.groups()]
+
+
+__all__ = (
+    "MEMORY_BUDGET",
+    "UnionFind",
+    "candidate_pairs",
+    "cluster",
+    "lsh_codes",
+    "similar_pairs_blocked",
+    "similar_pairs_lsh",
+)
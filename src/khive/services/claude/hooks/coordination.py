@@ -10,12 +10,29 @@ Key problems this solves:
 Clean, honest coordination - only features that actually work.
 """
 
+import heapq
+import itertools
 import re
 import time
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from pathlib import Path, PurePath
+from pathlib import Path, PurePath, PurePosixPath
 from typing import Any
 
+from khive.services.claude.hooks.minhash import MinHashLSH, Signature, minhash
+from khive.services.claude.hooks.path_locks import PathLockTree, path_parts
+
+# How many change events the registry keeps for clients resuming a stream
+EVENT_LOG_SIZE = 10_000
+
+# Stale expiry-heap entries (left by renewals and releases) tolerated before
+# the heap is rebuilt from the live locks
+LOCK_HEAP_SLACK = 1024
+
+# Token-set Jaccard similarity at which two tasks count as duplicate work
+DUPLICATE_THRESHOLD = 0.7
+
 # Stopwords for duplicate detection
 STOP = {
     "the",
@@ -55,6 +72,13 @@ class AgentWork:
     files_editing: list[str] = field(default_factory=list)
     started_at: float = field(default_factory=time.time)
     status: str = "active"  # active, completed, failed
+    # Computed once from `task`: duplicate checks compare these, not the text
+    tokens: frozenset[str] = field(init=False, repr=False)
+    signature: Signature = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.tokens = frozenset(_sig(self.task))
+        self.signature = minhash(self.tokens)
 
     def duration_seconds(self) -> float:
         return time.time() - self.started_at
@@ -68,9 +92,27 @@ class FileEdit:
     agent_id: str
     locked_at: float = field(default_factory=time.time)
     lock_duration_seconds: float = 300  # 5 minute default
+    directory: bool = False  # Covers everything below file_path
+
+    @property
+    def expires_at(self) -> float:
+        return self.locked_at + self.lock_duration_seconds
 
-    def is_expired(self) -> bool:
-        return time.time() > (self.locked_at + self.lock_duration_seconds)
+    def is_expired(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) > self.expires_at
+
+
+@dataclass
+class LockRequest:
+    """An all-or-nothing lock request waiting in the per-path queues."""
+
+    ticket: int
+    agent_id: str
+    paths: list[str]
+    keys: list[str]
+    directory: bool = False
+    on_granted: Callable[[dict[str, Any]], None] | None = None
+    queued_at: float = field(default_factory=time.time)
 
 
 @dataclass
@@ -84,6 +126,24 @@ class Artifact:
     created_at: float = field(default_factory=time.time)
 
 
+@dataclass
+class CoordinationEvent:
+    """Incremental change to registry state, ordered by sequence number."""
+
+    seq: int
+    kind: str  # lock_granted, lock_released, lock_expired, agent_registered, ...
+    data: dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "kind": self.kind,
+            "timestamp": self.timestamp,
+            "data": self.data,
+        }
+
+
 def _norm(path: str) -> str:
     """Normalize path to resolved absolute path."""
     try:
@@ -92,14 +152,9 @@ def _norm(path: str) -> str:
         return str(PurePath(path))
 
 
-def _key(path: str) -> tuple[int, int] | str:
-    """Get file key based on device+inode or normalized path."""
-    p = Path(path)
-    try:
-        st = p.stat()
-        return (st.st_dev, st.st_ino)  # OS-true identity via device + inode
-    except Exception:
-        return _norm(path)  # Fallback to normalized path
+def _key(path: str) -> str:
+    """Lock key: the resolved path, so symlinks and relative paths agree."""
+    return _norm(path)
 
 
 class CoordinationRegistry:
@@ -111,8 +166,25 @@ class CoordinationRegistry:
     def __init__(self):
         # Core tracking
         self.active_agents: dict[str, AgentWork] = {}
-        self.file_locks: dict[tuple[int, int] | str, FileEdit] = {}  # inode-based keys
+        self.file_locks: dict[str, FileEdit] = {}  # resolved-path keys
+        # The same locks by path, for directory locks and their conflicts
+        self._lock_tree: PathLockTree[FileEdit] = PathLockTree()
+        # Min-heap of (expires_at, tiebreak, key, lock). Renewals push a new
+        # entry and releases leave theirs behind; an entry only counts while
+        # its lock is still the one held under `key` with that deadline.
+        self._lock_heap: list[tuple[float, int, Any, FileEdit]] = []
+        self._lock_tiebreak = itertools.count()
+        # FIFO of waiting multi-path requests per lock key. A request joins
+        # the queue of every path it wants at once, so queue order follows
+        # arrival order everywhere and the oldest waiter is never blocked
+        # behind a younger one.
+        self._lock_queues: dict[str, deque[LockRequest]] = {}
+        self._lock_tickets = itertools.count(1)
+        self._granting = False
+        self._regrant = False
         self.artifacts: dict[str, Artifact] = {}
+        # MinHash LSH over active agents' task tokens, for duplicate checks
+        self._task_index = MinHashLSH()
 
         # Session mapping - Claude session ID -> agent ID
         self.session_to_agent: dict[str, str] = {}
@@ -122,6 +194,159 @@ class CoordinationRegistry:
         self.duplicates_avoided = 0
         self.artifacts_shared = 0
 
+        # Change feed - bounded log of sequenced events for stream consumers
+        self.event_seq = 0
+        self.event_log: deque[CoordinationEvent] = deque(maxlen=EVENT_LOG_SIZE)
+        self._event_listeners: list[Callable[[CoordinationEvent], None]] = []
+
+        # Persistence - set by CoordinationJournal.attach, gets every state op
+        self._journal: Callable[[tuple[Any, ...]], None] | None = None
+
+    def _log(self, *op: Any):
+        if self._journal is not None:
+            self._journal(op)
+
+    def _log_lock(self, key: str, lock: FileEdit):
+        self._log(
+            "l+",
+            key,
+            lock.file_path,
+            lock.agent_id,
+            lock.locked_at,
+            lock.lock_duration_seconds,
+            lock.directory,
+        )
+
+    def _emit(self, kind: str, **data: Any) -> CoordinationEvent:
+        """Record a change event and notify listeners."""
+        self.event_seq += 1
+        event = CoordinationEvent(seq=self.event_seq, kind=kind, data=data)
+        self.event_log.append(event)
+        for listener in list(self._event_listeners):
+            try:
+                listener(event)
+            except Exception:
+                pass  # A broken listener must never break coordination
+        return event
+
+    def add_event_listener(self, listener: Callable[[CoordinationEvent], None]):
+        """Get notified synchronously whenever an event is emitted."""
+        if listener not in self._event_listeners:
+            self._event_listeners.append(listener)
+
+    def remove_event_listener(self, listener: Callable[[CoordinationEvent], None]):
+        """Stop notifying a listener."""
+        if listener in self._event_listeners:
+            self._event_listeners.remove(listener)
+
+    def events_since(self, seq: int) -> list[CoordinationEvent] | None:
+        """
+        Get events with a sequence number greater than `seq`.
+
+        Returns None when events after `seq` have already been evicted from
+        the log, in which case the caller must resync from `get_status()`.
+        """
+        if seq == self.event_seq:
+            return []
+        if seq > self.event_seq:
+            return None  # From before a restart: the log has started over
+        if not self.event_log or self.event_log[0].seq > seq + 1:
+            return None
+        # Sequence numbers are contiguous, so the offset is direct
+        start = seq + 1 - self.event_log[0].seq
+        return [self.event_log[i] for i in range(start, len(self.event_log))]
+
+    def _schedule_expiry(self, key: Any, lock: FileEdit):
+        """Track a lock's current deadline in the expiry heap."""
+        heapq.heappush(
+            self._lock_heap, (lock.expires_at, next(self._lock_tiebreak), key, lock)
+        )
+        if len(self._lock_heap) > 2 * len(self.file_locks) + LOCK_HEAP_SLACK:
+            self._lock_heap = [
+                (lock.expires_at, next(self._lock_tiebreak), key, lock)
+                for key, lock in self.file_locks.items()
+            ]
+            heapq.heapify(self._lock_heap)
+
+    def _set_lock(self, key: str, lock: FileEdit):
+        self._log_lock(key, lock)
+        self.file_locks[key] = lock
+        self._lock_tree.insert(key, lock)
+        self._schedule_expiry(key, lock)
+
+    def _drop_lock(self, key: str) -> FileEdit:
+        self._log("l-", key)
+        self._lock_tree.remove(key)
+        return self.file_locks.pop(key)
+
+    def _expire_lock(self, key: str, lock: FileEdit):
+        self._drop_lock(key)
+        work = self.active_agents.get(lock.agent_id)
+        if work is not None and lock.file_path in work.files_editing:
+            work.files_editing.remove(lock.file_path)
+        self._emit("lock_expired", file=lock.file_path, agent_id=lock.agent_id)
+
+    def expire_locks(self, now: float | None = None) -> list[FileEdit]:
+        """
+        Drop every lock whose deadline has passed, emitting ``lock_expired``.
+
+        Pops due entries off the expiry heap, so the cost is O(log n) per
+        expired (or stale) entry rather than a scan of all locks.
+        """
+        now = time.time() if now is None else now
+        expired = []
+        heap = self._lock_heap
+        while heap and heap[0][0] < now:
+            deadline, _, key, lock = heapq.heappop(heap)
+            if self.file_locks.get(key) is lock and lock.expires_at == deadline:
+                self._expire_lock(key, lock)
+                expired.append(lock)
+        if expired:
+            self._grant_waiters(now)
+        return expired
+
+    def next_lock_expiry(self) -> float | None:
+        """Seconds until the earliest held lock expires, or None if none are held."""
+        heap = self._lock_heap
+        while heap:
+            deadline, _, key, lock = heap[0]
+            if self.file_locks.get(key) is lock and lock.expires_at == deadline:
+                return max(0.0, deadline - time.time())
+            heapq.heappop(heap)  # Stale: renewed or released since
+        return None
+
+    def _add_work(self, work: AgentWork):
+        self._log("w+", work.agent_id, work.task, work.files_editing, work.started_at)
+        self.active_agents[work.agent_id] = work
+        self._task_index.add(work.agent_id, work.signature)
+
+    def _drop_work(self, agent_id: str) -> AgentWork:
+        self._log("w-", agent_id)
+        self._task_index.remove(agent_id)
+        return self.active_agents.pop(agent_id)
+
+    def find_duplicate_work(self, agent_id: str, work: AgentWork) -> AgentWork | None:
+        """
+        The most similar other active task at or above DUPLICATE_THRESHOLD.
+
+        Only agents sharing an LSH bucket with `work` are compared, with
+        exact Jaccard, so nothing below the threshold is ever reported; a
+        task at exactly the threshold is missed with probability ~1.5e-4
+        (see `minhash`).
+        """
+        best, best_score = None, DUPLICATE_THRESHOLD
+        for other_id in self._task_index.candidates(work.signature):
+            if other_id == agent_id:
+                continue
+            other = self.active_agents.get(other_id)
+            if other is None:  # Removed without going through the registry
+                self._task_index.remove(other_id)
+                continue
+            score = _jaccard(work.tokens, other.tokens)
+            if score >= best_score:
+                best, best_score = other, score
+        return best
+
     def register_agent_work(
         self, agent_id: str, task: str, files: list[str] = None
     ) -> dict[str, Any]:
@@ -129,23 +354,22 @@ class CoordinationRegistry:
         Register what an agent is working on.
         This provides VISIBILITY to other agents.
         """
+        work = AgentWork(agent_id=agent_id, task=task, files_editing=files or [])
+
         # Check for duplicate work using token-Jaccard similarity
-        sig = _sig(task)
-        for existing_agent, work in self.active_agents.items():
-            if existing_agent != agent_id:
-                if _jaccard(sig, _sig(work.task)) >= 0.7:
-                    self.duplicates_avoided += 1
-                    return {
-                        "status": "duplicate_detected",
-                        "message": f"Agent {existing_agent} already working on similar task",
-                        "existing_task": work.task,
-                        "suggestion": "Consider different task or coordinate with existing agent",
-                    }
+        existing = self.find_duplicate_work(agent_id, work)
+        if existing is not None:
+            self.duplicates_avoided += 1
+            return {
+                "status": "duplicate_detected",
+                "message": f"Agent {existing.agent_id} already working on similar task",
+                "existing_task": existing.task,
+                "suggestion": "Consider different task or coordinate with existing agent",
+            }
 
         # Register the work
-        self.active_agents[agent_id] = AgentWork(
-            agent_id=agent_id, task=task, files_editing=files or []
-        )
+        self._add_work(work)
+        self._emit("agent_registered", agent_id=agent_id, task=task[:100])
 
         return {
             "status": "registered",
@@ -153,60 +377,315 @@ class CoordinationRegistry:
             "agent_id": agent_id,
         }
 
-    def request_file_lock(self, agent_id: str, file_path: str) -> dict[str, Any]:
+    def find_lock_conflict(
+        self, agent_id: str, key: str, now: float | None = None, directory: bool = False
+    ) -> tuple[str, FileEdit] | None:
+        """
+        Another agent's live lock on `key`, a directory lock above it or,
+        when `directory` is set, any lock below it.
+
+        O(path depth): see `path_locks`. Expired locks found on the way are
+        dropped rather than reported.
+        """
+        now = time.time() if now is None else now
+        expired = False
+        while (found := self._lock_tree.conflict(key, agent_id, directory)) is not None:
+            blocking_key, lock = found
+            if not lock.is_expired(now):
+                return found
+            self._expire_lock(blocking_key, lock)
+            expired = True
+        if expired and self._lock_queues:
+            # Waiters get what just freed up before this caller does
+            self._grant_waiters(now)
+            return self.find_lock_conflict(agent_id, key, now, directory)
+        return None
+
+    def request_file_lock(
+        self, agent_id: str, file_path: str, directory: bool = False
+    ) -> dict[str, Any]:
         """
-        Request exclusive lock on a file.
+        Request exclusive lock on a file, or on a directory and all below it.
         This PREVENTS file edit conflicts - the #1 problem for multi-agent work.
         """
         # Use normalized key for locks
         k = _key(file_path)
 
         # Clean expired locks
-        expired = [f for f, lock in self.file_locks.items() if lock.is_expired()]
-        for f in expired:
-            del self.file_locks[f]
+        now = time.time()
+        self.expire_locks(now)
 
-        # Check if file is locked
-        if k in self.file_locks:
-            lock = self.file_locks[k]
-            if lock.agent_id != agent_id:
-                self.conflicts_prevented += 1
-                return {
-                    "status": "locked",
-                    "message": f"File locked by {lock.agent_id}",
-                    "locked_by": lock.agent_id,
-                    "expires_in_seconds": max(
-                        0, lock.lock_duration_seconds - (time.time() - lock.locked_at)
-                    ),
-                    "suggestion": "Wait for lock to expire or work on different file",
-                }
+        # Check if the file, a directory above it or (for a directory) any
+        # file below it is locked, or others are queued for it
+        blocked = self._blocked(agent_id, k, now, directory)
+        if blocked is not None:
+            self.conflicts_prevented += 1
+            return blocked
 
         # Grant the lock
-        self.file_locks[k] = FileEdit(file_path=file_path, agent_id=agent_id)
+        self._grant_lock(agent_id, file_path, k, directory)
+
+        return {
+            "status": "granted",
+            "message": "File lock granted",
+            "expires_in_seconds": 300,
+        }
+
+    def _grant_lock(self, agent_id: str, file_path: str, key: str, directory: bool):
+        lock = FileEdit(file_path=file_path, agent_id=agent_id, directory=directory)
+        self._set_lock(key, lock)
+        self._emit(
+            "lock_granted",
+            file=file_path,
+            agent_id=agent_id,
+            directory=directory,
+            expires_in_seconds=lock.lock_duration_seconds,
+        )
 
         # Update agent's file list
         if agent_id in self.active_agents:
             if file_path not in self.active_agents[agent_id].files_editing:
                 self.active_agents[agent_id].files_editing.append(file_path)
 
+    def _blocked(
+        self, agent_id: str, key: str, now: float, directory: bool = False
+    ) -> dict[str, Any] | None:
+        """Why `agent_id` cannot take `key` now, as a "locked" result, or None."""
+        conflict = self.find_lock_conflict(agent_id, key, now, directory)
+        if conflict is not None:
+            _, lock = conflict
+            return {
+                "status": "locked",
+                "message": f"File locked by {lock.agent_id}",
+                "locked_by": lock.agent_id,
+                "locked_path": lock.file_path,
+                "directory_lock": lock.directory,
+                "expires_in_seconds": max(0, lock.expires_at - now),
+                "suggestion": "Wait for lock to expire or work on different file",
+            }
+        waiting = self._queued_conflict(agent_id, key, directory)
+        if waiting is not None:
+            # Free, but promised to an older waiter: no queue jumping
+            request, waiter_key = waiting
+            return {
+                "status": "locked",
+                "message": f"File reserved for queued agent {request.agent_id}",
+                "locked_by": request.agent_id,
+                "locked_path": request.paths[request.keys.index(waiter_key)],
+                "directory_lock": request.directory,
+                "queued": len(self._lock_queues[waiter_key]),
+                "suggestion": "Wait in the queue or work on different file",
+            }
+        return None
+
+    def _queued_conflict(
+        self, agent_id: str, key: str, directory: bool, before: int | None = None
+    ) -> tuple[LockRequest, str] | None:
+        """
+        The oldest queued request of another agent that taking `key` would
+        jump, with the key it waits on; only tickets below `before` count.
+
+        Those are the first waiter on `key` itself, directory waiters on an
+        ancestor and, for a directory, waiters anywhere below it - so a
+        queued directory request is not starved by later requests for the
+        files under it.
+        """
+        if not self._lock_queues:
+            return None
+
+        def first_other(queue, directory_only: bool = False) -> LockRequest | None:
+            for request in queue:
+                if before is not None and request.ticket >= before:
+                    return None
+                if request.agent_id != agent_id and (request.directory or not directory_only):
+                    return request
+            return None
+
+        found: list[tuple[LockRequest, str]] = []
+        queue = self._lock_queues.get(key)
+        if queue and queue[0].agent_id != agent_id:
+            if before is None or queue[0].ticket < before:
+                found.append((queue[0], key))
+        parts = path_parts(key)
+        for depth in range(1, len(parts)):
+            ancestor = str(PurePosixPath(*parts[:depth]))
+            if ancestor in self._lock_queues:
+                request = first_other(self._lock_queues[ancestor], directory_only=True)
+                if request is not None:
+                    found.append((request, ancestor))
+        if directory:
+            prefix = key.rstrip("/") + "/"
+            for waiter_key, queue in self._lock_queues.items():
+                if waiter_key.startswith(prefix):
+                    request = first_other(queue)
+                    if request is not None:
+                        found.append((request, waiter_key))
+        return min(found, key=lambda item: item[0].ticket, default=None)
+
+    def request_file_locks(
+        self,
+        agent_id: str,
+        file_paths: list[str],
+        directory: bool = False,
+        wait: bool = False,
+        on_granted: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Lock every path in `file_paths`, or none of them.
+
+        Paths are taken in one global order (sorted lock keys), so two
+        agents asking for overlapping sets can never each hold part of the
+        other's. If any path is blocked, nothing stays granted and the
+        result is "locked" with the blocking lock; with `wait=True` the
+        request instead joins a FIFO queue on each of its paths and
+        returns "queued" with a ticket. It is granted as soon as it is the
+        oldest waiter on all its paths (and on directories covering or
+        below them), none are locked by others, and `on_granted` is then
+        called with the "granted" result.
+        """
+        now = time.time()
+        self.expire_locks(now)
+        self._grant_waiters(now)
+
+        by_key: dict[str, str] = {}
+        for file_path in file_paths:
+            by_key.setdefault(_key(file_path), file_path)
+        keys = sorted(by_key)
+        paths = [by_key[k] for k in keys]
+
+        for k in keys:
+            blocked = self._blocked(agent_id, k, now, directory)
+            if blocked is None:
+                continue
+            self.conflicts_prevented += 1
+            if not wait:
+                return blocked
+            request = LockRequest(
+                ticket=next(self._lock_tickets),
+                agent_id=agent_id,
+                paths=paths,
+                keys=keys,
+                directory=directory,
+                on_granted=on_granted,
+            )
+            for key in keys:
+                self._lock_queues.setdefault(key, deque()).append(request)
+            self._emit("lock_queued", agent_id=agent_id, files=paths, ticket=request.ticket)
+            return {
+                **blocked,
+                "status": "queued",
+                "ticket": request.ticket,
+                "position": max(len(self._lock_queues[key]) for key in keys),
+            }
+
+        return self._grant_all(agent_id, paths, keys, directory)
+
+    def _grant_all(
+        self, agent_id: str, paths: list[str], keys: list[str], directory: bool
+    ) -> dict[str, Any]:
+        granted: list[tuple[str, str, FileEdit | None]] = []
+        try:
+            for file_path, k in zip(paths, keys):
+                previous = self.file_locks.get(k)
+                self._grant_lock(agent_id, file_path, k, directory)
+                granted.append((file_path, k, previous))
+        except Exception:
+            # Roll back: never leave an agent holding part of a set
+            for file_path, k, previous in reversed(granted):
+                self._drop_lock(k)
+                if previous is not None:
+                    self._set_lock(k, previous)
+                self._emit("lock_released", file=file_path, agent_id=agent_id)
+            raise
+        lock = self.file_locks[keys[0]] if keys else None
         return {
             "status": "granted",
-            "message": "File lock granted",
-            "expires_in_seconds": 300,
+            "message": f"{len(paths)} file locks granted",
+            "files": paths,
+            "expires_in_seconds": lock.lock_duration_seconds if lock else 0,
         }
 
+    def _grant_waiters(self, now: float | None = None):
+        """Grant queued requests that are now first in line and unblocked."""
+        if not self._lock_queues:
+            return
+        if self._granting:  # Re-entered via an expiry: the outer pass repeats
+            self._regrant = True
+            return
+        now = time.time() if now is None else now
+        self._granting = True
+        try:
+            self._grant_waiters_pass(now)
+        finally:
+            self._granting = False
+
+    def _grant_waiters_pass(self, now: float):
+        progress = True
+        while progress:
+            progress = self._regrant = False
+            heads = {queue[0].ticket: queue[0] for queue in self._lock_queues.values()}
+            for request in sorted(heads.values(), key=lambda r: r.ticket):
+                if any(
+                    k not in self._lock_queues or self._lock_queues[k][0] is not request
+                    for k in request.keys
+                ):
+                    continue
+                if any(
+                    self.find_lock_conflict(request.agent_id, k, now, request.directory)
+                    or self._queued_conflict(
+                        request.agent_id, k, request.directory, before=request.ticket
+                    )
+                    for k in request.keys
+                ):
+                    continue
+                self._dequeue(request)
+                result = self._grant_all(
+                    request.agent_id, request.paths, request.keys, request.directory
+                )
+                result["ticket"] = request.ticket
+                result["waited_seconds"] = max(0.0, now - request.queued_at)
+                if request.on_granted is not None:
+                    try:
+                        request.on_granted(result)
+                    except Exception:
+                        pass  # A broken waiter must never break coordination
+                progress = True
+            progress = progress or self._regrant
+
+    def _dequeue(self, request: LockRequest):
+        for k in request.keys:
+            queue = self._lock_queues[k]
+            queue.remove(request)
+            if not queue:
+                del self._lock_queues[k]
+
+    def cancel_lock_request(self, ticket: int) -> bool:
+        """Leave the queue; True if the request was still waiting."""
+        for queue in self._lock_queues.values():
+            for request in queue:
+                if request.ticket == ticket:
+                    self._dequeue(request)
+                    self._emit(
+                        "lock_request_cancelled", agent_id=request.agent_id, ticket=ticket
+                    )
+                    self._grant_waiters()  # Others may have queued behind it
+                    return True
+        return False
+
     def release_file_lock(self, agent_id: str, file_path: str) -> dict[str, Any]:
         """Release file lock when done editing."""
         k = _key(file_path)
         if k in self.file_locks:
             if self.file_locks[k].agent_id == agent_id:
-                del self.file_locks[k]
+                self._drop_lock(k)
+                self._emit("lock_released", file=file_path, agent_id=agent_id)
 
                 # Update agent's file list
                 if agent_id in self.active_agents:
                     if file_path in self.active_agents[agent_id].files_editing:
                         self.active_agents[agent_id].files_editing.remove(file_path)
 
+                self._grant_waiters()
                 return {"status": "released", "message": "Lock released"}
 
         return {"status": "not_found", "message": "No lock found"}
@@ -218,6 +697,14 @@ class CoordinationRegistry:
             lock = self.file_locks[k]
             if lock.agent_id == agent_id:
                 lock.locked_at = time.time()
+                self._log_lock(k, lock)
+                self._schedule_expiry(k, lock)
+                self._emit(
+                    "lock_renewed",
+                    file=lock.file_path,
+                    agent_id=agent_id,
+                    expires_in_seconds=lock.lock_duration_seconds,
+                )
                 return {
                     "status": "renewed",
                     "expires_in_seconds": lock.lock_duration_seconds,
@@ -233,14 +720,24 @@ class CoordinationRegistry:
         """
         artifact_id = f"artifact_{agent_id}_{int(time.time())}"
 
-        self.artifacts[artifact_id] = Artifact(
+        artifact = Artifact(
             artifact_id=artifact_id,
             created_by=agent_id,
             content=content,
             file_path=file_path,
         )
+        self.artifacts[artifact_id] = artifact
+        self._log(
+            "a+", artifact_id, agent_id, content, file_path, artifact.created_at
+        )
 
         self.artifacts_shared += 1
+        self._emit(
+            "artifact_shared",
+            artifact_id=artifact_id,
+            created_by=agent_id,
+            has_file=file_path is not None,
+        )
         return artifact_id
 
     def get_artifact(self, artifact_id: str) -> Artifact | None:
@@ -253,6 +750,7 @@ class CoordinationRegistry:
         This is what agents need to see to coordinate effectively.
         """
         return {
+            "seq": self.event_seq,
             "active_agents": len(self.active_agents),
             "active_work": [
                 {
@@ -267,6 +765,7 @@ class CoordinationRegistry:
                 {
                     "file": lock.file_path,
                     "locked_by": lock.agent_id,
+                    "directory": lock.directory,
                     "expires_in": max(
                         0, lock.lock_duration_seconds - (time.time() - lock.locked_at)
                     ),
@@ -288,6 +787,21 @@ class CoordinationRegistry:
             },
         }
 
+    def get_lock_tree(self) -> dict[str, Any]:
+        """Held locks as a path tree, with unlocked chains collapsed."""
+        now = time.time()
+        return {
+            "total_locks": len(self.file_locks),
+            "tree": self._lock_tree.to_dict(
+                lambda lock: {
+                    "file": lock.file_path,
+                    "locked_by": lock.agent_id,
+                    "directory": lock.directory,
+                    "expires_in": max(0, lock.expires_at - now),
+                }
+            ),
+        }
+
     def complete_work(self, agent_id: str) -> dict[str, Any]:
         """Mark agent's work as complete and release all locks."""
         if agent_id not in self.active_agents:
@@ -295,19 +809,16 @@ class CoordinationRegistry:
 
         work = self.active_agents[agent_id]
 
-        # Release all file locks
-        files_released = []
-        for file_path in list(work.files_editing):
-            if (
-                file_path in self.file_locks
-                and self.file_locks[file_path].agent_id == agent_id
-            ):
-                del self.file_locks[file_path]
-                files_released.append(file_path)
+        # Release all file locks and give up any place in the lock queues
+        files_released = self._release_agent_locks(work)
+        self._cancel_agent_requests(agent_id)
 
         # Mark as completed
         work.status = "completed"
-        del self.active_agents[agent_id]
+        self._drop_work(agent_id)
+        self._emit(
+            "agent_completed", agent_id=agent_id, files_released=files_released
+        )
 
         return {
             "status": "completed",
@@ -316,8 +827,64 @@ class CoordinationRegistry:
             "duration_seconds": work.duration_seconds(),
         }
 
+    def _release_agent_locks(self, work: AgentWork) -> list[str]:
+        """Release every lock still held by an agent, emitting release events."""
+        files_released = []
+        for file_path in list(work.files_editing):
+            k = _key(file_path)
+            if k in self.file_locks and self.file_locks[k].agent_id == work.agent_id:
+                self._drop_lock(k)
+                files_released.append(file_path)
+                self._emit(
+                    "lock_released", file=file_path, agent_id=work.agent_id
+                )
+        return files_released
+
+    def _cancel_agent_requests(self, agent_id: str):
+        waiting = {
+            request.ticket: request
+            for queue in self._lock_queues.values()
+            for request in queue
+            if request.agent_id == agent_id
+        }
+        for request in waiting.values():
+            self._dequeue(request)
+        self._grant_waiters()
+
+    def remove_stale_agents(self, max_age_seconds: float = 3600) -> dict[str, Any]:
+        """Drop agents running longer than `max_age_seconds` with their locks."""
+        now = time.time()
+        stale_agents = [
+            agent_id
+            for agent_id, work in self.active_agents.items()
+            if now - work.started_at > max_age_seconds
+        ]
+
+        for agent_id in stale_agents:
+            work = self._drop_work(agent_id)
+            self._release_agent_locks(work)
+            self._cancel_agent_requests(agent_id)
+            self._emit("agent_removed", agent_id=agent_id, reason="stale")
+
+        # Also clean up session mappings for removed agents
+        sessions_to_remove = [
+            session_id
+            for session_id, mapped_agent_id in self.session_to_agent.items()
+            if mapped_agent_id in stale_agents
+        ]
+        for session_id in sessions_to_remove:
+            self._log("s-", session_id)
+            del self.session_to_agent[session_id]
+
+        return {
+            "stale_agents_removed": len(stale_agents),
+            "sessions_cleaned": len(sessions_to_remove),
+            "agents_removed": stale_agents,
+        }
+
     def register_session_mapping(self, session_id: str, agent_id: str):
         """Map Claude session ID to agent ID."""
+        self._log("s+", session_id, agent_id)
         self.session_to_agent[session_id] = agent_id
 
     def get_agent_id_from_session(self, session_id: str) -> str | None:
@@ -327,8 +894,92 @@ class CoordinationRegistry:
     def cleanup_session(self, session_id: str):
         """Clean up session mapping when agent completes."""
         if session_id in self.session_to_agent:
+            self._log("s-", session_id)
             del self.session_to_agent[session_id]
 
+    def export_state(self) -> dict[str, Any]:
+        """Everything a restart would lose, as plain JSON-able data."""
+        return {
+            "seq": self.event_seq,
+            "agents": {
+                agent_id: [work.task, list(work.files_editing), work.started_at]
+                for agent_id, work in self.active_agents.items()
+            },
+            "locks": {
+                key: [
+                    lock.file_path,
+                    lock.agent_id,
+                    lock.locked_at,
+                    lock.lock_duration_seconds,
+                    lock.directory,
+                ]
+                for key, lock in self.file_locks.items()
+            },
+            "artifacts": {
+                artifact_id: [a.created_by, a.content, a.file_path, a.created_at]
+                for artifact_id, a in self.artifacts.items()
+            },
+            "sessions": dict(self.session_to_agent),
+            "metrics": {
+                "conflicts_prevented": self.conflicts_prevented,
+                "duplicates_avoided": self.duplicates_avoided,
+                "artifacts_shared": self.artifacts_shared,
+            },
+        }
+
+    def restore_state(
+        self, state: dict[str, Any], downtime: float = 0.0, now: float | None = None
+    ) -> dict[str, int]:
+        """
+        Load an `export_state` dict, e.g. recovered by CoordinationJournal.
+
+        Lock deadlines move forward by `downtime`, so each lock keeps the
+        time it had left; locks already expired before that are dropped.
+        """
+        now = time.time() if now is None else now
+        for agent_id, (task, files, started_at) in state["agents"].items():
+            work = AgentWork(
+                agent_id=agent_id, task=task, files_editing=list(files), started_at=started_at
+            )
+            self._add_work(work)
+        dropped = 0
+        for key, (file_path, agent_id, locked_at, duration, directory) in state[
+            "locks"
+        ].items():
+            lock = FileEdit(
+                file_path=file_path,
+                agent_id=agent_id,
+                locked_at=locked_at + downtime,
+                lock_duration_seconds=duration,
+                directory=directory,
+            )
+            if lock.is_expired(now):
+                dropped += 1
+                continue
+            self._set_lock(key, lock)
+        for artifact_id, (created_by, content, file_path, created_at) in state[
+            "artifacts"
+        ].items():
+            self.artifacts[artifact_id] = Artifact(
+                artifact_id=artifact_id,
+                created_by=created_by,
+                content=content,
+                file_path=file_path,
+                created_at=created_at,
+            )
+        self.session_to_agent.update(state["sessions"])
+        for name, value in state.get("metrics", {}).items():
+            setattr(self, name, max(getattr(self, name), value))
+        # Continue past the last sequence number clients may have seen
+        self.event_seq = max(self.event_seq, state["seq"] + 1)
+        return {
+            "agents": len(state["agents"]),
+            "locks": len(state["locks"]) - dropped,
+            "locks_expired": dropped,
+            "artifacts": len(state["artifacts"]),
+            "sessions": len(state["sessions"]),
+        }
+
 
 # Global registry instance
 _registry: CoordinationRegistry | None = None
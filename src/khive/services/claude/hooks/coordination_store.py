@@ -0,0 +1,256 @@
+"""
+Write-ahead log and snapshots for the coordination registry.
+
+The registry lives in the daemon's memory; without this, a restart drops
+every active agent, file lock, artifact and session mapping. The journal
+persists them in two files under ``COORDINATION_STATE_DIR``:
+
+- ``registry.wal`` - one compact JSON array per state change, appended and
+  flushed as it happens: ``[time, seq, op, *args]``. Ops set or delete one
+  entry (``w+``/``w-`` agent work, ``l+``/``l-`` locks, ``a+`` artifacts,
+  ``s+``/``s-`` session mappings), so replaying them in order is
+  idempotent. An ``hb`` line marks the daemon as alive while idle; with
+  no ops logged since the snapshot it replaces the previous one, so an
+  idle daemon's log stays two lines long.
+- ``registry.snapshot.json`` - the full state, written atomically (temp
+  file + rename) every checkpoint or ``snapshot_every`` ops, after which
+  the log restarts. Both carry a generation number; a log older than the
+  snapshot (a crash between the two writes) is ignored.
+
+Recovery folds the log into the snapshot's plain-dict state first and
+only then builds registry objects, so its cost is one JSON parse per
+logged op plus the size of the final state, not of the history.
+
+Lock deadlines are shifted by the downtime (now minus the last time the
+journal saw the daemon alive): a lock keeps the time it had left when the
+daemon stopped, since its holder could not renew it meanwhile. Locks that
+had already expired by then are dropped.
+
+Lines are flushed to the OS on every op, so a daemon crash loses nothing;
+``fsync=True`` also survives power loss, at a cost per op.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from khive.services.claude.hooks.coordination import CoordinationRegistry
+
+logger = logging.getLogger(__name__)
+
+WAL_NAME = "registry.wal"
+SNAPSHOT_NAME = "registry.snapshot.json"
+SNAPSHOT_EVERY = 50_000  # ops between forced snapshots, bounding recovery
+
+State = dict[str, Any]
+
+
+def empty_state() -> State:
+    return {
+        "generation": 0,
+        "saved_at": 0.0,
+        "seq": 0,
+        "agents": {},  # agent_id -> [task, files, started_at]
+        "locks": {},  # key -> [file_path, agent_id, locked_at, duration, directory]
+        "artifacts": {},  # artifact_id -> [created_by, content, file_path, created_at]
+        "sessions": {},  # session_id -> agent_id
+        "metrics": {},
+    }
+
+
+def apply_op(state: State, op: list[Any]):
+    """Apply one logged op (without its time and seq) to a plain state."""
+    kind, args = op[0], op[1:]
+    if kind == "w+":
+        agent_id, task, files, started_at = args
+        state["agents"][agent_id] = [task, list(files), started_at]
+    elif kind == "w-":
+        state["agents"].pop(args[0], None)
+    elif kind == "l+":
+        key, file_path, agent_id = args[0], args[1], args[2]
+        state["locks"][key] = list(args[1:])
+        # What the registry does to the holder's file list on a grant
+        work = state["agents"].get(agent_id)
+        if work is not None and file_path not in work[1]:
+            work[1].append(file_path)
+    elif kind == "l-":
+        lock = state["locks"].pop(args[0], None)
+        if lock is not None:
+            work = state["agents"].get(lock[1])
+            if work is not None and lock[0] in work[1]:
+                work[1].remove(lock[0])
+    elif kind == "a+":
+        state["artifacts"][args[0]] = list(args[1:])
+    elif kind == "s+":
+        state["sessions"][args[0]] = args[1]
+    elif kind == "s-":
+        state["sessions"].pop(args[0], None)
+    elif kind != "hb":
+        raise ValueError(f"Unknown coordination op: {kind!r}")
+
+
+class CoordinationJournal:
+    """Persists a CoordinationRegistry as a snapshot plus a write-ahead log."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        snapshot_every: int = SNAPSHOT_EVERY,
+        fsync: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.wal_path = self.directory / WAL_NAME
+        self.snapshot_path = self.directory / SNAPSHOT_NAME
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.generation = 0
+        self.ops_since_snapshot = 0
+        self.last_write = 0.0
+        self.counters = {"ops": 0, "snapshots": 0, "heartbeats": 0}
+        self.recovery: dict[str, Any] | None = None
+        self._registry: CoordinationRegistry | None = None
+        self._file = None
+        self._header_end = 0  # Log offset just past the "gen" header
+
+    # --- Recovery ---
+
+    def load_state(self) -> tuple[State, dict[str, int]]:
+        """The snapshot with the log folded in, as plain dicts."""
+        stats = {"snapshot": 0, "replayed": 0, "skipped": 0}
+        state = empty_state()
+        if self.snapshot_path.exists():
+            state = {**state, **json.loads(self.snapshot_path.read_text())}
+            stats["snapshot"] = 1
+        last_alive = state["saved_at"]
+        if self.wal_path.exists():
+            with open(self.wal_path, encoding="utf-8") as f:
+                header = f.readline()
+                try:
+                    wal_generation = json.loads(header)[1] if header else -1
+                except (ValueError, IndexError):
+                    wal_generation = -1
+                if wal_generation == state["generation"]:
+                    for line in f:
+                        try:
+                            t, seq, *op = json.loads(line)
+                            apply_op(state, op)
+                        except (ValueError, TypeError, KeyError, IndexError):
+                            stats["skipped"] += 1  # e.g. a line cut short by a crash
+                            continue
+                        last_alive, state["seq"] = t, max(state["seq"], seq)
+                        stats["replayed"] += 1
+                elif header:
+                    logger.info("Coordination log predates the snapshot; ignoring it")
+        state["saved_at"] = last_alive
+        return state, stats
+
+    def recover(
+        self, registry: CoordinationRegistry, now: float | None = None
+    ) -> dict[str, Any]:
+        """Restore `registry` from disk; returns what was recovered and how fast."""
+        started = time.perf_counter()
+        state, stats = self.load_state()
+        now = time.time() if now is None else now
+        downtime = max(0.0, now - state["saved_at"]) if state["saved_at"] else 0.0
+        restored = registry.restore_state(state, downtime=downtime, now=now)
+        self.generation = state["generation"]
+        self.recovery = {
+            **stats,
+            **restored,
+            "downtime_seconds": round(downtime, 3),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+        return self.recovery
+
+    # --- Logging ---
+
+    def attach(self, registry: CoordinationRegistry):
+        """Start logging `registry`'s changes, on top of a fresh snapshot."""
+        self._registry = registry
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot()
+        registry._journal = self.append
+
+    def _open_wal(self):
+        self._file = open(self.wal_path, "w", encoding="utf-8")
+        self._write(["gen", self.generation])
+        self._header_end = self._file.tell()
+
+    def _write(self, record: list[Any]):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.last_write = time.time()
+
+    def append(self, op: tuple[Any, ...]):
+        """Log one registry op; snapshots once `snapshot_every` have piled up."""
+        # The registry logs an op before applying it, so snapshot first: by
+        # now every earlier op is applied, and this one goes to the new log.
+        if self.ops_since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        self._write([round(time.time(), 3), self._registry.event_seq, *op])
+        self.counters["ops"] += 1
+        self.ops_since_snapshot += 1
+
+    def heartbeat(self):
+        """Mark the daemon alive, so downtime is measured from here."""
+        if not self.ops_since_snapshot:
+            # Only the header and earlier heartbeats follow the snapshot:
+            # the newest heartbeat is all recovery needs from them
+            self._file.seek(self._header_end)
+            self._file.truncate()
+        self._write([round(time.time(), 3), self._registry.event_seq, "hb"])
+        self.counters["heartbeats"] += 1
+
+    def checkpoint(self):
+        """Snapshot if anything changed since the last one, else heartbeat."""
+        if self.ops_since_snapshot:
+            self.snapshot()
+        else:
+            self.heartbeat()
+
+    def snapshot(self):
+        """Write the full state atomically and restart the log."""
+        self.generation += 1
+        state = self._registry.export_state()
+        state["generation"] = self.generation
+        state["saved_at"] = time.time()
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        if self._file is not None:
+            self._file.close()
+        self._open_wal()
+        self.ops_since_snapshot = 0
+        self.counters["snapshots"] += 1
+
+    def close(self):
+        """Final snapshot; the registry stops logging."""
+        if self._registry is None:
+            return
+        self.snapshot()
+        self._registry._journal = None
+        self._file.close()
+        self._file = None
+        self._registry = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.counters,
+            "generation": self.generation,
+            "ops_since_snapshot": self.ops_since_snapshot,
+            "recovery": self.recovery,
+        }
+
+
+__all__ = ("CoordinationJournal", "apply_op", "empty_state")
@@ -0,0 +1,170 @@
+"""
+On-disk format of the semantic dedup index, for warm restarts.
+
+An index directory (``SEMANTIC_INDEX_DIR`` for the global index) holds:
+
+- ``embeddings-<generation>.npy`` - the task embeddings, a plain
+  ``(n, dim)`` ``float32`` array. It is opened with ``mmap_mode="c"``, so
+  loading reads nothing up front: pages come in as lookups touch them,
+  and writes (new rows, tombstones) go to private copies, never the file.
+- ``index.json`` - everything else, with one entry per embedding row in
+  row order: the task's id, description, metadata and times, plus the
+  embedder's document frequencies, so queries after a restart are
+  weighted like the stored rows.
+
+A save writes a new embeddings file, then atomically replaces the sidecar
+(temp file + rename) and deletes older embeddings files. The sidecar
+names the embeddings file it belongs to, so a crash at any point leaves
+either the old pair or the new one, never a mix.
+
+Several processes may save to the same directory. Each save holds an
+exclusive ``flock`` on ``.lock`` from reading the generation to deleting
+old files, and loads hold a shared one, so saves never interleave. Saves
+are not merged, though: the last one wins, and tasks that only another
+process had added since this one loaded are dropped from the index.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_NAME = "index.json"
+LOCK_NAME = ".lock"
+FORMAT_VERSION = 1
+
+Sidecar = dict[str, Any]
+
+
+def _read_sidecar(directory: Path) -> Sidecar | None:
+    path = directory / SIDECAR_NAME
+    if not path.exists():
+        return None
+    try:
+        sidecar = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable dedup index {path}: {e}")
+        return None
+    if sidecar.get("version") != FORMAT_VERSION:
+        logger.warning(f"Ignoring dedup index {path} in format {sidecar.get('version')}")
+        return None
+    return sidecar
+
+
+@contextlib.contextmanager
+def _locked(directory: Path, exclusive: bool) -> Iterator[None]:
+    """Hold the directory's lock file, shared or exclusive."""
+    if fcntl is None:
+        yield
+        return
+    with open(directory / LOCK_NAME, "a+b") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _replace(directory: Path, name: str, dump) -> None:
+    """Write `name` atomically: ``dump(f)`` to a unique temp file, then rename."""
+    fd, tmp = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            dump(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, directory / name)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def write(directory: Path | str, vectors: np.ndarray, sidecar: Sidecar):
+    """
+    Save `vectors` and their `sidecar` as the directory's current index.
+
+    Replaces whatever another process saved there: see the module notes.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with _locked(directory, exclusive=True):
+        previous = _read_sidecar(directory)
+        generation = (previous["generation"] if previous else 0) + 1
+        name = f"embeddings-{generation}.npy"
+        _replace(
+            directory,
+            name,
+            lambda f: np.save(
+                f, np.ascontiguousarray(vectors, dtype=np.float32), allow_pickle=False
+            ),
+        )
+
+        sidecar = {
+            **sidecar,
+            "version": FORMAT_VERSION,
+            "generation": generation,
+            "embeddings": name,
+            "rows": len(vectors),
+            "dim": vectors.shape[1],
+        }
+        payload = json.dumps(sidecar, separators=(",", ":")).encode("utf-8")
+        _replace(directory, SIDECAR_NAME, lambda f: f.write(payload))
+
+        # Under the lock, any temp file left is a crashed save's
+        stale = [*directory.glob("embeddings-*.npy"), *directory.glob("*.tmp")]
+        for path in stale:
+            if path.name != name:
+                # A process may still map it; on POSIX unlinking is safe anyway
+                with contextlib.suppress(OSError):
+                    path.unlink()
+
+
+def read(directory: Path | str) -> tuple[np.ndarray, Sidecar] | None:
+    """
+    The saved embeddings (memory-mapped copy-on-write) and sidecar.
+
+    Returns None when there is no index, or one that cannot be used.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return None
+    with _locked(directory, exclusive=False):
+        sidecar = _read_sidecar(directory)
+        if sidecar is None:
+            return None
+        rows, dim = sidecar["rows"], sidecar["dim"]
+        if not rows:  # An empty file cannot be mapped
+            return np.zeros((0, dim), dtype=np.float32), sidecar
+        path = directory / sidecar["embeddings"]
+        try:
+            # The mapping outlives the lock, and a later save's unlink
+            vectors = np.load(path, mmap_mode="c", allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring dedup index {directory}: {e}")
+            return None
+    if vectors.shape != (rows, dim) or vectors.dtype != np.float32:
+        logger.warning(
+            f"Ignoring dedup index {directory}: {path.name} holds {vectors.shape} "
+            f"{vectors.dtype}, expected ({rows}, {dim}) float32"
+        )
+        return None
+    return vectors, sidecar
+
+
+__all__ = ("FORMAT_VERSION", "LOCK_NAME", "SIDECAR_NAME", "read", "write")
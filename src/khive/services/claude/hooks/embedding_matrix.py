@@ -0,0 +1,223 @@
+"""
+Contiguous matrix of unit-length embeddings with exact top-k search.
+
+Every vector is L2-normalized once, on insert, into one row of a C-order
+``float32`` array, so cosine similarity against the whole index is a
+single matrix-vector product (or matrix-matrix, for a batch of queries),
+with no per-task Python work and no candidate cap.
+
+Capacity doubles when full, so appends are amortized O(dim). Removing a
+key tombstones its row: the row is zeroed and masked out of results, and
+its id is dropped. Rows are compacted once tombstones outnumber live
+rows, which keeps both the memory and the per-query work proportional to
+the live tasks.
+
+`from_rows` adopts an existing array without copying it, such as a
+copy-on-write memory map of a saved index: rows are read from disk as
+queries touch them, and the first growth or compaction moves them into
+memory.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+COMPACT_MIN_TOMBSTONES = 256  # Below this, masking is cheaper than copying
+
+Match = tuple[str, float]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length; all-zero rows stay zero."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class EmbeddingMatrix:
+    """Normalized embeddings by key, searched with one product per query batch."""
+
+    def __init__(self, dim: int, capacity: int = INITIAL_CAPACITY, dtype=np.float32):
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self._vectors = np.zeros((max(capacity, 1), dim), dtype=self.dtype)
+        self._alive = np.zeros(max(capacity, 1), dtype=bool)
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._tombstones = 0
+
+    @classmethod
+    def from_rows(cls, keys: list[str], vectors: np.ndarray) -> EmbeddingMatrix:
+        """
+        A matrix over `vectors` as they are, one row per key.
+
+        The rows must already be unit length (or zero), as `live_rows`
+        returns them; the array is used in place, and must be writable.
+        """
+        if vectors.ndim != 2 or len(vectors) != len(keys):
+            raise ValueError(f"Got {len(keys)} keys for {len(vectors)} vectors")
+        matrix = cls(vectors.shape[1], capacity=1, dtype=vectors.dtype)
+        if len(keys):
+            matrix._vectors = vectors
+            matrix._alive = np.ones(len(keys), dtype=bool)
+        matrix._ids = list(keys)
+        matrix._rows = {key: row for row, key in enumerate(matrix._ids)}
+        if len(matrix._rows) != len(keys):
+            raise ValueError("Duplicate keys")
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    @property
+    def capacity(self) -> int:
+        return len(self._vectors)
+
+    @property
+    def tombstones(self) -> int:
+        return self._tombstones
+
+    @property
+    def nbytes(self) -> int:
+        return self._vectors.nbytes + self._alive.nbytes
+
+    def keys(self) -> list[str]:
+        return [key for key in self._ids if key is not None]
+
+    def live_rows(self) -> tuple[list[str], np.ndarray]:
+        """Keys and their vectors, compacted first; the array is a view."""
+        self.compact()
+        return list(self._ids), self._vectors[: len(self._ids)]
+
+    def vector(self, key: str) -> np.ndarray:
+        """The stored (normalized) vector for `key`."""
+        return self._vectors[self._rows[key]]
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dim), dtype=self.dtype)
+        alive = np.zeros(capacity, dtype=bool)
+        size = len(self._ids)
+        vectors[:size] = self._vectors[:size]
+        alive[:size] = self._alive[:size]
+        self._vectors, self._alive = vectors, alive
+
+    def add(self, key: str, vector) -> int:
+        """Store `vector` (normalized) for `key`, replacing any previous one."""
+        return self.add_many([key], np.asarray(vector, dtype=self.dtype)[None, :])[0]
+
+    def add_many(self, keys: list[str], vectors) -> list[int]:
+        """Store a batch of vectors, normalized together; returns their rows."""
+        vectors = normalize(np.asarray(vectors, dtype=self.dtype).reshape(-1, self.dim))
+        if len(vectors) != len(keys):
+            raise ValueError(f"Got {len(keys)} keys for {len(vectors)} vectors")
+        rows = []
+        for key, vector in zip(keys, vectors):
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._ids)
+                if row >= self.capacity:
+                    self._grow(row + 1)
+                self._ids.append(key)
+                self._rows[key] = row
+                self._alive[row] = True
+            self._vectors[row] = vector
+            rows.append(row)
+        return rows
+
+    def remove(self, key: str) -> bool:
+        """Tombstone `key`'s row; compacts once tombstones outnumber live rows."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        self._ids[row] = None
+        self._alive[row] = False
+        self._vectors[row] = 0
+        self._tombstones += 1
+        if self._tombstones >= COMPACT_MIN_TOMBSTONES and self._tombstones > len(self):
+            self.compact()
+        return True
+
+    def compact(self):
+        """Move live rows together, dropping tombstones; row numbers change."""
+        if not self._tombstones:
+            return
+        size = len(self._ids)
+        live = np.flatnonzero(self._alive[:size])
+        count = len(live)
+        self._vectors[:count] = self._vectors[live]
+        self._vectors[count:size] = 0
+        self._alive[:count] = True
+        self._alive[count:size] = False
+        self._ids = [self._ids[row] for row in live]
+        self._rows = {key: row for row, key in enumerate(self._ids)}
+        self._tombstones = 0
+
+    def scores(self, queries) -> np.ndarray:
+        """
+        Cosine similarity of each query row against every row, as ``(q, rows)``.
+
+        Tombstoned rows score ``-inf``. Columns are row numbers, which stay
+        valid until the next `compact`.
+        """
+        queries = normalize(np.asarray(queries, dtype=self.dtype).reshape(-1, self.dim))
+        size = len(self._ids)
+        scores = queries @ self._vectors[:size].T
+        if self._tombstones:
+            scores[:, ~self._alive[:size]] = -np.inf
+        return scores
+
+    def top_k(self, queries, k: int = 1, min_score: float | None = None) -> list[list[Match]]:
+        """
+        The `k` most similar keys for each query row, best first.
+
+        `queries` is one vector or a ``(q, dim)`` batch; either way the
+        similarities come from one product against the whole matrix.
+        """
+        scores = self.scores(queries)
+        k = min(k, len(self))
+        if k <= 0:
+            return [[] for _ in range(len(scores))]
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            self._matches(rows, row_scores, min_score)
+            for rows, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+    def top_k_among(
+        self, query, keys, k: int = 1, min_score: float | None = None
+    ) -> list[Match]:
+        """Like `top_k` for one query, scoring only `keys` (unknown keys are skipped)."""
+        rows = [row for row in map(self._rows.get, keys) if row is not None]
+        if not rows or k <= 0:
+            return []
+        query = normalize(np.asarray(query, dtype=self.dtype).reshape(self.dim))
+        scores = self._vectors[rows] @ query
+        top = np.argsort(-scores, kind="stable")[:k]
+        return self._matches(
+            [rows[i] for i in top.tolist()], scores[top].tolist(), min_score
+        )
+
+    def _matches(self, rows: list[int], scores: list[float], min_score) -> list[Match]:
+        matches = []
+        for row, score in zip(rows, scores):
+            if score == -np.inf or (min_score is not None and score < min_score):
+                break
+            matches.append((self._ids[row], score))
+        return matches
+
+
+__all__ = ("EmbeddingMatrix", "Match", "normalize")
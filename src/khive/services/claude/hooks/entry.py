@@ -0,0 +1,170 @@
+"""
+Lightweight front-end for Claude Code hooks.
+
+Every hook runs as a fresh Python process. The full hook modules import
+lionagi, SQLAlchemy and httpx before they even read stdin. This entry point
+uses only the stdlib: it reads the hook input, and when the daemon is up
+(answered from the shared liveness cache) forwards the raw JSON to
+``POST /api/hooks/<hook_type>`` over the local daemon socket and replays
+the daemon's stdout, stderr and exit code. The full in-process hook is
+imported only when the daemon is unreachable.
+
+Hook handlers may run in either process, so they must not read
+``os.environ`` or print diagnostics themselves: the hook process's
+``HOOK_ENV`` variables travel in the input under ``ENV_FIELD`` (read them
+with `hook_env`), and messages for Claude go in ``HookResponse.stderr``.
+
+Usage (e.g. in .claude/settings.json):
+    python -m khive.services.claude.hooks.entry pre_edit
+"""
+
+from __future__ import annotations
+
+import importlib
+import io
+import json
+import os
+import sys
+from typing import Any, Callable
+
+from khive.daemon.liveness import DAEMON_URL, DaemonLiveness, http_request
+
+HOOK_TYPES = (
+    "pre_edit",
+    "pre_command",
+    "pre_agent_spawn",
+    "post_edit",
+    "post_command",
+    "post_agent_spawn",
+    "prompt_submitted",
+    "notification",
+)
+HOOK_TIMEOUT = 30.0  # seconds the daemon may take to run a hook
+HOOK_ENV = ("CLAUDE_AGENT_ID",)  # hook process environment the handlers read
+ENV_FIELD = "khive_env"
+
+
+class HookResponse:
+    """What a hook writes to stdout/stderr, and its exit code."""
+
+    # Plain class: dataclasses imports inspect, ~15 ms of hook startup
+    __slots__ = ("output", "exit_code", "stderr")
+
+    def __init__(
+        self,
+        output: dict[str, Any] | None = None,
+        exit_code: int = 0,
+        stderr: str | None = None,
+    ):
+        self.output = output if output is not None else {}
+        self.exit_code = exit_code
+        self.stderr = stderr
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "output": self.output,
+            "exit_code": self.exit_code,
+            "stderr": self.stderr,
+        }
+
+    def emit(self):
+        """Write the response the way Claude Code expects, then exit."""
+        if self.stderr:
+            print(self.stderr, file=sys.stderr)
+        print(json.dumps(self.output))
+        sys.exit(self.exit_code)
+
+
+Responder = Callable[[dict[str, Any]], HookResponse]
+
+
+def with_env(hook_input: dict[str, Any], environ=os.environ) -> dict[str, Any]:
+    """Add this process's ``HOOK_ENV`` variables to `hook_input`."""
+    hook_input[ENV_FIELD] = {name: environ[name] for name in HOOK_ENV if name in environ}
+    return hook_input
+
+
+def hook_env(hook_input: dict[str, Any], name: str, default: str | None = None) -> str | None:
+    """A ``HOOK_ENV`` variable of the process the hook was invoked in."""
+    env = hook_input.get(ENV_FIELD)
+    return env.get(name, default) if isinstance(env, dict) else default
+
+
+def error_response(hook_type: str, error: Exception) -> HookResponse:
+    """Hooks never block on their own failures: pre-hooks still proceed."""
+    output = {"proceed": True} if hook_type.startswith("pre_") else {}
+    output["error"] = str(error)
+    label = hook_type.replace("_", "-")
+    return HookResponse(output, 0, f"Error in {label} hook: {error}")
+
+
+def respond_safely(
+    hook_type: str, hook_input: dict[str, Any], respond: Responder | None = None
+) -> HookResponse:
+    """Run a hook's responder, turning any exception into its error response."""
+    try:
+        if respond is None:
+            module = importlib.import_module(f"khive.services.claude.hooks.{hook_type}")
+            respond = module.respond
+        return respond(hook_input)
+    except Exception as e:
+        return error_response(hook_type, e)
+
+
+def run_hook(hook_type: str, respond: Responder):
+    """`main()` body shared by the full hook modules: stdin -> respond -> emit."""
+    try:
+        hook_input = with_env(json.load(sys.stdin))
+    except Exception as e:
+        error_response(hook_type, e).emit()
+    respond_safely(hook_type, hook_input, respond).emit()
+
+
+def forward(
+    hook_type: str, body: bytes, base_url: str = DAEMON_URL
+) -> HookResponse | None:
+    """POST the raw hook input to the daemon. None if it could not answer.
+
+    Raises OSError when the daemon cannot be reached.
+    """
+    status, payload = http_request(
+        base_url, "POST", f"/api/hooks/{hook_type}", body, timeout=HOOK_TIMEOUT
+    )
+    if status != 200:
+        return None
+    data = json.loads(payload)
+    return HookResponse(data["output"], data["exit_code"], data.get("stderr"))
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in HOOK_TYPES:
+        print(f"usage: entry.py {{{','.join(HOOK_TYPES)}}}", file=sys.stderr)
+        sys.exit(0)  # Never block Claude on a misconfigured hook
+    hook_type = argv[0]
+    body = sys.stdin.buffer.read()
+    try:
+        hook_input = json.loads(body)
+    except ValueError:
+        hook_input = None  # The local hook reports it
+
+    liveness = DaemonLiveness(DAEMON_URL)
+    if isinstance(hook_input, dict) and liveness.is_alive():
+        try:
+            response = forward(hook_type, json.dumps(with_env(hook_input)).encode())
+        except OSError:
+            liveness.record_failure()
+            response = None
+        except (ValueError, KeyError, IndexError):
+            response = None  # Malformed reply - let the local hook decide
+        if response is not None:
+            response.emit()
+
+    # Daemon unreachable: run the full hook in this process
+    sys.stdin = io.TextIOWrapper(io.BytesIO(body), encoding="utf-8")
+    module = importlib.import_module(f"khive.services.claude.hooks.{hook_type}")
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
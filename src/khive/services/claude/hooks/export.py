@@ -0,0 +1,150 @@
+"""
+Streaming export of hook events as NDJSON or CSV.
+
+Events are read with the keyset reader (see `reader`) and encoded one page
+at a time, optionally gzip-compressed on the fly, so an export of any size
+holds one page of rows and one compressor window in memory. The same
+generator backs ``khive claude export`` and the daemon's
+``GET /api/hooks/export``.
+
+NDJSON lines use the spool/archive record layout (lionagi's db dict), so an
+export can be dropped into the spool directory to re-import it. CSV flattens
+the indexed fields into columns and keeps the full content as JSON.
+
+Exports only read: migrating is left to the writers (the daemon's ingestor,
+HookEvent.save), so a database on an older schema is refused rather than
+upgraded under a reader.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Literal
+
+from khive.services.claude.hooks.reader import (
+    BATCH_SIZE,
+    EventRecord,
+    check_filters,
+    connect_reader,
+    iter_pages,
+)
+from khive.services.claude.hooks.schema import (
+    INDEXED_FIELDS,
+    SCHEMA_VERSION,
+    TABLE,
+    schema_version,
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+EXPORT_FORMATS: tuple[str, ...] = ("ndjson", "csv")
+CSV_COLUMNS = ("id", "created_at", *INDEXED_FIELDS, "content")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+GZIP_LEVEL = 6
+
+
+def _ndjson(records: list[EventRecord]) -> bytes:
+    return "".join(
+        json.dumps(r.to_dict(), separators=(",", ":")) + "\n" for r in records
+    ).encode()
+
+
+def _csv(records: list[EventRecord], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for r in records:
+        writer.writerow(
+            (
+                r.id,
+                r.created_at,
+                *(r.content.get(field) or "" for field in INDEXED_FIELDS),
+                json.dumps(r.content, separators=(",", ":")),
+            )
+        )
+    return buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """Compress a byte stream into one gzip member as it is produced."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    for chunk in chunks:
+        if out := compressor.compress(chunk):
+            yield out
+    yield compressor.flush()
+
+
+def _schema_ready(db_path: str | Path) -> bool:
+    """False if there is no database yet; raises if it needs migrating."""
+    if not Path(db_path).exists():
+        return False
+    conn = connect_reader(db_path)
+    try:
+        version = schema_version(conn)
+    finally:
+        conn.close()
+    if version < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"{db_path} is at schema version {version}, export needs "
+            f"{SCHEMA_VERSION}: start the daemon to migrate it"
+        )
+    return True
+
+
+def iter_export(
+    db_path: str | Path,
+    fmt: ExportFormat = "ndjson",
+    since: str | None = None,
+    until: str | None = None,
+    gzip: bool = False,
+    batch_size: int = BATCH_SIZE,
+    stats: dict[str, int] | None = None,
+    table: str = TABLE,
+    **filters: str,
+) -> Iterator[bytes]:
+    """
+    Encoded chunks (one per page) of the matching events, oldest first.
+
+    `since` is inclusive and `until` exclusive; `filters` match
+    event_type, session_id or tool_name. If given, ``stats["events"]``
+    counts the exported events as the stream is consumed. Raises
+    RuntimeError if the database is on an older schema.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    # Validate before the first chunk: errors mid-stream can't change a status
+    check_filters(filters)
+    ready = _schema_ready(db_path)
+
+    def chunks() -> Iterator[bytes]:
+        if fmt == "csv":
+            yield _csv([], header=True)
+        if not ready:  # Nothing written yet
+            return
+        conn = connect_reader(db_path)
+        try:
+            for page in iter_pages(
+                conn, None, since, until, batch_size, table, **filters
+            ):
+                yield _ndjson(page) if fmt == "ndjson" else _csv(page, header=False)
+                if stats is not None:
+                    stats["events"] = stats.get("events", 0) + len(page)
+        finally:
+            conn.close()
+
+    return gzip_chunks(chunks()) if gzip else chunks()
+
+
+__all__ = (
+    "CSV_COLUMNS",
+    "EXPORT_FORMATS",
+    "MEDIA_TYPES",
+    "ExportFormat",
+    "gzip_chunks",
+    "iter_export",
+)
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any, ClassVar
 
+import anyio
 from lionagi.libs.concurrency import shield
 from lionagi.protocols.types import Node
 from pydantic import field_validator
 from typing_extensions import TypedDict
 
-from khive.utils import SQLITE_DSN, EventBroadcaster, get_logger
+from khive.daemon.liveness import DAEMON_URL, DaemonLiveness, http_request
+from khive.services.claude.hooks import spool
+from khive.services.claude.hooks.reader import (
+    BATCH_SIZE,
+    Cursor,
+    EventRecord,
+    connect_reader,
+    fetch_page,
+)
+from khive.services.claude.hooks.schema import SELECT_COLUMNS, migrate_path
+from khive.utils import SQLITE_DSN, SQLITE_PATH, EventBroadcaster, get_logger
 
 hook_event_logger = get_logger("ClaudeHooks", "🪝 [CLAUDE-HOOKS]")
 
@@ -28,6 +41,8 @@ class HookEvent(Node):
     content: HookEventContent
     _initialized: ClassVar[bool] = False
     _table_name: ClassVar[str] = "hook_events"
+    # Set inside the daemon: saves go to its batched ingestion queue
+    _sink: ClassVar[Callable[[HookEvent], Awaitable[Any]] | None] = None
 
     @field_validator("content", mode="before")
     def _validate_event_type(cls, value) -> dict:
@@ -42,17 +57,48 @@ class HookEvent(Node):
             return value
         raise ValueError("Content must be a dictionary")
 
+    @classmethod
+    def set_sink(cls, sink: Callable[[HookEvent], Awaitable[Any]] | None):
+        """Route `save()` to `sink` (the daemon's ingestor) instead of the adapter."""
+        HookEvent._sink = sink
+
     async def save(self):
-        # Save to database
-        result = await self.adapt_to_async(
-            obj_key="lionagi_async_pg",
-            dsn=SQLITE_DSN,
-            table=self._table_name,
-        )
+        """
+        Persist and broadcast this event.
 
-        await HookEventBroadcaster.broadcast(self)
+        Inside the daemon the event is queued for its batched writer, and
+        the daemon's change feed broadcasts it once committed. Elsewhere the event is posted to the daemon
+        when it is up, and appended to this process's offline spool
+        otherwise; the daemon or the khive claude CLI imports it later.
+        """
+        if HookEvent._sink is not None:
+            await HookEvent._sink(self)
+            return self
+        if await anyio.to_thread.run_sync(self._post_to_daemon):
+            return self
 
-        return result
+        spool.append(self.to_dict(mode="db"))
+        await HookEventBroadcaster.broadcast(self)
+        # Hooks save from a short-lived loop (anyio.run): deliver before it ends
+        await HookEventBroadcaster.drain()
+        return self
+
+    def _post_to_daemon(self, base_url: str = DAEMON_URL) -> bool:
+        """Hand the event to the daemon's ingestion endpoint if it is up."""
+        liveness = DaemonLiveness(base_url)
+        if not liveness.is_alive():
+            return False
+        body = json.dumps({"events": [self.to_dict()]}, default=str).encode()
+        try:
+            status, _ = http_request(
+                base_url, "POST", "/api/hooks/events", body, timeout=5.0
+            )
+        except OSError:
+            liveness.record_failure()
+            return False
+        except (ValueError, IndexError):
+            return False
+        return status == 202
 
     # NOTE: Database format conversion is now handled by lionagi Element.from_dict(mode="db")
     # This automatically handles:
@@ -67,6 +113,7 @@ class HookEvent(Node):
     ) -> list[HookEvent]:
         """Execute raw SQL using lionagi's built-in adapter and convert results to HookEvent objects."""
         try:
+            await cls._ensure_schema()
             config = {
                 "dsn": SQLITE_DSN,
                 "table": cls._table_name,
@@ -104,21 +151,21 @@ class HookEvent(Node):
             hook_event_logger.error(f"Raw SQL query failed: {e}")
             return []
 
+    @classmethod
+    async def _ensure_schema(cls):
+        """Create the table and its indexed lookup columns once per process."""
+        if not cls._initialized:
+            SQLITE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            await anyio.to_thread.run_sync(migrate_path, str(SQLITE_PATH))
+            HookEvent._initialized = True
+
     @classmethod
     async def get_all(cls, limit: int | None = None):
         """Get all hook events from database."""
-        params = {
-            "dsn": SQLITE_DSN,
-            "table": cls._table_name,
-        }
+        sql = f"SELECT {SELECT_COLUMNS} FROM {cls._table_name}"
         if limit:
-            params["limit"] = limit
-
-        return await cls.adapt_from_async(
-            params,
-            obj_key="lionagi_async_pg",
-            many=True,
-        )
+            return await cls._execute_raw_sql_query(f"{sql} LIMIT :limit", {"limit": limit})
+        return await cls._execute_raw_sql_query(sql)
 
     @classmethod
     async def get_recent(cls, limit: int | None = None) -> list[HookEvent]:
@@ -139,7 +186,7 @@ class HookEvent(Node):
             )
             thirty_days_ago_iso = thirty_days_ago.isoformat().replace("T", " ")
 
-            sql = f"""SELECT * FROM {cls._table_name}
+            sql = f"""SELECT {SELECT_COLUMNS} FROM {cls._table_name}
                      WHERE created_at >= :thirty_days_ago
                      ORDER BY created_at DESC
                      LIMIT {default_event_limit}"""
@@ -149,7 +196,7 @@ class HookEvent(Node):
         else:
             # Use specified limit
             sql = (
-                f"SELECT * FROM {cls._table_name} ORDER BY created_at DESC LIMIT :limit"
+                f"SELECT {SELECT_COLUMNS} FROM {cls._table_name} ORDER BY created_at DESC LIMIT :limit"
             )
             return await cls._execute_raw_sql_query(sql, {"limit": limit})
 
@@ -174,8 +221,8 @@ class HookEvent(Node):
             )
             thirty_days_ago_iso = thirty_days_ago.isoformat().replace("T", " ")
 
-            sql = f"""SELECT * FROM {cls._table_name}
-                     WHERE json_extract(content, '$.event_type') = :event_type
+            sql = f"""SELECT {SELECT_COLUMNS} FROM {cls._table_name}
+                     WHERE event_type = :event_type
                      AND created_at >= :thirty_days_ago
                      ORDER BY created_at DESC
                      LIMIT {default_event_limit}"""
@@ -184,7 +231,7 @@ class HookEvent(Node):
             )
         else:
             # Use specified limit
-            sql = f"SELECT * FROM {cls._table_name} WHERE json_extract(content, '$.event_type') = :event_type ORDER BY created_at DESC LIMIT :limit"
+            sql = f"SELECT {SELECT_COLUMNS} FROM {cls._table_name} WHERE event_type = :event_type ORDER BY created_at DESC LIMIT :limit"
             return await cls._execute_raw_sql_query(
                 sql, {"event_type": event_type, "limit": limit}
             )
@@ -210,8 +257,8 @@ class HookEvent(Node):
             )
             thirty_days_ago_iso = thirty_days_ago.isoformat().replace("T", " ")
 
-            sql = f"""SELECT * FROM {cls._table_name}
-                     WHERE json_extract(content, '$.session_id') = :session_id
+            sql = f"""SELECT {SELECT_COLUMNS} FROM {cls._table_name}
+                     WHERE session_id = :session_id
                      AND created_at >= :thirty_days_ago
                      ORDER BY created_at DESC
                      LIMIT {default_event_limit}"""
@@ -220,11 +267,46 @@ class HookEvent(Node):
             )
         else:
             # Use specified limit
-            sql = f"SELECT * FROM {cls._table_name} WHERE json_extract(content, '$.session_id') = :session_id ORDER BY created_at DESC LIMIT :limit"
+            sql = f"SELECT {SELECT_COLUMNS} FROM {cls._table_name} WHERE session_id = :session_id ORDER BY created_at DESC LIMIT :limit"
             return await cls._execute_raw_sql_query(
                 sql, {"session_id": session_id, "limit": limit}
             )
 
+    @classmethod
+    async def iter_since(
+        cls,
+        cursor: str | Cursor | None = None,
+        batch_size: int = BATCH_SIZE,
+        *,
+        until: str | None = None,
+        as_events: bool = False,
+        **filters: str,
+    ) -> AsyncIterator[EventRecord | HookEvent]:
+        """Stream events oldest first, one `batch_size` page in memory at a time.
+
+        `cursor` is a timestamp to start at (inclusive) or the ``.cursor``
+        of the last record seen, to resume after it. `filters` match
+        event_type, session_id or tool_name. Yields lightweight
+        `EventRecord`s, or full HookEvents with ``as_events=True``.
+        """
+        await cls._ensure_schema()
+        after, since = (cursor, None) if isinstance(cursor, tuple) else (None, cursor)
+        conn = await anyio.to_thread.run_sync(connect_reader, SQLITE_PATH)
+        try:
+            while True:
+                page = await anyio.to_thread.run_sync(
+                    lambda: fetch_page(
+                        conn, after, since, until, batch_size, cls._table_name, **filters
+                    )
+                )
+                for record in page:
+                    yield cls.from_dict(record.to_dict(), mode="db") if as_events else record
+                if len(page) < batch_size:
+                    return
+                after = page[-1].cursor
+        finally:
+            conn.close()
+
     @classmethod
     async def get_since(
         cls, timestamp: str, limit: int | None = None
@@ -238,11 +320,11 @@ class HookEvent(Node):
 
         if limit is None:
             # Apply default event limit only
-            sql = f"SELECT * FROM {cls._table_name} WHERE created_at >= :timestamp ORDER BY created_at DESC LIMIT {default_event_limit}"
+            sql = f"SELECT {SELECT_COLUMNS} FROM {cls._table_name} WHERE created_at >= :timestamp ORDER BY created_at DESC LIMIT {default_event_limit}"
             return await cls._execute_raw_sql_query(sql, {"timestamp": timestamp})
         else:
             # Use specified limit
-            sql = f"SELECT * FROM {cls._table_name} WHERE created_at >= :timestamp ORDER BY created_at DESC LIMIT :limit"
+            sql = f"SELECT {SELECT_COLUMNS} FROM {cls._table_name} WHERE created_at >= :timestamp ORDER BY created_at DESC LIMIT :limit"
             return await cls._execute_raw_sql_query(
                 sql, {"timestamp": timestamp, "limit": limit}
             )
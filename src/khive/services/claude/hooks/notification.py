@@ -4,12 +4,11 @@ Claude Code notification hook for observability.
 Called when Claude Code sends system notifications to monitor system events.
 """
 
-import json
-import sys
 from typing import Any
 
 import anyio
 
+from khive.services.claude.hooks.entry import HookResponse, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -72,29 +71,16 @@ def handle_notification(message: str, session_id: str | None = None) -> dict[str
         return {"error": str(e), "event_logged": False}
 
 
-def main():
-    """Main entry point for notification hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
-
-        # Extract notification message from hook input
-        message = hook_input.get("message", "")
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Notification hook output for one hook input."""
+    session_id = hook_input.get("session_id", None)
+    message = hook_input.get("message", "")
+    return HookResponse(handle_notification(message, session_id))
 
-        result = handle_notification(message, session_id)
 
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
-
-        sys.exit(0)
-
-    except Exception as e:
-        print(f"Error in notification hook: {e}", file=sys.stderr)
-        print(json.dumps({"error": str(e)}))
-        sys.exit(0)
+def main():
+    """Main entry point for notification hook."""
+    run_hook("notification", respond)
 
 
 if __name__ == "__main__":
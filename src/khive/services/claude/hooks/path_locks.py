@@ -0,0 +1,182 @@
+"""
+Path trie for file and directory locks.
+
+Locks are stored on the trie node for their normalized path. A directory
+lock covers everything below it; a file lock covers only its own path. A
+request conflicts with:
+
+- a lock held by another agent on the path itself,
+- a directory lock held by another agent on any ancestor, and
+- for a directory request, any lock held by another agent below it.
+
+Walking down to the requested path covers the first case. For the second,
+every node keeps ``held_below``, a count of locks under it per agent,
+updated along the path on each insert and removal. Both checks therefore
+take O(path depth), whatever the number of locks held; only reporting
+which lock blocks a directory request walks further, down one chain.
+
+Nodes that hold no lock and have nothing below them are pruned, so the
+trie only ever holds the paths leading to live locks.
+"""
+
+from __future__ import annotations
+
+from pathlib import PurePosixPath
+from typing import Any, Generic, Protocol, TypeVar
+
+
+class _Lock(Protocol):
+    agent_id: str
+    directory: bool
+
+
+L = TypeVar("L", bound=_Lock)
+
+
+def path_parts(path: str) -> tuple[str, ...]:
+    """Trie key of an already-normalized path: ``/a/b`` -> ``("/", "a", "b")``."""
+    return PurePosixPath(path).parts
+
+
+class _Node:
+    __slots__ = ("children", "lock", "held_below")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.lock = None
+        self.held_below: dict[str, int] = {}  # agent_id -> locks strictly below
+
+    def others_below(self, agent_id: str) -> bool:
+        held = self.held_below
+        return len(held) > 1 or (len(held) == 1 and agent_id not in held)
+
+
+class PathLockTree(Generic[L]):
+    """Locks by path, with ancestor/descendant conflict checks in O(depth)."""
+
+    def __init__(self):
+        self.root = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, path: str) -> L | None:
+        node = self.root
+        for part in path_parts(path):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node.lock
+
+    def conflict(
+        self, path: str, agent_id: str, directory: bool = False
+    ) -> tuple[str, L] | None:
+        """
+        The (path, lock) of another agent's lock covering `path`.
+
+        That is a lock on `path` itself or a directory lock above it, and
+        when `directory` is set, any lock below it as well.
+        """
+        parts = path_parts(path)
+        node, walked = self.root, []
+        for depth, part in enumerate(parts, 1):
+            node = node.children.get(part)
+            if node is None:
+                return None
+            walked.append(part)
+            lock = node.lock
+            if (
+                lock is not None
+                and lock.agent_id != agent_id
+                and (lock.directory or depth == len(parts))
+            ):
+                return str(PurePosixPath(*walked)), lock
+        if not directory or not node.others_below(agent_id):
+            return None
+        # Follow a chain that holds another agent's lock down to it
+        while True:
+            for part, child in node.children.items():
+                if child.lock is not None and child.lock.agent_id != agent_id:
+                    walked.append(part)
+                    return str(PurePosixPath(*walked)), child.lock
+                if child.others_below(agent_id):
+                    walked.append(part)
+                    node = child
+                    break
+            else:  # pragma: no cover - held_below says a lock is there
+                return None
+
+    def insert(self, path: str, lock: L) -> L | None:
+        """Set the lock at `path`, returning the one it replaced."""
+        parts = path_parts(path)
+        node, chain = self.root, []
+        for part in parts:
+            chain.append(node)
+            node = node.children.setdefault(part, _Node())
+        previous = node.lock
+        if previous is not None:
+            self._count_below(chain, previous.agent_id, -1)
+        else:
+            self._count += 1
+        node.lock = lock
+        self._count_below(chain, lock.agent_id, 1)
+        return previous
+
+    def remove(self, path: str) -> L | None:
+        """Drop the lock at `path` (if any) and prune emptied nodes."""
+        parts = path_parts(path)
+        node, chain = self.root, []
+        for part in parts:
+            chain.append(node)
+            node = node.children.get(part)
+            if node is None:
+                return None
+        lock = node.lock
+        if lock is None:
+            return None
+        node.lock = None
+        self._count -= 1
+        self._count_below(chain, lock.agent_id, -1)
+        for parent, part in zip(reversed(chain), reversed(parts)):
+            child = parent.children[part]
+            if child.lock is not None or child.children:
+                break
+            del parent.children[part]
+        return lock
+
+    @staticmethod
+    def _count_below(chain: list[_Node], agent_id: str, delta: int):
+        for ancestor in chain:
+            count = ancestor.held_below.get(agent_id, 0) + delta
+            if count:
+                ancestor.held_below[agent_id] = count
+            else:
+                del ancestor.held_below[agent_id]
+
+    def to_dict(self, describe) -> dict[str, Any]:
+        """
+        The trie as nested dicts, for display.
+
+        Chains of nodes without locks are collapsed into one entry, so the
+        output is proportional to the number of locks, not path depth.
+        `describe(lock)` renders each lock.
+        """
+
+        def render(name: str, node: _Node) -> dict[str, Any]:
+            while node.lock is None and len(node.children) == 1:
+                (part, node), = node.children.items()
+                name = str(PurePosixPath(name, part))
+            return {
+                "name": name,
+                "lock": describe(node.lock) if node.lock is not None else None,
+                "locks_below": sum(node.held_below.values()),
+                "children": [
+                    render(part, child) for part, child in sorted(node.children.items())
+                ],
+            }
+
+        return render("", self.root)
+
+
+__all__ = ("PathLockTree", "path_parts")
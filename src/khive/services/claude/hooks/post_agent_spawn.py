@@ -5,13 +5,12 @@ Called after Claude Code spawns Task agents to analyze task completion, share re
 and enable context inheritance for future agents.
 """
 
-import json
-import sys
 from typing import Any
 
 import anyio
 
 from khive.services.claude.hooks.coordination import get_registry, share_result
+from khive.services.claude.hooks.entry import HookResponse, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -173,29 +172,16 @@ def handle_post_agent_spawn(
         return {"error": str(e), "event_logged": False}
 
 
-def main():
-    """Main entry point for post-agent-spawn hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
-
-        # Extract output from hook input
-        tool_output = hook_input.get("tool_output", "")
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Post-agent-spawn hook output for one hook input."""
+    session_id = hook_input.get("session_id", None)
+    tool_output = hook_input.get("tool_output", "")
+    return HookResponse(handle_post_agent_spawn(tool_output, session_id))
 
-        result = handle_post_agent_spawn(tool_output, session_id)
 
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
-
-        sys.exit(0)
-
-    except Exception as e:
-        print(f"Error in post-agent-spawn hook: {e}", file=sys.stderr)
-        print(json.dumps({"error": str(e)}))
-        sys.exit(0)
+def main():
+    """Main entry point for post-agent-spawn hook."""
+    run_hook("post_agent_spawn", respond)
 
 
 if __name__ == "__main__":
@@ -6,11 +6,11 @@ Auto-detects running daemon and uses it when available for better performance.
 """
 
 import json
-import sys
 from typing import Any
 
 import anyio
 
+from khive.services.claude.hooks.entry import HookResponse, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -106,42 +106,30 @@ def handle_post_command(
     return result
 
 
-def main():
-    """Main entry point for post-command hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Post-command hook output for one hook input."""
+    session_id = hook_input.get("session_id", None)
 
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
+    # Extract command output from hook input
+    tool_input = hook_input.get("tool_input", {})
 
-        # Extract command output from hook input
-        tool_input = hook_input.get("tool_input", {})
-
-        # Claude sends tool_response for PostToolUse, fall back to tool_output for compatibility
-        tool_response = hook_input.get(
-            "tool_response", hook_input.get("tool_output", "")
-        )
-        if isinstance(tool_response, dict):
-            # If it's a dict, extract the output field or stringify it
-            tool_output = tool_response.get("output", json.dumps(tool_response))
-        else:
-            # It's already a string
-            tool_output = str(tool_response)
+    # Claude sends tool_response for PostToolUse, fall back to tool_output for compatibility
+    tool_response = hook_input.get("tool_response", hook_input.get("tool_output", ""))
+    if isinstance(tool_response, dict):
+        # If it's a dict, extract the output field or stringify it
+        tool_output = tool_response.get("output", json.dumps(tool_response))
+    else:
+        # It's already a string
+        tool_output = str(tool_response)
 
-        command = tool_input.get("command", "")
+    command = tool_input.get("command", "")
 
-        result = handle_post_command(tool_output, command, session_id)
+    return HookResponse(handle_post_command(tool_output, command, session_id))
 
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
 
-        sys.exit(0)
-
-    except Exception as e:
-        print(f"Error in post-command hook: {e}", file=sys.stderr)
-        print(json.dumps({"error": str(e)}))
-        sys.exit(0)
+def main():
+    """Main entry point for post-command hook."""
+    run_hook("post_command", respond)
 
 
 if __name__ == "__main__":
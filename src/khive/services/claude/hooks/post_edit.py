@@ -6,11 +6,11 @@ Requires daemon for coordination.
 """
 
 import json
-import sys
 from typing import Any
 
 import anyio
 
+from khive.services.claude.hooks.entry import HookResponse, hook_env, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -33,8 +33,14 @@ def handle_post_edit(
     output: str,
     tool_name: str = "Edit",
     session_id: str | None = None,
+    env_agent_id: str | None = None,
 ) -> dict[str, Any]:
-    """Handle post-edit hook event with coordination and persistence."""
+    """
+    Handle post-edit hook event with coordination and persistence.
+
+    `env_agent_id` is the hook process's CLAUDE_AGENT_ID, used when there
+    is no session.
+    """
 
     # Basic pattern analysis
     lines_changed = output.count("\n") if output else 0
@@ -71,8 +77,6 @@ def handle_post_edit(
             client = get_daemon_client()
             if client.is_running():
                 # Get agent ID from session mapping in coordination registry
-                import os
-
                 try:
                     registry = get_registry()
                     agent_id = (
@@ -85,14 +89,14 @@ def handle_post_edit(
                         agent_id = (
                             f"session_{session_id[:8]}"
                             if session_id
-                            else os.environ.get("CLAUDE_AGENT_ID", "agent_unknown")
+                            else env_agent_id or "agent_unknown"
                         )
                 except Exception:
                     # Fallback if registry not available
                     agent_id = (
                         f"session_{session_id[:8]}"
                         if session_id
-                        else os.environ.get("CLAUDE_AGENT_ID", "agent_unknown")
+                        else env_agent_id or "agent_unknown"
                     )
 
                 # Release file locks for all edited files
@@ -128,52 +132,45 @@ def handle_post_edit(
     return result
 
 
-def main():
-    """Main entry point for post-edit hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
-
-        # Extract tool information from hook input
-        tool_input = hook_input.get("tool_input", {})
-        tool_name = hook_input.get("tool_name", "Edit")
-
-        # Claude sends tool_response (object) for PostToolUse, fall back to tool_output for compatibility
-        tool_response = hook_input.get(
-            "tool_response", hook_input.get("tool_output", {})
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Post-edit hook output for one hook input."""
+    session_id = hook_input.get("session_id", None)
+
+    # Extract tool information from hook input
+    tool_input = hook_input.get("tool_input", {})
+    tool_name = hook_input.get("tool_name", "Edit")
+
+    # Claude sends tool_response (object) for PostToolUse, fall back to tool_output for compatibility
+    tool_response = hook_input.get("tool_response", hook_input.get("tool_output", {}))
+    if isinstance(tool_response, dict):
+        tool_output = json.dumps(tool_response)
+    else:
+        # Legacy string output
+        tool_output = str(tool_response)
+
+    # Extract file paths from tool input
+    file_paths = []
+    if "file_path" in tool_input:
+        file_paths = [tool_input["file_path"]]
+    elif "file_paths" in tool_input:
+        file_paths = tool_input["file_paths"]
+    elif "edits" in tool_input:  # MultiEdit tool
+        file_paths = [tool_input.get("file_path", "")]
+
+    return HookResponse(
+        handle_post_edit(
+            file_paths,
+            tool_output,
+            tool_name,
+            session_id,
+            hook_env(hook_input, "CLAUDE_AGENT_ID"),
         )
-        if isinstance(tool_response, dict):
-            # Extract success status and any error messages
-            tool_output = json.dumps(tool_response)
-            success = tool_response.get("success", True)
-        else:
-            # Legacy string output
-            tool_output = str(tool_response)
-            success = True
-
-        # Extract file paths from tool input
-        file_paths = []
-        if "file_path" in tool_input:
-            file_paths = [tool_input["file_path"]]
-        elif "file_paths" in tool_input:
-            file_paths = tool_input["file_paths"]
-        elif "edits" in tool_input:  # MultiEdit tool
-            file_paths = [tool_input.get("file_path", "")]
-
-        result = handle_post_edit(file_paths, tool_output, tool_name, session_id)
-
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
-
-        sys.exit(0)
+    )
 
-    except Exception as e:
-        print(f"Error in post-edit hook: {e}", file=sys.stderr)
-        print(json.dumps({"error": str(e)}))
-        sys.exit(0)
+
+def main():
+    """Main entry point for post-edit hook."""
+    run_hook("post_edit", respond)
 
 
 if __name__ == "__main__":
@@ -5,13 +5,12 @@ Called before Claude Code spawns Task agents to monitor task coordination patter
 and enable intelligent task deduplication and context sharing.
 """
 
-import json
-import sys
 from typing import Any
 
 import anyio
 
 from khive.services.claude.hooks.coordination import check_duplicate_work
+from khive.services.claude.hooks.entry import HookResponse, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -135,40 +134,28 @@ def handle_pre_agent_spawn(
         }
 
 
-def main():
-    """Main entry point for pre-agent-spawn hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Pre-agent-spawn hook output for one hook input (exit 2 blocks)."""
+    session_id = hook_input.get("session_id", None)
 
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
-
-        # Extract task description from tool input
-        tool_input = hook_input.get("tool_input", {})
-        task_description = tool_input.get("prompt", "") or tool_input.get(
-            "description", ""
-        )
+    # Extract task description from tool input
+    tool_input = hook_input.get("tool_input", {})
+    task_description = tool_input.get("prompt", "") or tool_input.get(
+        "description", ""
+    )
 
-        result = handle_pre_agent_spawn(task_description, session_id)
+    result = handle_pre_agent_spawn(task_description, session_id)
 
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
+    if not result.get("proceed", True):
+        # Reason goes to stderr for Claude to see; exit code 2 blocks the tool
+        reason = result.get("coordination_message", "Duplicate task detected")
+        return HookResponse(result, 2, reason)
+    return HookResponse(result)
 
-        # Exit with 0 for proceed, 2 for block (exit code 2 blocks tool execution)
-        if not result.get("proceed", True):
-            # Output reason to stderr for Claude to see
-            reason = result.get("coordination_message", "Duplicate task detected")
-            print(reason, file=sys.stderr)
-            sys.exit(2)  # EXIT CODE 2 TO BLOCK!
 
-        sys.exit(0)
-
-    except Exception as e:
-        print(f"Error in pre-agent-spawn hook: {e}", file=sys.stderr)
-        # Default to proceed on error
-        print(json.dumps({"proceed": True, "error": str(e)}))
-        sys.exit(0)
+def main():
+    """Main entry point for pre-agent-spawn hook."""
+    run_hook("pre_agent_spawn", respond)
 
 
 if __name__ == "__main__":
@@ -5,12 +5,11 @@ Called before Claude Code executes bash commands to log and analyze command patt
 Auto-detects running daemon and uses it when available for better performance.
 """
 
-import json
-import sys
 from typing import Any
 
 import anyio
 
+from khive.services.claude.hooks.entry import HookResponse, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -97,32 +96,21 @@ def handle_pre_command(command: str, session_id: str | None = None) -> dict[str,
     return result
 
 
-def main():
-    """Main entry point for pre-command hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Pre-command hook output for one hook input (exit 1 blocks)."""
+    session_id = hook_input.get("session_id", None)
 
-        # Extract command from tool input
-        tool_input = hook_input.get("tool_input", {})
-        command = tool_input.get("command", "")
+    # Extract command from tool input
+    tool_input = hook_input.get("tool_input", {})
+    command = tool_input.get("command", "")
 
-        result = handle_pre_command(command, session_id)
+    result = handle_pre_command(command, session_id)
+    return HookResponse(result, 0 if result.get("proceed", True) else 1)
 
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
 
-        # Exit with 0 for proceed, 1 for block
-        sys.exit(0 if result.get("proceed", True) else 1)
-
-    except Exception as e:
-        print(f"Error in pre-command hook: {e}", file=sys.stderr)
-        # Default to proceed on error
-        print(json.dumps({"proceed": True, "error": str(e)}))
-        sys.exit(0)
+def main():
+    """Main entry point for pre-command hook."""
+    run_hook("pre_command", respond)
 
 
 if __name__ == "__main__":
@@ -5,19 +5,27 @@ This hook actually works with Claude Code to prevent multiple agents
 from editing the same file simultaneously.
 """
 
-import json
-import os
-import sys
 from typing import Any
 
 from khive.daemon.client import get_daemon_client
 from khive.services.claude.hooks.coordination import get_registry
+from khive.services.claude.hooks.entry import HookResponse, hook_env, run_hook
 
 
 def handle_pre_edit(
-    file_paths: list[str], tool_name: str, session_id: str | None = None
+    file_paths: list[str],
+    tool_name: str,
+    session_id: str | None = None,
+    env_agent_id: str | None = None,
+    notes: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Check if files can be edited - PREVENTS CONFLICTS."""
+    """
+    Check if files can be edited - PREVENTS CONFLICTS.
+
+    `env_agent_id` is the hook process's CLAUDE_AGENT_ID, used when there
+    is no session. Diagnostics for Claude are appended to `notes`.
+    """
+    notes = [] if notes is None else notes
 
     # Get agent ID from session mapping in coordination registry
     try:
@@ -43,24 +51,21 @@ def handle_pre_edit(
                 # Map to the most recently registered unmapped agent
                 agent_id = unmapped_agents[-1]  # Last registered
                 registry.register_session_mapping(session_id, agent_id)
-                print(
-                    f"🔗 Auto-mapped session {session_id[:8]}... to {agent_id}",
-                    file=sys.stderr,
-                )
+                notes.append(f"🔗 Auto-mapped session {session_id[:8]}... to {agent_id}")
 
         if not agent_id:
             # Fallback to session-based ID if no mapping exists
             agent_id = (
                 f"session_{session_id[:8]}"
                 if session_id
-                else os.environ.get("CLAUDE_AGENT_ID", "agent_unknown")
+                else env_agent_id or "agent_unknown"
             )
     except Exception:
         # Fallback if registry not available
         agent_id = (
             f"session_{session_id[:8]}"
             if session_id
-            else os.environ.get("CLAUDE_AGENT_ID", "agent_unknown")
+            else env_agent_id or "agent_unknown"
         )
 
     # Check daemon for file locks
@@ -94,16 +99,12 @@ def handle_pre_edit(
                     )
                 elif response.status_code != 200:
                     # Other error - log but don't block
-                    print(
-                        f"Warning: File lock check failed for {file_path}: {response.status_code}",
-                        file=sys.stderr,
+                    notes.append(
+                        f"Warning: File lock check failed for {file_path}: {response.status_code}"
                     )
 
             except Exception as e:
-                print(
-                    f"Warning: Could not check file lock for {file_path}: {e}",
-                    file=sys.stderr,
-                )
+                notes.append(f"Warning: Could not check file lock for {file_path}: {e}")
 
         if blocked_files:
             # Some files are locked - block the edit
@@ -130,59 +131,47 @@ def handle_pre_edit(
         }
 
 
-def main():
-    """Main entry point for pre-edit hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
-
-        # Extract tool information from hook input
-        tool_input = hook_input.get("tool_input", {})
-        tool_name = hook_input.get("tool_name", "unknown")
-
-        # Extract file paths from tool input
-        file_paths = []
-        if "file_path" in tool_input:
-            file_paths = [tool_input["file_path"]]
-        elif "file_paths" in tool_input:
-            file_paths = tool_input["file_paths"]
-        elif "edits" in tool_input:  # MultiEdit tool
-            file_paths = [tool_input.get("file_path", "")]
-
-        result = handle_pre_edit(file_paths, tool_name, session_id)
-
-        if not result.get("proceed", True):
-            # Block the edit - output reason to stderr and exit with code 2
-            reason = result.get("message", "File locked by another agent")
-            print(reason, file=sys.stderr)
-
-            # Optional: structured JSON output for Claude
-            print(
-                json.dumps(
-                    {
-                        "hookSpecificOutput": {
-                            "hookEventName": "PreToolUse",
-                            "permissionDecision": "deny",
-                            "permissionDecisionReason": reason,
-                            "blocked_files": result.get("blocked_files", []),
-                        }
-                    }
-                )
-            )
-            sys.exit(2)  # EXIT CODE 2 TO BLOCK!
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Pre-edit hook output for one hook input (exit 2 blocks the edit)."""
+    session_id = hook_input.get("session_id", None)
+
+    # Extract tool information from hook input
+    tool_input = hook_input.get("tool_input", {})
+    tool_name = hook_input.get("tool_name", "unknown")
+
+    # Extract file paths from tool input
+    file_paths = []
+    if "file_path" in tool_input:
+        file_paths = [tool_input["file_path"]]
+    elif "file_paths" in tool_input:
+        file_paths = tool_input["file_paths"]
+    elif "edits" in tool_input:  # MultiEdit tool
+        file_paths = [tool_input.get("file_path", "")]
+
+    notes: list[str] = []
+    result = handle_pre_edit(
+        file_paths, tool_name, session_id, hook_env(hook_input, "CLAUDE_AGENT_ID"), notes
+    )
+
+    if not result.get("proceed", True):
+        # Block the edit - reason to stderr, structured decision for Claude
+        reason = result.get("message", "File locked by another agent")
+        output = {
+            "hookSpecificOutput": {
+                "hookEventName": "PreToolUse",
+                "permissionDecision": "deny",
+                "permissionDecisionReason": reason,
+                "blocked_files": result.get("blocked_files", []),
+            }
+        }
+        return HookResponse(output, 2, "\n".join([*notes, reason]))  # EXIT CODE 2 TO BLOCK!
 
-        # Proceed - output success and exit 0
-        print(json.dumps(result))
-        sys.exit(0)
+    return HookResponse(result, 0, "\n".join(notes) or None)
 
-    except Exception as e:
-        print(f"Error in pre-edit hook: {e}", file=sys.stderr)
-        # Default to proceed on error (don't block on failures)
-        print(json.dumps({"proceed": True, "error": str(e)}))
-        sys.exit(0)
+
+def main():
+    """Main entry point for pre-edit hook."""
+    run_hook("pre_edit", respond)
 
 
 if __name__ == "__main__":
@@ -5,8 +5,6 @@ Called when user submits prompts to Claude Code to monitor interaction patterns
 and provide coordination insights.
 """
 
-import json
-import sys
 from typing import Any
 
 import anyio
@@ -15,6 +13,7 @@ from khive.services.claude.hooks.coordination import (
     get_coordination_insights,
     get_registry,
 )
+from khive.services.claude.hooks.entry import HookResponse, run_hook
 from khive.services.claude.hooks.hook_event import (
     HookEvent,
     HookEventContent,
@@ -107,29 +106,16 @@ def handle_prompt_submitted(
         return {"error": str(e), "event_logged": False}
 
 
-def main():
-    """Main entry point for prompt submission hook."""
-    try:
-        # Read JSON input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Extract session information
-        session_id = hook_input.get("session_id", None)
-
-        # Extract prompt from hook input
-        prompt = hook_input.get("prompt", "")
+def respond(hook_input: dict[str, Any]) -> HookResponse:
+    """Prompt submission hook output for one hook input."""
+    session_id = hook_input.get("session_id", None)
+    prompt = hook_input.get("prompt", "")
+    return HookResponse(handle_prompt_submitted(prompt, session_id))
 
-        result = handle_prompt_submitted(prompt, session_id)
 
-        # Always output JSON for Claude Code
-        print(json.dumps(result))
-
-        sys.exit(0)
-
-    except Exception as e:
-        print(f"Error in prompt submission hook: {e}", file=sys.stderr)
-        print(json.dumps({"error": str(e)}))
-        sys.exit(0)
+def main():
+    """Main entry point for prompt submission hook."""
+    run_hook("prompt_submitted", respond)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+"""
+Streaming reads of the hook events table.
+
+`HookEvent.get_recent` and friends build every matching row into a lionagi
+Node in one list. This module pages through the table instead, with keyset
+pagination on ``(created_at, id)``:
+
+    WHERE (created_at, id) > (:after_created_at, :after_id)
+    ORDER BY created_at, id LIMIT :limit
+
+Each page is one short query served by ``idx_hook_events_created_id``, so
+page N costs the same as page 1 (unlike OFFSET) and no read transaction
+stays open between pages to hold back WAL checkpoints. Rows come back as
+`EventRecord`, a ``__slots__`` object with the parsed columns; only one page
+is alive at a time, so iterating any number of events takes constant
+memory.
+
+Stdlib only, like `schema`, so exporters can use it without lionagi.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from khive.services.claude.hooks.schema import INDEXED_FIELDS, SELECT_COLUMNS, TABLE
+
+BATCH_SIZE = 1000
+CURSOR_SEPARATOR = "|"
+
+Cursor = tuple[str, str]  # (created_at, id) of the last event seen
+
+
+class EventRecord:
+    """One hook event row, parsed but not validated into a HookEvent."""
+
+    __slots__ = ("id", "content", "node_metadata", "created_at", "embedding")
+
+    def __init__(
+        self,
+        id: str,
+        content: dict[str, Any],
+        node_metadata: dict[str, Any],
+        created_at: str,
+        embedding: list[float] | None = None,
+    ):
+        self.id = id
+        self.content = content
+        self.node_metadata = node_metadata
+        self.created_at = created_at
+        self.embedding = embedding
+
+    @classmethod
+    def from_row(cls, row: tuple) -> EventRecord:
+        """From a ``SELECT {SELECT_COLUMNS}`` row."""
+        id, content, node_metadata, created_at, embedding = row
+        return cls(
+            id,
+            json.loads(content) if content else {},
+            json.loads(node_metadata) if node_metadata else {},
+            created_at,
+            json.loads(embedding) if embedding else None,
+        )
+
+    @property
+    def cursor(self) -> Cursor:
+        """Resume point: iteration continues after this event."""
+        return (self.created_at, self.id)
+
+    @property
+    def created_datetime(self) -> datetime:
+        return datetime.fromisoformat(self.created_at)
+
+    def to_dict(self) -> dict[str, Any]:
+        """lionagi's db layout, as stored and spooled."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        event_type = self.content.get("event_type")
+        return f"EventRecord(id={self.id!r}, event_type={event_type!r}, created_at={self.created_at!r})"
+
+
+def format_cursor(cursor: Cursor) -> str:
+    """Cursor as an opaque string for URLs and the CLI."""
+    return CURSOR_SEPARATOR.join(cursor)
+
+
+def parse_cursor(token: str) -> Cursor:
+    created_at, sep, event_id = token.partition(CURSOR_SEPARATOR)
+    if not sep or not created_at or not event_id:
+        raise ValueError(f"Invalid event cursor: {token!r}")
+    return (created_at, event_id)
+
+
+def connect_reader(db_path: str | Path) -> sqlite3.Connection:
+    """Read-only connection, usable from whichever worker thread runs a page."""
+    conn = sqlite3.connect(
+        f"file:{Path(db_path)}?mode=ro", uri=True, check_same_thread=False
+    )
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
+def check_filters(filters: dict[str, Any]):
+    """Reject filters other than the indexed content fields."""
+    if unknown := set(filters) - set(INDEXED_FIELDS):
+        raise ValueError(f"Unknown event filters: {sorted(unknown)}")
+
+
+def fetch_page(
+    conn: sqlite3.Connection,
+    after: Cursor | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    batch_size: int = BATCH_SIZE,
+    table: str = TABLE,
+    **filters: str,
+) -> list[EventRecord]:
+    """
+    Up to `batch_size` events in (created_at, id) order.
+
+    `after` is exclusive and takes over from `since` (inclusive) once
+    iteration has started; `until` is exclusive. `filters` match the
+    indexed content fields (event_type, session_id, tool_name).
+    """
+    check_filters(filters)
+    where, params = [], {"limit": batch_size}
+    if after is not None:
+        where.append("(created_at, id) > (:after_created_at, :after_id)")
+        params["after_created_at"], params["after_id"] = after
+    elif since is not None:
+        where.append("created_at >= :since")
+        params["since"] = since
+    if until is not None:
+        where.append("created_at < :until")
+        params["until"] = until
+    for name, value in filters.items():
+        where.append(f"{name} = :{name}")
+        params[name] = value
+
+    sql = f"SELECT {SELECT_COLUMNS} FROM {table}"
+    if where:
+        sql += f" WHERE {' AND '.join(where)}"
+    sql += " ORDER BY created_at, id LIMIT :limit"
+    return [EventRecord.from_row(row) for row in conn.execute(sql, params)]
+
+
+def iter_pages(
+    conn: sqlite3.Connection,
+    after: Cursor | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    batch_size: int = BATCH_SIZE,
+    table: str = TABLE,
+    **filters: str,
+) -> Iterator[list[EventRecord]]:
+    """`fetch_page` repeatedly, each page resuming after the last one."""
+    while True:
+        page = fetch_page(conn, after, since, until, batch_size, table, **filters)
+        if page:
+            yield page
+        if len(page) < batch_size:
+            return
+        after = page[-1].cursor
+
+
+def iter_records(
+    conn: sqlite3.Connection,
+    after: Cursor | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    batch_size: int = BATCH_SIZE,
+    table: str = TABLE,
+    **filters: str,
+) -> Iterator[EventRecord]:
+    """Every matching event, one page in memory at a time."""
+    for page in iter_pages(conn, after, since, until, batch_size, table, **filters):
+        yield from page
+
+
+__all__ = (
+    "BATCH_SIZE",
+    "Cursor",
+    "EventRecord",
+    "check_filters",
+    "connect_reader",
+    "fetch_page",
+    "format_cursor",
+    "iter_pages",
+    "iter_records",
+    "parse_cursor",
+)
@@ -0,0 +1,333 @@
+"""
+Retention for the hook events database: rollup, purge, compaction.
+
+Raw hook events are only interesting in detail for a while. This module
+keeps ``claude_hooks.db`` bounded:
+
+1. **Rollup** - raw events are folded into ``hook_events_hourly``: counts
+   per (hour, event_type, session, tool) plus duration stats taken from
+   ``content.metadata.duration_ms`` when hooks report it. Each raw row is
+   flagged ``rolled_up`` in the same transaction that adds it to the
+   aggregate, so rows arriving late (e.g. from the offline spool) are
+   counted exactly once.
+2. **Purge** - rolled-up rows older than ``max_age_days`` are deleted,
+   optionally archived first as gzipped NDJSON.
+3. **Compaction** - once a day, inside the off-peak window, free pages are
+   returned to the filesystem with ``incremental_vacuum`` (converting the
+   database to ``auto_vacuum=INCREMENTAL`` with one full ``VACUUM`` the
+   first time).
+
+Rollup and purge work in bounded batches, each its own short transaction,
+so the daemon's writer can interleave hook event inserts between them.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from khive.services.claude.hooks.schema import COLUMNS, SELECT_COLUMNS, TABLE
+
+BATCH_SIZE = 5000  # rows per rollup/purge transaction
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+ROLLUP_SQL = """
+INSERT INTO {table}_hourly AS h (
+    hour, event_type, session_id, tool_name, count,
+    duration_count, duration_sum_ms, duration_min_ms, duration_max_ms
+)
+SELECT
+    strftime('%Y-%m-%d %H:00:00', created_at),
+    COALESCE(event_type, ''),
+    COALESCE(session_id, ''),
+    COALESCE(tool_name, ''),
+    COUNT(*),
+    COUNT(duration),
+    COALESCE(SUM(duration), 0),
+    MIN(duration),
+    MAX(duration)
+FROM (
+    SELECT created_at, event_type, session_id, tool_name,
+           json_extract(content, '$.metadata.duration_ms') AS duration
+    FROM {table} WHERE rowid IN (SELECT rid FROM temp.retention_batch)
+)
+WHERE true
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (hour, event_type, session_id, tool_name) DO UPDATE SET
+    count = h.count + excluded.count,
+    duration_count = h.duration_count + excluded.duration_count,
+    duration_sum_ms = h.duration_sum_ms + excluded.duration_sum_ms,
+    duration_min_ms = COALESCE(
+        MIN(h.duration_min_ms, excluded.duration_min_ms),
+        h.duration_min_ms, excluded.duration_min_ms
+    ),
+    duration_max_ms = COALESCE(
+        MAX(h.duration_max_ms, excluded.duration_max_ms),
+        h.duration_max_ms, excluded.duration_max_ms
+    )
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+@dataclass
+class RetentionPolicy:
+    """How long raw events live and when maintenance may run."""
+
+    max_age_days: float = 30.0
+    batch_size: int = BATCH_SIZE
+    archive_dir: Path | None = None  # gzipped NDJSON of purged rows
+    off_peak_hours: tuple[int, int] = (2, 5)  # local [start, end) for VACUUM
+    interval_seconds: float = 3600.0
+    vacuum_pages: int = 0  # pages per incremental_vacuum; 0 frees all
+
+    @classmethod
+    def from_env(cls) -> RetentionPolicy:
+        """Policy from KHIVE_HOOK_RETENTION_DAYS / _ARCHIVE / _OFFPEAK ("2-5")."""
+        policy = cls(max_age_days=_env_float("KHIVE_HOOK_RETENTION_DAYS", 30.0))
+        if archive := os.getenv("KHIVE_HOOK_RETENTION_ARCHIVE"):
+            policy.archive_dir = Path(archive).expanduser()
+        if off_peak := os.getenv("KHIVE_HOOK_RETENTION_OFFPEAK"):
+            try:
+                start, end = (int(h) % 24 for h in off_peak.split("-", 1))
+                policy.off_peak_hours = (start, end)
+            except ValueError:
+                pass
+        return policy
+
+    def in_off_peak(self, now: datetime | None = None) -> bool:
+        hour = (now or datetime.now()).hour
+        start, end = self.off_peak_hours
+        return start <= hour < end if start <= end else hour >= start or hour < end
+
+    def cutoff(self, now: datetime | None = None) -> str:
+        """created_at strings below this are past their retention age."""
+        now = now or datetime.now(timezone.utc)
+        return (now - timedelta(days=self.max_age_days)).strftime(TIME_FORMAT)
+
+
+def _select_batch(conn: sqlite3.Connection, where: str, params: dict, table: str) -> int:
+    conn.execute("DROP TABLE IF EXISTS temp.retention_batch")
+    conn.execute(
+        f"CREATE TEMP TABLE retention_batch AS SELECT rowid AS rid FROM {table} "
+        f"WHERE {where} LIMIT :limit",
+        params,
+    )
+    return conn.execute("SELECT COUNT(*) FROM temp.retention_batch").fetchone()[0]
+
+
+def rollup_batch(
+    conn: sqlite3.Connection, batch_size: int = BATCH_SIZE, table: str = TABLE
+) -> int:
+    """Fold up to `batch_size` pending raw events into the hourly table."""
+    conn.execute("BEGIN IMMEDIATE")  # Select and flag under one write lock
+    with conn:
+        rows = _select_batch(conn, "rolled_up = 0", {"limit": batch_size}, table)
+        if rows:
+            conn.execute(ROLLUP_SQL.format(table=table))
+            conn.execute(
+                f"UPDATE {table} SET rolled_up = 1 "
+                "WHERE rowid IN (SELECT rid FROM temp.retention_batch)"
+            )
+        conn.execute("DROP TABLE temp.retention_batch")
+    return rows
+
+
+def purge_batch(
+    conn: sqlite3.Connection,
+    cutoff: str,
+    batch_size: int = BATCH_SIZE,
+    archive_dir: Path | None = None,
+    table: str = TABLE,
+) -> int:
+    """Delete (after archiving) up to `batch_size` rolled-up rows older than `cutoff`."""
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        rows = _select_batch(
+            conn,
+            "rolled_up = 1 AND created_at < :cutoff",
+            {"cutoff": cutoff, "limit": batch_size},
+            table,
+        )
+        if rows and archive_dir is not None:
+            _archive(conn, archive_dir, table)
+        if rows:
+            conn.execute(
+                f"DELETE FROM {table} WHERE rowid IN (SELECT rid FROM temp.retention_batch)"
+            )
+        conn.execute("DROP TABLE temp.retention_batch")
+    return rows
+
+
+def _archive(conn: sqlite3.Connection, archive_dir: Path, table: str):
+    """Append the batch as NDJSON lines in the spool's record format."""
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{table}-{datetime.now(timezone.utc):%Y%m%d}.ndjson.gz"
+    cursor = conn.execute(
+        f"SELECT {SELECT_COLUMNS} FROM {table} "
+        "WHERE rowid IN (SELECT rid FROM temp.retention_batch)"
+    )
+    # Appending makes a multi-member gzip file, which gzip readers concatenate
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for row in cursor:
+            record = dict(zip(COLUMNS, row))
+            for key in ("content", "node_metadata", "embedding"):
+                if record[key] is not None:
+                    record[key] = json.loads(record[key])
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def compact(conn: sqlite3.Connection, pages: int = 0) -> dict[str, Any]:
+    """Return free pages to the filesystem and truncate the WAL."""
+    started = time.perf_counter()
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode != 2:  # Not INCREMENTAL yet: switching needs one full VACUUM
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        method = "vacuum"
+    else:
+        # One result row per freed page; it only runs as far as it is stepped
+        conn.execute(
+            f"PRAGMA incremental_vacuum({pages})" if pages else "PRAGMA incremental_vacuum"
+        ).fetchall()
+        method = "incremental_vacuum"
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return {
+        "method": method,
+        "freed_pages": before - conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def query_rollups(
+    conn: sqlite3.Connection,
+    since: str | None = None,
+    until: str | None = None,
+    group_by: tuple[str, ...] = ("event_type",),
+    table: str = TABLE,
+    **filters: str,
+) -> list[dict[str, Any]]:
+    """Hourly aggregates, summed over the dimensions not in `group_by`."""
+    dimensions = ("event_type", "session_id", "tool_name")
+    if unknown := set(group_by) - set(dimensions):
+        raise ValueError(f"Unknown rollup dimensions: {sorted(unknown)}")
+    if unknown := set(filters) - set(dimensions):
+        raise ValueError(f"Unknown rollup filters: {sorted(unknown)}")
+
+    where, params = ["1 = 1"], {}
+    if since:
+        where.append("hour >= :since")
+        params["since"] = since
+    if until:
+        where.append("hour < :until")
+        params["until"] = until
+    for name, value in filters.items():
+        where.append(f"{name} = :{name}")
+        params[name] = value
+
+    keys = ("hour", *group_by)
+    cursor = conn.execute(
+        f"SELECT {', '.join(keys)}, SUM(count), SUM(duration_count), "
+        "SUM(duration_sum_ms), MIN(duration_min_ms), MAX(duration_max_ms) "
+        f"FROM {table}_hourly WHERE {' AND '.join(where)} "
+        f"GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}",
+        params,
+    )
+    results = []
+    for row in cursor:
+        record = dict(zip(keys, row))
+        count, d_count, d_sum, d_min, d_max = row[len(keys) :]
+        record.update(
+            count=count,
+            duration_avg_ms=round(d_sum / d_count, 3) if d_count else None,
+            duration_min_ms=d_min,
+            duration_max_ms=d_max,
+        )
+        results.append(record)
+    return results
+
+
+ConnectionRunner = Callable[[Callable[[sqlite3.Connection], Any]], Awaitable[Any]]
+
+
+@dataclass
+class HookEventRetention:
+    """Runs retention passes and remembers what they did."""
+
+    policy: RetentionPolicy = field(default_factory=RetentionPolicy)
+    table: str = TABLE
+    last_run: float | None = None
+    last_compacted: str | None = None  # local date of the last compaction
+    totals: dict[str, int] = field(
+        default_factory=lambda: {"rolled_up": 0, "purged": 0, "compactions": 0}
+    )
+    last_compaction: dict[str, Any] | None = None
+
+    async def run_once(
+        self, run: ConnectionRunner, now: datetime | None = None
+    ) -> dict[str, Any]:
+        """
+        One pass: rollup, purge, and compaction when due.
+
+        `run(func)` must call ``func(conn)`` on the database's writer
+        connection (e.g. `HookEventIngestor.run_on_connection`). Each batch
+        is a separate call, so other writes interleave between batches.
+        """
+        policy = self.policy
+        result = {"rolled_up": 0, "purged": 0, "compaction": None}
+
+        while rows := await run(lambda c: rollup_batch(c, policy.batch_size, self.table)):
+            result["rolled_up"] += rows
+
+        cutoff = policy.cutoff(now.astimezone(timezone.utc) if now else None)
+        while rows := await run(
+            lambda c: purge_batch(c, cutoff, policy.batch_size, policy.archive_dir, self.table)
+        ):
+            result["purged"] += rows
+
+        local_now = now or datetime.now()
+        today = local_now.date().isoformat()
+        if policy.in_off_peak(local_now) and self.last_compacted != today:
+            result["compaction"] = await run(lambda c: compact(c, policy.vacuum_pages))
+            self.last_compacted = today
+            self.last_compaction = result["compaction"]
+            self.totals["compactions"] += 1
+
+        self.totals["rolled_up"] += result["rolled_up"]
+        self.totals["purged"] += result["purged"]
+        self.last_run = time.time()
+        return result
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "max_age_days": self.policy.max_age_days,
+            "archive_dir": str(self.policy.archive_dir) if self.policy.archive_dir else None,
+            "off_peak_hours": list(self.policy.off_peak_hours),
+            "last_run": self.last_run,
+            "last_compaction": self.last_compaction,
+            **self.totals,
+        }
+
+
+__all__ = (
+    "HookEventRetention",
+    "RetentionPolicy",
+    "compact",
+    "purge_batch",
+    "query_rollups",
+    "rollup_batch",
+)
@@ -0,0 +1,144 @@
+"""
+Schema and migrations for the hook events table.
+
+The table keeps lionagi's node layout (id, content JSON, node_metadata JSON,
+created_at, embedding) so the lionagi adapter and the daemon's batched
+writer can share it. Filters on fields inside `content` used to run
+``json_extract`` over every row; migration 1 exposes those fields as
+virtual generated columns and indexes them together with `created_at`, so
+"latest events of a type/session/tool" queries are index range scans and
+no writer has to change. Migration 2 adds the hourly rollup table that
+retention (see `retention`) folds raw events into; migration 3 indexes
+``(created_at, id)`` for keyset pagination (see `reader`).
+
+Versions are tracked with ``PRAGMA user_version``. Only the stdlib is
+used, so the hook spool importer and the daemon can run migrations
+without importing lionagi.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+TABLE = "hook_events"
+COLUMNS = ("id", "content", "node_metadata", "created_at", "embedding")
+# Explicit list: SELECT * would also return the generated columns, which
+# lionagi's Node.from_dict rejects as unknown fields
+SELECT_COLUMNS = ", ".join(COLUMNS)
+
+# Same schema the lionagi adapter creates, so both writers share the table
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id VARCHAR NOT NULL,
+    content JSON,
+    node_metadata JSON,
+    created_at DATETIME,
+    embedding JSON,
+    PRIMARY KEY (id)
+)
+"""
+INSERT_SQL = (
+    "INSERT OR IGNORE INTO {table} "
+    f"({SELECT_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Fields of `content` promoted to indexed columns
+INDEXED_FIELDS = ("event_type", "session_id", "tool_name")
+
+MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    # 1: generated lookup columns and composite (field, created_at) indexes
+    (
+        *(
+            f"ALTER TABLE {{table}} ADD COLUMN {field} TEXT "
+            f"GENERATED ALWAYS AS (json_extract(content, '$.{field}')) VIRTUAL"
+            for field in INDEXED_FIELDS
+        ),
+        *(
+            f"CREATE INDEX IF NOT EXISTS idx_{{table}}_{field}_created "
+            f"ON {{table}} ({field}, created_at)"
+            for field in INDEXED_FIELDS
+        ),
+        "CREATE INDEX IF NOT EXISTS idx_{table}_created ON {table} (created_at)",
+    ),
+    # 2: hourly rollups for retention; raw rows are flagged once counted
+    (
+        "ALTER TABLE {table} ADD COLUMN rolled_up INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_{table}_pending_rollup "
+        "ON {table} (created_at) WHERE rolled_up = 0",
+        """
+        CREATE TABLE IF NOT EXISTS {table}_hourly (
+            hour TEXT NOT NULL,
+            event_type TEXT NOT NULL DEFAULT '',
+            session_id TEXT NOT NULL DEFAULT '',
+            tool_name TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL,
+            duration_count INTEGER NOT NULL DEFAULT 0,
+            duration_sum_ms REAL NOT NULL DEFAULT 0,
+            duration_min_ms REAL,
+            duration_max_ms REAL,
+            PRIMARY KEY (hour, event_type, session_id, tool_name)
+        )
+        """,
+    ),
+    # 3: (created_at, id) keyset pagination; supersedes the created_at index
+    (
+        "CREATE INDEX IF NOT EXISTS idx_{table}_created_id ON {table} (created_at, id)",
+        "DROP INDEX IF EXISTS idx_{table}_created",
+    ),
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, table: str = TABLE) -> int:
+    """
+    Create the table if needed and apply pending migrations.
+
+    Each migration runs in its own IMMEDIATE transaction, so concurrent
+    callers (daemon, CLI) serialize and apply it exactly once. Returns the
+    resulting schema version.
+    """
+    conn.execute(CREATE_TABLE_SQL.format(table=table))
+    conn.commit()
+    version = schema_version(conn)
+    while version < SCHEMA_VERSION:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = schema_version(conn)  # Another process may have won
+            if version < SCHEMA_VERSION:
+                for statement in MIGRATIONS[version]:
+                    conn.execute(statement.format(table=table))
+                version += 1
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return version
+
+
+def migrate_path(db_path: str, table: str = TABLE) -> int:
+    """`migrate` on a short-lived connection to the database at `db_path`."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return migrate(conn, table)
+    finally:
+        conn.close()
+
+
+__all__ = (
+    "COLUMNS",
+    "CREATE_TABLE_SQL",
+    "INDEXED_FIELDS",
+    "INSERT_SQL",
+    "SCHEMA_VERSION",
+    "SELECT_COLUMNS",
+    "TABLE",
+    "migrate",
+    "migrate_path",
+    "schema_version",
+)
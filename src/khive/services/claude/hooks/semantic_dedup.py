@@ -2,362 +2,378 @@
 Semantic deduplication for intelligent task matching.
 
 Uses embedding-based similarity to detect semantically similar tasks
-even when phrasing differs.
+even when phrasing differs. Descriptions are embedded as feature-hashed
+word and character n-grams with TF-IDF weights learned from the indexed
+tasks (see `text_embedding`). Task embeddings live in an EmbeddingMatrix,
+so a lookup scores every indexed task with one matrix-vector product.
+Past ``LSH_MIN_TASKS`` tasks, a SimHash LSH index narrows that to the
+tasks sharing a bucket with the query, which are then scored exactly.
+
+The index is bounded by ``index_budget`` bytes (embedding rows plus
+per-task bookkeeping and descriptions): tasks are kept in least recently
+used order, where adding a task or returning it as a match uses it, and
+the least recently used are evicted once the budget is exceeded.
+Completed tasks expire ``completed_ttl`` seconds after completion.
+
+`save` / `load` keep the index across restarts (format in
+`dedup_store`). Loading maps the saved embeddings instead of reading
+them, and the LSH index is rebuilt on the first lookup that needs it, so
+startup costs one JSON parse. The global index lives in
+``SEMANTIC_INDEX_DIR``; it is loaded on first use and saved at exit.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Set
-import hashlib
+import atexit
+import logging
 import time
-from collections import defaultdict, deque
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
 
 import numpy as np
 
+from khive.services.claude.hooks import dedup_store
+from khive.services.claude.hooks.clustering import MEMORY_BUDGET, cluster, lsh_codes
+from khive.services.claude.hooks.embedding_matrix import EmbeddingMatrix, normalize
+from khive.services.claude.hooks.simhash import BITS, TABLES, SimHashLSH
+from khive.services.claude.hooks.text_embedding import HashedNgramEmbedder
+from khive.utils import SEMANTIC_INDEX_DIR
+
+logger = logging.getLogger(__name__)
+
+# Precision 0.9 on tests/performance/datasets/task_pairs.json (see
+# test_embedding_quality); lower thresholds trade it for recall
+SIMILARITY_THRESHOLD = 0.75
+# check_duplicate's confidence bands, from the same pairs: every pair at
+# or above HIGH_CONFIDENCE is a duplicate, and MEDIUM_CONFIDENCE is where
+# precision reaches 0.9. Below it (only with a lower threshold) is "low".
+HIGH_CONFIDENCE = 0.8
+MEDIUM_CONFIDENCE = SIMILARITY_THRESHOLD
+
+# Below this many tasks one product over the whole matrix is as fast as LSH
+LSH_MIN_TASKS = 20_000
+
+EMBED_BATCH = 4096  # Rows embedded per NumPy batch when re-weighting
+
+INDEX_BUDGET = 256 * 2**20  # ~47k tasks with the LSH index built, ~100k without
+COMPLETED_TTL = 7 * 24 * 3600.0  # Seconds a completed task stays matchable
+
+# Bytes per task besides its row and description, measured on CPython 3.10:
+# the TaskEmbedding, dict and matrix entries, and its LSH codes and bucket
+# memberships (per table) while the LSH index is built. Spare matrix
+# capacity (up to as much again as the rows) is not counted.
+TASK_OVERHEAD = 400
+LSH_OVERHEAD_PER_TABLE = 130
+
 
 @dataclass
 class TaskEmbedding:
-    """Represents a task with its semantic embedding."""
+    """An indexed task; its vector is a row of the deduplicator's matrix."""
 
     task_id: str
     description: str
-    embedding: list[float]
-    metadata: dict
+    metadata: dict = field(default_factory=dict)
+    added_at: float = field(default_factory=time.time)
+    completed_at: float | None = None
 
 
 class SemanticDeduplicator:
-    """Semantic task deduplication using lightweight embeddings with O(1) duplicate detection."""
-
-    def __init__(self, similarity_threshold: float = 0.85):
+    """Semantic task deduplication using lightweight embeddings and vectorized search."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        lsh_tables: int = TABLES,
+        lsh_bits: int = BITS,
+        lsh_min_tasks: int = LSH_MIN_TASKS,
+        index_budget: int = INDEX_BUDGET,
+        completed_ttl: float = COMPLETED_TTL,
+    ):
         """
         Initialize semantic deduplicator with performance optimizations.
 
         Args:
             similarity_threshold: Minimum similarity score to consider tasks duplicate (0-1)
+            lsh_tables: SimHash tables; more raise recall and candidate counts
+            lsh_bits: Hyperplanes per table; more shrink buckets and lower recall
+            lsh_min_tasks: Index size from which lookups go through LSH
+            index_budget: Bytes the index may hold before evicting tasks
+            completed_ttl: Seconds after completion that a task expires
         """
         self.similarity_threshold = similarity_threshold
-        self.task_embeddings: dict[str, TaskEmbedding] = {}
-        
-        # Performance optimization: Hash-based index for O(1) lookups
-        self._keyword_hash_index: Dict[str, Set[str]] = defaultdict(set)
-        self._embedding_cache: Dict[str, List[float]] = {}  # LRU cache for embeddings
-        self._similarity_cache: Dict[Tuple[str, str], float] = {}  # Cache similarity calculations
-        self._cache_max_size = 10000
-        self._cache_access_times: Dict[str, float] = {}  # For LRU eviction
-        
-        # Spatial indexing for fast nearest neighbor search
-        self._bucket_grid: Dict[int, List[str]] = defaultdict(list)
-        self._grid_resolution = 20  # Number of buckets per dimension
-        
+        self.lsh_min_tasks = lsh_min_tasks
+        self.index_budget = index_budget
+        self.completed_ttl = completed_ttl
+        # Least recently used first
+        self.task_embeddings: OrderedDict[str, TaskEmbedding] = OrderedDict()
+        self._description_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.dirty = False  # Changed since the last save or load
+
         # Performance metrics
         self._lookup_times: deque = deque(maxlen=1000)  # Track lookup performance
-        self._cache_hits = 0
-        self._cache_misses = 0
-
-        # Simple keyword-based embeddings (no external dependencies)
-        # In production, would use sentence-transformers
-        self.feature_keywords = {
-            # Action keywords (what)
-            "refactor": 0,
-            "implement": 1,
-            "fix": 2,
-            "update": 3,
-            "create": 4,
-            "analyze": 5,
-            "test": 6,
-            "review": 7,
-            "optimize": 8,
-            "debug": 9,
-            "design": 10,
-            "build": 11,
-            "deploy": 12,
-            "migrate": 13,
-            "integrate": 14,
-            # Domain keywords (where)
-            "auth": 15,
-            "authentication": 15,
-            "database": 16,
-            "api": 17,
-            "frontend": 18,
-            "backend": 19,
-            "middleware": 20,
-            "model": 21,
-            "controller": 22,
-            "service": 23,
-            "security": 24,
-            "performance": 25,
-            "ui": 26,
-            "ux": 27,
-            "configuration": 28,
-            # Technical keywords (how)
-            "async": 29,
-            "cache": 30,
-            "queue": 31,
-            "webhook": 32,
-            "rest": 33,
-            "graphql": 34,
-            "websocket": 35,
-            "jwt": 36,
-            "oauth": 37,
-            "encryption": 38,
-            "validation": 39,
-            "schema": 40,
-            "migration": 41,
-            "index": 42,
-            "query": 43,
-        }
 
-    def _create_embedding(self, description: str) -> list[float]:
-        """
-        Create optimized embedding vector with caching and fast keyword matching.
+        self.embedder = HashedNgramEmbedder()
+        # Document count and churn when the stored rows were weighted
+        self._embedded_at_docs = 0
+        self._embedded_at_churn = 0
+
+        # Normalized task embeddings, one row per task
+        self._matrix = EmbeddingMatrix(self.embedder.dim)
+        self._lsh = SimHashLSH(self._matrix.dim, tables=lsh_tables, bits=lsh_bits)
+        self._lsh_synced = True  # False after a load, until a lookup needs LSH
+
+    def _create_embedding(self, description: str) -> np.ndarray:
+        """TF-IDF embedding of one description (features cached by content hash)."""
+        return self.embedder.embed(description)
+
+    def embedding(self, task_id: str) -> np.ndarray:
+        """The indexed (normalized) embedding of a task."""
+        return self._matrix.vector(task_id)
+
+    def _index(self, task_ids: list[str], descriptions: list[str]) -> None:
+        for i in range(0, len(task_ids), EMBED_BATCH):
+            ids = task_ids[i : i + EMBED_BATCH]
+            vectors = self.embedder.embed_batch(descriptions[i : i + EMBED_BATCH])
+            self._matrix.add_many(ids, vectors)
+            if self._lsh_synced:
+                self._lsh.add_many(ids, vectors)
+
+    def _sync_lsh(self) -> None:
+        """Hash every row into the LSH index, which `load` leaves empty."""
+        if self._lsh_synced:
+            return
+        task_ids, vectors = self._matrix.live_rows()
+        for i in range(0, len(task_ids), EMBED_BATCH):
+            self._lsh.add_many(task_ids[i : i + EMBED_BATCH], vectors[i : i + EMBED_BATCH])
+        self._lsh_synced = True
+
+    def reweight(self) -> None:
+        """Re-embed every task with the current IDF weights."""
+        tasks = list(self.task_embeddings.values())
+        self._index([t.task_id for t in tasks], [t.description for t in tasks])
+        self._embedded_at_docs = self.embedder.docs
+        self._embedded_at_churn = self.embedder.churn
+
+    def _reweight_due(self) -> bool:
+        return self.embedder.idf_stale(self._embedded_at_docs, self._embedded_at_churn)
 
-        Performance optimizations:
-        - LRU cache for repeated descriptions
-        - Optimized keyword matching with early termination
-        - Vectorized operations where possible
-        """
-        # Check cache first (O(1) lookup)
-        desc_hash = hashlib.md5(description.encode()).hexdigest()
-        if desc_hash in self._embedding_cache:
-            self._cache_hits += 1
-            self._cache_access_times[desc_hash] = time.time()
-            return self._embedding_cache[desc_hash]
-        
-        self._cache_misses += 1
-        start_time = time.time()
-        
-        # Initialize embedding vector
-        embedding = [0.0] * len(set(self.feature_keywords.values()))
-
-        # Normalize description (optimized)
-        desc_lower = description.lower()
-        words = desc_lower.split()
-        word_set = set(words)  # O(1) lookups for exact matches
-
-        # Optimized keyword matching
-        keyword_counts = {}
-        
-        # Fast exact matches using set intersection
-        matched_keywords = word_set.intersection(self.feature_keywords.keys())
-        for keyword in matched_keywords:
-            idx = self.feature_keywords[keyword]
-            keyword_counts[idx] = keyword_counts.get(idx, 0) + 1
-
-        # Optimized partial matches with early termination
-        for word in words:
-            if len(word) > 3:  # Skip very short words
-                for keyword, idx in self.feature_keywords.items():
-                    if len(keyword) > 3 and keyword in word and keyword not in word_set:
-                        keyword_counts[idx] = keyword_counts.get(idx, 0) + 0.5
-                        break  # Early termination after first match
-
-        # Vectorized embedding creation
-        total_keywords = sum(keyword_counts.values()) if keyword_counts else 1
-        for idx, count in keyword_counts.items():
-            embedding[idx] = count / total_keywords
-
-        # Add optimized features
-        embedding.append(len(words) / 100.0)  # Normalized length
-        
-        # Fast component detection using set operations
-        component_keywords = {"controller", "model", "service", "middleware"}
-        has_multiple_components = len(word_set.intersection(component_keywords)) > 1
-        embedding.append(1.0 if has_multiple_components else 0.0)
-
-        # Cache result with LRU eviction
-        self._cache_embedding(desc_hash, embedding)
-        
-        # Track performance
-        self._lookup_times.append(time.time() - start_time)
-        
-        return embedding
-
-    def _cache_embedding(self, desc_hash: str, embedding: List[float]) -> None:
-        """Cache embedding with LRU eviction."""
-        if len(self._embedding_cache) >= self._cache_max_size:
-            # Evict least recently used entry
-            oldest_hash = min(self._cache_access_times.keys(), 
-                             key=self._cache_access_times.get)
-            del self._embedding_cache[oldest_hash]
-            del self._cache_access_times[oldest_hash]
-        
-        self._embedding_cache[desc_hash] = embedding
-        self._cache_access_times[desc_hash] = time.time()
-    
-    def _cosine_similarity(
-        self, embedding1: list[float], embedding2: list[float]
-    ) -> float:
-        """Calculate optimized cosine similarity with caching."""
-        # Create cache key
-        key1 = tuple(embedding1)
-        key2 = tuple(embedding2)
-        cache_key = (key1, key2) if key1 < key2 else (key2, key1)
-        
-        # Check cache
-        if cache_key in self._similarity_cache:
-            return self._similarity_cache[cache_key]
-        
-        # Convert to numpy arrays (optimized)
-        vec1 = np.array(embedding1, dtype=np.float32)  # Use float32 for speed
-        vec2 = np.array(embedding2, dtype=np.float32)
-
-        # Early termination for zero vectors
-        norm1_sq = np.sum(vec1 * vec1)
-        norm2_sq = np.sum(vec2 * vec2)
-        if norm1_sq == 0 or norm2_sq == 0:
-            return 0.0
-
-        # Optimized cosine similarity calculation
-        dot_product = np.dot(vec1, vec2)
-        similarity = float(dot_product / (np.sqrt(norm1_sq) * np.sqrt(norm2_sq)))
-        
-        # Cache result (with size limit)
-        if len(self._similarity_cache) < self._cache_max_size // 2:
-            self._similarity_cache[cache_key] = similarity
-        
-        return similarity
-
-    def _get_grid_bucket(self, embedding: List[float]) -> int:
-        """Get spatial grid bucket for embedding (for O(1) candidate filtering)."""
-        # Use first few dimensions for spatial bucketing
-        if len(embedding) < 3:
-            return 0
-        
-        # Quantize first 3 dimensions to create bucket ID
-        x = int(embedding[0] * self._grid_resolution)
-        y = int(embedding[1] * self._grid_resolution) if len(embedding) > 1 else 0
-        z = int(embedding[2] * self._grid_resolution) if len(embedding) > 2 else 0
-        
-        # Combine into single bucket ID
-        return x + y * self._grid_resolution + z * self._grid_resolution ** 2
-    
-    def _get_candidate_buckets(self, bucket_id: int) -> List[int]:
-        """Get nearby buckets for similarity search (includes current + neighbors)."""
-        candidates = [bucket_id]
-        
-        # Add neighboring buckets for better recall
-        for offset in [-1, 0, 1]:
-            for y_offset in [-self._grid_resolution, 0, self._grid_resolution]:
-                for z_offset in [-self._grid_resolution**2, 0, self._grid_resolution**2]:
-                    neighbor = bucket_id + offset + y_offset + z_offset
-                    if neighbor != bucket_id and neighbor >= 0:
-                        candidates.append(neighbor)
-        
-        return candidates
-    
-    def _update_keyword_index(self, task_id: str, description: str) -> None:
-        """Update hash-based keyword index for fast filtering."""
-        words = description.lower().split()
-        for word in words:
-            if word in self.feature_keywords:
-                self._keyword_hash_index[word].add(task_id)
-    
     def find_similar_task(self, description: str) -> tuple[str, float] | None:
         """
-        Find the most similar existing task using optimized O(1) candidate filtering.
+        Find the most similar existing task at or above the threshold.
 
-        Performance optimizations:
-        - Spatial grid indexing for O(1) candidate filtering  
-        - Keyword-based pre-filtering
-        - Early termination on high similarity
-        - Vectorized similarity calculations
+        Every indexed task is scored (one matrix-vector product), or on a
+        large index every task sharing an LSH bucket with the description.
 
         Returns:
             Tuple of (task_id, similarity_score) if found, None otherwise
         """
-        if not self.task_embeddings:
-            return None
+        matches = self.find_similar_tasks(description, k=1)
+        return matches[0] if matches else None
+
+    def find_similar_tasks(
+        self, description: str, k: int = 5, min_similarity: float | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        The `k` most similar tasks scoring at least `min_similarity`, best first.
+
+        `min_similarity` defaults to the duplicate threshold.
+        """
+        return self.find_similar_batch([description], k, min_similarity)[0]
+
+    def find_similar_batch(
+        self,
+        descriptions: list[str],
+        k: int = 1,
+        min_similarity: float | None = None,
+        exact: bool | None = None,
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Top-`k` matches for many descriptions.
+
+        Exact search scores them all with one matrix-matrix product; LSH
+        search (the default from `lsh_min_tasks` tasks on, unless `exact`
+        is given) scores only each one's bucket-mates, and can miss a
+        match with the probability described in `simhash`.
+        """
+        if not len(self._matrix) or not descriptions:
+            return [[] for _ in descriptions]
 
         start_time = time.time()
-        
-        # Create embedding for new task
-        new_embedding = self._create_embedding(description)
-        
-        # Step 1: Fast keyword-based candidate filtering (O(1) average)
-        candidate_tasks = set()
-        words = description.lower().split()
-        keyword_candidates = set()
-        
-        for word in words:
-            if word in self._keyword_hash_index:
-                keyword_candidates.update(self._keyword_hash_index[word])
-        
-        # Step 2: Spatial grid filtering (O(1) average)
-        bucket_id = self._get_grid_bucket(new_embedding)
-        spatial_candidates = set()
-        
-        for bucket in self._get_candidate_buckets(bucket_id):
-            if bucket in self._bucket_grid:
-                spatial_candidates.update(self._bucket_grid[bucket])
-        
-        # Combine candidates (intersection for precision, union for recall)
-        if keyword_candidates and spatial_candidates:
-            candidate_tasks = keyword_candidates.intersection(spatial_candidates)
-            if not candidate_tasks:  # Fallback to union if intersection is empty
-                candidate_tasks = keyword_candidates.union(spatial_candidates)
-        elif keyword_candidates:
-            candidate_tasks = keyword_candidates
-        elif spatial_candidates:
-            candidate_tasks = spatial_candidates
+        queries = self.embedder.embed_batch(descriptions)
+        if min_similarity is None:
+            min_similarity = self.similarity_threshold
+        if exact is None:
+            exact = len(self._matrix) < self.lsh_min_tasks
+        if exact:
+            matches = self._matrix.top_k(queries, k, min_score=min_similarity)
         else:
-            # Fallback to all tasks if no candidates found
-            candidate_tasks = set(self.task_embeddings.keys())
-        
-        # Limit candidates for performance (top K most promising)
-        if len(candidate_tasks) > 50:  # Configurable threshold
-            candidate_tasks = set(list(candidate_tasks)[:50])
-
-        # Step 3: Similarity calculation only on candidates
-        best_match = None
-        best_score = 0.0
-
-        for task_id in candidate_tasks:
-            if task_id not in self.task_embeddings:
-                continue
-                
-            task_emb = self.task_embeddings[task_id]
-            similarity = self._cosine_similarity(new_embedding, task_emb.embedding)
-
-            if similarity > best_score:
-                best_score = similarity
-                best_match = task_id
-                
-                # Early termination for very high similarity
-                if similarity > 0.98:
-                    break
-
-        # Track performance
-        lookup_time = time.time() - start_time
-        self._lookup_times.append(lookup_time)
-        
-        if best_score >= self.similarity_threshold:
-            return (best_match, best_score)
-
-        return None
+            self._sync_lsh()
+            matches = [
+                self._matrix.top_k_among(query, candidates, k, min_score=min_similarity)
+                for query, candidates in zip(
+                    queries, self._lsh.candidates_batch(queries)
+                )
+            ]
+        for task_matches in matches:
+            for task_id, _ in task_matches:
+                self.task_embeddings.move_to_end(task_id)
+        self._lookup_times.append(time.time() - start_time)
+        return matches
 
     def add_task(
         self, task_id: str, description: str, metadata: dict | None = None
     ) -> TaskEmbedding:
         """Add a task to the deduplication index with optimized indexing."""
-        embedding = self._create_embedding(description)
+        return self.add_tasks([(task_id, description)], metadata)[0]
+
+    def add_tasks(
+        self, tasks: list[tuple[str, str]], metadata: dict | None = None
+    ) -> list[TaskEmbedding]:
+        """
+        Index many (task_id, description) pairs, embedded in NumPy batches.
+
+        A task_id given more than once is indexed once, with its last
+        description. The tasks update the IDF first; once as many tasks
+        have been added and removed as were indexed when the index was
+        last weighted, every task is re-embedded, so stored and query
+        vectors never drift far apart. Least recently used tasks are then
+        evicted while the index is over budget.
+        """
+        batch = dict(tasks)
+        for task_id in batch:
+            self.remove_task(task_id)
+        added = [
+            TaskEmbedding(task_id=task_id, description=description, metadata=dict(metadata or {}))
+            for task_id, description in batch.items()
+        ]
+        self.embedder.observe(t.description for t in added)
+        for task_emb in added:
+            self.task_embeddings[task_emb.task_id] = task_emb
+            self._description_bytes += len(task_emb.description)
+        self.dirty = True
+
+        if self._reweight_due():
+            self.reweight()
+        else:
+            self._index([t.task_id for t in added], [t.description for t in added])
+        self._evict_to_budget()
+        return added
+
+    def remove_task(self, task_id: str) -> bool:
+        """Drop a task from the index; returns whether it was indexed."""
+        task_emb = self.task_embeddings.pop(task_id, None)
+        if task_emb is None:
+            return False
+        self._description_bytes -= len(task_emb.description)
+        self.embedder.forget([task_emb.description])
+        self._matrix.remove(task_id)
+        self._lsh.remove(task_id)
+        self.dirty = True
+        return True
+
+    def complete_task(self, task_id: str, completed_at: float | None = None) -> bool:
+        """Mark a task done; it stays matchable for ``completed_ttl`` seconds."""
+        task_emb = self.task_embeddings.get(task_id)
+        if task_emb is None:
+            return False
+        task_emb.completed_at = time.time() if completed_at is None else completed_at
+        self.dirty = True
+        return True
+
+    def expire_completed(self, now: float | None = None) -> list[str]:
+        """Drop tasks completed more than ``completed_ttl`` seconds ago."""
+        cutoff = (time.time() if now is None else now) - self.completed_ttl
+        expired = [
+            task_id
+            for task_id, task_emb in self.task_embeddings.items()
+            if task_emb.completed_at is not None and task_emb.completed_at <= cutoff
+        ]
+        for task_id in expired:
+            self.remove_task(task_id)
+        self.expirations += len(expired)
+        return expired
+
+    @property
+    def index_bytes(self) -> int:
+        """Estimated bytes held by the indexed tasks (see ``TASK_OVERHEAD``)."""
+        per_task = self._matrix.dim * self._matrix.dtype.itemsize + TASK_OVERHEAD
+        if self._lsh_synced:
+            per_task += self._lsh.tables * LSH_OVERHEAD_PER_TABLE
+        return len(self.task_embeddings) * per_task + self._description_bytes
+
+    def _evict_to_budget(self) -> None:
+        while self.task_embeddings and self.index_bytes > self.index_budget:
+            self.remove_task(next(iter(self.task_embeddings)))
+            self.evictions += 1
+
+    # --- Persistence ---
+
+    def save(self, directory: Path | str) -> None:
+        """
+        Write the index to `directory`, replacing any saved there before.
 
-        task_emb = TaskEmbedding(
-            task_id=task_id,
-            description=description,
-            embedding=embedding,
-            metadata=metadata or {},
+        Concurrent saves are serialized but not merged: the last one wins,
+        dropping tasks only another process had added. Expired tasks are
+        dropped first. Tasks are written in least recently used order, so
+        eviction picks up where it left off.
+        """
+        self.expire_completed()
+        task_ids, vectors = self._matrix.live_rows()
+        row_of = {task_id: row for row, task_id in enumerate(task_ids)}
+        rows = [row_of[task_id] for task_id in self.task_embeddings]
+        dedup_store.write(
+            directory,
+            vectors[rows],
+            {
+                "embedder": self.embedder.state(),
+                "embedded_at_docs": self._embedded_at_docs,
+                "embedded_at_churn": self._embedded_at_churn,
+                "tasks": [
+                    [t.task_id, t.description, t.metadata, t.added_at, t.completed_at]
+                    for t in self.task_embeddings.values()
+                ],
+            },
         )
+        self.dirty = False
+
+    @classmethod
+    def load(cls, directory: Path | str, **kwargs) -> "SemanticDeduplicator":
+        """
+        A deduplicator over the index saved in `directory`, or an empty one.
 
-        # Update main index
-        self.task_embeddings[task_id] = task_emb
-        
-        # Update performance indexes
-        self._update_keyword_index(task_id, description)
-        
-        # Update spatial grid index
-        bucket_id = self._get_grid_bucket(embedding)
-        self._bucket_grid[bucket_id].append(task_id)
-        
-        return task_emb
+        The embeddings stay memory-mapped until the matrix grows or is
+        compacted. `kwargs` go to the constructor; an index saved with
+        different embedder settings cannot be reused and is ignored.
+        """
+        dedup = cls(**kwargs)
+        saved = dedup_store.read(directory)
+        if saved is None:
+            return dedup
+        vectors, sidecar = saved
+        try:
+            dedup.embedder.restore(sidecar["embedder"])
+        except ValueError as e:
+            logger.warning(f"Ignoring dedup index {directory}: {e}")
+            return dedup
+
+        tasks = [
+            TaskEmbedding(task_id, description, metadata, added_at, completed_at)
+            for task_id, description, metadata, added_at, completed_at in sidecar["tasks"]
+        ]
+        dedup._matrix = EmbeddingMatrix.from_rows([t.task_id for t in tasks], vectors)
+        dedup._embedded_at_docs = sidecar["embedded_at_docs"]
+        dedup._embedded_at_churn = sidecar.get("embedded_at_churn", dedup.embedder.churn)
+        for task_emb in tasks:
+            dedup.task_embeddings[task_emb.task_id] = task_emb
+            dedup._description_bytes += len(task_emb.description)
+        dedup._lsh_synced = not tasks
+
+        # Both may have changed since the save: the clock, or the settings
+        dedup.expire_completed()
+        dedup._evict_to_budget()
+        return dedup
 
     def check_duplicate(self, description: str) -> dict[str, any]:
         """
@@ -379,8 +395,8 @@ class SemanticDeduplicator:
                 "similar_description": existing_task.description,
                 "confidence": (
                     "high"
-                    if similarity > 0.95
-                    else "medium" if similarity > 0.9 else "low"
+                    if similarity >= HIGH_CONFIDENCE
+                    else "medium" if similarity >= MEDIUM_CONFIDENCE else "low"
                 ),
             }
 
@@ -389,161 +405,138 @@ class SemanticDeduplicator:
     def get_performance_stats(self) -> Dict[str, any]:
         """Get performance statistics for monitoring."""
         avg_lookup_time = sum(self._lookup_times) / len(self._lookup_times) if self._lookup_times else 0
-        cache_hit_rate = self._cache_hits / (self._cache_hits + self._cache_misses) if (self._cache_hits + self._cache_misses) > 0 else 0
-        
+        embedder = self.embedder.stats()
+
         return {
             "average_lookup_time_ms": avg_lookup_time * 1000,
-            "cache_hit_rate": cache_hit_rate,
-            "cache_size": len(self._embedding_cache),
+            "cache_hit_rate": embedder["cache_hit_rate"],
+            "cache_size": embedder["cache_size"],
+            "embedding": embedder,
             "total_tasks": len(self.task_embeddings),
-            "keyword_index_size": sum(len(tasks) for tasks in self._keyword_hash_index.values()),
-            "spatial_buckets_used": len(self._bucket_grid),
-            "similarity_cache_size": len(self._similarity_cache),
+            "matrix_capacity": self._matrix.capacity,
+            "matrix_tombstones": self._matrix.tombstones,
+            "matrix_bytes": self._matrix.nbytes,
+            "index_bytes": self.index_bytes,
+            "index_budget": self.index_budget,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "search": "exact" if len(self._matrix) < self.lsh_min_tasks else "lsh",
+            "lsh": {**self._lsh.stats(), "synced": self._lsh_synced},
             "recent_lookup_times": list(self._lookup_times)[-10:]  # Last 10 lookup times
         }
     
     def optimize_indexes(self) -> None:
         """Optimize indexes for better performance (maintenance operation)."""
-        # Rebuild spatial index for better distribution
-        self._bucket_grid.clear()
-        for task_id, task_emb in self.task_embeddings.items():
-            bucket_id = self._get_grid_bucket(task_emb.embedding)
-            self._bucket_grid[bucket_id].append(task_id)
-        
-        # Clean up similarity cache if too large
-        if len(self._similarity_cache) > self._cache_max_size:
-            # Keep only most recent entries
-            items = list(self._similarity_cache.items())
-            self._similarity_cache = dict(items[-self._cache_max_size//2:])
+        self.expire_completed()
+        # Drop tombstoned rows left by removed tasks
+        self._matrix.compact()
+        if self._reweight_due():
+            self.reweight()
     
-    def get_task_clusters(self, min_similarity: float = 0.7) -> list[list[str]]:
+    def get_task_clusters(
+        self,
+        min_similarity: float = 0.7,
+        exact: bool | None = None,
+        memory_budget: int = MEMORY_BUDGET,
+    ) -> list[list[str]]:
         """
         Group tasks into clusters based on similarity.
 
+        Tasks are linked at `min_similarity` and clusters are connected
+        groups of links. Exact clustering scores all pairs in blocks of at
+        most `memory_budget` bytes; from `lsh_min_tasks` tasks on (unless
+        `exact` is given) only pairs sharing an LSH bucket are scored.
+
         Returns:
             List of task clusters (groups of similar tasks)
         """
         if not self.task_embeddings:
             return []
 
-        # Build similarity matrix
-        task_ids = list(self.task_embeddings.keys())
-        n = len(task_ids)
-        similarity_matrix = np.zeros((n, n))
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                emb1 = self.task_embeddings[task_ids[i]].embedding
-                emb2 = self.task_embeddings[task_ids[j]].embedding
-                sim = self._cosine_similarity(emb1, emb2)
-                similarity_matrix[i, j] = sim
-                similarity_matrix[j, i] = sim
-
-        # Simple clustering: group tasks that are similar to each other
-        clusters = []
-        visited = set()
-
-        for i, task_id in enumerate(task_ids):
-            if task_id in visited:
-                continue
-
-            cluster = [task_id]
-            visited.add(task_id)
-
-            # Find all tasks similar to this one
-            for j, other_id in enumerate(task_ids):
-                if (
-                    other_id not in visited
-                    and similarity_matrix[i, j] >= min_similarity
-                ):
-                    cluster.append(other_id)
-                    visited.add(other_id)
-
-            if len(cluster) > 1:
-                clusters.append(cluster)
-
-        return clusters
+        task_ids, vectors = self._matrix.live_rows()
+        if exact is None:
+            exact = len(task_ids) < self.lsh_min_tasks
+        codes = None if exact else lsh_codes(vectors)
+        groups = cluster(vectors, min_similarity, codes=codes, memory_budget=memory_budget)
+        return [[task_ids[row] for row in group] for group in groups]
 
     def suggest_merge_strategy(self, task_descriptions: list[str]) -> dict[str, any]:
         """
         Suggest how to merge or coordinate similar tasks.
 
+        The descriptions are clustered among themselves with the same
+        machinery as `get_task_clusters`, weighted by the index's IDF; the
+        index itself is left untouched.
+
         Args:
             task_descriptions: List of task descriptions to analyze
 
         Returns:
             Strategy for handling the tasks
         """
-        # Add all tasks temporarily
-        temp_tasks = []
-        for i, desc in enumerate(task_descriptions):
-            task_id = f"temp_{i}"
-            self.add_task(task_id, desc)
-            temp_tasks.append(task_id)
-
-        # Find clusters
-        clusters = self.get_task_clusters(min_similarity=0.8)
+        vectors = normalize(self.embedder.embed_batch(task_descriptions))
+        exact = len(task_descriptions) < self.lsh_min_tasks
+        codes = None if exact else lsh_codes(vectors)
+        groups = cluster(vectors, self.similarity_threshold, codes=codes)
 
         # Build strategy
         strategy = {
             "merge_groups": [],
             "independent_tasks": [],
-            "coordination_needed": False,
+            "coordination_needed": bool(groups),
         }
 
-        # Identify which temp tasks are in clusters
-        clustered_tasks = set()
-        for cluster in clusters:
-            cluster_temps = [t for t in cluster if t.startswith("temp_")]
-            if len(cluster_temps) > 1:
-                strategy["merge_groups"].append(
-                    {
-                        "tasks": [
-                            task_descriptions[int(t.split("_")[1])]
-                            for t in cluster_temps
-                        ],
-                        "suggested_merge": f"Combine into single task: {task_descriptions[int(cluster_temps[0].split('_')[1])]}",
-                    }
-                )
-                clustered_tasks.update(cluster_temps)
-                strategy["coordination_needed"] = True
+        clustered = set()
+        for group in groups:
+            strategy["merge_groups"].append(
+                {
+                    "tasks": [task_descriptions[i] for i in group],
+                    "suggested_merge": f"Combine into single task: {task_descriptions[group[0]]}",
+                }
+            )
+            clustered.update(group)
 
         # Identify independent tasks
-        for i, task_id in enumerate(temp_tasks):
-            if task_id not in clustered_tasks:
-                strategy["independent_tasks"].append(task_descriptions[i])
-
-        # Clean up temp tasks
-        for task_id in temp_tasks:
-            del self.task_embeddings[task_id]
+        for i, description in enumerate(task_descriptions):
+            if i not in clustered:
+                strategy["independent_tasks"].append(description)
 
         return strategy
 
 
-# Global instance with performance monitoring
-_semantic_dedup = SemanticDeduplicator()
+# Global instance, loaded from SEMANTIC_INDEX_DIR on first use
+_semantic_dedup: SemanticDeduplicator | None = None
+
+
+def get_semantic_deduplicator() -> SemanticDeduplicator:
+    """Get the global semantic deduplicator instance."""
+    global _semantic_dedup
+    if _semantic_dedup is None:
+        _semantic_dedup = SemanticDeduplicator.load(SEMANTIC_INDEX_DIR)
+        atexit.register(save_semantic_index)
+    return _semantic_dedup
+
+
+def save_semantic_index() -> None:
+    """Save the global index if it was loaded and has changed since."""
+    if _semantic_dedup is not None and _semantic_dedup.dirty:
+        _semantic_dedup.save(SEMANTIC_INDEX_DIR)
+
 
 def get_performance_stats() -> Dict[str, any]:
     """Get global performance statistics."""
-    return _semantic_dedup.get_performance_stats()
+    return get_semantic_deduplicator().get_performance_stats()
 
 def optimize_global_indexes() -> None:
     """Optimize global indexes for better performance."""
-    _semantic_dedup.optimize_indexes()
-
-# Global instance
-
-
-def get_semantic_deduplicator() -> SemanticDeduplicator:
-    """Get the global semantic deduplicator instance."""
-    return _semantic_dedup
+    get_semantic_deduplicator().optimize_indexes()
 
 
 def check_semantic_duplicate(description: str) -> dict[str, any]:
     """Quick function to check for semantic duplicates."""
-    return _semantic_dedup.check_duplicate(description)
+    return get_semantic_deduplicator().check_duplicate(description)
 
 
 def add_task_to_index(task_id: str, description: str) -> None:
     """Add a task to the semantic index."""
-    _semantic_dedup.add_task(task_id, description)
+    get_semantic_deduplicator().add_task(task_id, description)
@@ -0,0 +1,118 @@
+"""
+Random-hyperplane (SimHash) LSH for cosine similarity.
+
+Each table draws ``bits`` random hyperplanes; a vector's bucket key in
+that table is the sign pattern of its projections onto them, packed into
+an int. Two vectors at angle ``θ`` agree on one sign with probability
+``1 - θ / π``, so they share a table's bucket with ``p = (1 - θ/π) ** bits``
+and become candidates with ``1 - (1 - p) ** tables``.
+
+More bits per table make buckets smaller (fewer candidates to verify);
+more tables win back the recall that costs. At cosine 0.85 (``θ ≈ 0.55``)
+one bit agrees with probability 0.82, so the default 12 bits x 24 tables
+finds such a pair with probability ``1 - (1 - 0.82**12) ** 24 ≈ 0.91``,
+and one at cosine 0.9 with ``≈ 0.98``. Buckets hold about ``n / 2**bits``
+keys, so bits should grow with ``log2(n)`` for a flat candidate count.
+``tests/performance/test_simhash_recall.py`` measures the recall/latency
+curve against brute force for other settings.
+
+Callers verify candidates with exact cosine, so LSH only causes misses,
+never false matches. Hyperplanes come from a seeded generator, so bucket
+keys are stable across processes for the same seed and dimension.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+
+import numpy as np
+
+TABLES = 24
+BITS = 12
+SEED = 1
+CODE_CHUNK = 4096  # rows hashed per product
+
+
+class SimHashLSH:
+    """Multi-table random-hyperplane LSH from keys to vectors."""
+
+    def __init__(self, dim: int, tables: int = TABLES, bits: int = BITS, seed: int = SEED):
+        if not 0 < bits <= 63:
+            raise ValueError(f"bits must be between 1 and 63, got {bits}")
+        self.dim = dim
+        self.tables = tables
+        self.bits = bits
+        rng = np.random.default_rng(seed)
+        # (dim, tables * bits): one product projects onto every hyperplane
+        self._planes = rng.standard_normal((dim, tables * bits)).astype(np.float32)
+        self._weights = (1 << np.arange(bits, dtype=np.int64)).astype(np.int64)
+        self._buckets: list[dict[int, set[Hashable]]] = [{} for _ in range(tables)]
+        self._codes: dict[Hashable, tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._codes
+
+    def codes(self, vectors) -> np.ndarray:
+        """Bucket keys of each vector in each table, as an ``(n, tables)`` array."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        codes = np.empty((len(vectors), self.tables), dtype=np.int64)
+        # In row chunks: the projections are tables * bits wide per row
+        for start in range(0, len(vectors), CODE_CHUNK):
+            chunk = vectors[start : start + CODE_CHUNK]
+            signs = (chunk @ self._planes > 0).reshape(-1, self.tables, self.bits)
+            codes[start : start + CODE_CHUNK] = signs.astype(np.int64) @ self._weights
+        return codes
+
+    def add(self, key: Hashable, vector):
+        self.add_many([key], [vector])
+
+    def add_many(self, keys: Iterable[Hashable], vectors):
+        """Index a batch of keys, replacing previous vectors for known keys."""
+        for key, codes in zip(keys, self.codes(vectors).tolist()):
+            if key in self._codes:
+                self.remove(key)
+            self._codes[key] = tuple(codes)
+            for table, code in zip(self._buckets, codes):
+                table.setdefault(code, set()).add(key)
+
+    def remove(self, key: Hashable):
+        codes = self._codes.pop(key, None)
+        if codes is None:
+            return
+        for table, code in zip(self._buckets, codes):
+            bucket = table[code]
+            bucket.discard(key)
+            if not bucket:
+                del table[code]
+
+    def candidates(self, vector) -> set[Hashable]:
+        """Keys sharing a bucket with `vector` in at least one table."""
+        return self.candidates_batch(vector)[0]
+
+    def candidates_batch(self, vectors) -> list[set[Hashable]]:
+        """Candidates for each row of `vectors`, hashed with one product."""
+        results = []
+        for codes in self.codes(vectors).tolist():
+            found: set[Hashable] = set()
+            for table, code in zip(self._buckets, codes):
+                bucket = table.get(code)
+                if bucket:
+                    found |= bucket
+            results.append(found)
+        return results
+
+    def stats(self) -> dict[str, float]:
+        buckets = sum(len(table) for table in self._buckets)
+        return {
+            "tables": self.tables,
+            "bits": self.bits,
+            "keys": len(self),
+            "buckets": buckets,
+            "mean_bucket_size": len(self) * self.tables / buckets if buckets else 0.0,
+        }
+
+
+__all__ = ("BITS", "SEED", "TABLES", "SimHashLSH")
@@ -0,0 +1,153 @@
+"""
+Offline spool for hook events.
+
+When the daemon is not running, hooks used to insert each event straight
+into SQLite. With several agents running tools in parallel those inserts
+contend for the database write lock ("database is locked") and every tool
+call waits on a commit.
+
+Instead, each hook process appends its events as NDJSON lines to its own
+spool file, opened with ``O_APPEND`` and written with one ``write()`` per
+line, so appends never need a lock. The daemon (on startup) and the
+``khive claude`` CLI bulk-import finished spool files into the events table.
+Rows are inserted with ``INSERT OR IGNORE`` on the event id, so importing
+the same file twice - e.g. after a crash mid-import - never duplicates
+events.
+
+Import protocol: a spool file is named ``<pid>-<token>.ndjson`` and is only
+imported once its writer process has exited. The importer claims it by
+renaming it to ``<name>.<importer pid>.importing``; a claim left behind by a
+dead importer is picked up again by the next one.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+from khive.daemon.liveness import pid_exists
+from khive.utils import HOOK_SPOOL_DIR
+
+SPOOL_SUFFIX = ".ndjson"
+CLAIM_SUFFIX = ".importing"
+IMPORT_BATCH = 1000  # rows per import transaction
+
+_spool_name: tuple[int, str] | None = None  # (pid, file name) for this process
+
+
+def spool_path(spool_dir: str | Path = HOOK_SPOOL_DIR) -> Path:
+    """This process's spool file (a forked child gets its own)."""
+    global _spool_name
+    pid = os.getpid()
+    if _spool_name is None or _spool_name[0] != pid:
+        _spool_name = (pid, f"{pid}-{uuid.uuid4().hex[:8]}{SPOOL_SUFFIX}")
+    return Path(spool_dir) / _spool_name[1]
+
+
+def append(record: dict[str, Any], spool_dir: str | Path = HOOK_SPOOL_DIR) -> Path:
+    """Append one event (lionagi db dict) as a single NDJSON line."""
+    line = (json.dumps(record, default=str, separators=(",", ":")) + "\n").encode()
+    path = spool_path(spool_dir)
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        fd = os.open(path, flags, 0o600)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, flags, 0o600)
+    try:
+        written = os.write(fd, line)
+        while written < len(line):  # Only on a nearly full disk
+            written += os.write(fd, line[written:])
+    finally:
+        os.close(fd)
+    return path
+
+
+def _owner_pid(name: str) -> int | None:
+    try:
+        return int(name.split("-", 1)[0] if name.endswith(SPOOL_SUFFIX) else name.split(".")[-2])
+    except (ValueError, IndexError):
+        return None
+
+
+def _claim(path: Path) -> Path | None:
+    """Rename a finished spool file (or an abandoned claim) to our claim name."""
+    name = path.name
+    if name.endswith(SPOOL_SUFFIX):
+        base = name
+    elif name.endswith(CLAIM_SUFFIX):
+        base = name.split(".", 1)[0] + SPOOL_SUFFIX
+    else:
+        return None
+
+    owner = _owner_pid(name)
+    if owner is None or (pid_exists(owner) and owner != os.getpid()):
+        return None  # Still being written, or being imported by someone else
+    if owner == os.getpid() and name.endswith(SPOOL_SUFFIX):
+        return None  # This process's own spool is still open for appends
+
+    claimed = path.with_name(f"{base}.{os.getpid()}{CLAIM_SUFFIX}")
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return None  # Another importer got there first
+    return claimed
+
+
+def import_spool(
+    spool_dir: str | Path = HOOK_SPOOL_DIR,
+    db_path: str | Path | None = None,
+    conn: Any = None,
+    table: str = "hook_events",
+) -> dict[str, int]:
+    """
+    Import every finished spool file into the events table, then delete it.
+
+    Pass an open writer connection (`conn`) or a `db_path` to open one.
+    Lines that are not valid events (e.g. a write cut short by a crash) are
+    counted and skipped.
+    """
+    from khive.daemon.ingest import db_row, insert_rows, open_table
+
+    stats = {"files": 0, "events": 0, "imported": 0, "duplicates": 0, "bad_lines": 0}
+    spool_dir = Path(spool_dir)
+    if not spool_dir.is_dir():
+        return stats
+
+    own_conn = conn is None
+    for path in sorted(spool_dir.iterdir()):
+        claimed = _claim(path)
+        if claimed is None:
+            continue
+        if conn is None:
+            if db_path is None:
+                raise ValueError("import_spool needs a db_path or a connection")
+            conn = open_table(db_path, table)
+
+        rows = []
+        with open(claimed, "rb") as f:
+            for line in f:
+                try:
+                    rows.append(db_row(json.loads(line)))
+                except (ValueError, KeyError, TypeError):
+                    stats["bad_lines"] += 1
+                if len(rows) >= IMPORT_BATCH:
+                    stats["imported"] += insert_rows(conn, rows, table)
+                    stats["events"] += len(rows)
+                    rows = []
+        if rows:
+            stats["imported"] += insert_rows(conn, rows, table)
+            stats["events"] += len(rows)
+        claimed.unlink()
+        stats["files"] += 1
+
+    if own_conn and conn is not None:
+        conn.close()
+    stats["duplicates"] = stats["events"] - stats["imported"]
+    return stats
+
+
+__all__ = ("append", "import_spool", "spool_path")
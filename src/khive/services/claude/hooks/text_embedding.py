@@ -0,0 +1,241 @@
+"""
+Feature-hashed n-gram embeddings with incremental TF-IDF weighting.
+
+A description becomes word unigrams and bigrams plus character n-grams
+of each word (with ``<``/``>`` boundary marks, so ``auth`` shares most
+of its grams with ``authentication``). Every feature is hashed with
+CRC32 into one of ``dim`` buckets, with a hash-derived sign so that
+colliding features cancel rather than pile up, and counted as
+``1 + log(count)``. No vocabulary is stored and nothing outside the
+standard library and NumPy is needed.
+
+Bucket weights are TF-IDF: the embedder counts, per bucket, how many
+indexed documents use it (`observe` / `forget`), and scales each bucket
+by ``log((1 + docs) / (1 + doc_freq)) + 1``. Common words ("the", "add",
+"fix") therefore count for little once a few tasks are indexed. Callers
+holding embeddings should recompute them when `idf_stale` says enough
+documents came and went since they were made: as many as were indexed
+then (at least ``REWEIGHT_MIN_CHURN``). Churn rather than the document
+count, so an index held at a fixed size by eviction is still refreshed.
+
+Per-description features do not depend on the IDF, so they are cached
+by content hash; `embed_batch` then turns a batch of cached features
+into a dense ``float32`` matrix with a few NumPy operations. The cache is
+an LRU bounded in bytes (``cache_bytes``): a description's cost is its
+two arrays plus a fixed per-entry overhead, about 1.3 KiB for a
+six-word task description.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+DIM = 512
+WORD_NGRAMS = 2  # unigrams and bigrams
+CHAR_NGRAMS = (2, 4)  # shortest and longest character n-gram
+CHAR_WEIGHT = 1.0  # relative to word n-grams; grams carry most of the paraphrase signal
+CACHE_BYTES = 32 * 2**20
+REWEIGHT_MIN_CHURN = 64  # documents observed or forgotten before the first re-weight
+# Key, tuple, two ndarray headers and the OrderedDict links, measured on CPython 3.10
+CACHE_ENTRY_OVERHEAD = 400
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+Features = tuple[np.ndarray, np.ndarray]  # (buckets, signed weights)
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _entry_bytes(features: Features) -> int:
+    buckets, weights = features
+    return buckets.nbytes + weights.nbytes + CACHE_ENTRY_OVERHEAD
+
+
+class HashedNgramEmbedder:
+    """Hashed word/char n-gram TF-IDF vectors of a fixed width."""
+
+    def __init__(
+        self,
+        dim: int = DIM,
+        word_ngrams: int = WORD_NGRAMS,
+        char_ngrams: tuple[int, int] = CHAR_NGRAMS,
+        char_weight: float = CHAR_WEIGHT,
+        cache_bytes: int = CACHE_BYTES,
+    ):
+        self.dim = dim
+        self.word_ngrams = word_ngrams
+        self.char_ngrams = char_ngrams
+        self.char_weight = char_weight
+        self.cache_bytes = cache_bytes
+        self.doc_freq = np.zeros(dim, dtype=np.int64)
+        self.docs = 0
+        self.churn = 0  # documents ever observed or forgotten
+        self._idf: np.ndarray | None = None
+        self._cache: OrderedDict[bytes, Features] = OrderedDict()  # Least recent first
+        self._cached_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # --- Features ---
+
+    def _raw_features(self, text: str) -> tuple[dict[str, int], dict[str, int]]:
+        words = tokenize(text)
+        word_counts: dict[str, int] = {}
+        for n in range(1, self.word_ngrams + 1):
+            for i in range(len(words) - n + 1):
+                feature = " ".join(words[i : i + n])
+                word_counts[feature] = word_counts.get(feature, 0) + 1
+        char_counts: dict[str, int] = {}
+        low, high = self.char_ngrams
+        for word in words:
+            marked = f"<{word}>"
+            for n in range(low, high + 1):
+                for i in range(len(marked) - n + 1):
+                    feature = marked[i : i + n]
+                    char_counts[feature] = char_counts.get(feature, 0) + 1
+        return word_counts, char_counts
+
+    def features(self, text: str) -> Features:
+        """Hashed buckets and signed weights of `text` (cached by content hash)."""
+        key = content_hash(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return cached
+        self.cache_misses += 1
+
+        buckets: dict[int, float] = {}
+        dim = self.dim
+        word_counts, char_counts = self._raw_features(text)
+        for prefix, counts, scale in (
+            (b"w:", word_counts, 1.0),
+            (b"c:", char_counts, self.char_weight),
+        ):
+            for feature, count in counts.items():
+                h = zlib.crc32(prefix + feature.encode())
+                weight = scale * (1.0 + math.log(count))
+                bucket = h % dim
+                buckets[bucket] = buckets.get(bucket, 0.0) + (
+                    weight if h & 0x80000000 else -weight
+                )
+        result = (
+            np.fromiter(buckets.keys(), dtype=np.int32, count=len(buckets)),
+            np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets)),
+        )
+        self._cache[key] = result
+        self._cached_bytes += _entry_bytes(result)
+        while self._cached_bytes > self.cache_bytes and self._cache:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= _entry_bytes(evicted)
+        return result
+
+    # --- Document frequencies ---
+
+    def observe(self, texts: Iterable[str]):
+        """Count `texts` as indexed documents for the IDF."""
+        self._count(texts, 1)
+
+    def forget(self, texts: Iterable[str]):
+        """Undo `observe` for documents leaving the index."""
+        self._count(texts, -1)
+
+    def _count(self, texts: Iterable[str], delta: int):
+        buckets = [self.features(text)[0] for text in texts]
+        if not buckets:
+            return
+        np.add.at(self.doc_freq, np.concatenate(buckets), delta)
+        self.docs += delta * len(buckets)
+        self.churn += len(buckets)
+        self._idf = None
+
+    @property
+    def idf(self) -> np.ndarray:
+        if self._idf is None:
+            self._idf = (
+                np.log((1.0 + self.docs) / (1.0 + self.doc_freq)) + 1.0
+            ).astype(np.float32)
+        return self._idf
+
+    def idf_stale(self, docs_at_embedding: int, churn_at_embedding: int) -> bool:
+        """Whether embeddings made when `docs` and `churn` were these are due a refresh."""
+        return self.churn - churn_at_embedding >= max(docs_at_embedding, REWEIGHT_MIN_CHURN)
+
+    # --- Persistence ---
+
+    def settings(self) -> dict[str, Any]:
+        """The parameters that decide which bucket a feature lands in."""
+        return {
+            "dim": self.dim,
+            "word_ngrams": self.word_ngrams,
+            "char_ngrams": list(self.char_ngrams),
+            "char_weight": self.char_weight,
+        }
+
+    def state(self) -> dict[str, Any]:
+        """Settings and document frequencies, as JSON-serializable values."""
+        return {
+            **self.settings(),
+            "docs": self.docs,
+            "churn": self.churn,
+            "doc_freq": self.doc_freq.tolist(),
+        }
+
+    def restore(self, state: dict[str, Any]):
+        """Load the document frequencies from `state`, saved with the same settings."""
+        saved = {key: state.get(key) for key in self.settings()}
+        if saved != self.settings():
+            raise ValueError(f"Embedder settings changed: saved {saved}, now {self.settings()}")
+        doc_freq = np.asarray(state["doc_freq"], dtype=np.int64)
+        if doc_freq.shape != (self.dim,):
+            raise ValueError(f"Expected {self.dim} document frequencies, got {len(doc_freq)}")
+        self.doc_freq = doc_freq
+        self.docs = int(state["docs"])
+        self.churn = int(state.get("churn", state["docs"]))
+        self._idf = None
+
+    # --- Embeddings ---
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """TF-IDF vectors of `texts` as an ``(n, dim)`` array (not normalized)."""
+        features = [self.features(text) for text in texts]
+        out = np.zeros((len(features), self.dim), dtype=np.float32)
+        if not features:
+            return out
+        lengths = [len(buckets) for buckets, _ in features]
+        rows = np.repeat(np.arange(len(features)), lengths)
+        cols = np.concatenate([buckets for buckets, _ in features])
+        weights = np.concatenate([weights for _, weights in features])
+        out[rows, cols] = weights * self.idf[cols]  # buckets are unique per text
+        return out
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "dim": self.dim,
+            "docs": self.docs,
+            "churn": self.churn,
+            "cache_size": len(self._cache),
+            "cache_bytes": self._cached_bytes,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
+
+
+__all__ = ("DIM", "HashedNgramEmbedder", "content_hash", "tokenize")
@@ -10,9 +10,13 @@ from typing import Any
 import yaml
 
 from .parts import AgentCompositionRequest
+from .prompt_library import PromptLibrary
 
 __all__ = ("AgentComposer",)
 
+# Domain files that document the taxonomy rather than define a domain
+UNLISTED_DOMAINS = ("TAXONOMY", "README")
+
 
 class AgentComposer:
     """Compose agent persona from role + domain specifications"""
@@ -34,6 +38,9 @@ class AgentComposer:
         self.roles_path = self.base_path / "roles"
         self.domains_path = self.base_path / "domains"
 
+        # Role/domain name -> file index and parsed specs, checked by mtime
+        self._library = PromptLibrary(self.roles_path, self.domains_path)
+
         # Load agent prompts template for PromptFactory
         self._agent_prompts = self._load_agent_prompts()
 
@@ -78,6 +85,12 @@ class AgentComposer:
             print(f"Error loading {file_path}: {e}", file=sys.stderr)
             return {}
 
+    def reload(self) -> None:
+        """Re-read the prompt library: roles, domains, agent prompts and name mapper"""
+        self._library.reload()
+        self._agent_prompts = self._load_agent_prompts()
+        self._domain_mapper = self._load_domain_mapper()
+
     def load_agent_role(self, role: str) -> dict[str, Any]:
         """Load base agent role specification with enhanced error handling"""
         if not role or not isinstance(role, str):
@@ -86,19 +99,18 @@ class AgentComposer:
         # Sanitize role name
         safe_role = self._sanitize_input(role)
 
-        # Try .md file first
-        agent_file = self.roles_path / f"{safe_role}.md"
-
-        if not agent_file.exists():
-            # Try .yaml as fallback
-            agent_file = self.roles_path / f"{safe_role}.yaml"
-            if not agent_file.exists():
-                available_roles = self.list_available_roles()
-                raise ValueError(
-                    f"Agent role '{role}' not found in {self.roles_path}. "
-                    f"Available roles: {', '.join(available_roles[:10])}"
-                )
-
+        # .md takes precedence over .yaml; parsed once per file version
+        try:
+            return self._library.spec("role", safe_role, self._parse_role_file)
+        except KeyError:
+            available_roles = self.list_available_roles()
+            raise ValueError(
+                f"Agent role '{role}' not found in {self.roles_path}. "
+                f"Available roles: {', '.join(available_roles[:10])}"
+            ) from None
+
+    def _parse_role_file(self, agent_file: Path) -> dict[str, Any]:
+        """Parse a role file: YAML as is, markdown into its identity and sections"""
         if agent_file.suffix == ".yaml":
             return self.load_yaml(agent_file)
 
@@ -147,15 +159,11 @@ class AgentComposer:
         # Sanitize domain name
         safe_domain = self._sanitize_input(domain)
 
-        # First try the old flat structure for backward compatibility
-        domain_file = self.domains_path / f"{safe_domain}.yaml"
-
-        if domain_file.exists():
-            return self.load_yaml(domain_file)
-
-        # Search recursively in taxonomy structure
-        for yaml_file in self.domains_path.rglob(f"{safe_domain}.yaml"):
-            return self.load_yaml(yaml_file)
+        # Flat structure first for backward compatibility, then the taxonomy
+        try:
+            return self._library.spec("domain", safe_domain, self.load_yaml)
+        except KeyError:
+            pass
 
         # Provide helpful error message with available domains
         available_domains = self.list_available_domains()
@@ -916,36 +924,15 @@ Your task includes creating a deliverable document to record your work.
 
     def list_available_roles(self) -> list[str]:
         """List all available agent roles"""
-        roles = [
-            file_path.stem
-            for file_path in self.roles_path.glob("*")
-            if file_path.suffix in [".md", ".yaml"]
-        ]
-        return sorted(roles)
+        return self._library.names("role")
 
     def list_available_domains(self) -> list[str]:
         """List all available domain expertise modules from hierarchical taxonomy"""
-        domains = []
-
-        # Include flat structure domains for backward compatibility
-        domains.extend(
-            file_path.stem
-            for file_path in self.domains_path.glob("*.yaml")
-            if file_path.stem not in ["TAXONOMY", "README"]
-        )
-
-        # Include hierarchical domains
-        domains.extend(
-            file_path.stem
-            for file_path in self.domains_path.rglob("*.yaml")
-            # Skip files in the root (already processed above)
-            if (
-                file_path.parent != self.domains_path
-                and file_path.stem not in ["TAXONOMY", "README"]
-            )
-        )
-
-        return sorted(set(domains))  # Remove duplicates
+        return [
+            domain
+            for domain in self._library.names("domain")
+            if domain not in UNLISTED_DOMAINS
+        ]
 
     def list_domains_by_taxonomy(self) -> dict[str, dict[str, list[str]]]:
         """List domains organized by taxonomy categories"""
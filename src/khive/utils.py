@@ -9,12 +9,13 @@ import os
 import shutil
 import subprocess
 import sys
+import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from functools import cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -697,15 +698,132 @@ def print_step(step: str, status: str = "running") -> None:
 # Set up project root as module-level constant
 PROJECT_ROOT = get_project_root()
 KHIVE_CONFIG_DIR = PROJECT_ROOT / ".khive"
-SQLITE_DSN = f"sqlite+aiosqlite:///{KHIVE_CONFIG_DIR}/claude_hooks.db"
+SQLITE_PATH = KHIVE_CONFIG_DIR / "claude_hooks.db"
+SQLITE_DSN = f"sqlite+aiosqlite:///{SQLITE_PATH}"
+HOOK_SPOOL_DIR = KHIVE_CONFIG_DIR / "spool"
+COORDINATION_STATE_DIR = KHIVE_CONFIG_DIR / "coordination"
+SEMANTIC_INDEX_DIR = KHIVE_CONFIG_DIR / "semantic_index"
+
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "block"]
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class _Subscription:
+    """One subscriber's bounded queue and the task that feeds it."""
+
+    def __init__(self, callback: Callable[[Any], Any], maxsize: int, overflow: OverflowPolicy):
+        if overflow not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self.callback = callback
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.queue: asyncio.Queue | None = None
+        self.task: asyncio.Task | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def _consumer(self) -> asyncio.Queue:
+        """
+        Queue for the running loop; callers may use a fresh loop per call.
+
+        Events still queued on a previous loop can never be delivered
+        (its consumer task died with it) and are counted as dropped.
+        Publishers on short-lived loops should `drain()` before returning.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop or self.task is None or self.task.done():
+            if self.queue is not None:
+                self.dropped += self.queue.qsize()
+            self.queue = asyncio.Queue(self.maxsize)
+            self.loop = loop
+            self.task = loop.create_task(self._consume())
+        return self.queue
+
+    async def put(self, event: Any):
+        queue = self._consumer()
+        item = (time.perf_counter(), event)
+        if queue.full():
+            if self.overflow == "drop_newest":
+                self.dropped += 1
+                return
+            if self.overflow == "drop_oldest":
+                queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+            else:  # block: the broadcaster waits for room
+                await queue.put(item)
+                return
+        queue.put_nowait(item)
+
+    async def _consume(self):
+        queue = self.queue
+        while True:
+            queued_at, event = await queue.get()
+            lag_ms = (time.perf_counter() - queued_at) * 1000
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            try:
+                result = self.callback(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except asyncio.CancelledError:
+                self.dropped += 1  # Its loop ended, or unsubscribed, mid-event
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.getLogger(__name__).warning(f"Event subscriber {self.name} failed: {e}")
+            finally:
+                queue.task_done()
+
+    @property
+    def name(self) -> str:
+        return getattr(self.callback, "__qualname__", repr(self.callback))
+
+    @property
+    def pending(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    async def drain(self):
+        if self.queue is not None and self.loop is asyncio.get_running_loop():
+            await self.queue.join()
+
+    def close(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscriber": self.name,
+            "overflow": self.overflow,
+            "capacity": self.maxsize,
+            "pending": self.pending,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+        }
 
 
 class EventBroadcaster:
-    """Real-time event broadcasting system for hook events."""
+    """
+    Real-time event broadcasting system for hook events.
+
+    Every subscriber gets its own bounded queue and consumer task, so
+    `broadcast` returns once the event is queued and a slow subscriber
+    only delays itself. When a queue is full, the subscriber's overflow
+    policy decides: drop its oldest queued event (default), drop the new
+    one, or block the broadcaster until there is room.
+    """
 
     _instance: ClassVar[EventBroadcaster | None] = None
-    _subscribers: ClassVar[list[Callable[[Any], None]]] = []
-    _async_subscribers: ClassVar[list[Callable[[Any], Any]]] = []
+    _subscriptions: ClassVar[dict[Callable[[Any], Any], _Subscription]] = {}
     _event_type: ClassVar[type]
 
     def __new__(cls):
@@ -714,46 +832,50 @@ class EventBroadcaster:
         return cls._instance
 
     @classmethod
-    def subscribe(cls, callback: Callable[[Any], None]) -> None:
-        """Subscribe to hook events with sync callback."""
-        if callback not in cls._subscribers:
-            cls._subscribers.append(callback)
+    def subscribe(
+        cls,
+        callback: Callable[[Any], Any],
+        maxsize: int = SUBSCRIBER_QUEUE_SIZE,
+        overflow: OverflowPolicy = "drop_oldest",
+    ) -> None:
+        """Subscribe to hook events with a sync or async callback."""
+        if callback not in cls._subscriptions:
+            cls._subscriptions[callback] = _Subscription(callback, maxsize, overflow)
 
     @classmethod
-    def subscribe_async(cls, callback: Callable[[Any], Any]) -> None:
+    def subscribe_async(
+        cls,
+        callback: Callable[[Any], Any],
+        maxsize: int = SUBSCRIBER_QUEUE_SIZE,
+        overflow: OverflowPolicy = "drop_oldest",
+    ) -> None:
         """Subscribe to hook events with async callback."""
-        if callback not in cls._async_subscribers:
-            cls._async_subscribers.append(callback)
+        cls.subscribe(callback, maxsize, overflow)
 
     @classmethod
-    def unsubscribe(cls, callback: Callable[[Any], None]) -> None:
-        """Unsubscribe from hook events."""
-        if callback in cls._subscribers:
-            cls._subscribers.remove(callback)
-        if callback in cls._async_subscribers:
-            cls._async_subscribers.remove(callback)
+    def unsubscribe(cls, callback: Callable[[Any], Any]) -> None:
+        """Unsubscribe from hook events; events still queued are discarded."""
+        if subscription := cls._subscriptions.pop(callback, None):
+            subscription.close()
 
     @classmethod
     async def broadcast(cls, event) -> None:
-        """Broadcast event to all subscribers."""
-        # Sync callbacks
-        for callback in cls._subscribers:
-            try:
-                callback(event)
-            except Exception as e:
-                print(f"Error in sync subscriber callback: {e}")
+        """Queue event for every subscriber."""
+        for subscription in list(cls._subscriptions.values()):
+            await subscription.put(event)
 
-        # Async callbacks
-        for callback in cls._async_subscribers:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event)
-                else:
-                    callback(event)
-            except Exception as e:
-                print(f"Error in async subscriber callback: {e}")
+    @classmethod
+    async def drain(cls) -> None:
+        """Wait until every subscriber has handled what is queued for it."""
+        for subscription in list(cls._subscriptions.values()):
+            await subscription.drain()
 
     @classmethod
     def get_subscriber_count(cls) -> int:
         """Get total number of subscribers."""
-        return len(cls._subscribers) + len(cls._async_subscribers)
+        return len(cls._subscriptions)
+
+    @classmethod
+    def get_subscriber_stats(cls) -> list[dict[str, Any]]:
+        """Per-subscriber queue depth, lag, delivery and drop counters."""
+        return [s.stats() for s in cls._subscriptions.values()]
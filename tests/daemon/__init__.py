@@ -0,0 +1 @@
+"""Test daemon package."""
@@ -0,0 +1,151 @@
+"""Tests for the push-based coordination change stream."""
+
+import asyncio
+
+import pytest
+
+from khive.daemon.event_stream import CoordinationEventStream, format_sse
+from khive.services.claude.hooks import coordination
+from khive.services.claude.hooks.coordination import CoordinationRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    reg = CoordinationRegistry()
+    reg.register_agent_work("agent-a", "refactor the parser module")
+    return reg
+
+
+@pytest.mark.unit
+class TestRegistryChangeFeed:
+    def test_mutations_emit_sequenced_events(self, registry, tmp_path):
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+
+        registry.request_file_lock("agent-a", str(target))
+        registry.renew_file_lock("agent-a", str(target))
+        registry.share_artifact("agent-a", "notes")
+        registry.complete_work("agent-a")
+
+        kinds = [e.kind for e in registry.event_log]
+        assert kinds == [
+            "agent_registered",
+            "lock_granted",
+            "lock_renewed",
+            "artifact_shared",
+            "lock_released",
+            "agent_completed",
+        ]
+        assert [e.seq for e in registry.event_log] == list(range(1, 7))
+        assert registry.file_locks == {}
+
+    def test_events_since_resumes_without_gaps(self, registry):
+        registry.register_agent_work("agent-b", "write database migration tests")
+        assert [e.kind for e in registry.events_since(1)] == ["agent_registered"]
+        assert registry.events_since(registry.event_seq) == []
+
+    def test_events_since_requires_resync_after_eviction(self, monkeypatch):
+        monkeypatch.setattr(coordination, "EVENT_LOG_SIZE", 3)
+        reg = CoordinationRegistry()
+        for i in range(5):
+            reg.share_artifact(f"agent-{i}", "content")
+        assert reg.events_since(0) is None
+        assert [e.seq for e in reg.events_since(2)] == [3, 4, 5]
+
+    def test_expired_lock_emits_expiry(self, registry, tmp_path):
+        target = tmp_path / "b.py"
+        target.write_text("")
+        registry.request_file_lock("agent-a", str(target))
+        next(iter(registry.file_locks.values())).lock_duration_seconds = -1
+
+        registry.request_file_lock("agent-b", str(target))
+        kinds = [e.kind for e in registry.event_log]
+        assert kinds[-2:] == ["lock_expired", "lock_granted"]
+
+    def test_expiry_heap_skips_renewed_and_released_locks(self, registry, tmp_path):
+        paths = [tmp_path / f"{name}.py" for name in "abc"]
+        for path in paths:
+            path.write_text("")
+            registry.request_file_lock("agent-a", str(path))
+        locks = list(registry.file_locks.values())
+        deadline_c = locks[2].expires_at
+
+        locks[0].lock_duration_seconds += 60  # renewal pushes a later deadline
+        registry.renew_file_lock("agent-a", str(paths[0]))
+        registry.release_file_lock("agent-a", str(paths[1]))
+        assert len(registry._lock_heap) == 4  # stale entries stay until popped
+
+        assert registry.expire_locks(now=deadline_c + 1) == [locks[2]]
+        assert 0 < registry.next_lock_expiry() <= 360
+        assert registry.expire_locks(now=locks[0].expires_at + 1) == [locks[0]]
+        assert registry.file_locks == {}
+        assert registry.next_lock_expiry() is None
+        assert registry.active_agents["agent-a"].files_editing == []
+        kinds = [e.kind for e in registry.event_log]
+        assert kinds[-2:] == ["lock_expired", "lock_expired"]
+
+    @pytest.mark.asyncio
+    async def test_daemon_sweeper_expires_locks(self, registry, tmp_path, monkeypatch):
+        from khive.daemon import server as server_module
+
+        monkeypatch.setattr(server_module, "LOCK_SWEEP_MAX_SECONDS", 0.01)
+        daemon = server_module.KhiveDaemonServer()
+        daemon.coordination_registry = registry
+        target = tmp_path / "c.py"
+        target.write_text("")
+        registry.request_file_lock("agent-a", str(target))
+        next(iter(registry.file_locks.values())).lock_duration_seconds = 0.02
+        registry._lock_heap.clear()  # re-track with the shortened deadline
+        registry._schedule_expiry(*next(iter(registry.file_locks.items())))
+
+        sweeper = asyncio.create_task(daemon._lock_sweep_loop())
+        for _ in range(100):
+            if not registry.file_locks:
+                break
+            await asyncio.sleep(0.01)
+        sweeper.cancel()
+        assert registry.file_locks == {}
+        assert registry.event_log[-1].kind == "lock_expired"
+
+
+@pytest.mark.unit
+class TestCoordinationEventStream:
+    @pytest.mark.asyncio
+    async def test_starts_with_snapshot_then_streams_changes(self, registry):
+        stream = CoordinationEventStream(registry, heartbeat_seconds=5)
+        events = stream.iter_events()
+
+        snapshot = await events.__anext__()
+        assert snapshot["kind"] == "snapshot"
+        assert snapshot["seq"] == registry.event_seq
+        assert snapshot["data"]["active_agents"] == 1
+
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+        registry.share_artifact("agent-a", "handoff")
+        event = await asyncio.wait_for(pending, 1)
+        assert event["kind"] == "artifact_shared"
+        assert event["seq"] == snapshot["seq"] + 1
+        await events.aclose()
+        assert stream.subscribers == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_only_missed_events(self, registry):
+        registry.share_artifact("agent-a", "one")
+        stream = CoordinationEventStream(registry)
+        events = stream.iter_events(since=1)
+        assert (await events.__anext__())["kind"] == "artifact_shared"
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self, registry):
+        stream = CoordinationEventStream(registry, heartbeat_seconds=0.01)
+        events = stream.iter_events(since=registry.event_seq)
+        assert await events.__anext__() is None
+        await events.aclose()
+
+    def test_format_sse(self):
+        frame = format_sse({"seq": 7, "kind": "lock_granted", "data": {}})
+        assert frame.startswith("id: 7\nevent: lock_granted\ndata: ")
+        assert frame.endswith("\n\n")
+        assert format_sse(None) == ": heartbeat\n\n"
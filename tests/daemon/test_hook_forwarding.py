@@ -0,0 +1,149 @@
+"""Tests for the lightweight hook entry point and the daemon hook endpoint."""
+
+import functools
+import io
+import json
+import socket
+import types
+
+import pytest
+
+from khive.daemon import server as server_module
+from khive.daemon.liveness import DaemonLiveness
+from khive.services.claude.hooks import entry
+from khive.services.claude.hooks.entry import HookResponse, respond_safely, run_hook
+from tests.performance.load_harness import in_process_daemon
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _exit_code(fn, *args) -> int:
+    with pytest.raises(SystemExit) as exc:
+        fn(*args)
+    return exc.value.code
+
+
+@pytest.mark.unit
+class TestEntry:
+    def test_respond_safely_turns_errors_into_proceed(self):
+        def boom(_hook_input):
+            raise RuntimeError("db locked")
+
+        response = respond_safely("pre_edit", {}, boom)
+
+        assert response.exit_code == 0
+        assert response.output == {"proceed": True, "error": "db locked"}
+        assert response.stderr == "Error in pre-edit hook: db locked"
+        assert respond_safely("post_edit", {}, boom).output == {"error": "db locked"}
+
+    def test_run_hook_emits_response(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.stdin", io.StringIO('{"session_id": "s1"}'))
+        monkeypatch.setenv("CLAUDE_AGENT_ID", "agent-7")
+        respond = lambda hook_input: HookResponse({"seen": hook_input}, 2, "blocked")
+
+        assert _exit_code(run_hook, "pre_edit", respond) == 2
+        out, err = capsys.readouterr()
+        assert json.loads(out) == {
+            "seen": {"session_id": "s1", "khive_env": {"CLAUDE_AGENT_ID": "agent-7"}}
+        }
+        assert err.strip() == "blocked"
+
+    def test_forwarded_input_carries_the_hook_environment(self, monkeypatch, capsys):
+        monkeypatch.setenv("CLAUDE_AGENT_ID", "agent-7")
+        monkeypatch.setattr(entry.DaemonLiveness, "is_alive", lambda self: True)
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b'{"x": 1}')))
+        sent = []
+
+        def forward(hook_type, body):
+            sent.append(json.loads(body))
+            return HookResponse({"proceed": True})
+
+        monkeypatch.setattr(entry, "forward", forward)
+
+        assert _exit_code(entry.main, ["pre_edit"]) == 0
+        assert sent == [{"x": 1, "khive_env": {"CLAUDE_AGENT_ID": "agent-7"}}]
+        assert entry.hook_env(sent[0], "CLAUDE_AGENT_ID") == "agent-7"
+        assert entry.hook_env({}, "CLAUDE_AGENT_ID", "none") == "none"
+
+    def test_pre_edit_uses_the_hook_env_and_returns_its_warnings(self, monkeypatch):
+        from khive.services.claude.hooks import pre_edit
+
+        class Client:
+            base_url = "http://daemon"
+
+            def is_running(self):
+                return True
+
+            @property
+            def client(self):
+                return self
+
+            def post(self, url, json):
+                raise OSError("connection reset")
+
+        monkeypatch.setenv("CLAUDE_AGENT_ID", "the-daemons-own")
+        monkeypatch.setattr(pre_edit, "get_daemon_client", Client)
+        response = pre_edit.respond(
+            {"tool_input": {"file_path": "/tmp/a.py"}, "khive_env": {"CLAUDE_AGENT_ID": "agent-7"}}
+        )
+
+        assert response.exit_code == 0
+        assert response.output["agent_id"] == "agent-7"
+        assert response.stderr == (
+            "Warning: Could not check file lock for /tmp/a.py: connection reset"
+        )
+        assert pre_edit.respond({"tool_input": {}}).output["agent_id"] == "agent_unknown"
+
+    def test_invalid_stdin_never_blocks(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.stdin", io.StringIO("not json"))
+
+        assert _exit_code(run_hook, "pre_command", lambda _: HookResponse()) == 0
+        assert json.loads(capsys.readouterr().out)["proceed"] is True
+
+    def test_unreachable_daemon_falls_back_to_full_hook(
+        self, monkeypatch, tmp_path, capsys
+    ):
+        monkeypatch.setattr(entry, "DAEMON_URL", _closed_port_url())
+        monkeypatch.setattr(
+            entry,
+            "DaemonLiveness",
+            functools.partial(DaemonLiveness, path=tmp_path / "daemon.state"),
+        )
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b'{"x": 1}')))
+        ran = []
+        full_hook = types.SimpleNamespace(
+            main=lambda: ran.append(json.load(entry.sys.stdin))
+        )
+        monkeypatch.setattr(entry.importlib, "import_module", lambda name: full_hook)
+
+        entry.main(["notification"])
+
+        assert ran == [{"x": 1}]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_daemon_runs_forwarded_hooks(monkeypatch):
+    calls = []
+
+    def fake_respond_safely(hook_type, hook_input):
+        calls.append((hook_type, hook_input))
+        return HookResponse({"proceed": False}, 2, "file locked")
+
+    monkeypatch.setattr(server_module, "respond_safely", fake_respond_safely)
+    async with in_process_daemon() as client:
+        response = await client.post("/api/hooks/pre_edit", json={"session_id": "s1"})
+        unknown = await client.post("/api/hooks/process", json={})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "output": {"proceed": False},
+        "exit_code": 2,
+        "stderr": "file locked",
+    }
+    assert calls == [("pre_edit", {"session_id": "s1"})]
+    assert unknown.status_code == 404
@@ -0,0 +1,284 @@
+"""Tests for the daemon's batched hook event ingestion."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import uuid
+
+import pytest
+
+from khive.daemon import server as server_module
+from khive.daemon.ingest import HookEventIngestor, IngestBackpressure, IngestorClosed
+from tests.performance.load_harness import in_process_daemon
+
+
+class FakeEvent:
+    """Anything with lionagi's ``to_dict(mode="db")`` can be ingested."""
+
+    def __init__(self, event_id: str | None = None):
+        self.id = event_id or str(uuid.uuid4())
+
+    def to_dict(self, mode: str = "python") -> dict:
+        return {
+            "id": self.id,
+            "content": {"event_type": "post_edit", "tool_name": "Edit"},
+            "node_metadata": {"lion_class": "FakeEvent"},
+            "created_at": "2026-01-01 00:00:00.000000+00:00",
+            "embedding": None,
+        }
+
+
+def _rows(db_path) -> list[tuple]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT id, content FROM hook_events").fetchall()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestHookEventIngestor:
+    async def test_batches_writes_and_notifies_after_commit(self, tmp_path):
+        db_path = tmp_path / "hooks.db"
+        ingestor = HookEventIngestor(db_path, batch_size=64)
+        seen = []
+
+        async def on_event(event):
+            # Subscribers only ever see committed events
+            seen.append((event.id, event.id in {r[0] for r in _rows(db_path)}))
+
+        ingestor.subscribe(on_event)
+        ingestor.start()
+        events = [FakeEvent() for _ in range(200)]
+        for event in events:
+            await ingestor.submit(event)
+        await ingestor.stop()
+
+        assert len(_rows(db_path)) == 200
+        assert [event_id for event_id, _ in seen] == [e.id for e in events]
+        assert all(committed for _, committed in seen)
+        stats = ingestor.stats()
+        assert stats["written"] == 200
+        assert stats["batches"] < 200 / 2  # queued events share transactions
+        assert stats["avg_batch_size"] > 2
+
+    async def test_uses_wal_and_ignores_duplicate_ids(self, tmp_path):
+        db_path = tmp_path / "hooks.db"
+        ingestor = HookEventIngestor(db_path)
+        ingestor.start()
+        await ingestor.submit(FakeEvent("same"))
+        await ingestor.submit(FakeEvent("same"))
+        await ingestor.stop()
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert len(_rows(db_path)) == 1
+        assert ingestor.stats()["duplicates"] == 1
+
+    async def test_full_queue_applies_backpressure(self, tmp_path):
+        ingestor = HookEventIngestor(tmp_path / "hooks.db", max_queue=2, enqueue_timeout=0.05)
+        ingestor.start()
+        release = threading.Event()
+        # Hold the writer thread so the queue cannot drain
+        ingestor._executor.submit(release.wait)
+
+        with pytest.raises(IngestBackpressure):
+            for _ in range(10):
+                await ingestor.submit(FakeEvent())
+        release.set()
+        await ingestor.stop()
+
+        stats = ingestor.stats()
+        assert stats["rejected"] == 1
+        assert stats["producer_waits"] >= 1
+        assert stats["max_queue_depth"] == 2
+
+    async def test_enqueue_from_another_thread(self, tmp_path):
+        db_path = tmp_path / "hooks.db"
+        ingestor = HookEventIngestor(db_path)
+        ingestor.start()
+
+        # Hooks run in an executor with their own event loop
+        def run_hook():
+            asyncio.run(ingestor.enqueue(FakeEvent("from-thread")))
+
+        await asyncio.get_running_loop().run_in_executor(None, run_hook)
+        await ingestor.stop()
+
+        assert [r[0] for r in _rows(db_path)] == ["from-thread"]
+
+    async def test_retries_a_failed_batch(self, tmp_path):
+        db_path = tmp_path / "hooks.db"
+        ingestor = HookEventIngestor(db_path, retry_backoff=0.001)
+        insert, failures = ingestor._insert, [sqlite3.OperationalError("database is locked")]
+
+        def flaky_insert(rows):
+            if failures:
+                raise failures.pop()
+            return insert(rows)
+
+        ingestor._insert = flaky_insert
+        ingestor.start()
+        await ingestor.submit(FakeEvent("retried"))
+        await ingestor.stop()
+
+        assert [r[0] for r in _rows(db_path)] == ["retried"]
+        stats = ingestor.stats()
+        assert stats["retries"] == 1 and stats["failed_batches"] == 0
+
+    async def test_spools_a_batch_that_keeps_failing(self, tmp_path):
+        from khive.services.claude.hooks.spool import import_spool
+
+        db_path, spool_dir = tmp_path / "hooks.db", tmp_path / "spool"
+        ingestor = HookEventIngestor(
+            db_path, spool_dir=spool_dir, write_retries=2, retry_backoff=0.001
+        )
+        seen = []
+        ingestor.subscribe(seen.append)
+
+        def failing_insert(rows):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        ingestor._insert = failing_insert
+        ingestor.start()
+        for i in range(3):
+            await ingestor.submit(FakeEvent(f"spooled-{i}"))
+        await ingestor.stop()
+
+        stats = ingestor.stats()
+        assert stats["retries"] == 2 and stats["failed_batches"] == 1
+        assert stats["spooled"] == 3 and stats["lost"] == 0 and stats["written"] == 0
+        assert seen == []  # never committed, so never broadcast
+
+        # The next spool import (after this process exits) replays them
+        (spooled,) = spool_dir.iterdir()
+        spooled.rename(spool_dir / "1999999999-ingest.ndjson")
+        assert import_spool(spool_dir, db_path=db_path)["imported"] == 3
+        assert sorted(r[0] for r in _rows(db_path)) == [f"spooled-{i}" for i in range(3)]
+        assert json.loads(_rows(db_path)[0][1]) == FakeEvent().to_dict()["content"]
+
+    async def test_rejects_events_when_stopped(self, tmp_path):
+        ingestor = HookEventIngestor(tmp_path / "hooks.db")
+
+        with pytest.raises(IngestorClosed):
+            await ingestor.submit(FakeEvent())
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_ingests_posted_and_saved_events():
+    from khive.services.claude.hooks.hook_event import HookEvent, HookEventBroadcaster
+
+    broadcast = []
+
+    async def on_event(event):
+        broadcast.append(event.id)
+
+    HookEventBroadcaster.subscribe_async(on_event)
+    try:
+        async with in_process_daemon() as client:
+            content = {"event_type": "post_command", "tool_name": "Bash"}
+            response = await client.post(
+                "/api/hooks/events",
+                json={"events": [{"content": content} for _ in range(5)]},
+            )
+            assert response.status_code == 202
+            assert response.json()["accepted"] == 5
+
+            # Inside the daemon, HookEvent.save() goes through the ingestor
+            saved = HookEvent(content=content)
+            await saved.save()
+
+            invalid = await client.post(
+                "/api/hooks/events", json={"events": [{"content": {}}]}
+            )
+            assert invalid.status_code == 422
+
+            for _ in range(100):
+                stats = (await client.get("/api/stats")).json()["ingest"]
+                if stats["written"] == 6:
+                    break
+                await asyncio.sleep(0.01)
+            assert stats["written"] == 6
+        assert saved.id in broadcast
+        assert len(broadcast) == 6
+        assert HookEvent._sink is None  # detached on shutdown
+    finally:
+        HookEventBroadcaster.unsubscribe(on_event)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_imports_offline_spool_on_startup(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_module, "WARMUP_ENABLED", False)
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    offline = spool_dir / "1999999999-offline.ndjson"  # writer long gone
+    offline.write_text(
+        "\n".join(
+            json.dumps(FakeEvent(f"offline-{i}").to_dict()) for i in range(3)
+        )
+        + "\n"
+    )
+    daemon = server_module.KhiveDaemonServer()
+    daemon.ingestor = HookEventIngestor(tmp_path / "hooks.db", spool_dir=spool_dir)
+    daemon.spool_dir = spool_dir
+    daemon.coordination_state_dir = tmp_path / "coordination"
+
+    await daemon.startup()
+    await daemon.shutdown()
+
+    assert daemon.spool_import["imported"] == 3
+    assert daemon.startup_report()["spool_import"]["files"] == 1
+    assert sorted(r[0] for r in _rows(tmp_path / "hooks.db")) == [
+        "offline-0",
+        "offline-1",
+        "offline-2",
+    ]
+    assert not offline.exists()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_serves_hook_rollups(tmp_path, monkeypatch):
+    import httpx
+
+    monkeypatch.setattr(server_module, "WARMUP_ENABLED", False)
+    daemon = server_module.KhiveDaemonServer()
+    daemon.ingestor = HookEventIngestor(tmp_path / "hooks.db")
+    daemon.spool_dir = tmp_path / "spool"
+    daemon.coordination_state_dir = tmp_path / "coordination"
+
+    await daemon.startup()
+    try:
+        for i in range(3):
+            await daemon.ingestor.submit(FakeEvent(f"event-{i}"))
+        for _ in range(100):
+            if daemon.ingestor.stats()["written"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        result = await daemon.retention.run_once(daemon.ingestor.run_on_connection)
+        assert result["rolled_up"] == 3
+
+        transport = httpx.ASGITransport(app=daemon.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://d") as client:
+            response = await client.get(
+                "/api/hooks/rollups", params={"group_by": "event_type,tool_name"}
+            )
+            bad = await client.get("/api/hooks/rollups", params={"group_by": "id"})
+            stats = (await client.get("/api/stats")).json()
+    finally:
+        await daemon.shutdown()
+
+    assert response.json()["rollups"] == [
+        {
+            "hour": "2026-01-01 00:00:00",
+            "event_type": "post_edit",
+            "tool_name": "Edit",
+            "count": 3,
+            "duration_avg_ms": None,
+            "duration_min_ms": None,
+            "duration_max_ms": None,
+        }
+    ]
+    assert bad.status_code == 422
+    assert stats["retention"]["rolled_up"] == 3
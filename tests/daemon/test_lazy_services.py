@@ -0,0 +1,122 @@
+"""Tests for lazy daemon service initialization."""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from khive.daemon.lazy_services import LazyService, warm_up
+
+
+def _counting_factory(calls):
+    def factory(module):
+        calls.append(module.__name__)
+        return object()
+
+    return factory
+
+
+@pytest.mark.unit
+class TestLazyService:
+    @pytest.mark.asyncio
+    async def test_concurrent_first_use_builds_once(self):
+        calls = []
+        service = LazyService("json", "json", _counting_factory(calls))
+
+        results = await asyncio.gather(*(service.get() for _ in range(20)))
+
+        assert calls == ["json"]
+        assert all(r is results[0] for r in results)
+        report = service.report()
+        assert report["state"] == "ready"
+        assert report["initialized_by"] == "request"
+        assert report["import_ms"] is not None and report["init_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_service_returns_none_and_records_error(self):
+        def boom(_module):
+            raise RuntimeError("no config")
+
+        service = LazyService("broken", "json", boom)
+        assert await service.get() is None
+        assert service.state == "failed"
+        assert service.report()["error"] == "no config"
+
+    @pytest.mark.asyncio
+    async def test_failed_service_is_retried_after_backoff(self):
+        attempts = []
+
+        def flaky(module):
+            attempts.append(module.__name__)
+            if len(attempts) < 3:
+                raise RuntimeError("not yet")
+            return "service"
+
+        service = LazyService("flaky", "json", flaky, retry_backoff=0.02)
+        assert await service.get() is None
+        assert await service.get() is None  # within the backoff: not rebuilt
+        assert len(attempts) == 1 and service.report()["failures"] == 1
+
+        await asyncio.sleep(0.03)
+        assert await service.get() is None
+        assert service.failures == 2  # backoff doubled to 0.04s
+        await asyncio.sleep(0.03)
+        assert await service.get() is None and len(attempts) == 2
+
+        await asyncio.sleep(0.02)
+        assert await service.get() == "service"
+        report = service.report()
+        assert (report["state"], report["failures"], report["error"]) == ("ready", 0, None)
+
+    @pytest.mark.asyncio
+    async def test_missing_module_fails_cleanly(self):
+        service = LazyService("ghost", "khive.does_not_exist", lambda m: m)
+        assert await service.get() is None
+        assert service.state == "failed"
+
+    @pytest.mark.asyncio
+    async def test_warm_up_marks_services(self):
+        services = {
+            "a": LazyService("a", "json", lambda m: 1),
+            "b": LazyService("b", "csv", lambda m: 2),
+        }
+        await warm_up(services)
+        assert [s.initialized_by for s in services.values()] == ["warmup"] * 2
+        assert services["b"].instance == 2
+
+
+@pytest.mark.unit
+def test_daemon_server_import_defers_heavy_services():
+    """Importing the daemon must not pull in lionagi or the service modules."""
+    code = (
+        "import sys, khive.daemon.server\n"
+        "heavy = [m for m in ('lionagi', 'khive.services.plan.service',"
+        " 'khive.services.composition.agent_composer',"
+        " 'khive.services.artifacts.factory') if m in sys.modules]\n"
+        "print(','.join(heavy))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_shutdown_cancels_pending_warmup(tmp_path, monkeypatch):
+    from khive.daemon import server as server_module
+    from khive.daemon.ingest import HookEventIngestor
+
+    monkeypatch.setattr(server_module, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(server_module, "WARMUP_DELAY_SECONDS", 60.0)
+    daemon = server_module.KhiveDaemonServer()
+    daemon.spool_dir = tmp_path / "spool"
+    daemon.ingestor = HookEventIngestor(tmp_path / "hooks.db", spool_dir=daemon.spool_dir)
+    daemon.coordination_state_dir = tmp_path / "coordination"
+
+    await daemon.startup()
+    await daemon.shutdown()
+
+    assert daemon._warmup_task.cancelled()
+    assert all(s.state == "pending" for s in daemon.services.values())
@@ -0,0 +1,160 @@
+"""Tests for the shared daemon liveness cache and circuit breaker."""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from khive.daemon.client import KhiveDaemonClient
+from khive.daemon.liveness import (
+    DaemonLiveness,
+    clear_daemon_state,
+    normalize_url,
+    read_daemon_record,
+    read_state,
+    write_daemon_state,
+)
+
+URL = "http://127.0.0.1:11634"
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return tmp_path / "daemon.state"
+
+
+@pytest.fixture
+def no_probe(monkeypatch):
+    """Fail the test if anything touches the network."""
+
+    def probe(self, timeout=0):
+        raise AssertionError("unexpected /health probe")
+
+    monkeypatch.setattr(DaemonLiveness, "probe", probe)
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.mark.unit
+class TestDaemonLiveness:
+    def test_normalize_url_shares_localhost_circuit(self):
+        assert normalize_url("http://localhost:11634/") == URL
+        assert normalize_url("http://0.0.0.0:11634") == URL
+
+    def test_daemon_state_is_seen_by_other_clients(self, state_file, no_probe):
+        write_daemon_state("http://localhost:11634", path=state_file)
+
+        assert read_daemon_record(state_file)["pid"] == os.getpid()
+        assert DaemonLiveness(URL, path=state_file).cached() is True
+
+    def test_stopped_daemon_fails_fast_without_probing(self, state_file, no_probe):
+        write_daemon_state(URL, path=state_file)
+        clear_daemon_state(URL, path=state_file)
+
+        liveness = DaemonLiveness(URL, path=state_file)
+        started = time.perf_counter()
+        results = [liveness.is_alive() for _ in range(1000)]
+        per_call_us = (time.perf_counter() - started) * 1e6 / 1000
+
+        assert not any(results)
+        assert read_daemon_record(state_file) is None
+        assert per_call_us < 1000  # State-file read, not a connect timeout
+
+    def test_dead_daemon_pid_opens_circuit(self, state_file, no_probe):
+        write_daemon_state(URL, pid=_dead_pid(), path=state_file)
+
+        liveness = DaemonLiveness(URL, path=state_file)
+        assert liveness.cached() is False
+        assert read_state(state_file)["circuits"][URL]["state"] == "open"
+        assert not liveness.allow_request()
+
+    def test_half_open_probe_is_claimed_by_one_caller(self, state_file):
+        url = _closed_port_url()
+        first = DaemonLiveness(url, path=state_file, open_seconds=0.0)
+        assert first.is_alive() is False  # Real probe: connection refused
+
+        other = DaemonLiveness(url, path=state_file)
+        assert first.cached() is None  # Window elapsed - first claims the probe
+        assert other.cached() is False  # ...and others keep failing fast
+        assert first.allow_request()
+
+    def test_failed_probes_back_off(self, state_file):
+        liveness = DaemonLiveness(
+            _closed_port_url(), path=state_file, open_seconds=0.0001
+        )
+        for _ in range(3):
+            time.sleep(0.001)
+            liveness.is_alive()
+        circuit = liveness.circuit
+        assert circuit["failures"] == 3
+        assert circuit["state"] == "open"
+
+    def test_successful_probe_closes_circuit(self, state_file, monkeypatch):
+        probes = []
+        monkeypatch.setattr(
+            DaemonLiveness, "probe", lambda self, timeout=0: probes.append(1) or True
+        )
+        liveness = DaemonLiveness(URL, path=state_file, ttl=60, open_seconds=0.0)
+        liveness.record_failure()
+
+        assert liveness.is_alive() is True  # Half-open probe succeeds
+        assert liveness.is_alive() is True  # Cached for the TTL
+        assert probes == [1]
+        assert read_state(state_file)["circuits"][URL]["state"] == "closed"
+
+    def test_remote_urls_are_not_persisted(self, state_file):
+        liveness = DaemonLiveness("http://khive-daemon", path=state_file)
+        liveness.record_failure()
+        assert not state_file.exists()
+        assert liveness.cached() is False
+
+
+@pytest.mark.unit
+def test_client_short_circuits_while_daemon_is_down(tmp_path):
+    client = KhiveDaemonClient(_closed_port_url())
+    client.liveness.path = tmp_path / "daemon.state"
+
+    assert client.is_running() is False
+    started = time.perf_counter()
+    assert client.register_file_operation("/tmp/a.py", "agent")["can_proceed"]
+    assert client.is_running() is False
+    assert time.perf_counter() - started < 0.1  # No transport retries
+    assert client.liveness.state == "open"
+
+
+@pytest.mark.unit
+def test_slow_replies_leave_the_circuit_closed(tmp_path):
+    def handler(request):
+        if request.url.path == "/api/plan":
+            raise httpx.ReadTimeout("slow plan", request=request)
+        raise httpx.ConnectError("refused", request=request)
+
+    client = KhiveDaemonClient(URL)
+    client.liveness.path = tmp_path / "daemon.state"
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(httpx.ReadTimeout):
+        client._make_sync_request("POST", f"{URL}/api/plan")
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(client._make_async_request("POST", f"{URL}/api/plan"))
+    assert client.liveness.state != "open"
+
+    with pytest.raises(httpx.ConnectError):
+        client._make_sync_request("GET", f"{URL}/health")
+    assert client.liveness.state == "open"
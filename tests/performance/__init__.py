@@ -0,0 +1 @@
+"""Daemon load and performance tests."""
@@ -0,0 +1,428 @@
+"""Load-testing harness for the khive daemon.
+
+Drives scripted, concurrent scenarios against either an in-process
+KhiveDaemonServer (via httpx's ASGI transport) or a running local daemon,
+and reports throughput, p50/p99 latency and error rates. Results can be
+compared with a JSON baseline so regressions fail the performance suite.
+
+Run against a local daemon:
+    python -m tests.performance.load_harness --url http://127.0.0.1:11634
+
+Refresh the committed baseline (in-process):
+    python -m tests.performance.load_harness --update-baseline
+
+Absolute throughput and latency depend on the machine, so every run also
+times the ``calibration`` scenario (bare ``/health`` requests) and scales
+the baseline by how fast this machine served it compared with the one
+that recorded the baseline. The suite enforces the committed baseline by
+default; ``KHIVE_LOAD_BASELINE=PATH`` compares with one recorded locally
+(``--update-baseline --baseline PATH``) and ``KHIVE_SKIP_LOAD_BASELINE=1``
+turns the comparison off.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "daemon_load.json"
+BASELINE_ENV = "KHIVE_LOAD_BASELINE"
+SKIP_BASELINE_ENV = "KHIVE_SKIP_LOAD_BASELINE"
+CALIBRATION = "calibration"
+
+# Files shared by lock-contention agents; fewer files -> more conflicts
+SHARED_FILES = 8
+
+
+@dataclass
+class ScenarioResult:
+    """Aggregated outcome of one scenario run."""
+
+    name: str
+    duration_seconds: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+    status_counts: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def throughput_rps(self) -> float:
+        return self.requests / self.duration_seconds if self.duration_seconds else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "throughput_rps": round(self.throughput_rps, 1),
+            "p50_ms": round(self.percentile(50), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "status_counts": {str(k): v for k, v in self.status_counts.items()},
+        }
+
+
+class Recorder:
+    """Issues timed requests and records them into a ScenarioResult."""
+
+    def __init__(self, client: httpx.AsyncClient, result: ScenarioResult):
+        self.client = client
+        self.result = result
+
+    async def request(
+        self, method: str, url: str, ok: tuple[int, ...] = (200,), **kwargs
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        self.result.latencies_ms.append((time.perf_counter() - started) * 1000)
+        self.result.status_counts[status] += 1
+        if status not in ok:
+            self.result.errors += 1
+        return response
+
+
+Operation = Callable[[Recorder, int, int], Awaitable[None]]
+
+
+@dataclass
+class Scenario:
+    """A named workload: `workers` tasks each running `operation` N times."""
+
+    name: str
+    operation: Operation
+    workers: int
+    iterations: int
+    needs_planner: bool = False
+
+
+async def _calibration(rec: Recorder, worker: int, i: int):
+    """The cheapest request the daemon serves, to gauge the machine's speed."""
+    await rec.request("GET", "/health")
+
+
+async def _lock_contention(rec: Recorder, worker: int, i: int):
+    """Many agents fighting over a few files; 409 means 'locked', not failure."""
+    agent_id = f"load-agent-{worker}"
+    path = f"/khive-load/shared_{(worker + i) % SHARED_FILES}.py"
+    payload = {"file_path": path, "agent_id": agent_id}
+    response = await rec.request(
+        "POST", "/api/coordinate/file-register", ok=(200, 409), json=payload
+    )
+    if response is not None and response.status_code == 200:
+        # Hold the lock across a scheduling point, as a real edit would
+        await asyncio.sleep(0)
+        await rec.request("POST", "/api/coordinate/file-unregister", json=payload)
+
+
+async def _hook_burst(rec: Recorder, worker: int, i: int):
+    """What each hook process does today: a liveness probe, then coordination."""
+    agent_id = f"hook-agent-{worker}"
+    await rec.request("GET", "/health")
+    await rec.request(
+        "POST",
+        "/api/coordinate/register-session",
+        json={"session_id": f"session-{worker}", "agent_id": agent_id},
+    )
+    path = f"/khive-load/hooks/{worker}/file_{i}.py"
+    payload = {"file_path": path, "agent_id": agent_id}
+    await rec.request("POST", "/api/coordinate/file-register", json=payload)
+    await rec.request("POST", "/api/coordinate/file-unregister", json=payload)
+
+
+async def _dashboard_polling(rec: Recorder, worker: int, i: int):
+    """A dashboard refresh: every status endpoint it polls."""
+    await rec.request("GET", "/api/coordinate/status")
+    await rec.request("GET", "/api/coordination/file-locks")
+    await rec.request("GET", "/api/coordination/metrics")
+    await rec.request("GET", "/api/stats")
+
+
+async def _hook_ingest(rec: Recorder, worker: int, i: int):
+    """Hook processes handing their events to the daemon's batched writer."""
+    event = {
+        "content": {
+            "event_type": "post_edit",
+            "tool_name": "Edit",
+            "session_id": f"session-{worker}",
+            "file_paths": [f"/khive-load/hooks/{worker}/file_{i}.py"],
+        }
+    }
+    await rec.request(
+        "POST", "/api/hooks/events", ok=(202,), json={"events": [event]}
+    )
+
+
+async def _planner_requests(rec: Recorder, worker: int, i: int):
+    await rec.request("POST", "/api/plan", json={"task": f"load task {worker}-{i}"})
+
+
+SCENARIOS: dict[str, Scenario] = {
+    CALIBRATION: Scenario(CALIBRATION, _calibration, 10, 100),
+    "lock_contention": Scenario("lock_contention", _lock_contention, 50, 40),
+    "hook_burst": Scenario("hook_burst", _hook_burst, 32, 25),
+    "dashboard_polling": Scenario("dashboard_polling", _dashboard_polling, 10, 30),
+    "hook_ingest": Scenario("hook_ingest", _hook_ingest, 32, 25),
+    "planner_requests": Scenario(
+        "planner_requests", _planner_requests, 10, 20, needs_planner=True
+    ),
+}
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario) -> ScenarioResult:
+    """Run every worker of a scenario concurrently and time the whole batch."""
+    result = ScenarioResult(scenario.name)
+    recorder = Recorder(client, result)
+
+    async def worker(worker_id: int):
+        for i in range(scenario.iterations):
+            await scenario.operation(recorder, worker_id, i)
+            # In-process requests can complete without ever suspending; yield
+            # so workers interleave the way they would over a socket
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(scenario.workers)))
+    result.duration_seconds = time.perf_counter() - started
+    return result
+
+
+class _StubPlanner:
+    """Stands in for the LLM-backed planner so in-process runs measure the daemon."""
+
+    async def create_plan(self, task: str) -> dict[str, Any]:
+        return {"task": task, "phases": []}
+
+
+@asynccontextmanager
+async def in_process_app() -> AsyncIterator[Any]:
+    """A fresh, started KhiveDaemonServer's ASGI app."""
+    from khive.daemon import server as server_module
+    from khive.daemon.ingest import HookEventIngestor
+    from khive.daemon.lazy_services import LazyService
+    from khive.services.claude.hooks import coordination
+
+    # Fresh registry and event database per run; never build the real
+    # (LLM-backed) services
+    coordination._registry = None
+    warmup_enabled = server_module.WARMUP_ENABLED
+    server_module.WARMUP_ENABLED = False
+    with tempfile.TemporaryDirectory() as tmp:
+        daemon = server_module.KhiveDaemonServer()
+        daemon.spool_dir = Path(tmp) / "spool"
+        daemon.ingestor = HookEventIngestor(
+            Path(tmp) / "claude_hooks.db", spool_dir=daemon.spool_dir
+        )
+        daemon.coordination_state_dir = Path(tmp) / "coordination"
+        daemon.services["planner"] = LazyService(
+            "planner", "json", lambda _module: _StubPlanner()
+        )
+        try:
+            await daemon.startup()
+            # What warm-up would do for the services the scenarios use, so
+            # planner_requests' p99 is not its first batch waiting on the
+            # build. Freeze the imported modules' objects so a full GC pass
+            # over them does not land inside a measured request.
+            await daemon.services["hooks"].get()
+            await daemon.services["planner"].get()
+            gc.collect()
+            gc.freeze()
+            yield daemon.app
+        finally:
+            gc.unfreeze()
+            await daemon.shutdown()
+            server_module.WARMUP_ENABLED = warmup_enabled
+            coordination._registry = None
+
+
+@asynccontextmanager
+async def in_process_daemon() -> AsyncIterator[httpx.AsyncClient]:
+    """A fresh KhiveDaemonServer served through httpx's ASGI transport."""
+    async with in_process_app() as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://khive-daemon"
+        ) as client:
+            yield client
+
+
+async def run_all(
+    names: list[str] | None = None, url: str | None = None
+) -> dict[str, ScenarioResult]:
+    """Run the named scenarios (default: all) in-process or against `url`."""
+    selected = [SCENARIOS[n] for n in (names or SCENARIOS)]
+    results = {}
+    if url:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+        async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+            for scenario in selected:
+                results[scenario.name] = await run_scenario(client, scenario)
+    else:
+        async with in_process_daemon() as client:
+            for scenario in selected:
+                results[scenario.name] = await run_scenario(client, scenario)
+    return results
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def baseline_from_env() -> dict[str, Any] | None:
+    """The baseline to enforce, or None when ``KHIVE_SKIP_LOAD_BASELINE`` is set."""
+    if os.environ.get(SKIP_BASELINE_ENV):
+        return None
+    return load_baseline(Path(os.environ.get(BASELINE_ENV) or BASELINE_PATH))
+
+
+def machine_speed(
+    calibration: ScenarioResult | None, baseline: dict[str, Any]
+) -> float:
+    """Calibration throughput relative to the machine that recorded the baseline."""
+    base = baseline["scenarios"].get(CALIBRATION)
+    if calibration is None or base is None or not calibration.throughput_rps:
+        return 1.0
+    return calibration.throughput_rps / base["throughput_rps"]
+
+
+def find_regressions(
+    results: dict[str, ScenarioResult],
+    baseline: dict[str, Any],
+    speed: float = 1.0,
+) -> list[str]:
+    """Compare results with the baseline and describe every regression.
+
+    `speed` (see machine_speed) scales the recorded throughput up and the
+    recorded p99 down on a faster machine, and the reverse on a slower one.
+    """
+    tolerance = baseline["tolerance"]
+    regressions = []
+    for name, result in results.items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+
+        min_rps = base["throughput_rps"] * speed * (1 - tolerance["throughput_drop"])
+        if result.throughput_rps < min_rps:
+            regressions.append(
+                f"{name}: throughput {result.throughput_rps:.0f} rps < {min_rps:.0f} rps"
+            )
+
+        max_p99 = base["p99_ms"] / speed * (1 + tolerance["p99_increase"])
+        if result.percentile(99) > max_p99:
+            regressions.append(
+                f"{name}: p99 {result.percentile(99):.2f} ms > {max_p99:.2f} ms"
+            )
+
+        max_errors = max(tolerance["max_error_rate"], base["error_rate"])
+        if result.error_rate > max_errors:
+            regressions.append(
+                f"{name}: error rate {result.error_rate:.2%} > {max_errors:.2%}"
+            )
+    return regressions
+
+
+def write_baseline(
+    results: dict[str, ScenarioResult], path: Path = BASELINE_PATH
+) -> None:
+    """Record current results as the new baseline, keeping the tolerances."""
+    baseline = load_baseline(path) if path.exists() else {}
+    baseline.setdefault(
+        "tolerance", {"throughput_drop": 0.6, "p99_increase": 4.0, "max_error_rate": 0.01}
+    )
+    scenarios = baseline.setdefault("scenarios", {})
+    for name, result in results.items():
+        data = result.to_dict()
+        scenarios[name] = {
+            k: data[k] for k in ("throughput_rps", "p50_ms", "p99_ms", "error_rate")
+        }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the khive daemon")
+    parser.add_argument("--url", help="Target a running daemon instead of in-process")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline file to compare with or update (default: the committed one)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    names = args.scenario
+    if args.url and not names:
+        # The real planner calls LLM providers - only run it when asked to
+        names = [n for n, s in SCENARIOS.items() if not s.needs_planner]
+    elif names and CALIBRATION not in names:
+        # Baseline comparisons and updates are scaled by the calibration run
+        names = [CALIBRATION, *names]
+
+    results = asyncio.run(run_all(names, args.url))
+
+    if args.json:
+        print(json.dumps({n: r.to_dict() for n, r in results.items()}, indent=2))
+    else:
+        print(f"{'scenario':<20} {'reqs':>7} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>8}")
+        for name, r in results.items():
+            print(
+                f"{name:<20} {r.requests:>7} {r.throughput_rps:>9.1f} "
+                f"{r.percentile(50):>9.2f} {r.percentile(99):>9.2f} {r.error_rate:>8.2%}"
+            )
+
+    if args.update_baseline:
+        write_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = []
+    if not args.url:
+        baseline = load_baseline(args.baseline)
+        speed = machine_speed(results.get(CALIBRATION), baseline)
+        regressions = find_regressions(results, baseline, speed)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+"""Composing 1,000 agents from the bundled prompt library.
+
+Every composition loads a role and two domains. With the prompt library
+index warm, that is a dict lookup, a ``stat`` and an unpickle per file.
+The baseline drops the index and parsed specs before each composition,
+which is the work every call used to do: find the files (a walk of the
+domain taxonomy), then parse the role markdown and domain YAML.
+"""
+
+import itertools
+import time
+from pathlib import Path
+
+import pytest
+
+from khive.services.composition.agent_composer import AgentComposer
+
+PROMPTS = Path(__file__).parents[2] / "src" / "khive" / "prompts"
+AGENTS = 1_000
+COLD_AGENTS = 100
+MIN_SPEEDUP = 5.0
+
+
+@pytest.mark.performance
+def test_compose_thousand_agents():
+    composer = AgentComposer(str(PROMPTS))
+    roles = composer.list_available_roles()
+    domains = composer.list_available_domains()
+    requests = [
+        (role, f"{domains[i % len(domains)]},{domains[(i + 5) % len(domains)]}")
+        for i, role in zip(range(AGENTS), itertools.cycle(roles))
+    ]
+
+    started = time.perf_counter()
+    cold = []
+    for role, pair in requests[:COLD_AGENTS]:
+        composer._library.reload()
+        cold.append(composer.compose_agent(role, pair, "Ship the feature"))
+    cold_s = (time.perf_counter() - started) / COLD_AGENTS
+
+    parses = composer._library.parses
+    started = time.perf_counter()
+    warm = [composer.compose_agent(role, pair, "Ship the feature") for role, pair in requests]
+    warm_s = (time.perf_counter() - started) / AGENTS
+
+    assert warm[:COLD_AGENTS] == cold
+    assert all(len(spec["domains"]) == 2 for spec in warm)
+    stats = composer._library.stats()
+    # Each file is parsed at most once across the 1,000 compositions
+    assert stats["parses"] - parses <= len(roles) + len(domains)
+
+    print(
+        f"\n{AGENTS} agents ({len(roles)} roles x {len(domains)} domains): "
+        f"{warm_s * 1000:.2f} ms/agent warm ({warm_s * AGENTS:.2f}s total), "
+        f"{cold_s * 1000:.1f} ms/agent re-reading the library, "
+        f"{stats['hits']} cache hits",
+        end="",
+    )
+    assert cold_s / warm_s >= MIN_SPEEDUP
@@ -0,0 +1,133 @@
+"""Concurrency benchmark for the async KhiveDaemonClient.
+
+50 agents register file locks at once through one client, first with
+requests serialized (max_concurrency=1, the old lock-per-client behaviour)
+and then bounded by the client's semaphore. Each request waits a fixed
+simulated round trip before reaching the daemon, so the benchmark measures
+how much of that wait the client overlaps rather than raw CPU speed.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from khive.daemon.client import KhiveDaemonClient
+from tests.performance.load_harness import in_process_app
+
+AGENTS = 50
+ROUND_TRIP_SECONDS = 0.005  # Simulated network/daemon latency per request
+
+
+def _with_latency(app, seconds: float):
+    async def delayed(scope, receive, send):
+        if scope["type"] == "http":
+            await asyncio.sleep(seconds)
+        await app(scope, receive, send)
+
+    return delayed
+
+
+def _client(app, max_concurrency: int, latency: float = 0.0) -> KhiveDaemonClient:
+    client = KhiveDaemonClient("http://khive-daemon", max_concurrency=max_concurrency)
+    client.async_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_with_latency(app, latency))
+    )
+    return client
+
+
+async def _register_all(client: KhiveDaemonClient, run: str):
+    paths = [f"/khive-bench/{run}/file_{i}.py" for i in range(AGENTS)]
+    started = time.perf_counter()
+    results = await client.gather(
+        *(
+            client.register_file_operation_async(path, f"agent-{i}")
+            for i, path in enumerate(paths)
+        )
+    )
+    return results, time.perf_counter() - started
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_50_concurrent_lock_registrations():
+    async with in_process_app() as app:
+        async with _client(app, 1, ROUND_TRIP_SECONDS) as serial_client:
+            serial, serial_s = await _register_all(serial_client, "serial")
+        async with _client(app, AGENTS, ROUND_TRIP_SECONDS) as client:
+            concurrent, concurrent_s = await _register_all(client, "concurrent")
+
+    metrics = client.get_performance_metrics()
+    register = metrics["endpoints"]["POST /api/coordinate/file-register"]
+    print(
+        f"\n{AGENTS} lock registrations: serialized {serial_s * 1000:.1f} ms, "
+        f"concurrent {concurrent_s * 1000:.1f} ms, per-request p50 "
+        f"{register['p50_ms']:.1f} ms, peak in flight {metrics['peak_in_flight']}"
+    )
+    assert all(r["status"] == "granted" for r in serial + concurrent)
+    assert serial_client.request_stats.peak_in_flight == 1
+    assert metrics["peak_in_flight"] == AGENTS
+    assert register["count"] == AGENTS
+    assert serial_s >= AGENTS * ROUND_TRIP_SECONDS
+    assert concurrent_s < serial_s / 2
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_concurrent_registrations_on_one_file_grant_exactly_one():
+    async with in_process_app() as app:
+        async with _client(app, AGENTS) as client:
+            results = await client.gather(
+                *(
+                    client.register_file_operation_async(
+                        "/khive-bench/shared.py", f"agent-{i}"
+                    )
+                    for i in range(AGENTS)
+                )
+            )
+
+    granted = [r for r in results if r["can_proceed"]]
+    assert len(granted) == 1
+    assert all(r["status"] == "locked" for r in results if not r["can_proceed"])
+    assert client.request_stats.in_flight == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_semaphore_bounds_in_flight_requests():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"status": "healthy"})
+
+    client = KhiveDaemonClient("http://khive-daemon", max_concurrency=4)
+    client.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with client:
+        results = await client.gather(*(client.is_running_async() for _ in range(20)))
+
+    assert results == [True] * 20
+    assert client.request_stats.peak_in_flight == 4
+    assert client.get_performance_metrics()["endpoints"]["GET /health"]["count"] == 20
+
+
+@pytest.mark.unit
+def test_client_is_reusable_across_event_loops():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"status": "healthy"})
+
+    client = KhiveDaemonClient("http://khive-daemon", max_concurrency=2)
+
+    async def burst():
+        # Contended, so the semaphore binds to this loop
+        client.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            responses = await client.gather(
+                *(client._make_async_request("GET", f"{client.base_url}/health") for _ in range(6))
+            )
+        return [r.status_code for r in responses]
+
+    # e.g. hooks run each call under a fresh anyio.run / asyncio.run
+    assert asyncio.run(burst()) == [200] * 6
+    assert asyncio.run(burst()) == [200] * 6
+    assert client.request_stats.peak_in_flight == 2
@@ -0,0 +1,76 @@
+"""Restarting the daemon from a coordination log of 100k ops.
+
+A busy registry logs lock grants and releases, agent work and session
+mappings, with snapshots pushed out of the way so recovery has to replay
+the whole log. The recovered registry must match the one that wrote it;
+recovery from the final snapshot alone is reported for comparison.
+"""
+
+import random
+import time
+
+import pytest
+
+from khive.services.claude.hooks.coordination import CoordinationRegistry
+from khive.services.claude.hooks.coordination_store import CoordinationJournal
+
+LOGGED_OPS = 100_000
+AGENTS = 500
+PATHS = 5_000
+MAX_RECOVERY_SECONDS = 5.0
+
+
+def _comparable(registry: CoordinationRegistry) -> dict:
+    state = registry.export_state()
+    return {
+        "agents": state["agents"],
+        "locks": {key: lock[:2] + lock[3:] for key, lock in state["locks"].items()},
+        "sessions": state["sessions"],
+    }
+
+
+@pytest.mark.performance
+def test_recovery_from_a_long_log(tmp_path):
+    rng = random.Random(11)
+    registry = CoordinationRegistry()
+    journal = CoordinationJournal(tmp_path / "state", snapshot_every=LOGGED_OPS * 2)
+    journal.attach(registry)
+    for i in range(AGENTS):
+        registry.register_agent_work(f"agent-{i}", f"work item {i:04d} for module-{i}")
+    paths = [str(tmp_path / f"src-{i}.py") for i in range(PATHS)]
+
+    started = time.perf_counter()
+    while journal.counters["ops"] < LOGGED_OPS:
+        agent_id, path = f"agent-{rng.randrange(AGENTS)}", rng.choice(paths)
+        roll = rng.random()
+        if roll < 0.5:
+            registry.request_file_lock(agent_id, path)
+        elif roll < 0.8:
+            lock = registry.file_locks.get(path)
+            if lock is not None:
+                registry.release_file_lock(lock.agent_id, path)
+        elif roll < 0.9:
+            registry.renew_file_lock(agent_id, path)
+        else:
+            registry.register_session_mapping(f"session-{rng.randrange(2000)}", agent_id)
+    logging_s = time.perf_counter() - started
+    wal_bytes = journal.wal_path.stat().st_size
+    expected = _comparable(registry)  # the daemon crashes here
+
+    recovered = CoordinationRegistry()
+    stats = CoordinationJournal(tmp_path / "state").recover(recovered)
+    assert stats["replayed"] >= LOGGED_OPS
+    assert _comparable(recovered) == expected
+
+    journal.close()
+    snapshot_stats = CoordinationJournal(tmp_path / "state").recover(CoordinationRegistry())
+    print(
+        f"\n{journal.counters['ops']} ops logged at "
+        f"{journal.counters['ops'] / logging_s:.0f} ops/s ({wal_bytes / 1e6:.1f} MB); "
+        f"recovery {stats['seconds']:.2f} s from the log "
+        f"({stats['locks']} locks, {stats['agents']} agents), "
+        f"{snapshot_stats['seconds'] * 1000:.0f} ms from a snapshot"
+    )
+    assert stats["seconds"] < MAX_RECOVERY_SECONDS
+    assert snapshot_stats["replayed"] == 0
+    assert snapshot_stats["seconds"] < stats["seconds"]
@@ -0,0 +1,116 @@
+"""Daemon load tests - fail when a scenario errors or regresses.
+
+Every scenario must run without errors and stay within the committed
+baseline, scaled by the calibration scenario to this machine's speed.
+KHIVE_LOAD_BASELINE=<path> compares with a baseline recorded locally:
+    python -m tests.performance.load_harness --update-baseline --baseline <path>
+and KHIVE_SKIP_LOAD_BASELINE=1 skips the comparison altogether.
+"""
+
+import pytest
+
+from tests.performance.load_harness import (
+    CALIBRATION,
+    SCENARIOS,
+    SKIP_BASELINE_ENV,
+    ScenarioResult,
+    baseline_from_env,
+    find_regressions,
+    machine_speed,
+    run_all,
+)
+
+MAX_ERROR_RATE = 0.01
+
+_results: dict[str, ScenarioResult] = {}
+
+
+async def _run(scenario: str) -> ScenarioResult:
+    """Each scenario runs once per session, whichever test asks first."""
+    if scenario not in _results:
+        _results.update(await run_all([scenario]))
+    return _results[scenario]
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    baseline = baseline_from_env()
+    if baseline is None:
+        pytest.skip(f"{SKIP_BASELINE_ENV} is set")
+    return baseline
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+async def test_scenario_runs_cleanly(scenario):
+    result = await _run(scenario)
+
+    assert result.requests > 0
+    assert result.error_rate <= MAX_ERROR_RATE
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+async def test_scenario_within_baseline(scenario, baseline):
+    result = await _run(scenario)
+    speed = machine_speed(await _run(CALIBRATION), baseline)
+
+    assert find_regressions({scenario: result}, baseline, speed) == []
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_lock_contention_produces_conflicts():
+    result = (await run_all(["lock_contention"]))["lock_contention"]
+    assert result.status_counts[409] > 0
+    assert result.errors == 0
+
+
+@pytest.mark.unit
+def test_find_regressions_flags_slow_and_failing_runs():
+    baseline = {
+        "tolerance": {"throughput_drop": 0.5, "p99_increase": 1.0, "max_error_rate": 0.01},
+        "scenarios": {
+            "x": {"throughput_rps": 1000, "p50_ms": 1, "p99_ms": 2, "error_rate": 0.0}
+        },
+    }
+    slow = ScenarioResult("x", duration_seconds=1.0, latencies_ms=[10.0] * 100)
+    slow.errors = 5
+
+    regressions = find_regressions({"x": slow}, baseline)
+
+    assert len(regressions) == 3
+    assert find_regressions({"y": slow}, baseline) == []
+
+
+@pytest.mark.unit
+def test_find_regressions_scales_by_machine_speed():
+    baseline = {
+        "tolerance": {"throughput_drop": 0.5, "p99_increase": 1.0, "max_error_rate": 0.01},
+        "scenarios": {
+            CALIBRATION: {"throughput_rps": 1000, "p50_ms": 1, "p99_ms": 1, "error_rate": 0.0},
+            "x": {"throughput_rps": 1000, "p50_ms": 1, "p99_ms": 2, "error_rate": 0.0},
+        },
+    }
+    # Half the calibration throughput: half the throughput and twice the
+    # p99 of the recorded run are what this machine should manage
+    calibration = ScenarioResult(CALIBRATION, duration_seconds=1.0, latencies_ms=[2.0] * 500)
+    slower = ScenarioResult("x", duration_seconds=1.0, latencies_ms=[6.0] * 300)
+    speed = machine_speed(calibration, baseline)
+
+    assert speed == 0.5
+    assert len(find_regressions({"x": slower}, baseline)) == 2
+    assert find_regressions({"x": slower}, baseline, speed) == []
+    assert machine_speed(None, baseline) == 1.0
+
+
+@pytest.mark.unit
+def test_baseline_is_enforced_unless_skipped(monkeypatch):
+    monkeypatch.delenv("KHIVE_LOAD_BASELINE", raising=False)
+    monkeypatch.delenv(SKIP_BASELINE_ENV, raising=False)
+    assert CALIBRATION in baseline_from_env()["scenarios"]
+
+    monkeypatch.setenv(SKIP_BASELINE_ENV, "1")
+    assert baseline_from_env() is None
@@ -0,0 +1,73 @@
+"""Warm restart of the semantic dedup index against rebuilding it.
+
+Without persistence a restarted process starts empty, and getting the
+index back means re-embedding every task. Loading the saved index parses
+the JSON sidecar and maps the embeddings file, so embeddings are neither
+recomputed nor read up front, and the first lookup already returns what
+the saving process would have. At this size lookups go through LSH,
+and the first one also hashes every loaded row into its index.
+"""
+
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from khive.services.claude.hooks.semantic_dedup import SemanticDeduplicator
+
+SIZE = 20_000
+QUERIES = 50
+MIN_SPEEDUP = 5.0
+WORDS = (
+    "refactor implement fix test api auth database cache queue schema ui "
+    "websocket leak broadcaster endpoint migration dashboard billing orders "
+    "retry timeout config logging metrics session token user admin report"
+).split()
+
+
+def _tasks(rng: random.Random, n: int) -> list[tuple[str, str]]:
+    return [(f"task-{i}", " ".join(rng.sample(WORDS, 6))) for i in range(n)]
+
+
+@pytest.mark.performance
+def test_warm_restart_beats_rebuilding(tmp_path):
+    rng = random.Random(11)
+    tasks = _tasks(rng, SIZE)
+    queries = [" ".join(rng.sample(WORDS, 5)) for _ in range(QUERIES)]
+
+    started = time.perf_counter()
+    dedup = SemanticDeduplicator()
+    dedup.add_tasks(tasks)
+    rebuild_s = time.perf_counter() - started
+    expected = dedup.find_similar_batch(queries, k=3, min_similarity=-1)
+
+    started = time.perf_counter()
+    dedup.save(tmp_path)
+    save_s = time.perf_counter() - started
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    loaded = SemanticDeduplicator.load(tmp_path)
+    load_s = time.perf_counter() - started
+    _, load_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    found = loaded.find_similar_batch(queries, k=3, min_similarity=-1)
+    first_lookup_s = time.perf_counter() - started
+    assert [[key for key, _ in m] for m in found] == [[key for key, _ in m] for m in expected]
+
+    started = time.perf_counter()
+    loaded.find_similar_batch(queries, k=3, min_similarity=-1)
+    lookup_s = time.perf_counter() - started
+
+    print(
+        f"\n{SIZE} tasks: rebuild {rebuild_s:.2f}s, save {save_s:.2f}s, "
+        f"load {load_s:.3f}s (peak {load_peak / 2**20:.1f} MiB traced, "
+        f"{loaded._matrix.nbytes / 2**20:.0f} MiB matrix mapped), "
+        f"{QUERIES}-query batch {first_lookup_s * 1000:.0f} ms first (LSH build), "
+        f"{lookup_s * 1000:.1f} ms after",
+        end="",
+    )
+    assert rebuild_s / load_s >= MIN_SPEEDUP
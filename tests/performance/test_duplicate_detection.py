@@ -0,0 +1,86 @@
+"""Duplicate-work detection at 10k active tasks: MinHash LSH vs exact scan.
+
+The exact baseline is what `register_agent_work` used to do: tokenize
+every active task again and compute Jaccard against each. Queries are
+near-duplicates of registered tasks (one or two tokens swapped, Jaccard
+0.6-0.8) plus unrelated tasks, and LSH decisions are checked against the
+exact ones at the 0.7 threshold.
+"""
+
+import random
+import time
+
+import pytest
+
+from khive.services.claude.hooks.coordination import (
+    DUPLICATE_THRESHOLD,
+    AgentWork,
+    CoordinationRegistry,
+    _jaccard,
+    _sig,
+)
+
+ACTIVE_TASKS = 10_000
+QUERIES = 200
+VOCABULARY = [f"word{i:04d}" for i in range(3000)]
+MIN_RECALL = 0.99
+MIN_SPEEDUP = 10.0
+
+
+def _task(rng: random.Random) -> list[str]:
+    return rng.sample(VOCABULARY, rng.randint(6, 10))
+
+
+def _exact_duplicate(registry: CoordinationRegistry, agent_id: str, task: str):
+    """The previous implementation: re-tokenize and compare every task."""
+    sig = _sig(task)
+    for existing_agent, work in registry.active_agents.items():
+        if existing_agent != agent_id:
+            if _jaccard(sig, _sig(work.task)) >= DUPLICATE_THRESHOLD:
+                return work
+    return None
+
+
+@pytest.mark.performance
+def test_lsh_matches_exact_jaccard_at_threshold():
+    rng = random.Random(7)
+    registry = CoordinationRegistry()
+    for i in range(ACTIVE_TASKS):
+        registry.register_agent_work(f"agent-{i}", " ".join(_task(rng)))
+    active = list(registry.active_agents.values())
+    assert len(active) >= ACTIVE_TASKS * 0.99  # a few random clashes
+
+    queries = []
+    for i in range(QUERIES):
+        if i % 2:
+            queries.append(" ".join(_task(rng)))
+            continue
+        tokens = rng.choice(active).task.split()
+        for _ in range(rng.randint(1, 2)):
+            tokens[rng.randrange(len(tokens))] = rng.choice(VOCABULARY)
+        queries.append(" ".join(tokens))
+
+    started = time.perf_counter()
+    exact = [_exact_duplicate(registry, "query", q) is not None for q in queries]
+    exact_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    found = [
+        registry.find_duplicate_work("query", AgentWork(agent_id="query", task=q))
+        is not None
+        for q in queries
+    ]
+    lsh_s = time.perf_counter() - started
+
+    duplicates = sum(exact)
+    recall = sum(e and f for e, f in zip(exact, found)) / duplicates
+    false_positives = sum(f and not e for e, f in zip(exact, found))
+    print(
+        f"\n{len(active)} active tasks, {QUERIES} queries ({duplicates} duplicates): "
+        f"exact {exact_s / QUERIES * 1000:.2f} ms/query, "
+        f"LSH {lsh_s / QUERIES * 1000:.3f} ms/query, recall {recall:.4f}"
+    )
+    assert duplicates > QUERIES // 10
+    assert false_positives == 0  # candidates are verified exactly
+    assert recall >= MIN_RECALL
+    assert exact_s / lsh_s >= MIN_SPEEDUP
@@ -0,0 +1,101 @@
+"""Offline quality of the dedup embeddings on labelled task pairs.
+
+`datasets/task_pairs.json` holds hand-labelled pairs of agent task
+descriptions: paraphrases of the same work, and hard negatives that name
+the same component but a different job. IDF weights are learned from
+all descriptions in the set, as the deduplicator learns them from its
+indexed tasks. The baseline is the keyword embedding the deduplicator
+used before: counts of 44 hand-picked keywords.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks.embedding_matrix import normalize
+from khive.services.claude.hooks.semantic_dedup import (
+    HIGH_CONFIDENCE,
+    MEDIUM_CONFIDENCE,
+    SIMILARITY_THRESHOLD,
+)
+from khive.services.claude.hooks.text_embedding import HashedNgramEmbedder
+
+PAIRS = json.loads((Path(__file__).parent / "datasets" / "task_pairs.json").read_text())[
+    "pairs"
+]
+KEYWORDS = (
+    "refactor implement fix update create analyze test review optimize debug design "
+    "build deploy migrate integrate auth database api frontend backend middleware "
+    "model controller service security performance ui ux configuration async cache "
+    "queue webhook rest graphql websocket jwt oauth encryption validation schema "
+    "migration index query"
+).split()
+MIN_AUC = 0.75
+MIN_PRECISION = 0.85
+MIN_HIGH_CONFIDENCE_PRECISION = 0.95
+MIN_THROUGHPUT = 1_000  # uncached descriptions per second
+
+
+def _keyword_embed(texts: list[str]) -> np.ndarray:
+    return np.array(
+        [[text.lower().split().count(k) for k in KEYWORDS] for text in texts],
+        dtype=np.float32,
+    )
+
+
+def _pair_scores(embed) -> np.ndarray:
+    left = normalize(embed([a for a, _, _ in PAIRS]))
+    right = normalize(embed([b for _, b, _ in PAIRS]))
+    return (left * right).sum(axis=1)
+
+
+def _precision(scores: np.ndarray, labels: np.ndarray, threshold: float) -> float:
+    predicted = scores >= threshold
+    return (predicted & labels).sum() / max(predicted.sum(), 1)
+
+
+def _auc(scores: np.ndarray, labels: np.ndarray) -> float:
+    pos, neg = scores[labels], scores[~labels]
+    wins = (pos[:, None] > neg[None, :]).sum() + 0.5 * (pos[:, None] == neg[None, :]).sum()
+    return float(wins / (len(pos) * len(neg)))
+
+
+@pytest.mark.performance
+def test_embedding_quality_on_labelled_pairs():
+    labels = np.array([duplicate for *_, duplicate in PAIRS])
+    embedder = HashedNgramEmbedder()
+    embedder.observe(sorted({text for a, b, _ in PAIRS for text in (a, b)}))
+
+    hashed = _pair_scores(embedder.embed_batch)
+    keywords = _pair_scores(_keyword_embed)
+    predicted = hashed >= SIMILARITY_THRESHOLD
+    precision = _precision(hashed, labels, SIMILARITY_THRESHOLD)
+    recall = (predicted & labels).sum() / labels.sum()
+
+    texts = [f"{a} (variant {i})" for i, (a, _, _) in enumerate(PAIRS * 30)]
+    started = time.perf_counter()
+    embedder.embed_batch(texts)
+    cold_s = time.perf_counter() - started
+    started = time.perf_counter()
+    embedder.embed_batch(texts)
+    warm_s = time.perf_counter() - started
+
+    print(
+        f"\n{labels.sum()} duplicate / {(~labels).sum()} distinct pairs: "
+        f"AUC {_auc(hashed, labels):.3f} hashed n-grams vs {_auc(keywords, labels):.3f} "
+        f"keywords; at {SIMILARITY_THRESHOLD}: precision {precision:.2f}, "
+        f"recall {recall:.2f}; embedding {len(texts) / cold_s:.0f}/s cold, "
+        f"{len(texts) / warm_s:.0f}/s cached"
+    )
+    assert _auc(hashed, labels) >= MIN_AUC
+    assert _auc(hashed, labels) > _auc(keywords, labels) + 0.1
+    assert precision >= MIN_PRECISION
+    # The confidence bands sit inside the range the embeddings produce
+    assert _precision(hashed, labels, MEDIUM_CONFIDENCE) >= MIN_PRECISION
+    assert _precision(hashed, labels, HIGH_CONFIDENCE) >= MIN_HIGH_CONFIDENCE_PRECISION
+    assert (hashed[labels] >= HIGH_CONFIDENCE).any()
+    assert len(texts) / cold_s >= MIN_THROUGHPUT
+    assert warm_s < cold_s
@@ -0,0 +1,76 @@
+"""File lock acquisition and expiry with many locks held.
+
+`request_file_lock` used to rebuild a list of expired locks by scanning
+every held lock on each request. The registry now keeps deadlines in a
+min-heap, so a request only pops locks that are actually due. The
+baseline replays the old scan on the same registry.
+"""
+
+import time
+
+import pytest
+
+from khive.services.claude.hooks.coordination import CoordinationRegistry
+
+HELD_LOCKS = 10_000
+REQUESTS = 500
+MIN_SPEEDUP = 5.0
+
+
+def _held_registry(tmp_path) -> CoordinationRegistry:
+    registry = CoordinationRegistry()
+    for i in range(HELD_LOCKS):
+        registry.request_file_lock(f"agent-{i % 50}", str(tmp_path / f"held-{i}.py"))
+    return registry
+
+
+def _scan_expired(registry: CoordinationRegistry) -> list:
+    """What each request used to do before granting."""
+    return [f for f, lock in registry.file_locks.items() if lock.is_expired()]
+
+
+@pytest.mark.performance
+def test_lock_requests_do_not_scan_held_locks(tmp_path):
+    registry = _held_registry(tmp_path)
+    paths = [str(tmp_path / f"new-{i}.py") for i in range(REQUESTS)]
+
+    started = time.perf_counter()
+    for path in paths:
+        registry.request_file_lock("agent-new", path)
+    heap_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for path in paths:
+        _scan_expired(registry)
+        registry.request_file_lock("agent-new", path)  # re-request: same work
+    scan_s = time.perf_counter() - started
+
+    print(
+        f"\n{HELD_LOCKS} held locks: {REQUESTS / heap_s:.0f} requests/s with the "
+        f"expiry heap vs {REQUESTS / scan_s:.0f}/s scanning"
+    )
+    assert len(registry.file_locks) == HELD_LOCKS + REQUESTS
+    assert scan_s / heap_s >= MIN_SPEEDUP
+
+
+@pytest.mark.performance
+def test_expiring_all_held_locks(tmp_path):
+    registry = _held_registry(tmp_path)
+    for path in list(registry.file_locks)[::2]:  # renewals leave stale entries
+        registry._schedule_expiry(path, registry.file_locks[path])
+    latest = max(lock.expires_at for lock in registry.file_locks.values())
+
+    started = time.perf_counter()
+    assert registry.expire_locks(now=latest - 3600) == []
+    idle_s = time.perf_counter() - started
+    expired = registry.expire_locks(now=latest + 1)
+    sweep_s = time.perf_counter() - started - idle_s
+
+    print(
+        f"\nidle sweep {idle_s * 1e6:.1f} us, expiring {len(expired)} locks "
+        f"{sweep_s * 1000:.1f} ms"
+    )
+    assert len(expired) == HELD_LOCKS
+    assert registry.file_locks == {}
+    assert registry.event_log[-1].kind == "lock_expired"
+    assert idle_s < 0.001
@@ -0,0 +1,141 @@
+"""Hook event lookups over a large table: indexed columns vs json_extract.
+
+Builds a synthetic events table (1M rows by default, override with
+KHIVE_BENCH_EVENTS), migrates it, then checks with EXPLAIN QUERY PLAN that
+the HookEvent queries are index range scans and times them against the
+pre-migration json_extract filters.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from khive.daemon.ingest import connect
+from khive.services.claude.hooks.schema import (
+    CREATE_TABLE_SQL,
+    SCHEMA_VERSION,
+    SELECT_COLUMNS,
+    migrate,
+    schema_version,
+)
+
+EVENTS = int(os.getenv("KHIVE_BENCH_EVENTS", "1000000"))
+EVENT_TYPES = ("pre_edit", "post_edit", "pre_command", "post_command", "notification")
+TOOLS = ("Edit", "MultiEdit", "Write", "Bash", "Task", "Read")
+SESSIONS = 2000
+LIMIT = 100
+MIN_SPEEDUP = 20.0
+
+# (HookEvent query, pre-migration query). The table had no indexes before
+# the migration, so the old filters run NOT INDEXED.
+QUERIES = {
+    "event_type": (
+        f"SELECT {SELECT_COLUMNS} FROM hook_events WHERE event_type = :value "
+        "AND created_at >= :since ORDER BY created_at DESC LIMIT :limit",
+        "SELECT * FROM hook_events NOT INDEXED WHERE json_extract(content, '$.event_type') = :value "
+        "AND created_at >= :since ORDER BY created_at DESC LIMIT :limit",
+    ),
+    "session_id": (
+        f"SELECT {SELECT_COLUMNS} FROM hook_events WHERE session_id = :value "
+        "AND created_at >= :since ORDER BY created_at DESC LIMIT :limit",
+        "SELECT * FROM hook_events NOT INDEXED WHERE json_extract(content, '$.session_id') = :value "
+        "AND created_at >= :since ORDER BY created_at DESC LIMIT :limit",
+    ),
+    "tool_name": (
+        f"SELECT {SELECT_COLUMNS} FROM hook_events WHERE tool_name = :value "
+        "ORDER BY created_at DESC LIMIT :limit",
+        "SELECT * FROM hook_events NOT INDEXED WHERE json_extract(content, '$.tool_name') = :value "
+        "ORDER BY created_at DESC LIMIT :limit",
+    ),
+}
+VALUES = {"event_type": "post_edit", "session_id": "session-7", "tool_name": "Task"}
+
+
+# Generated inside SQLite: building a million rows in Python takes longer
+# than the whole benchmark. Values are spread with multiplicative hashing
+# so runs are reproducible.
+GENERATE_SQL = """
+WITH RECURSIVE seq(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < :count)
+INSERT INTO hook_events (id, content, node_metadata, created_at, embedding)
+SELECT
+    printf('event-%08d', i),
+    json_object(
+        'event_type', json_extract(:event_types, printf('$[%d]', (i * 2654435761) % :n_types)),
+        'tool_name', json_extract(:tools, printf('$[%d]', (i * 7919) % :n_tools)),
+        'session_id', printf('session-%d', (i * 2246822519) % :sessions),
+        'file_paths', json_array(printf('/repo/src/module_%d.py', i % 500)),
+        'metadata', json_object('hook_type', 'bench')
+    ),
+    '{"lion_class": "HookEvent"}',
+    strftime('%Y-%m-%d %H:%M:%f', 1767225600 + i * 5.184 * 1000000 / :count, 'unixepoch'),
+    NULL
+FROM seq
+"""
+
+
+@pytest.fixture(scope="module")
+def events_db(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("hook_events") / "claude_hooks.db"
+    # A pre-migration table full of events, as the lionagi adapter left it
+    conn = connect(db_path)
+    conn.execute(CREATE_TABLE_SQL.format(table="hook_events"))
+    with conn:
+        conn.execute(
+            GENERATE_SQL,
+            {
+                "count": EVENTS,
+                "event_types": json.dumps(EVENT_TYPES),
+                "n_types": len(EVENT_TYPES),
+                "tools": json.dumps(TOOLS),
+                "n_tools": len(TOOLS),
+                "sessions": SESSIONS,
+            },
+        )
+    started = time.perf_counter()
+    migrate(conn)
+    print(f"\nmigrated {EVENTS} events in {time.perf_counter() - started:.1f} s")
+    conn.execute("ANALYZE")
+    yield conn
+    conn.close()
+
+
+def _timed(conn: sqlite3.Connection, sql: str, params: dict, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.performance
+def test_migration_is_applied(events_db):
+    assert schema_version(events_db) == SCHEMA_VERSION
+    assert events_db.execute("SELECT COUNT(*) FROM hook_events").fetchone()[0] == EVENTS
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("field", sorted(QUERIES))
+def test_lookup_is_index_range_scan(events_db, field):
+    indexed, legacy = QUERIES[field]
+    params = {"value": VALUES[field], "since": "2026-02-01", "limit": LIMIT}
+
+    plan = " ".join(
+        row[-1] for row in events_db.execute(f"EXPLAIN QUERY PLAN {indexed}", params)
+    )
+    assert f"USING INDEX idx_hook_events_{field}_created ({field}=?" in plan
+    assert "USE TEMP B-TREE" not in plan  # ORDER BY comes from the index
+
+    indexed_s = _timed(events_db, indexed, params)
+    legacy_s = _timed(events_db, legacy, params, repeat=1)
+    print(
+        f"\n{field} over {EVENTS} events: indexed {indexed_s * 1000:.2f} ms, "
+        f"json_extract {legacy_s * 1000:.1f} ms ({legacy_s / indexed_s:.0f}x)"
+    )
+    rows = events_db.execute(indexed, params).fetchall()
+    assert len(rows) == LIMIT
+    assert rows == [row[:5] for row in events_db.execute(legacy, params).fetchall()]
+    assert legacy_s / indexed_s >= MIN_SPEEDUP
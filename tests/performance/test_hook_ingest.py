@@ -0,0 +1,63 @@
+"""Batched hook event ingestion vs one committed transaction per event.
+
+The per-event baseline mirrors what HookEvent.save() did through the
+adapter: its own connection-level transaction and commit for every event,
+in the default rollback-journal mode.
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from khive.daemon.ingest import HookEventIngestor, event_row
+from khive.services.claude.hooks.schema import CREATE_TABLE_SQL, INSERT_SQL
+from tests.daemon.test_ingest import FakeEvent
+
+EVENTS = 2000
+MIN_SPEEDUP = 5.0
+
+
+def _per_event_commits(db_path, events) -> float:
+    conn = sqlite3.connect(db_path)
+    conn.execute(CREATE_TABLE_SQL.format(table="hook_events"))
+    started = time.perf_counter()
+    for event in events:
+        with conn:
+            conn.execute(INSERT_SQL.format(table="hook_events"), event_row(event))
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+async def _batched(db_path, events, producers: int = 32) -> tuple[float, dict]:
+    ingestor = HookEventIngestor(db_path)
+    ingestor.start()
+
+    async def produce(chunk):
+        for event in chunk:
+            await ingestor.submit(event)
+            await asyncio.sleep(0)  # hook requests arrive interleaved
+
+    started = time.perf_counter()
+    await asyncio.gather(*(produce(events[i::producers]) for i in range(producers)))
+    await ingestor.stop()
+    return time.perf_counter() - started, ingestor.stats()
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_batched_ingestion_outpaces_per_event_commits(tmp_path):
+    events = [FakeEvent() for _ in range(EVENTS)]
+
+    serial_s = _per_event_commits(tmp_path / "serial.db", events)
+    batched_s, stats = await _batched(tmp_path / "batched.db", events)
+
+    print(
+        f"\n{EVENTS} events: per-event {EVENTS / serial_s:.0f}/s, "
+        f"batched {EVENTS / batched_s:.0f}/s in {stats['batches']} batches "
+        f"(avg {stats['avg_batch_size']}, commit p50 {stats['commit_p50_ms']} ms)"
+    )
+    assert stats["written"] == EVENTS
+    assert serial_s / batched_s >= MIN_SPEEDUP
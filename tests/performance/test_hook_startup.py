@@ -0,0 +1,119 @@
+"""Start-to-exit budget for the lightweight hook entry point.
+
+Runs `python -X importtime -m khive.services.claude.hooks.entry <hook>`
+against a stub daemon and fails when the hook process imports a heavy
+dependency, spends more than IMPORT_BUDGET_MS importing modules, or takes
+longer than HOOK_BUDGET_MS from spawn to exit.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from khive.daemon.liveness import write_daemon_state
+
+IMPORT_BUDGET_MS = 50.0  # modules imported after interpreter startup
+HOOK_BUDGET_MS = 400.0  # spawn to exit, including interpreter startup
+HEAVY_MODULES = ("lionagi", "httpx", "pydantic", "sqlalchemy", "fastapi", "anyio")
+
+
+class _StubDaemon(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._reply({"status": "healthy"})
+
+    def do_POST(self):
+        hook_input = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        hook_type = self.path.rsplit("/", 1)[-1]
+        if hook_input.get("block"):
+            self._reply({"output": {"denied": True}, "exit_code": 2, "stderr": "locked"})
+        else:
+            self._reply(
+                {"output": {"hook": hook_type, "proceed": True}, "exit_code": 0, "stderr": None}
+            )
+
+    def _reply(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def hook_env(tmp_path_factory):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubDaemon)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    state = tmp_path_factory.mktemp("khive") / "daemon.state"
+    write_daemon_state(url, path=state)
+    yield {**os.environ, "KHIVE_DAEMON_URL": url, "KHIVE_DAEMON_STATE": str(state)}
+    server.shutdown()
+
+
+def _run_hook(env, hook_type: str, hook_input: dict, *flags: str):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *flags, "-m", "khive.services.claude.hooks.entry", hook_type],
+        input=json.dumps(hook_input),
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    return result, (time.perf_counter() - started) * 1000
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """Top-level module -> cumulative import ms from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):  # nested imports are indented
+            modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+
+@pytest.mark.performance
+def test_forwarded_hook_stays_within_budget(hook_env):
+    result, _ = _run_hook(hook_env, "pre_command", {"tool_input": {"command": "ls"}}, "-X", "importtime")
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout) == {"hook": "pre_command", "proceed": True}
+
+    modules = parse_importtime(result.stderr)
+    heavy = [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+    assert heavy == []
+    # Modules a bare interpreter also imports (site, encodings) are not ours
+    bare = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True,
+        text=True,
+        env=hook_env,
+    )
+    startup = parse_importtime(bare.stderr)
+    import_ms = sum(ms for m, ms in modules.items() if m not in startup)
+    assert import_ms < IMPORT_BUDGET_MS, f"hook imports took {import_ms:.1f} ms"
+
+    best_ms = min(_run_hook(hook_env, "post_edit", {})[1] for _ in range(3))
+    print(f"\nhook imports {import_ms:.1f} ms, start-to-exit {best_ms:.1f} ms")
+    assert best_ms < HOOK_BUDGET_MS
+
+
+@pytest.mark.performance
+def test_forwarded_hook_replays_block_decision(hook_env):
+    result, _ = _run_hook(hook_env, "pre_edit", {"block": True})
+
+    assert result.returncode == 2
+    assert result.stderr.strip() == "locked"
+    assert json.loads(result.stdout) == {"denied": True}
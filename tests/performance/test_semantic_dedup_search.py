@@ -0,0 +1,86 @@
+"""Semantic duplicate lookup at 1k-100k indexed tasks.
+
+Lookups score every task with one matrix-vector product, so they stay
+exact with no candidate cap. The baseline is the same exact search done
+the old way, one NumPy cosine call per stored embedding list, measured
+at 10k. Rows are random sparse vectors inserted directly, since building
+100k embeddings through `add_task` would dominate the run.
+"""
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks.semantic_dedup import (
+    SemanticDeduplicator,
+    TaskEmbedding,
+)
+
+SIZES = (1_000, 10_000, 100_000)
+QUERIES = 100
+LOOP_QUERIES = 5
+MAX_LOOKUP_MS = 50.0
+MIN_SPEEDUP = 20.0
+WORDS = "refactor implement fix test api auth database cache queue schema ui".split()
+
+
+def _index(size: int, rng: np.random.Generator) -> tuple[SemanticDeduplicator, np.ndarray]:
+    dedup = SemanticDeduplicator(lsh_min_tasks=SIZES[-1] + 1)  # exact search only
+    dim = dedup._matrix.dim
+    vectors = rng.standard_normal((size, dim)).astype(np.float32)
+    vectors *= rng.random((size, dim)) < 0.1  # ~50 active buckets, like a description
+    ids = [f"task-{i}" for i in range(size)]
+    dedup._matrix.add_many(ids, vectors)
+    for task_id in ids:
+        dedup.task_embeddings[task_id] = TaskEmbedding(task_id, task_id)
+    return dedup, vectors
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    vec1, vec2 = np.array(a, dtype=np.float32), np.array(b, dtype=np.float32)
+    norms = np.sqrt(np.sum(vec1 * vec1)) * np.sqrt(np.sum(vec2 * vec2))
+    return float(np.dot(vec1, vec2) / norms) if norms else 0.0
+
+
+def _loop_best(dedup: SemanticDeduplicator, stored: list[list[float]], description: str):
+    query = dedup._create_embedding(description).tolist()
+    return max(_cosine(query, embedding) for embedding in stored)
+
+
+@pytest.mark.performance
+def test_lookup_latency_stays_flat():
+    rng = np.random.default_rng(5)
+    words = random.Random(5)
+    queries = [" ".join(words.sample(WORDS, 4)) for _ in range(QUERIES)]
+
+    per_query = {}
+    for size in SIZES:
+        dedup, vectors = _index(size, rng)
+        started = time.perf_counter()
+        singles = [dedup.find_similar_tasks(q, k=1, min_similarity=-1) for q in queries]
+        single_s = (time.perf_counter() - started) / QUERIES
+
+        started = time.perf_counter()
+        batch = dedup.find_similar_batch(queries, k=1, min_similarity=-1)
+        batch_s = (time.perf_counter() - started) / QUERIES
+        assert [m[0][1] for m in batch] == pytest.approx([m[0][1] for m in singles], abs=1e-5)
+        per_query[size] = single_s
+
+        line = (
+            f"\n{size:>7} tasks: {single_s * 1000:.2f} ms/query, "
+            f"{batch_s * 1000:.3f} ms/query batched"
+        )
+        if size == 10_000:
+            stored = vectors.tolist()
+            started = time.perf_counter()
+            exact = [_loop_best(dedup, stored, q) for q in queries[:LOOP_QUERIES]]
+            loop_s = (time.perf_counter() - started) / LOOP_QUERIES
+            # Same best score as the per-task loop, not a sampled one
+            assert [m[0][1] for m in singles[:LOOP_QUERIES]] == pytest.approx(exact, abs=1e-5)
+            line += f", per-task loop {loop_s * 1000:.1f} ms/query"
+            assert loop_s / single_s >= MIN_SPEEDUP
+        print(line, end="")
+
+    assert per_query[SIZES[-1]] * 1000 < MAX_LOOKUP_MS
@@ -0,0 +1,73 @@
+"""SimHash LSH recall against latency, vs brute-force cosine search.
+
+Indexes 50k random 256-dim vectors and queries near-duplicates of them
+(cosine 0.85-0.97 to their source). For each (tables, bits) setting,
+recall is the fraction of queries whose exact nearest neighbour is found
+among the LSH candidates, and latency covers hashing, collecting
+candidates and scoring them exactly. Brute force is one matrix-vector
+product over all rows.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks.embedding_matrix import EmbeddingMatrix, normalize
+from khive.services.claude.hooks.simhash import BITS, TABLES, SimHashLSH
+
+INDEXED = 50_000
+DIM = 256
+QUERIES = 200
+SETTINGS = [(8, 12), (16, 12), (TABLES, BITS), (32, 16), (48, 16)]
+MIN_RECALL = 0.95
+MIN_SPEEDUP = 5.0
+
+
+@pytest.mark.performance
+def test_recall_latency_curve():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((INDEXED, DIM)).astype(np.float32)
+    keys = [f"task-{i}" for i in range(INDEXED)]
+    matrix = EmbeddingMatrix(DIM)
+    matrix.add_many(keys, vectors)
+
+    sources = rng.integers(0, INDEXED, QUERIES)
+    noise = normalize(rng.standard_normal((QUERIES, DIM)).astype(np.float32))
+    scale = rng.uniform(0.25, 0.6, (QUERIES, 1)).astype(np.float32)
+    queries = normalize(vectors[sources]) + noise * scale
+
+    started = time.perf_counter()
+    exact = [matrix.top_k(query, 1)[0][0] for query in queries]
+    brute_s = (time.perf_counter() - started) / QUERIES
+    similarities = [score for _, score in exact]
+    print(
+        f"\n{INDEXED} x {DIM}: brute force {brute_s * 1000:.2f} ms/query "
+        f"(nearest cosine {min(similarities):.2f}-{max(similarities):.2f})"
+    )
+
+    curve = {}
+    for tables, bits in SETTINGS:
+        lsh = SimHashLSH(DIM, tables=tables, bits=bits)
+        lsh.add_many(keys, vectors)
+        started = time.perf_counter()
+        found, candidates = 0, 0
+        for query, (key, _) in zip(queries, exact):
+            pool = lsh.candidates(query)
+            candidates += len(pool)
+            best = matrix.top_k_among(query, pool, 1)
+            found += bool(best) and best[0][0] == key
+        lsh_s = (time.perf_counter() - started) / QUERIES
+        curve[tables, bits] = (found / QUERIES, lsh_s)
+        print(
+            f"  {tables:>2} tables x {bits} bits: recall {found / QUERIES:.3f}, "
+            f"{lsh_s * 1000:.2f} ms/query ({brute_s / lsh_s:.1f}x), "
+            f"{candidates / QUERIES:.0f} candidates"
+        )
+
+    # More tables at the same width trade latency for recall
+    assert curve[8, 12][0] <= curve[16, 12][0] <= curve[TABLES, BITS][0]
+    assert curve[32, 16][0] <= curve[48, 16][0]
+    recall, lsh_s = curve[TABLES, BITS]
+    assert recall >= MIN_RECALL
+    assert brute_s / lsh_s >= MIN_SPEEDUP
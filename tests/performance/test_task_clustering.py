@@ -0,0 +1,116 @@
+"""Clustering 1k, 10k and 50k indexed tasks.
+
+Tasks are synthetic 512-dim embeddings in planted groups of 1-6 (members
+at cosine ~0.86 to each other, ~0 to everything else), so the expected
+clusters are known. The baseline is the previous `get_task_clusters`
+loop, one Python-level cosine per pair, timed at 1k only. Exact blocked
+clustering runs at 1k and 10k; LSH clustering at 10k and 50k, where it
+must recover nearly all planted clusters. Peak allocation is tracked
+with tracemalloc against the memory budget.
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks.embedding_matrix import normalize
+from khive.services.claude.hooks.semantic_dedup import (
+    SemanticDeduplicator,
+    TaskEmbedding,
+)
+
+DIM = 512
+THRESHOLD = 0.75
+NOISE = 0.4  # member-member cosine ~ 1 / (1 + NOISE**2)
+BUDGET = 32 * 2**20
+MIN_LSH_RECALL = 0.97
+
+
+def _planted(n: int, rng: np.random.Generator) -> tuple[np.ndarray, list[list[int]]]:
+    sizes = []
+    while sum(sizes) < n:
+        sizes.append(int(rng.integers(1, 7)))
+    sizes[-1] -= sum(sizes) - n
+    centers = normalize(rng.standard_normal((len(sizes), DIM)).astype(np.float32))
+    labels = np.repeat(np.arange(len(sizes)), sizes)
+    order = rng.permutation(n)  # members are scattered over the index
+    labels = labels[order]
+    noise = normalize(rng.standard_normal((n, DIM)).astype(np.float32)) * NOISE
+    vectors = normalize(centers[labels] + noise)
+    truth: dict[int, list[int]] = {}
+    for row, label in enumerate(labels.tolist()):
+        truth.setdefault(label, []).append(row)
+    return vectors, sorted(g for g in truth.values() if len(g) > 1)
+
+
+def _dedup(vectors: np.ndarray) -> SemanticDeduplicator:
+    dedup = SemanticDeduplicator()
+    ids = [f"task-{i}" for i in range(len(vectors))]
+    dedup._matrix.add_many(ids, vectors)
+    dedup._lsh.add_many(ids, vectors)
+    for task_id in ids:
+        dedup.task_embeddings[task_id] = TaskEmbedding(task_id, task_id)
+    return dedup
+
+
+def _pairwise_loop(vectors: np.ndarray) -> list[list[int]]:
+    """The previous implementation: a similarity per pair, then greedy grouping."""
+    n = len(vectors)
+    similarity = np.zeros((n, n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            similarity[i, j] = similarity[j, i] = float(vectors[i] @ vectors[j])
+    clusters, visited = [], set()
+    for i in range(n):
+        if i in visited:
+            continue
+        group = [i] + [
+            j for j in range(n) if j not in visited and j != i and similarity[i, j] >= THRESHOLD
+        ]
+        visited.update(group)
+        if len(group) > 1:
+            clusters.append(group)
+    return clusters
+
+
+def _timed(dedup: SemanticDeduplicator, exact: bool):
+    tracemalloc.start()
+    started = time.perf_counter()
+    clusters = dedup.get_task_clusters(THRESHOLD, exact=exact, memory_budget=BUDGET)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    as_rows = sorted(sorted(int(t.split("-")[1]) for t in c) for c in clusters)
+    return as_rows, elapsed, peak
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("size", [1_000, 10_000, 50_000])
+def test_clustering_scales(size):
+    rng = np.random.default_rng(size)
+    vectors, truth = _planted(size, rng)
+    dedup = _dedup(vectors)
+    results = []
+
+    if size <= 10_000:
+        exact, exact_s, exact_peak = _timed(dedup, exact=True)
+        assert exact == truth
+        assert exact_peak < 2 * BUDGET
+        results.append(f"exact {exact_s:.2f} s (peak {exact_peak / 2**20:.0f} MiB)")
+    if size == 1_000:
+        started = time.perf_counter()
+        assert sorted(_pairwise_loop(vectors)) == truth
+        loop_s = time.perf_counter() - started
+        results.append(f"pairwise loop {loop_s:.2f} s")
+        assert loop_s / exact_s >= 10
+    if size >= 10_000:
+        found, lsh_s, lsh_peak = _timed(dedup, exact=False)
+        recall = len(set(map(tuple, found)) & set(map(tuple, truth))) / len(truth)
+        results.append(
+            f"LSH {lsh_s:.2f} s (peak {lsh_peak / 2**20:.0f} MiB, recall {recall:.3f})"
+        )
+        assert recall >= MIN_LSH_RECALL
+        assert lsh_peak < 2 * BUDGET
+    print(f"\n{size:>6} tasks, {len(truth)} planted clusters: {', '.join(results)}", end="")
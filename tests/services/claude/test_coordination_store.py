@@ -0,0 +1,179 @@
+"""Tests for persisting the coordination registry across restarts."""
+
+import json
+import time
+
+import pytest
+
+from khive.services.claude.hooks.coordination import CoordinationRegistry
+from khive.services.claude.hooks.coordination_store import CoordinationJournal
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    return tmp_path / "coordination"
+
+
+def _journaled(state_dir, **kwargs) -> tuple[CoordinationRegistry, CoordinationJournal]:
+    registry = CoordinationRegistry()
+    journal = CoordinationJournal(state_dir, **kwargs)
+    journal.recover(registry)
+    journal.attach(registry)
+    return registry, journal
+
+
+def _recover(state_dir, now=None) -> tuple[CoordinationRegistry, dict]:
+    registry = CoordinationRegistry()
+    return registry, CoordinationJournal(state_dir).recover(registry, now=now)
+
+
+@pytest.mark.unit
+class TestCoordinationJournal:
+    def test_crash_recovery_replays_the_log(self, state_dir, tmp_path):
+        registry, journal = _journaled(state_dir)
+        registry.register_agent_work("agent-a", "refactor the parser module")
+        registry.register_agent_work("agent-b", "write database migration tests")
+        a, b = str(tmp_path / "a.py"), str(tmp_path / "b.py")
+        registry.request_file_lock("agent-a", a)
+        registry.request_file_lock("agent-a", str(tmp_path / "pkg"), directory=True)
+        registry.request_file_lock("agent-b", b)
+        registry.release_file_lock("agent-b", b)
+        registry.complete_work("agent-b")
+        artifact_id = registry.share_artifact("agent-a", "notes", a)
+        registry.register_session_mapping("session-1", "agent-a")
+        lock = registry.file_locks[a]
+        seq = registry.event_seq
+        # Crash: no close(), no final snapshot
+
+        later = lock.locked_at + 100  # down for ~100 s
+        recovered, stats = _recover(state_dir, now=later)
+        assert stats["snapshot"] == 1 and stats["replayed"] > 0
+        assert list(recovered.active_agents) == ["agent-a"]
+        assert recovered.active_agents["agent-a"].files_editing == [a, str(tmp_path / "pkg")]
+        assert set(recovered.file_locks) == {a, str(tmp_path / "pkg")}
+        assert recovered.file_locks[str(tmp_path / "pkg")].directory is True
+        # Deadline moved by the downtime: the same time left as at the crash
+        remaining = recovered.file_locks[a].expires_at - later
+        assert remaining == pytest.approx(lock.expires_at - journal.last_write, abs=0.01)
+        assert recovered.get_artifact(artifact_id).content == "notes"
+        assert recovered.get_agent_id_from_session("session-1") == "agent-a"
+        assert recovered.event_seq > seq
+        assert recovered.events_since(seq) is None  # resync after a restart
+        assert recovered.request_file_lock("agent-c", str(tmp_path / "pkg" / "x.py"))[
+            "status"
+        ] == "locked"
+
+    def test_locks_expired_before_the_crash_are_dropped(self, state_dir, tmp_path):
+        registry, journal = _journaled(state_dir)
+        registry.request_file_lock("agent-a", str(tmp_path / "a.py"))
+        registry.file_locks[str(tmp_path / "a.py")].lock_duration_seconds = 0.001
+        registry.renew_file_lock("agent-a", str(tmp_path / "a.py"))  # logs the deadline
+        time.sleep(0.01)
+        journal.heartbeat()
+
+        recovered, stats = _recover(state_dir)
+        assert recovered.file_locks == {}
+        assert stats["locks_expired"] == 1
+
+    def test_torn_lines_and_stale_logs(self, state_dir):
+        registry, journal = _journaled(state_dir)
+        registry.register_session_mapping("s1", "agent-a")
+        registry.register_session_mapping("s2", "agent-b")
+        with open(journal.wal_path, "a") as f:
+            f.write('[1.0,3,"s+","s3"')  # cut short by a crash
+        recovered, stats = _recover(state_dir)
+        assert recovered.session_to_agent == {"s1": "agent-a", "s2": "agent-b"}
+        assert stats["skipped"] == 1
+
+        # A crash between snapshot and log restart leaves an older log behind
+        wal = journal.wal_path.read_text()
+        journal.close()
+        journal.wal_path.write_text(wal.replace('"s1","agent-a"', '"s1","other"'))
+        recovered, stats = _recover(state_dir)
+        assert stats["replayed"] == 0
+        assert recovered.session_to_agent["s1"] == "agent-a"
+
+    def test_snapshots_bound_the_log(self, state_dir):
+        registry, journal = _journaled(state_dir, snapshot_every=10)
+        for i in range(25):
+            registry.register_session_mapping(f"s{i}", "agent-a")
+        assert journal.counters["snapshots"] == 3  # attach + two forced
+        assert journal.ops_since_snapshot == 5
+        assert len(journal.wal_path.read_text().splitlines()) == 6  # header + 5
+
+        snapshot = json.loads(journal.snapshot_path.read_text())
+        assert len(snapshot["sessions"]) == 20
+        recovered, stats = _recover(state_dir)
+        assert len(recovered.session_to_agent) == 25
+        assert stats["replayed"] == 5
+
+    def test_idle_heartbeats_do_not_grow_the_log(self, state_dir, tmp_path):
+        registry, journal = _journaled(state_dir)
+        registry.request_file_lock("agent-a", str(tmp_path / "a.py"))
+        journal.checkpoint()  # snapshots the lock
+        for _ in range(100):
+            journal.checkpoint()
+        assert journal.counters == {"ops": 1, "snapshots": 2, "heartbeats": 100}
+        lines = journal.wal_path.read_text().splitlines()
+        assert len(lines) == 2 and json.loads(lines[1])[-1] == "hb"
+
+        # Downtime still counts from the newest heartbeat
+        later = journal.last_write + 100
+        recovered, stats = _recover(state_dir, now=later)
+        assert stats["replayed"] == 1
+        assert stats["downtime_seconds"] == pytest.approx(100, abs=0.01)
+        assert str(tmp_path / "a.py") in recovered.file_locks
+
+        # Once ops are logged, heartbeats append after them
+        registry.register_session_mapping("s1", "agent-a")
+        journal.heartbeat()
+        assert len(journal.wal_path.read_text().splitlines()) == 4
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_keeps_coordination_state_across_restarts(tmp_path, monkeypatch):
+    import httpx
+
+    from khive.daemon import server as server_module
+    from khive.daemon.ingest import HookEventIngestor
+    from khive.services.claude.hooks import coordination
+
+    monkeypatch.setattr(server_module, "WARMUP_ENABLED", False)
+    target = str(tmp_path / "mod.py")
+
+    async def run_daemon(requests):
+        monkeypatch.setattr(coordination, "_registry", None)
+        daemon = server_module.KhiveDaemonServer()
+        daemon.ingestor = HookEventIngestor(tmp_path / "hooks.db")
+        daemon.spool_dir = tmp_path / "spool"
+        daemon.coordination_state_dir = tmp_path / "coordination"
+        await daemon.startup()
+        try:
+            transport = httpx.ASGITransport(app=daemon.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://d") as client:
+                return [await request(client) for request in requests]
+        finally:
+            await daemon.shutdown()
+
+    await run_daemon(
+        [
+            lambda c: c.post(
+                "/api/coordinate/start",
+                json={"task_id": "t", "description": "refactor parser", "agent_id": "a"},
+            ),
+            lambda c: c.post(
+                "/api/coordinate/file-register", json={"file_path": target, "agent_id": "a"}
+            ),
+        ]
+    )
+    blocked, status = await run_daemon(
+        [
+            lambda c: c.post(
+                "/api/coordinate/file-register", json={"file_path": target, "agent_id": "b"}
+            ),
+            lambda c: c.get("/api/coordinate/status"),
+        ]
+    )
+    assert blocked.status_code == 409
+    assert status.json()["active_agents"] == 1
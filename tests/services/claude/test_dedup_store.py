@@ -0,0 +1,168 @@
+"""Tests for saving, bounding and expiring the semantic dedup index."""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks import dedup_store, semantic_dedup
+from khive.services.claude.hooks.embedding_matrix import EmbeddingMatrix
+from khive.services.claude.hooks.semantic_dedup import SemanticDeduplicator
+
+TASKS = [
+    ("leak", "Fix the memory leak in the websocket broadcaster"),
+    ("auth", "Add JWT authentication to the REST API"),
+    ("dark", "Add dark mode to the dashboard"),
+    ("cache", "Cache database queries for the orders endpoint"),
+]
+
+
+def _dedup(**kwargs) -> SemanticDeduplicator:
+    dedup = SemanticDeduplicator(**kwargs)
+    dedup.add_tasks(TASKS, metadata={"source": "test"})
+    return dedup
+
+
+@pytest.mark.unit
+class TestPersistence:
+    def test_reload_matches_like_the_original(self, tmp_path):
+        dedup = _dedup(completed_ttl=float("inf"))
+        dedup.complete_task("dark", completed_at=123.0)
+        queries = ["Websocket broadcaster leaks memory", "JWT auth for the API"]
+        before = dedup.find_similar_batch(queries, k=2, min_similarity=-1)
+        dedup.save(tmp_path)
+        assert not dedup.dirty
+
+        loaded = SemanticDeduplicator.load(tmp_path, completed_ttl=float("inf"))
+        assert list(loaded.task_embeddings) == list(dedup.task_embeddings)
+        assert isinstance(loaded._matrix._vectors, np.memmap)
+        assert not loaded._lsh_synced and not loaded.dirty
+        assert loaded.task_embeddings["dark"].completed_at == 123.0
+        assert loaded.task_embeddings["auth"].metadata == {"source": "test"}
+        assert loaded.embedder.docs == dedup.embedder.docs
+
+        after = loaded.find_similar_batch(queries, k=2, min_similarity=-1)
+        assert [[key for key, _ in m] for m in after] == [[key for key, _ in m] for m in before]
+        assert [s for m in after for _, s in m] == pytest.approx(
+            [s for m in before for _, s in m], abs=1e-6
+        )
+        # LSH is built on the first lookup that needs it
+        assert loaded.find_similar_batch(queries, k=2, min_similarity=-1, exact=False)
+        assert loaded._lsh_synced and len(loaded._lsh) == len(TASKS)
+
+    def test_changes_after_load_never_touch_the_saved_file(self, tmp_path):
+        _dedup().save(tmp_path)
+        loaded = SemanticDeduplicator.load(tmp_path)
+        loaded.remove_task("leak")  # zeroes a mapped row: copy-on-write
+        loaded.add_task("queue", "Retry failed jobs in the task queue")  # grows the matrix
+        assert not isinstance(loaded._matrix._vectors, np.memmap)
+
+        again = SemanticDeduplicator.load(tmp_path)
+        assert "leak" in again.task_embeddings and "queue" not in again.task_embeddings
+        assert again.find_similar_task(TASKS[0][1])[0] == "leak"
+
+        loaded.save(tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".lock", "embeddings-2.npy", "index.json"]
+        assert set(SemanticDeduplicator.load(tmp_path).task_embeddings) == {
+            "auth", "dark", "cache", "queue"
+        }
+
+    def test_unusable_indexes_load_empty(self, tmp_path):
+        assert not SemanticDeduplicator.load(tmp_path / "missing").task_embeddings
+
+        _dedup().save(tmp_path)
+        sidecar = json.loads((tmp_path / dedup_store.SIDECAR_NAME).read_text())
+        sidecar["embedder"]["dim"] = 64  # saved by a differently configured embedder
+        (tmp_path / dedup_store.SIDECAR_NAME).write_text(json.dumps(sidecar))
+        assert not SemanticDeduplicator.load(tmp_path).task_embeddings
+
+        sidecar["embeddings"] = "embeddings-9.npy"  # lost to a crash
+        (tmp_path / dedup_store.SIDECAR_NAME).write_text(json.dumps(sidecar))
+        assert dedup_store.read(tmp_path) is None
+
+        empty = tmp_path / "empty"
+        SemanticDeduplicator().save(empty)
+        assert not SemanticDeduplicator.load(empty).task_embeddings
+
+    def test_concurrent_saves_leave_one_whole_index(self, tmp_path):
+        savers = [_dedup() for _ in range(6)]
+        for i, dedup in enumerate(savers):
+            dedup.add_task(f"extra-{i}", f"Task number {i} for saver {i}")
+        barrier = threading.Barrier(len(savers))
+        errors = []
+
+        def save(dedup):
+            barrier.wait()
+            try:
+                dedup.save(tmp_path)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save, args=(d,)) for d in savers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        sidecar = json.loads((tmp_path / dedup_store.SIDECAR_NAME).read_text())
+        assert sidecar["generation"] == len(savers)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            ".lock", sidecar["embeddings"], "index.json"
+        ]
+        loaded = SemanticDeduplicator.load(tmp_path)
+        extras = [t for t in loaded.task_embeddings if t.startswith("extra-")]
+        assert len(extras) == 1  # last writer wins
+        assert loaded.find_similar_task(TASKS[0][1])[0] == "leak"
+
+    def test_from_rows_adopts_the_array(self):
+        vectors = np.eye(3, dtype=np.float32)
+        matrix = EmbeddingMatrix.from_rows(["a", "b", "c"], vectors)
+        assert matrix._vectors is vectors
+        assert matrix.top_k([0.0, 1.0, 0.1], k=1)[0][0][0] == "b"
+        with pytest.raises(ValueError):
+            EmbeddingMatrix.from_rows(["a", "a", "c"], vectors)
+
+
+@pytest.mark.unit
+class TestBudgetAndExpiry:
+    def test_least_recently_used_tasks_are_evicted(self):
+        dedup = _dedup()
+        per_task = dedup.index_bytes // len(TASKS)
+        dedup.index_budget = dedup.index_bytes + per_task // 2
+
+        dedup.find_similar_task(TASKS[0][1])  # "leak" is now the most recent
+        dedup.add_task("queue", "Retry failed jobs in the task queue")
+        assert list(dedup.task_embeddings) == ["dark", "cache", "leak", "queue"]
+        assert dedup.evictions == 1 and dedup.index_bytes <= dedup.index_budget
+        assert dedup.embedder.docs == 4  # evicted tasks leave the IDF too
+
+    def test_completed_tasks_expire_after_the_ttl(self, tmp_path):
+        dedup = _dedup(completed_ttl=60.0)
+        assert not dedup.complete_task("missing")
+        dedup.complete_task("auth", completed_at=1_000.0)
+        dedup.complete_task("dark", completed_at=1_050.0)
+
+        assert dedup.expire_completed(now=1_059.0) == []
+        assert dedup.expire_completed(now=1_100.0) == ["auth"]
+        assert dedup.find_similar_task(TASKS[1][1]) is None
+        assert dedup.expirations == 1
+
+        dedup.save(tmp_path)  # "dark" expired long ago by the wall clock
+        assert set(SemanticDeduplicator.load(tmp_path).task_embeddings) == {"leak", "cache"}
+
+    def test_global_index_loads_lazily_and_saves_when_changed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(semantic_dedup, "SEMANTIC_INDEX_DIR", tmp_path)
+        monkeypatch.setattr(semantic_dedup, "_semantic_dedup", None)
+        monkeypatch.setattr(semantic_dedup.atexit, "register", lambda fn: None)
+
+        semantic_dedup.save_semantic_index()  # never loaded: nothing to save
+        assert not (tmp_path / dedup_store.SIDECAR_NAME).exists()
+
+        semantic_dedup.add_task_to_index("leak", TASKS[0][1])
+        semantic_dedup.save_semantic_index()
+        assert (tmp_path / dedup_store.SIDECAR_NAME).exists()
+
+        monkeypatch.setattr(semantic_dedup, "_semantic_dedup", None)
+        assert semantic_dedup.check_semantic_duplicate(TASKS[0][1])["similar_task_id"] == "leak"
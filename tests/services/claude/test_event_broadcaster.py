@@ -0,0 +1,150 @@
+"""Tests for per-subscriber queued dispatch in EventBroadcaster."""
+
+import asyncio
+import time
+
+import pytest
+
+from khive.utils import EventBroadcaster
+
+
+class Broadcaster(EventBroadcaster):
+    _subscriptions = {}  # isolated from HookEventBroadcaster's subscribers
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    yield
+    for callback in list(Broadcaster._subscriptions):
+        Broadcaster.unsubscribe(callback)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestEventBroadcaster:
+    async def test_slow_subscriber_does_not_delay_broadcast_or_others(self):
+        fast, slow = [], []
+        release = asyncio.Event()
+
+        async def slow_subscriber(event):
+            await release.wait()
+            slow.append(event)
+
+        Broadcaster.subscribe_async(slow_subscriber)
+        Broadcaster.subscribe(fast.append)  # sync callbacks are queued too
+
+        started = time.perf_counter()
+        for i in range(5):
+            await Broadcaster.broadcast(i)
+        assert time.perf_counter() - started < 0.05
+
+        for _ in range(100):
+            if len(fast) == 5:
+                break
+            await asyncio.sleep(0)
+        assert fast == [0, 1, 2, 3, 4]
+        assert slow == []
+
+        release.set()
+        await Broadcaster.drain()
+        assert slow == [0, 1, 2, 3, 4]
+        stats = {s["subscriber"]: s for s in Broadcaster.get_subscriber_stats()}
+        slow_stats = stats[slow_subscriber.__qualname__]
+        assert slow_stats["delivered"] == 5
+        assert slow_stats["pending"] == 0
+        assert slow_stats["max_lag_ms"] > 0
+
+    @pytest.mark.parametrize(
+        ("overflow", "received", "dropped"),
+        [("drop_oldest", [7, 8, 9], 7), ("drop_newest", [0, 1, 2], 7)],
+    )
+    async def test_overflow_drops_and_counts(self, overflow, received, dropped):
+        got = []
+        Broadcaster.subscribe(got.append, maxsize=3, overflow=overflow)
+
+        for i in range(10):  # no await in between: the consumer can't run
+            await Broadcaster.broadcast(i)
+        await Broadcaster.drain()
+
+        assert got == received
+        (stats,) = Broadcaster.get_subscriber_stats()
+        assert (stats["dropped"], stats["delivered"]) == (dropped, 3)
+
+    async def test_block_policy_applies_backpressure(self):
+        got = []
+
+        async def subscriber(event):
+            await asyncio.sleep(0.001)
+            got.append(event)
+
+        Broadcaster.subscribe_async(subscriber, maxsize=2, overflow="block")
+        for i in range(10):
+            await Broadcaster.broadcast(i)
+        await Broadcaster.drain()
+
+        assert got == list(range(10))
+        (stats,) = Broadcaster.get_subscriber_stats()
+        assert stats["dropped"] == 0
+
+    async def test_failing_subscriber_is_isolated(self):
+        got = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        Broadcaster.subscribe(broken)
+        Broadcaster.subscribe(got.append)
+        await Broadcaster.broadcast("event")
+        await Broadcaster.drain()
+
+        assert got == ["event"]
+        stats = {s["subscriber"]: s for s in Broadcaster.get_subscriber_stats()}
+        assert stats[broken.__qualname__]["errors"] == 1
+
+    async def test_unsubscribe_and_bad_policy(self):
+        Broadcaster.subscribe(print)
+        assert Broadcaster.get_subscriber_count() == 1
+        Broadcaster.unsubscribe(print)
+        assert Broadcaster.get_subscriber_count() == 0
+        with pytest.raises(ValueError):
+            Broadcaster.subscribe(print, overflow="spill")
+
+
+@pytest.mark.unit
+def test_subscribers_survive_event_loop_changes():
+    got = []
+    Broadcaster.subscribe(got.append)
+
+    async def publish(event):
+        await Broadcaster.broadcast(event)
+        await Broadcaster.drain()
+
+    # e.g. the dashboard runs each load in a fresh event loop
+    asyncio.run(publish("first"))
+    asyncio.run(publish("second"))
+
+    assert got == ["first", "second"]
+
+
+@pytest.mark.unit
+def test_events_stranded_on_a_finished_loop_count_as_dropped():
+    got = []
+
+    async def subscriber(event):
+        await asyncio.sleep(0.01)
+        got.append(event)
+
+    Broadcaster.subscribe_async(subscriber)
+
+    async def publish(events, drain):
+        for event in events:
+            await Broadcaster.broadcast(event)
+        if drain:
+            await Broadcaster.drain()
+
+    asyncio.run(publish(["lost-1", "lost-2", "lost-3"], drain=False))  # ends too soon
+    asyncio.run(publish(["kept"], drain=True))
+
+    assert got == ["kept"]
+    (stats,) = Broadcaster.get_subscriber_stats()
+    assert (stats["dropped"], stats["delivered"]) == (3, 1)
@@ -0,0 +1,137 @@
+"""Tests for the cross-process hook event change feed."""
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import khive
+from khive.daemon.ingest import insert_rows, open_table
+from khive.services.claude.hooks.change_feed import HookEventFeed, current_high_water
+
+
+def _row(event_id: str, created_at: str = "2026-01-01 00:00:00", **content):
+    content = {"event_type": "post_edit", "tool_name": "Edit", "session_id": "s1", **content}
+    return (event_id, json.dumps(content), "{}", created_at, None)
+
+
+def _insert(db_path, rows):
+    conn = open_table(db_path)
+    insert_rows(conn, rows)
+    conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "hooks.db"
+    _insert(path, [_row("old")])
+    return path
+
+
+async def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestHookEventFeed:
+    async def test_delivers_commits_from_another_process(self, db_path):
+        feed = HookEventFeed(db_path)
+        seen = []
+        feed.start(seen.append)
+        await _wait_for(lambda: feed.high_water is not None)
+
+        # Late created_at: insert order, not timestamps, drives the feed
+        script = (
+            "import json, sys\n"
+            "from khive.daemon.ingest import insert_rows, open_table\n"
+            "conn = open_table(sys.argv[1])\n"
+            "for i in range(3):\n"
+            "    content = json.dumps({'event_type': 'post_edit'})\n"
+            "    insert_rows(conn, [(f'p{i}', content, '{}', '2020-01-01', None)])\n"
+        )
+        started = time.monotonic()
+        subprocess.run(
+            [sys.executable, "-c", script, str(db_path)],
+            check=True,
+            env={"PYTHONPATH": str(Path(khive.__file__).parents[1])},
+        )
+        await _wait_for(lambda: len(seen) == 3)
+        latency = time.monotonic() - started
+        await feed.stop()
+
+        assert [r.id for r in seen] == ["p0", "p1", "p2"]  # not the old row
+        assert latency < 5.0
+        assert feed.stats()["delivered"] == 3
+
+    async def test_idle_feed_does_not_query_the_table(self, db_path):
+        feed = HookEventFeed(db_path, poll_interval=0.005)
+        feed.start(lambda _record: None)
+        await _wait_for(lambda: feed.high_water is not None)
+        fetches = feed.counters["fetches"]
+        await asyncio.sleep(0.2)  # ~40 polls
+        assert feed.counters["fetches"] - fetches <= 1
+        await feed.stop()
+
+    async def test_wake_reads_before_the_next_poll(self, db_path):
+        feed = HookEventFeed(db_path, poll_interval=60)
+        seen = []
+        feed.start(seen.append, high_water=0)
+        await _wait_for(lambda: seen)  # first pass reads from the mark
+
+        _insert(db_path, [_row("new")])
+        feed.wake()
+        await _wait_for(lambda: len(seen) == 2)
+        assert [r.id for r in seen] == ["old", "new"]
+        assert feed.counters["wakeups"] >= 1
+        await feed.stop()
+
+    async def test_stop_delivers_what_is_committed(self, db_path):
+        feed = HookEventFeed(db_path, poll_interval=60, batch_size=2)
+        seen = []
+        conn = open_table(db_path)
+        feed.start(seen.append, high_water=current_high_water(conn))
+        await _wait_for(lambda: feed._conn is not None)
+        insert_rows(conn, [_row(f"e{i}") for i in range(5)])
+        conn.close()
+
+        await feed.stop()
+        assert [r.id for r in seen] == [f"e{i}" for i in range(5)]
+        assert not feed.running
+
+    async def test_imports_spool_and_reanchors_after_renumbering(self, db_path, tmp_path):
+        spool_dir = tmp_path / "spool"
+        spool_dir.mkdir()
+        record = {
+            "id": "spooled",
+            "content": {"event_type": "pre_command"},
+            "node_metadata": {},
+            "created_at": "2026-01-01 00:00:01",
+            "embedding": None,
+        }
+        (spool_dir / "1999999999-offline.ndjson").write_text(json.dumps(record) + "\n")
+
+        feed = HookEventFeed(db_path, spool_dir=spool_dir, spool_interval=0)
+        seen = []
+        feed.start(seen.append)
+        await _wait_for(lambda: seen)
+        assert seen[0].id == "spooled"
+        assert feed.counters["spool_imported"] == 1
+
+        # Rows deleted and rowids reused below the mark, as after a VACUUM
+        conn = open_table(db_path)
+        with conn:
+            conn.execute("DELETE FROM hook_events")
+        conn.close()
+        await _wait_for(lambda: feed.counters["resets"] == 1)
+        _insert(db_path, [_row("after")])
+        await _wait_for(lambda: len(seen) == 2)
+        await feed.stop()
+        assert seen[1].id == "after"
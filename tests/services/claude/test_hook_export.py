@@ -0,0 +1,150 @@
+"""Tests for streaming hook event exports."""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import tracemalloc
+
+import pytest
+
+from khive.daemon.ingest import insert_rows, open_table
+from khive.services.claude.hooks import spool
+from khive.services.claude.hooks.export import CSV_COLUMNS, iter_export
+from khive.services.claude.hooks.schema import schema_version
+
+EXPORTED_EVENTS = 50_000
+
+
+def _row(event_id: str, created_at: str, **content):
+    content = {"event_type": "post_edit", "tool_name": "Edit", "session_id": "s1", **content}
+    return (event_id, json.dumps(content), "{}", created_at, None)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "hooks.db"
+    conn = open_table(path)
+    insert_rows(
+        conn,
+        [
+            _row("e1", "2026-01-01 00:00:00", command="echo 'a,b'"),
+            _row("e2", "2026-01-02 00:00:00", event_type="pre_command", tool_name="Bash"),
+            _row("e3", "2026-01-03 00:00:00", session_id="s2"),
+        ],
+    )
+    conn.close()
+    return path
+
+
+@pytest.mark.unit
+class TestHookEventExport:
+    def test_ndjson_round_trips_through_the_spool(self, db_path, tmp_path):
+        stats = {}
+        data = b"".join(iter_export(db_path, batch_size=2, stats=stats))
+
+        records = [json.loads(line) for line in data.splitlines()]
+        assert [r["id"] for r in records] == ["e1", "e2", "e3"]
+        assert records[0]["content"]["command"] == "echo 'a,b'"
+        assert stats == {"events": 3}
+
+        # An export is a valid spool file: it re-imports into a fresh database
+        spool_dir = tmp_path / "spool"
+        spool_dir.mkdir()
+        (spool_dir / "1999999999-export.ndjson").write_bytes(data)
+        result = spool.import_spool(spool_dir, db_path=tmp_path / "copy.db")
+        assert result["imported"] == 3
+
+    def test_csv_with_filters_and_gzip(self, db_path):
+        data = b"".join(
+            iter_export(db_path, "csv", since="2026-01-01 12:00", gzip=True, session_id="s1")
+        )
+
+        rows = list(csv.reader(io.StringIO(gzip.decompress(data).decode())))
+        assert rows[0] == list(CSV_COLUMNS)
+        assert [r[:5] for r in rows[1:]] == [
+            ["e2", "2026-01-02 00:00:00", "pre_command", "s1", "Bash"]
+        ]
+        assert json.loads(rows[1][5])["tool_name"] == "Bash"
+
+    def test_rejects_bad_arguments_before_streaming(self, db_path):
+        with pytest.raises(ValueError):
+            iter_export(db_path, "xml")
+        with pytest.raises(ValueError):
+            iter_export(db_path, content="x")
+
+    def test_reads_without_migrating(self, db_path, tmp_path):
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA user_version = 2")
+        conn.close()
+
+        with pytest.raises(RuntimeError, match="schema version 2"):
+            iter_export(db_path)
+        conn = sqlite3.connect(db_path)
+        assert schema_version(conn) == 2
+        conn.close()
+
+        missing = tmp_path / "missing.db"
+        assert b"".join(iter_export(missing, "csv")).decode().startswith("id,")
+        assert not missing.exists()
+
+    def test_memory_is_independent_of_row_count(self, tmp_path):
+        db_path = tmp_path / "big.db"
+        conn = open_table(db_path)
+        with conn:
+            conn.execute(
+                "WITH RECURSIVE seq(i) AS "
+                "(SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < :count) "
+                "INSERT INTO hook_events (id, content, node_metadata, created_at) "
+                "SELECT printf('e%08d', i), json_object('event_type', 'post_edit', "
+                "'output', printf('%.200c', 'x')), '{}', "
+                "strftime('%Y-%m-%d %H:%M:%f', 1767225600 + i, 'unixepoch') FROM seq",
+                {"count": EXPORTED_EVENTS},
+            )
+        conn.close()
+
+        def peak(until: str) -> tuple[int, int]:
+            tracemalloc.start()
+            stats = {}
+            for _chunk in iter_export(db_path, "csv", until=until, gzip=True, stats=stats):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak, stats["events"]
+
+        small, small_events = peak("2026-01-01 01:23:20")  # first 5,000
+        large, large_events = peak("2027-01-01")
+        assert (small_events, large_events) == (5_000, EXPORTED_EVENTS)
+        assert large < small * 1.5
+        assert large < 5 * 1024 * 1024
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_streams_export():
+    from tests.performance.load_harness import in_process_daemon
+
+    async with in_process_daemon() as client:
+        content = {"event_type": "post_command", "tool_name": "Bash", "session_id": "s9"}
+        await client.post(
+            "/api/hooks/events", json={"events": [{"content": content} for _ in range(3)]}
+        )
+        for _ in range(100):
+            if (await client.get("/api/stats")).json()["ingest"]["written"] == 3:
+                break
+            await asyncio.sleep(0.01)
+
+        ndjson = await client.get("/api/hooks/export", params={"session_id": "s9"})
+        gzipped = await client.get(
+            "/api/hooks/export", params={"format": "csv", "gzip": "true"}
+        )
+        bad = await client.get("/api/hooks/export", params={"format": "xml"})
+
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert len(ndjson.text.splitlines()) == 3
+    assert gzipped.headers["content-type"] == "application/gzip"
+    assert 'filename="hook_events.csv.gz"' in gzipped.headers["content-disposition"]
+    assert len(gzip.decompress(gzipped.content).decode().splitlines()) == 4
+    assert bad.status_code == 422
@@ -0,0 +1,163 @@
+"""Tests for keyset-paginated hook event reads."""
+
+import json
+import tracemalloc
+import uuid
+
+import pytest
+
+from khive.daemon.ingest import insert_rows, open_table
+from khive.services.claude.hooks.reader import (
+    EventRecord,
+    connect_reader,
+    fetch_page,
+    format_cursor,
+    iter_records,
+    parse_cursor,
+)
+
+STREAMED_EVENTS = 50_000
+NODE_METADATA = {"lion_class": "khive.services.claude.hooks.hook_event.HookEvent"}
+
+
+def _row(event_id: str, created_at: str, **content):
+    content = {"event_type": "post_edit", "tool_name": "Edit", "session_id": "s1", **content}
+    return (event_id, json.dumps(content), json.dumps(NODE_METADATA), created_at, None)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "hooks.db"
+    open_table(path).close()
+    return path
+
+
+def _insert(db_path, rows):
+    conn = open_table(db_path)
+    insert_rows(conn, rows)
+    conn.close()
+
+
+@pytest.mark.unit
+class TestKeysetReader:
+    def test_pages_through_ties_without_gaps_or_repeats(self, db_path):
+        # Several events per timestamp: paging on created_at alone would
+        # skip or repeat rows at page boundaries
+        rows = [
+            _row(f"e{i:03d}", f"2026-01-01 00:00:{i // 4:02d}", session_id=f"s{i % 2}")
+            for i in range(40)
+        ]
+        _insert(db_path, reversed(rows))
+        conn = connect_reader(db_path)
+
+        records = list(iter_records(conn, batch_size=3))
+        assert [r.id for r in records] == [f"e{i:03d}" for i in range(40)]
+
+        since = list(iter_records(conn, since="2026-01-01 00:00:05", batch_size=7))
+        assert since[0].id == "e020"
+        assert len(since) == 20
+
+        resumed = list(iter_records(conn, after=records[9].cursor, batch_size=4))
+        assert [r.id for r in resumed] == [r.id for r in records[10:]]
+
+        filtered = list(
+            iter_records(conn, session_id="s1", until="2026-01-01 00:00:02", batch_size=2)
+        )
+        assert [r.id for r in filtered] == ["e001", "e003", "e005", "e007"]
+        with pytest.raises(ValueError):
+            fetch_page(conn, content="x")
+        conn.close()
+
+    def test_page_query_uses_keyset_index(self, db_path):
+        conn = connect_reader(db_path)
+        calls = []
+        conn.set_trace_callback(calls.append)
+        fetch_page(conn, after=("2026-01-01 00:00:00", "e1"), batch_size=10)
+        (sql,) = calls
+
+        plan = " ".join(r[-1] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "USING INDEX idx_hook_events_created_id ((created_at,id)>(?,?))" in plan
+        assert "TEMP B-TREE" not in plan
+        conn.close()
+
+    def test_records_and_cursors(self, db_path):
+        _insert(db_path, [_row("e1", "2026-01-01 00:00:00.500000+00:00")])
+        conn = connect_reader(db_path)
+        (record,) = fetch_page(conn)
+        conn.close()
+
+        assert isinstance(record, EventRecord)
+        assert not hasattr(record, "__dict__")
+        assert record.content["tool_name"] == "Edit"
+        assert record.created_datetime.microsecond == 500000
+        assert record.to_dict()["node_metadata"] == NODE_METADATA
+        token = format_cursor(record.cursor)
+        assert parse_cursor(token) == record.cursor
+        with pytest.raises(ValueError):
+            parse_cursor("2026-01-01")
+
+    def test_streaming_memory_is_independent_of_row_count(self, db_path):
+        conn = open_table(db_path)
+        with conn:
+            conn.execute(
+                "WITH RECURSIVE seq(i) AS "
+                "(SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i + 1 < :count) "
+                "INSERT INTO hook_events (id, content, node_metadata, created_at) "
+                "SELECT printf('e%08d', i), json_object('event_type', 'post_edit', "
+                "'output', printf('%.200c', 'x')), '{}', "
+                "strftime('%Y-%m-%d %H:%M:%f', 1767225600 + i, 'unixepoch') FROM seq",
+                {"count": STREAMED_EVENTS},
+            )
+        conn.close()
+        reader = connect_reader(db_path)
+
+        def peak_while_streaming(limit: int) -> int:
+            tracemalloc.start()
+            seen = sum(1 for _ in zip(range(limit), iter_records(reader, batch_size=500)))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert seen == limit
+            return peak
+
+        small = peak_while_streaming(5_000)
+        large = peak_while_streaming(STREAMED_EVENTS)
+        reader.close()
+
+        assert large < small * 1.5
+        assert large < 5 * 1024 * 1024
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_hook_event_iter_since(db_path, monkeypatch):
+    from khive.services.claude.hooks import hook_event
+    from khive.services.claude.hooks.hook_event import HookEvent
+
+    monkeypatch.setattr(hook_event, "SQLITE_PATH", db_path)
+    ids = [str(uuid.uuid4()) for _ in range(6)]  # HookEvent ids are UUIDs
+    _insert(
+        db_path,
+        [
+            _row(ids[i], f"2026-01-01 00:00:0{i}.000000+00:00", event_type=kind)
+            for i, kind in enumerate(["pre_edit", "post_edit"] * 3)
+        ],
+    )
+
+    records = [r async for r in HookEvent.iter_since(batch_size=4)]
+    assert [r.id for r in records] == ids
+
+    resumed = [
+        r async for r in HookEvent.iter_since(records[1].cursor, 2, event_type="post_edit")
+    ]
+    assert [r.id for r in resumed] == [ids[3], ids[5]]
+
+    events = [
+        e
+        async for e in HookEvent.iter_since(
+            "2026-01-01 00:00:04", as_events=True, event_type="pre_edit"
+        )
+    ]
+    assert len(events) == 1
+    assert isinstance(events[0], HookEvent)
+    assert str(events[0].id) == ids[4]
+    assert events[0].content["event_type"] == "pre_edit"
@@ -0,0 +1,162 @@
+"""Tests for hook event rollup, purge and compaction."""
+
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from khive.daemon.ingest import connect, insert_rows, open_table
+from khive.services.claude.hooks.retention import (
+    HookEventRetention,
+    RetentionPolicy,
+    compact,
+    purge_batch,
+    query_rollups,
+    rollup_batch,
+)
+
+
+def _row(event_id: str, created_at: str, duration: float | None = None, **content):
+    content = {"event_type": "post_edit", "tool_name": "Edit", "session_id": "s1", **content}
+    if duration is not None:
+        content["metadata"] = {"duration_ms": duration}
+    return (event_id, json.dumps(content), "{}", created_at, None)
+
+
+def _count(conn, where: str = "1 = 1") -> int:
+    return conn.execute(f"SELECT COUNT(*) FROM hook_events WHERE {where}").fetchone()[0]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = open_table(tmp_path / "hooks.db")
+    yield conn
+    conn.close()
+
+
+@pytest.mark.unit
+class TestHookEventRetention:
+    def test_rollup_counts_each_event_once(self, conn):
+        insert_rows(
+            conn,
+            [
+                _row("a", "2026-01-01 10:05:00", 10.0),
+                _row("b", "2026-01-01 10:40:00", 30.0),
+                _row("c", "2026-01-01 10:50:00"),
+                _row("d", "2026-01-01 11:00:00", 5.0, tool_name="Bash"),
+            ],
+        )
+
+        assert rollup_batch(conn, batch_size=3) == 3
+        assert rollup_batch(conn, batch_size=3) == 1
+        assert rollup_batch(conn) == 0
+        # A late (e.g. spooled) event merges into the existing hour
+        insert_rows(conn, [_row("e", "2026-01-01 10:59:00", 50.0)])
+        assert rollup_batch(conn) == 1
+
+        assert _count(conn, "rolled_up = 0") == 0
+        rollups = query_rollups(conn, group_by=("tool_name",))
+        assert rollups == [
+            {
+                "hour": "2026-01-01 10:00:00",
+                "tool_name": "Edit",
+                "count": 4,
+                "duration_avg_ms": 30.0,
+                "duration_min_ms": 10.0,
+                "duration_max_ms": 50.0,
+            },
+            {
+                "hour": "2026-01-01 11:00:00",
+                "tool_name": "Bash",
+                "count": 1,
+                "duration_avg_ms": 5.0,
+                "duration_min_ms": 5.0,
+                "duration_max_ms": 5.0,
+            },
+        ]
+        assert query_rollups(conn, since="2026-01-01 11:00:00", tool_name="Edit") == []
+        with pytest.raises(ValueError):
+            query_rollups(conn, group_by=("content",))
+
+    def test_purge_only_old_rolled_up_rows_and_archives(self, conn, tmp_path):
+        insert_rows(conn, [_row(f"old-{i}", "2026-01-01 00:00:00") for i in range(5)])
+        insert_rows(conn, [_row("new", "2026-03-01 00:00:00")])
+        rollup_batch(conn)
+        # Arrived late and not rolled up yet: must not be purged
+        insert_rows(conn, [_row("old-pending", "2026-01-01 00:00:00")])
+
+        archive = tmp_path / "archive"
+        purged = []
+        while rows := purge_batch(conn, "2026-02-01 00:00:00", 2, archive):
+            purged.append(rows)
+
+        assert purged == [2, 2, 1]
+        assert _count(conn) == 2
+        (path,) = archive.iterdir()
+        with gzip.open(path, "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert sorted(r["id"] for r in records) == [f"old-{i}" for i in range(5)]
+        assert records[0]["content"]["event_type"] == "post_edit"
+        assert query_rollups(conn)[0]["count"] == 5  # aggregates survive
+
+    def test_compact_switches_to_incremental_vacuum(self, tmp_path):
+        conn = connect(tmp_path / "hooks.db")
+        open_table(tmp_path / "hooks.db").close()
+        insert_rows(
+            conn, [_row(f"e{i}", "2026-01-01 00:00:00", note="x" * 2000) for i in range(200)]
+        )
+        rollup_batch(conn, batch_size=1000)
+
+        first = compact(conn)
+        assert first["method"] == "vacuum"
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+        while purge_batch(conn, "2027-01-01 00:00:00"):
+            pass
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] > 0
+        second = compact(conn)
+        assert second["method"] == "incremental_vacuum"
+        assert second["freed_pages"] > 0
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_run_once_compacts_once_per_off_peak_day(self, conn):
+        insert_rows(
+            conn,
+            [_row("old", "2026-01-01 00:00:00"), _row("new", "2026-03-01 00:00:00")],
+        )
+        calls = []
+
+        async def run(func):
+            calls.append(func)
+            return func(conn)
+
+        retention = HookEventRetention(RetentionPolicy(max_age_days=30, batch_size=1))
+        now = datetime(2026, 3, 2, 3, 0, tzinfo=timezone.utc)
+
+        first = await retention.run_once(run, now=now)
+        second = await retention.run_once(run, now=now)
+
+        assert (first["rolled_up"], first["purged"]) == (2, 1)
+        assert first["compaction"]["method"] == "vacuum"
+        assert second == {"rolled_up": 0, "purged": 0, "compaction": None}
+        assert retention.report()["compactions"] == 1
+        assert _count(conn) == 1
+        # Every batch is its own runner call, so writes interleave
+        assert len(calls) == 2 + 1 + 1 + 1 + 1 + 2
+
+    def test_policy_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("KHIVE_HOOK_RETENTION_DAYS", "7")
+        monkeypatch.setenv("KHIVE_HOOK_RETENTION_ARCHIVE", str(tmp_path))
+        monkeypatch.setenv("KHIVE_HOOK_RETENTION_OFFPEAK", "22-4")
+
+        policy = RetentionPolicy.from_env()
+
+        assert policy.max_age_days == 7
+        assert policy.archive_dir == tmp_path
+        assert policy.in_off_peak(datetime(2026, 1, 1, 23))
+        assert policy.in_off_peak(datetime(2026, 1, 1, 3))
+        assert not policy.in_off_peak(datetime(2026, 1, 1, 12))
+        assert policy.cutoff(datetime(2026, 1, 8, tzinfo=timezone.utc)) == "2026-01-01 00:00:00"
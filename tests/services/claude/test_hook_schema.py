@@ -0,0 +1,51 @@
+"""Tests for the hook events schema migrations."""
+
+import json
+import sqlite3
+
+import pytest
+
+from khive.services.claude.hooks.schema import (
+    CREATE_TABLE_SQL,
+    SCHEMA_VERSION,
+    migrate,
+    migrate_path,
+    schema_version,
+)
+
+
+@pytest.mark.unit
+class TestHookEventSchema:
+    def test_migrates_existing_table_in_place(self, tmp_path):
+        db_path = tmp_path / "hooks.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(CREATE_TABLE_SQL.format(table="hook_events"))
+        content = {"event_type": "pre_edit", "tool_name": "Edit", "session_id": "s1"}
+        with conn:
+            conn.execute(
+                "INSERT INTO hook_events VALUES (?, ?, ?, ?, ?)",
+                ("e1", json.dumps(content), "{}", "2026-01-01 00:00:00", None),
+            )
+
+        assert migrate(conn) == SCHEMA_VERSION
+
+        row = conn.execute(
+            "SELECT event_type, tool_name, session_id FROM hook_events"
+        ).fetchone()
+        assert row == ("pre_edit", "Edit", "s1")
+        indexes = {r[1] for r in conn.execute("PRAGMA index_list(hook_events)")}
+        assert {
+            "idx_hook_events_event_type_created",
+            "idx_hook_events_session_id_created",
+            "idx_hook_events_tool_name_created",
+            "idx_hook_events_created_id",
+        } <= indexes
+        conn.close()
+
+    def test_migration_is_idempotent(self, tmp_path):
+        db_path = str(tmp_path / "hooks.db")
+
+        assert migrate_path(db_path) == SCHEMA_VERSION
+        assert migrate_path(db_path) == SCHEMA_VERSION
+        with sqlite3.connect(db_path) as conn:
+            assert schema_version(conn) == SCHEMA_VERSION
@@ -0,0 +1,128 @@
+"""Tests for the offline hook event spool."""
+
+import functools
+import json
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+from khive.services.claude.hooks import spool
+
+EVENTS_PER_WRITER = 200
+
+
+def _record(event_id: str | None = None) -> dict:
+    return {
+        "id": event_id or str(uuid.uuid4()),
+        "created_at": "2026-01-01 00:00:00.000000+00:00",
+        "content": {"event_type": "post_edit", "tool_name": "Edit"},
+        "embedding": None,
+        "node_metadata": {"lion_class": "HookEvent"},
+    }
+
+
+def _write_events(spool_dir: str, count: int):
+    for _ in range(count):
+        spool.append(_record(), spool_dir)
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _count(db_path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM hook_events").fetchone()[0]
+
+
+@pytest.mark.unit
+class TestHookSpool:
+    def test_parallel_writers_then_idempotent_import(self, tmp_path):
+        spool_dir = tmp_path / "spool"
+        writers = [
+            multiprocessing.Process(
+                target=_write_events, args=(str(spool_dir), EVENTS_PER_WRITER)
+            )
+            for _ in range(4)
+        ]
+        for proc in writers:
+            proc.start()
+        for proc in writers:
+            proc.join()
+
+        files = sorted(spool_dir.iterdir())
+        assert len(files) == 4  # one spool file per process
+        lines = [line for f in files for line in f.read_text().splitlines()]
+        assert all(json.loads(line)["id"] for line in lines)
+
+        kept = tmp_path / "copy.ndjson"
+        kept.write_bytes(files[0].read_bytes())
+        db_path = tmp_path / "hooks.db"
+        result = spool.import_spool(spool_dir, db_path=db_path)
+
+        assert result["files"] == 4
+        assert result["imported"] == 4 * EVENTS_PER_WRITER
+        assert list(spool_dir.iterdir()) == []
+
+        # Re-importing the same events adds nothing
+        os.replace(kept, spool_dir / f"{_dead_pid()}-replay.ndjson")
+        again = spool.import_spool(spool_dir, db_path=db_path)
+        assert again["events"] == EVENTS_PER_WRITER
+        assert again["imported"] == 0
+        assert again["duplicates"] == EVENTS_PER_WRITER
+        assert _count(db_path) == 4 * EVENTS_PER_WRITER
+
+    def test_skips_files_still_being_written(self, tmp_path):
+        spool_dir = tmp_path / "spool"
+        own = spool.append(_record(), spool_dir)  # this process is alive
+        live = spool_dir / f"{os.getppid()}-live.ndjson"
+        live.write_text(json.dumps(_record()) + "\n")
+
+        result = spool.import_spool(spool_dir, db_path=tmp_path / "hooks.db")
+
+        assert result["files"] == 0
+        assert own.exists() and live.exists()
+
+    def test_reclaims_abandoned_imports_and_skips_torn_lines(self, tmp_path):
+        spool_dir = tmp_path / "spool"
+        spool_dir.mkdir()
+        abandoned = spool_dir / f"{_dead_pid()}-a.ndjson.{_dead_pid()}.importing"
+        abandoned.write_text(
+            json.dumps(_record("kept")) + "\n" + '{"id": "torn", "conte'
+        )
+
+        result = spool.import_spool(spool_dir, db_path=tmp_path / "hooks.db")
+
+        assert result == {
+            "files": 1,
+            "events": 1,
+            "imported": 1,
+            "duplicates": 0,
+            "bad_lines": 1,
+        }
+        assert not abandoned.exists()
+
+    @pytest.mark.asyncio
+    async def test_offline_save_appends_to_spool(self, tmp_path, monkeypatch):
+        from khive.services.claude.hooks import hook_event
+        from khive.services.claude.hooks.hook_event import HookEvent
+
+        monkeypatch.setattr(HookEvent, "_post_to_daemon", lambda self: False)
+        monkeypatch.setattr(
+            hook_event.spool,
+            "append",
+            functools.partial(spool.append, spool_dir=tmp_path),
+        )
+        event = HookEvent(content={"event_type": "post_command", "tool_name": "Bash"})
+
+        await event.save()
+
+        (line,) = spool.spool_path(tmp_path).read_text().splitlines()
+        assert json.loads(line)["id"] == str(event.id)
@@ -0,0 +1,203 @@
+"""Tests for all-or-nothing multi-file lock requests."""
+
+import asyncio
+
+import pytest
+
+from khive.services.claude.hooks.coordination import CoordinationRegistry
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return [str(tmp_path / f"{name}.py") for name in "abcd"]
+
+
+@pytest.mark.unit
+class TestRequestFileLocks:
+    def test_all_or_nothing(self, paths):
+        registry = CoordinationRegistry()
+        assert registry.request_file_lock("agent-b", paths[2])["status"] == "granted"
+
+        result = registry.request_file_locks("agent-a", [paths[3], paths[0], paths[2]])
+        assert result["status"] == "locked"
+        assert result["locked_path"] == paths[2]
+        assert set(registry.file_locks) == {paths[2]}  # nothing partially held
+
+        granted = registry.request_file_locks("agent-a", [paths[1], paths[0], paths[0]])
+        assert granted["status"] == "granted"
+        assert granted["files"] == [paths[0], paths[1]]  # global (sorted) order
+
+    def test_rolls_back_partial_grants(self, paths, monkeypatch):
+        registry = CoordinationRegistry()
+        original = registry._grant_lock
+
+        def fail_on_third(agent_id, file_path, key, directory):
+            if file_path == paths[2]:
+                raise RuntimeError("boom")
+            original(agent_id, file_path, key, directory)
+
+        monkeypatch.setattr(registry, "_grant_lock", fail_on_third)
+        with pytest.raises(RuntimeError):
+            registry.request_file_locks("agent-a", paths)
+        assert registry.file_locks == {}
+        assert len(registry._lock_tree) == 0
+        kinds = [e.kind for e in registry.event_log]
+        assert kinds == ["lock_granted"] * 2 + ["lock_released"] * 2
+
+    def test_fifo_queue_grants_in_arrival_order(self, paths):
+        registry = CoordinationRegistry()
+        registry.request_file_locks("holder", paths[:2])
+        granted = []
+
+        first = registry.request_file_locks(
+            "agent-1", paths[:2], wait=True, on_granted=granted.append
+        )
+        second = registry.request_file_locks(
+            "agent-2", [paths[1]], wait=True, on_granted=granted.append
+        )
+        assert (first["status"], second["status"]) == ("queued", "queued")
+        assert second["position"] == 2
+        # Free paths[1] is still reserved for the waiters: no queue jumping
+        registry.release_file_lock("holder", paths[1])
+        assert granted == []
+        assert registry.request_file_lock("agent-3", paths[1])["status"] == "locked"
+
+        registry.release_file_lock("holder", paths[0])
+        assert [r["ticket"] for r in granted] == [first["ticket"]]
+        assert registry.file_locks[paths[1]].agent_id == "agent-1"
+
+        registry.release_file_lock("agent-1", paths[1])
+        assert [r["ticket"] for r in granted] == [first["ticket"], second["ticket"]]
+        assert registry._lock_queues == {}
+
+    def test_directory_waiter_is_not_starved_by_files_below(self, tmp_path):
+        registry = CoordinationRegistry()
+        pkg = tmp_path / "pkg"
+        registry.request_file_lock("holder", str(pkg / "a.py"))
+        granted = []
+
+        waiter = registry.request_file_locks(
+            "dir-agent", [str(pkg)], directory=True, wait=True, on_granted=granted.append
+        )
+        assert waiter["status"] == "queued"
+        # Later requests for other files below the directory queue behind it
+        blocked = registry.request_file_lock("agent-b", str(pkg / "b.py"))
+        assert blocked["status"] == "locked"
+        assert (blocked["locked_by"], blocked["locked_path"]) == ("dir-agent", str(pkg))
+        later = registry.request_file_locks(
+            "agent-c", [str(pkg / "sub" / "c.py")], wait=True, on_granted=granted.append
+        )
+        assert later["status"] == "queued"
+        # A file waiter below does not hold up a file outside the directory
+        assert registry.request_file_lock("agent-b", str(tmp_path / "x.py"))["status"] == "granted"
+
+        registry.release_file_lock("holder", str(pkg / "a.py"))
+        assert [r["ticket"] for r in granted] == [waiter["ticket"]]
+        assert registry.file_locks[str(pkg)].directory
+
+        registry.release_file_lock("dir-agent", str(pkg))
+        assert [r["ticket"] for r in granted] == [waiter["ticket"], later["ticket"]]
+        assert registry._lock_queues == {}
+
+    def test_directory_request_waits_for_file_waiters_below(self, tmp_path):
+        registry = CoordinationRegistry()
+        pkg, other = tmp_path / "pkg", str(tmp_path / "other.py")
+        registry.request_file_lock("holder", other)
+        registry.request_file_locks("agent-a", [str(pkg / "a.py"), other], wait=True)
+
+        # Nothing below pkg is locked, but agent-a is queued for a file there
+        blocked = registry.request_file_lock("agent-b", str(pkg), directory=True)
+        assert (blocked["status"], blocked["locked_by"]) == ("locked", "agent-a")
+        assert blocked["locked_path"] == str(pkg / "a.py")
+        assert registry.request_file_lock("agent-b", str(pkg / "b.py"))["status"] == "granted"
+
+    def test_cancel_and_expiry_wake_waiters(self, paths):
+        registry = CoordinationRegistry()
+        registry.request_file_lock("holder", paths[0])
+        granted = []
+        ticket = registry.request_file_locks("agent-1", [paths[0]], wait=True)["ticket"]
+        registry.request_file_locks("agent-2", [paths[0]], wait=True, on_granted=granted.append)
+
+        assert registry.cancel_lock_request(ticket)
+        assert not registry.cancel_lock_request(ticket)
+        lock = registry.file_locks[paths[0]]
+        registry.expire_locks(now=lock.expires_at + 1)
+        assert len(granted) == 1
+        assert registry.file_locks[paths[0]].agent_id == "agent-2"
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_waits_for_file_locks(paths):
+    from tests.performance.load_harness import in_process_daemon
+
+    async with in_process_daemon() as client:
+        held = await client.post(
+            "/api/coordinate/file-locks",
+            json={"file_paths": paths[:2], "agent_id": "multi-a"},
+        )
+        refused = await client.post(
+            "/api/coordinate/file-locks",
+            json={"file_paths": paths[1:3], "agent_id": "multi-b"},
+        )
+        waiting = asyncio.ensure_future(
+            client.post(
+                "/api/coordinate/file-locks",
+                json={"file_paths": paths[1:3], "agent_id": "multi-b", "wait_seconds": 5},
+            )
+        )
+        await asyncio.sleep(0.05)
+        await client.post(
+            "/api/coordinate/file-unregister",
+            json={"file_path": paths[1], "agent_id": "multi-a"},
+        )
+        waited = await asyncio.wait_for(waiting, 5)
+        timed_out = await client.post(
+            "/api/coordinate/file-locks",
+            json={"file_paths": [paths[0]], "agent_id": "multi-c", "wait_seconds": 0.05},
+        )
+        for agent, owned in (("multi-a", paths[0]), ("multi-b", paths[1]), ("multi-b", paths[2])):
+            await client.post(
+                "/api/coordinate/file-unregister", json={"file_path": owned, "agent_id": agent}
+            )
+
+    assert held.json()["status"] == "granted"
+    assert refused.status_code == 409
+    assert waited.status_code == 200
+    assert waited.json()["files"] == paths[1:3]
+    assert timed_out.status_code == 409
+    assert timed_out.json()["detail"]["timed_out"] is True
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_releases_locks_granted_as_the_client_leaves(paths):
+    from khive.daemon.server import FileLocksRequest
+    from khive.services.claude.hooks.coordination import get_registry
+    from tests.performance.load_harness import in_process_app
+
+    async with in_process_app() as app:
+        (request_file_locks,) = (
+            route.endpoint
+            for route in app.routes
+            if route.path == "/api/coordinate/file-locks" and "POST" in route.methods
+        )
+        registry = get_registry()
+        registry.request_file_locks("multi-a", [paths[0]])
+        waiting = asyncio.ensure_future(
+            request_file_locks(
+                FileLocksRequest(file_paths=paths[:2], agent_id="multi-b", wait_seconds=5)
+            )
+        )
+        await asyncio.sleep(0.01)
+        # The client disconnects, then the locks are granted before the
+        # endpoint gets to run again
+        waiting.cancel()
+        registry.release_file_lock("multi-a", paths[0])
+        assert registry.file_locks[paths[0]].agent_id == "multi-b"
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert paths[0] not in registry.file_locks
+        assert paths[1] not in registry.file_locks
@@ -0,0 +1,157 @@
+"""Tests for directory-scoped locks on the path trie."""
+
+import pytest
+
+from khive.services.claude.hooks.coordination import CoordinationRegistry
+from khive.services.claude.hooks.path_locks import PathLockTree
+
+
+class Lock:
+    def __init__(self, agent_id, directory=False):
+        self.agent_id = agent_id
+        self.directory = directory
+
+
+@pytest.mark.unit
+class TestPathLockTree:
+    def test_ancestor_and_descendant_conflicts(self):
+        tree = PathLockTree()
+        pkg = Lock("a", directory=True)
+        tree.insert("/repo/pkg", pkg)
+        tree.insert("/repo/docs/index.md", Lock("b"))
+
+        assert tree.conflict("/repo/pkg/mod.py", "b") == ("/repo/pkg", pkg)
+        assert tree.conflict("/repo/pkg/mod.py", "a") is None
+        path, lock = tree.conflict("/repo", "a", directory=True)  # over b's file
+        assert (path, lock.agent_id) == ("/repo/docs/index.md", "b")
+        assert tree.conflict("/repo", "a") is None  # a file request only
+        assert tree.conflict("/repo/docs", "b", directory=True) is None
+        assert tree.conflict("/elsewhere", "c") is None
+
+    def test_file_locks_cover_only_their_own_path(self):
+        tree = PathLockTree()
+        lock = Lock("a")
+        tree.insert("/repo/pkg", lock)
+        tree.insert("/repo/src/mod.py", Lock("a"))
+
+        assert tree.conflict("/repo/pkg", "b") == ("/repo/pkg", lock)
+        assert tree.conflict("/repo/pkg/mod.py", "b") is None
+        assert tree.conflict("/repo/src/mod.py/x", "b") is None
+        assert tree.conflict("/repo/src", "b") is None
+        assert tree.conflict("/repo/src", "b", directory=True)[0] == "/repo/src/mod.py"
+
+    def test_remove_prunes_and_counts(self):
+        tree = PathLockTree()
+        tree.insert("/repo/a/b/c.py", Lock("a"))
+        tree.insert("/repo/a/d.py", Lock("a"))
+        assert len(tree) == 2
+        assert tree.root.held_below == {"a": 2}
+
+        assert tree.remove("/repo/a/b/c.py").agent_id == "a"
+        assert tree.remove("/repo/a/b/c.py") is None
+        assert "b" not in tree.root.children["/"].children["repo"].children["a"].children
+        tree.remove("/repo/a/d.py")
+        assert tree.root.children == {} and tree.root.held_below == {}
+
+    def test_to_dict_collapses_unlocked_chains(self):
+        tree = PathLockTree()
+        tree.insert("/repo/src/pkg", Lock("a"))
+        tree.insert("/repo/src/pkg/mod.py", Lock("a"))
+        tree.insert("/repo/tests/test_mod.py", Lock("b"))
+
+        rendered = tree.to_dict(lambda lock: lock.agent_id)
+        assert rendered["name"] == "/repo"
+        assert rendered["locks_below"] == 3
+        pkg, tests = rendered["children"]
+        assert (pkg["name"], pkg["lock"], pkg["locks_below"]) == ("src/pkg", "a", 1)
+        assert pkg["children"][0]["name"] == "mod.py"
+        assert (tests["name"], tests["lock"]) == ("tests/test_mod.py", "b")
+
+
+@pytest.mark.unit
+class TestDirectoryLocks:
+    def test_directory_lock_blocks_files_below(self, tmp_path):
+        registry = CoordinationRegistry()
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+
+        granted = registry.request_file_lock("agent-a", str(pkg), directory=True)
+        assert granted["status"] == "granted"
+        blocked = registry.request_file_lock("agent-b", str(pkg / "mod.py"))
+        assert blocked["status"] == "locked"
+        assert blocked["locked_path"] == str(pkg)
+        assert blocked["directory_lock"] is True
+        assert registry.request_file_lock("agent-a", str(pkg / "mod.py"))["status"] == "granted"
+
+        registry.release_file_lock("agent-a", str(pkg))
+        registry.release_file_lock("agent-a", str(pkg / "mod.py"))
+        assert registry.request_file_lock("agent-b", str(pkg / "mod.py"))["status"] == "granted"
+        # A directory lock now conflicts with b's file below it
+        assert (
+            registry.request_file_lock("agent-a", str(tmp_path), directory=True)["status"]
+            == "locked"
+        )
+
+    def test_file_lock_blocks_neither_children_nor_parents(self, tmp_path):
+        registry = CoordinationRegistry()
+        pkg = tmp_path / "pkg"
+
+        assert registry.request_file_lock("agent-a", str(pkg))["status"] == "granted"
+        assert registry.request_file_lock("agent-b", str(pkg / "x.py"))["status"] == "granted"
+        assert registry.request_file_lock("agent-c", str(tmp_path))["status"] == "granted"
+        assert registry.request_file_lock("agent-b", str(pkg))["status"] == "locked"
+        # Only a directory request sees the locks below it
+        blocked = registry.request_file_locks("agent-d", [str(pkg)], directory=True)
+        assert blocked["status"] == "locked"
+        assert blocked["locked_by"] == "agent-a"
+
+    def test_directory_request_is_blocked_by_a_held_child(self, tmp_path):
+        registry = CoordinationRegistry()
+        registry.request_file_lock("agent-b", str(tmp_path / "pkg" / "x.py"))
+
+        blocked = registry.request_file_lock("agent-a", str(tmp_path / "pkg"), directory=True)
+        assert blocked["status"] == "locked"
+        assert blocked["locked_path"] == str(tmp_path / "pkg" / "x.py")
+        assert blocked["directory_lock"] is False
+
+    def test_expired_blocker_is_dropped(self, tmp_path):
+        registry = CoordinationRegistry()
+        registry.request_file_lock("agent-a", str(tmp_path), directory=True)
+        registry.file_locks[str(tmp_path)].lock_duration_seconds = -1
+
+        assert registry.request_file_lock("agent-b", str(tmp_path / "x.py"))["status"] == "granted"
+        assert registry.event_log[-2].kind == "lock_expired"
+        tree = registry.get_lock_tree()
+        assert tree["total_locks"] == 1
+        assert tree["tree"]["name"] == str(tmp_path / "x.py")
+        assert tree["tree"]["lock"]["locked_by"] == "agent-b"
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_daemon_directory_locks_and_tree(tmp_path):
+    from tests.performance.load_harness import in_process_daemon
+
+    async with in_process_daemon() as client:
+        pkg = str(tmp_path / "pkg")
+        granted = await client.post(
+            "/api/coordinate/file-register",
+            json={"file_path": pkg, "agent_id": "tree-a", "directory": True},
+        )
+        blocked = await client.post(
+            "/api/coordinate/file-register",
+            json={"file_path": f"{pkg}/mod.py", "agent_id": "tree-b"},
+        )
+        tree = (await client.get("/api/coordinate/file-locks")).json()
+        await client.post(
+            "/api/coordinate/file-unregister", json={"file_path": pkg, "agent_id": "tree-a"}
+        )
+
+    assert granted.json()["status"] == "granted"
+    assert blocked.status_code == 409
+    assert blocked.json()["detail"]["locked_path"] == pkg
+    def count(node):
+        return (node["lock"] is not None) + sum(count(c) for c in node["children"])
+
+    assert tree["total_locks"] >= 1
+    assert count(tree["tree"]) == tree["total_locks"]
@@ -0,0 +1,138 @@
+"""Tests for the semantic deduplicator's vectorized task index."""
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks import embedding_matrix
+from khive.services.claude.hooks.embedding_matrix import EmbeddingMatrix
+from khive.services.claude.hooks.semantic_dedup import SemanticDeduplicator
+from khive.services.claude.hooks.simhash import SimHashLSH
+
+
+def _brute_force(vectors: dict[str, np.ndarray], query: np.ndarray, k: int):
+    unit = query / np.linalg.norm(query)
+    scores = {
+        key: float(v @ unit / np.linalg.norm(v)) for key, v in vectors.items()
+    }
+    return sorted(scores.items(), key=lambda kv: -kv[1])[:k]
+
+
+@pytest.mark.unit
+class TestEmbeddingMatrix:
+    def test_top_k_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        matrix = EmbeddingMatrix(16, capacity=4)  # forces several regrowths
+        vectors = {f"t{i}": rng.normal(size=16) for i in range(300)}
+        matrix.add_many(list(vectors), np.array(list(vectors.values())))
+        assert len(matrix) == 300 and matrix.capacity == 512
+
+        queries = rng.normal(size=(5, 16))
+        for query, found in zip(queries, matrix.top_k(queries, k=7)):
+            expected = _brute_force(vectors, query, 7)
+            assert [key for key, _ in found] == [key for key, _ in expected]
+            assert [s for _, s in found] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+    def test_tombstones_are_masked_then_compacted(self, monkeypatch):
+        monkeypatch.setattr(embedding_matrix, "COMPACT_MIN_TOMBSTONES", 4)
+        matrix = EmbeddingMatrix(3)
+        for i in range(10):
+            matrix.add(f"t{i}", [1.0, i / 10, 0.0])
+        matrix.add("t0", [0.0, 0.0, 1.0])  # replaced in place
+        assert matrix.top_k([0.0, 0.0, 1.0], k=1) == [[("t0", pytest.approx(1.0))]]
+
+        for i in range(1, 6):
+            matrix.remove(f"t{i}")
+        assert matrix.tombstones == 5 and len(matrix) == 5
+        assert {key for key, _ in matrix.top_k([1.0, 0.3, 0.0], k=10)[0]} == {
+            "t0", "t6", "t7", "t8", "t9"
+        }
+
+        matrix.remove("t6")  # tombstones now outnumber live rows
+        assert matrix.tombstones == 0
+        assert matrix.keys() == ["t0", "t7", "t8", "t9"]
+        assert matrix.vector("t9") == pytest.approx(np.array([1.0, 0.9, 0.0]) / np.hypot(1, 0.9))
+        assert not matrix.remove("t6")
+
+    def test_zero_vectors_never_match(self):
+        matrix = EmbeddingMatrix(2)
+        matrix.add("zero", [0.0, 0.0])
+        assert matrix.top_k([1.0, 0.0], k=1, min_score=0.1) == [[]]
+        assert matrix.top_k([0.0, 0.0], k=1)[0][0][1] == 0.0
+
+
+@pytest.mark.unit
+class TestSimHashLSH:
+    def test_candidates_follow_cosine_neighbourhoods(self):
+        rng = np.random.default_rng(1)
+        lsh = SimHashLSH(32, tables=16, bits=8)
+        base = rng.normal(size=32)
+        lsh.add_many(["same", "near", "opposite"], [base * 3, base + 0.1 * rng.normal(size=32), -base])
+        assert {"same", "near"} <= lsh.candidates(base)
+        assert "opposite" not in lsh.candidates(base)
+
+        lsh.add("same", -base)  # re-indexed, not duplicated
+        assert "same" not in lsh.candidates(base) and len(lsh) == 3
+        lsh.remove("near")
+        lsh.remove("near")
+        assert lsh.candidates(base) == set()
+        assert lsh.stats()["keys"] == 2
+
+    def test_codes_are_stable_for_a_seed(self):
+        vectors = np.random.default_rng(2).normal(size=(4, 8))
+        a, b = SimHashLSH(8, seed=5), SimHashLSH(8, seed=5)
+        assert (a.codes(vectors) == b.codes(vectors)).all()
+        assert a.codes(vectors).shape == (4, a.tables)
+        with pytest.raises(ValueError):
+            SimHashLSH(8, bits=64)
+
+
+@pytest.mark.unit
+class TestSemanticDeduplicator:
+    def test_best_match_is_found_among_many_candidates(self):
+        dedup = SemanticDeduplicator()
+        # Share keywords with the query, so the old keyword filter would keep
+        # them all and then truncate its candidates to an arbitrary 50
+        for i in range(200):
+            dedup.add_task(f"filler-{i}", f"update api backend cache {i}")
+        dedup.add_task("target", "implement jwt oauth authentication api middleware")
+
+        match = dedup.check_duplicate("implement oauth jwt authentication api middleware")
+        assert match["is_duplicate"] and match["similar_task_id"] == "target"
+
+    def test_batch_and_removal(self):
+        dedup = SemanticDeduplicator()
+        dedup.add_task("db", "optimize database query index")
+        dedup.add_task("ui", "design frontend ui ux")
+        results = dedup.find_similar_batch(
+            ["optimize database query index", "design frontend ui ux", "deploy"], k=2
+        )
+        assert [[key for key, _ in r] for r in results] == [["db"], ["ui"], []]
+
+        assert dedup.remove_task("db") and not dedup.remove_task("db")
+        assert dedup.find_similar_task("optimize database query index") is None
+        found = dedup.find_similar_tasks("optimize database query", min_similarity=-1)
+        assert [key for key, _ in found] == ["ui"]
+
+    def test_lsh_search_agrees_with_exact_search(self):
+        dedup = SemanticDeduplicator(lsh_min_tasks=0)
+        for i, words in enumerate(
+            ["optimize database query index", "design frontend ui ux", "fix api cache"]
+        ):
+            dedup.add_task(f"t{i}", words)
+        queries = ["optimize the database query index", "fix api cache", "deploy"]
+        assert dedup.get_performance_stats()["search"] == "lsh"
+        found = dedup.find_similar_batch(queries)
+        expected = dedup.find_similar_batch(queries, exact=True)
+        assert [[key for key, _ in m] for m in found] == [["t0"], ["t2"], []]
+        assert [[key for key, _ in m] for m in expected] == [["t0"], ["t2"], []]
+        assert found[0][0][1] == pytest.approx(expected[0][0][1])
+
+    def test_merge_strategy_leaves_no_temporary_tasks(self):
+        dedup = SemanticDeduplicator()
+        strategy = dedup.suggest_merge_strategy(
+            ["fix api cache", "fix api cache bug", "design frontend ui"]
+        )
+        assert strategy["coordination_needed"]
+        assert strategy["independent_tasks"] == ["design frontend ui"]
+        assert dedup.task_embeddings == {} and len(dedup._matrix) == 0
+        assert len(dedup._lsh) == 0
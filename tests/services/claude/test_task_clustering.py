@@ -0,0 +1,98 @@
+"""Tests for threshold clustering of task embeddings."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks.clustering import (
+    UnionFind,
+    candidate_pairs,
+    cluster,
+    similar_pairs_blocked,
+    similar_pairs_lsh,
+)
+from khive.services.claude.hooks.embedding_matrix import normalize
+from khive.services.claude.hooks.semantic_dedup import SemanticDeduplicator
+
+
+def _unit(rng, n, dim=16):
+    return normalize(rng.standard_normal((n, dim)).astype(np.float32))
+
+
+def _pairs(left, right):
+    return sorted(zip(left.tolist(), right.tolist()))
+
+
+@pytest.mark.unit
+class TestClustering:
+    def test_union_find(self):
+        sets = UnionFind(6)
+        assert sets.union(4, 1) and sets.union(1, 3) and not sets.union(3, 4)
+        sets.union(5, 0)
+        assert sets.groups() == [[0, 5], [1, 3, 4]]
+        assert sets.groups(min_size=1) == [[0, 5], [1, 3, 4], [2]]
+
+    def test_blocked_pairs_match_brute_force(self):
+        vectors = _unit(np.random.default_rng(0), 60, dim=4)
+        scores = vectors @ vectors.T
+        expected = [
+            (i, j) for i, j in itertools.combinations(range(60), 2) if scores[i, j] >= 0.8
+        ]
+        # A budget of 7 rows' scores forces uneven blocks
+        left, right = similar_pairs_blocked(vectors, 0.8, memory_budget=7 * 60 * 4)
+        assert _pairs(left, right) == expected
+        assert len(expected) > 50
+
+    def test_lsh_pairs_only_come_from_shared_buckets(self):
+        codes = np.array([[1, 7], [2, 7], [1, 8], [3, 9], [1, 9]])
+        n = len(codes)
+        keys = candidate_pairs(codes)
+        assert [divmod(k, n) for k in keys.tolist()] == [
+            (0, 1), (0, 2), (0, 4), (2, 4), (3, 4)
+        ]
+        vectors = normalize(np.ones((n, 2), dtype=np.float32))
+        left, right = similar_pairs_lsh(vectors, codes, 0.9, memory_budget=16)
+        assert _pairs(left, right) == [(0, 1), (0, 2), (0, 4), (2, 4), (3, 4)]
+
+    def test_clusters_are_transitive_and_skip_zero_rows(self):
+        vectors = np.array(
+            [[1, 0, 0], [0.8, 0.6, 0], [0.28, 0.96, 0], [0, 0, 1], [0, 0, 0], [0, 0, 0]],
+            dtype=np.float32,
+        )
+        # 0~1 and 1~2 at 0.8, but 0 and 2 only at 0.28
+        assert cluster(vectors, 0.75) == [[0, 1, 2]]
+        codes = np.zeros((6, 1), dtype=np.int64)  # one shared bucket
+        assert cluster(vectors, 0.75, codes=codes) == [[0, 1, 2]]
+
+
+@pytest.mark.unit
+class TestDeduplicatorClusters:
+    TASKS = [
+        ("jwt-1", "Refactor the authentication middleware to use JWT tokens"),
+        ("leak-1", "Fix the memory leak in the websocket broadcaster"),
+        ("jwt-2", "Refactor authentication middleware to use JWT tokens"),
+        ("ui", "Add a dark mode toggle to the dashboard"),
+        ("leak-2", "Fix the memory leak in the websocket broadcasters"),
+        ("jwt-3", "Refactor the authentication middleware to use JWT"),
+    ]
+
+    def test_exact_and_lsh_clusters_agree(self):
+        dedup = SemanticDeduplicator()
+        dedup.add_tasks(self.TASKS)
+        expected = [["jwt-1", "jwt-2", "jwt-3"], ["leak-1", "leak-2"]]
+        assert dedup.get_task_clusters(min_similarity=0.8) == expected
+        assert dedup.get_task_clusters(min_similarity=0.8, exact=False) == expected
+        assert dedup.get_task_clusters(min_similarity=0.8, memory_budget=1) == expected
+
+        dedup.remove_task("jwt-2")
+        assert dedup.get_task_clusters(min_similarity=0.8)[0] == ["jwt-1", "jwt-3"]
+
+    def test_merge_strategy_groups_descriptions(self):
+        dedup = SemanticDeduplicator()
+        strategy = dedup.suggest_merge_strategy([d for _, d in self.TASKS])
+        assert strategy["coordination_needed"]
+        assert [len(g["tasks"]) for g in strategy["merge_groups"]] == [3, 2]
+        assert strategy["merge_groups"][0]["suggested_merge"].endswith(self.TASKS[0][1])
+        assert strategy["independent_tasks"] == ["Add a dark mode toggle to the dashboard"]
+        assert dedup.task_embeddings == {}
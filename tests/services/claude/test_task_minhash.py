@@ -0,0 +1,61 @@
+"""Tests for MinHash LSH duplicate-work detection."""
+
+import pytest
+
+from khive.services.claude.hooks.coordination import AgentWork, CoordinationRegistry
+from khive.services.claude.hooks.minhash import (
+    NUM_PERM,
+    MinHashLSH,
+    estimate_jaccard,
+    minhash,
+)
+
+
+@pytest.mark.unit
+class TestMinHash:
+    def test_signatures_are_stable_and_estimate_jaccard(self):
+        a = {f"token{i}" for i in range(40)}
+        b = {f"token{i}" for i in range(10, 50)}  # Jaccard 30/50 = 0.6
+        sig_a = minhash(a)
+        assert len(sig_a) == NUM_PERM
+        assert sig_a == minhash(sorted(a))
+        assert minhash(set()) == ()
+        assert abs(estimate_jaccard(sig_a, minhash(b)) - 0.6) < 0.15
+
+    def test_index_add_remove_and_candidates(self):
+        index = MinHashLSH()
+        sig = minhash({"parser", "module", "refactor"})
+        index.add("a", sig)
+        index.add("b", minhash({"database", "migration", "tests"}))
+        index.add("empty", ())
+
+        assert index.candidates(sig) == {"a"}
+        assert len(index) == 2 and "empty" not in index
+        index.remove("a")
+        assert index.candidates(sig) == set()
+        assert not any("a" in keys for band in index._buckets for keys in band.values())
+        with pytest.raises(ValueError):
+            index.add("short", sig[:10])
+
+
+@pytest.mark.unit
+class TestRegistryDuplicates:
+    def test_agent_work_stores_tokens_and_signature(self):
+        work = AgentWork(agent_id="a", task="Refactor the parser module")
+        assert work.tokens == frozenset({"refactor", "parser", "module"})
+        assert work.signature == minhash(work.tokens)
+
+    def test_detects_duplicates_and_forgets_finished_work(self):
+        registry = CoordinationRegistry()
+        registry.register_agent_work("a", "refactor parser module tokenizer")
+        registry.register_agent_work("b", "write database migration tests")
+
+        result = registry.register_agent_work("c", "refactor the parser module tokenizer")
+        assert result["status"] == "duplicate_detected"
+        assert result["existing_task"] == "refactor parser module tokenizer"
+        # Re-registering your own task is not a duplicate
+        assert registry.register_agent_work("a", "refactor parser module")["status"] == "registered"
+
+        registry.complete_work("a")
+        assert registry.register_agent_work("c", "refactor parser module")["status"] == "registered"
+        assert len(registry._task_index) == 2
@@ -0,0 +1,120 @@
+"""Tests for feature-hashed n-gram TF-IDF embeddings."""
+
+import numpy as np
+import pytest
+
+from khive.services.claude.hooks.embedding_matrix import normalize
+from khive.services.claude.hooks.semantic_dedup import SemanticDeduplicator
+from khive.services.claude.hooks.text_embedding import HashedNgramEmbedder, tokenize
+
+
+def _cos(a: np.ndarray, b: np.ndarray) -> float:
+    return float(normalize(a) @ normalize(b))
+
+
+@pytest.mark.unit
+class TestHashedNgramEmbedder:
+    def test_embeddings_are_stable_and_batched(self):
+        texts = ["Fix the websocket leak", "Add JWT auth", ""]
+        a, b = HashedNgramEmbedder(), HashedNgramEmbedder()
+        batch = a.embed_batch(texts)
+        assert batch.shape == (3, a.dim) and batch.dtype == np.float32
+        assert (batch == b.embed_batch(texts)).all()  # no per-process hash salt
+        assert (batch[1] == a.embed("Add JWT auth")).all()
+        assert not batch[2].any()
+        assert tokenize("Re-run CI_tests, now!") == ["re", "run", "ci", "tests", "now"]
+
+    def test_features_are_cached_by_content_in_lru_order(self):
+        sizes = {}
+        for text in ("one", "two", "six"):  # same grams count, same cost
+            single = HashedNgramEmbedder()
+            single.embed(text)
+            sizes[text] = single.stats()["cache_bytes"]
+        assert len(set(sizes.values())) == 1
+
+        embedder = HashedNgramEmbedder(cache_bytes=2 * sizes["one"])
+        embedder.embed_batch(["one", "two", "one"])
+        assert (embedder.cache_hits, embedder.cache_misses) == (1, 2)
+        embedder.embed("six")  # evicts "two", the least recently used
+        embedder.embed("one")
+        assert (embedder.cache_hits, embedder.cache_misses) == (2, 3)
+        embedder.embed("two")
+        assert embedder.cache_misses == 4
+        assert embedder.stats()["cache_size"] == 2
+        assert embedder.stats()["cache_bytes"] == 2 * sizes["one"]
+
+    def test_paraphrases_beat_unrelated_tasks(self):
+        embedder = HashedNgramEmbedder()
+        leak, rephrased, other = embedder.embed_batch(
+            [
+                "Fix the memory leak in the websocket broadcaster",
+                "Websocket broadcaster leaks memory",
+                "Add dark mode to the dashboard",
+            ]
+        )
+        assert _cos(leak, rephrased) > 0.5 > _cos(leak, other)
+
+    def test_idf_learns_and_unlearns_common_words(self):
+        embedder = HashedNgramEmbedder()
+        docs = [f"add the {word} endpoint" for word in ("users", "orders", "billing", "auth")]
+        embedder.observe(docs)
+        assert embedder.docs == 4
+        common, rare = (embedder.features(w)[0] for w in ("endpoint", "billing"))
+        assert embedder.idf[common].mean() < embedder.idf[rare].mean()
+
+        embedder.forget(docs)
+        assert embedder.docs == 0 and not embedder.doc_freq.any()
+        assert (embedder.idf == 1.0).all()
+
+
+@pytest.mark.unit
+def test_deduplicator_reweights_as_the_index_doubles():
+    dedup = SemanticDeduplicator()
+    dedup.add_tasks([(f"t{i}", f"task number {i} for module {i}") for i in range(40)])
+    assert dedup._embedded_at_docs == 0  # still the weights it started with
+    before = dedup.embedding("t0").copy()
+
+    dedup.add_tasks([(f"u{i}", f"another task number {i}") for i in range(30)])
+    assert dedup._embedded_at_docs == 70
+    assert not np.allclose(before, dedup.embedding("t0"))
+    # Rows match fresh embeddings under the current weights
+    fresh = normalize(dedup.embedder.embed("task number 0 for module 0"))
+    assert dedup.embedding("t0") == pytest.approx(fresh, abs=1e-6)
+
+    dedup.remove_task("u0")
+    assert dedup.embedder.docs == 69
+
+
+@pytest.mark.unit
+def test_deduplicator_reweights_on_churn_at_a_fixed_size():
+    dedup = SemanticDeduplicator()
+    dedup.add_tasks([(f"t{i}", f"original task {i:03d}") for i in range(100)])
+    assert dedup._embedded_at_docs == 100
+    dedup.index_budget = dedup.index_bytes  # held at size by eviction from now on
+    before = dedup.embedding("t99").copy()
+
+    for i in range(50):  # each add and eviction is two documents of churn
+        dedup.add_task(f"u{i}", f"replaced task {i:03d}")
+    assert dedup.embedder.docs == 100 and dedup.embedder.churn == 200
+    assert dedup._embedded_at_churn == 100  # the count alone never doubles
+    dedup.add_task("u50", "replaced task 050")
+    assert dedup._embedded_at_churn == 201
+    assert not np.allclose(before, dedup.embedding("t99"))
+    # Weighted as of the re-weight, one eviction ago
+    assert _cos(dedup.embedding("t99"), dedup.embedder.embed("original task 099")) > 0.9999
+
+
+@pytest.mark.unit
+def test_repeated_task_ids_in_a_batch_are_indexed_once():
+    dedup = SemanticDeduplicator()
+    added = dedup.add_tasks(
+        [("a", "Fix the websocket leak"), ("b", "Add JWT auth"), ("a", "Add dark mode")]
+    )
+
+    assert [t.task_id for t in added] == ["a", "b"]
+    assert dedup.task_embeddings["a"].description == "Add dark mode"
+    assert dedup.embedder.docs == 2
+    assert dedup._description_bytes == len("Add dark mode") + len("Add JWT auth")
+    dedup.remove_task("a")
+    dedup.remove_task("b")
+    assert dedup.embedder.docs == 0 and not dedup.embedder.doc_freq.any()
@@ -1,6 +1,7 @@
 """Comprehensive tests for AgentComposer class with >95% coverage."""
 
 import json
+import os
 import tempfile
 import threading
 import time
@@ -1867,6 +1868,88 @@ Content
         # Some results may be empty due to file deletion
 
 
+class TestPromptLibraryCaching:
+    """The role/domain index and parsed-spec cache behind compositions."""
+
+    @staticmethod
+    def _library(temp_dir: Path) -> tuple[Path, Path]:
+        roles_dir = temp_dir / "roles"
+        domains_dir = temp_dir / "domains" / "engineering"
+        roles_dir.mkdir()
+        domains_dir.mkdir(parents=True)
+        (roles_dir / "tester.md").write_text(
+            "# Tester\n```yaml\nid: tester\n```\n## Role\nTests things"
+        )
+        (domains_dir / "api.yaml").write_text(
+            yaml.dump({"domain": {"id": "api"}, "specialized_tools": {"http": ["curl"]}})
+        )
+        return roles_dir, domains_dir
+
+    @staticmethod
+    def _touch(path: Path, content: str):
+        """Rewrite `path` with a later mtime, however coarse the clock."""
+        before = path.stat().st_mtime_ns
+        path.write_text(content)
+        os.utime(path, ns=(before + 10**9, before + 10**9))
+
+    def test_repeat_compositions_parse_each_file_once(self, temp_dir):
+        self._library(temp_dir)
+        composer = AgentComposer(str(temp_dir))
+
+        first = composer.compose_agent("tester", "api")
+        first["identity"]["id"] = "changed"
+        first["domain_tools"]["http"].append("wget")
+        for _ in range(5):
+            spec = composer.compose_agent("tester", "api")
+            assert spec["identity"]["id"] == "tester"
+            assert spec["domain_tools"] == {"http": ["curl"]}
+
+        stats = composer._library.stats()
+        assert stats["parses"] == 2 and stats["hits"] == 10
+
+        # Neither a known nor an unknown domain walks the taxonomy again
+        with patch.object(Path, "rglob", side_effect=AssertionError("walked")):
+            assert composer.load_domain_expertise("api")["domain"] == {"id": "api"}
+            with patch("sys.stderr"):
+                assert composer.load_domain_expertise("unknown") == {}
+
+    def test_changed_added_and_removed_files_are_seen(self, temp_dir):
+        roles_dir, domains_dir = self._library(temp_dir)
+        composer = AgentComposer(str(temp_dir))
+        assert composer.list_available_domains() == ["api"]
+
+        self._touch(domains_dir / "api.yaml", yaml.dump({"domain": {"id": "api-v2"}}))
+        assert composer.load_domain_expertise("api")["domain"] == {"id": "api-v2"}
+
+        (domains_dir / "db.yaml").write_text(yaml.dump({"domain": {"id": "db"}}))
+        assert composer.load_domain_expertise("db")["domain"] == {"id": "db"}
+        assert composer.list_available_domains() == ["api", "db"]
+
+        (roles_dir / "tester.md").unlink()
+        with pytest.raises(ValueError, match="Agent role 'tester' not found"):
+            composer.load_agent_role("tester")
+        assert composer.list_available_roles() == []
+
+    def test_reload_rereads_the_whole_library(self, temp_dir):
+        roles_dir, _ = self._library(temp_dir)
+        (temp_dir / "name_mapper.yaml").write_text("synonyms: {}")
+        composer = AgentComposer(str(temp_dir))
+        assert composer.load_agent_role("tester")["identity"] == {"id": "tester"}
+
+        # A known name is not re-indexed, so a new file shadowing its
+        # current one needs an explicit reload
+        (roles_dir / "critic.yaml").write_text("identity: {id: critic}")
+        assert composer.load_agent_role("critic")["identity"] == {"id": "critic"}
+        (roles_dir / "critic.md").write_text("# Critic\n```yaml\nid: critic-md\n```")
+        assert composer.load_agent_role("critic")["identity"] == {"id": "critic"}
+        (temp_dir / "name_mapper.yaml").write_text("synonyms: {qa: quality}")
+
+        composer.reload()
+        assert composer._library.stats()["cached_specs"] == 0
+        assert composer.canonicalize_domain("qa") == "quality"
+        assert composer.load_agent_role("critic")["identity"] == {"id": "critic-md"}
+
+
 class TestCompleteIntegrationWorkflow:
     """End-to-end integration testing of complete workflows."""
 